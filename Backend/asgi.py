@@ -0,0 +1,9 @@
+"""
+BYTE Website Backend API - ASGI entry point
+Serves the read endpoints with async handlers (see async_api/) and
+everything else through the WSGI app:
+    hypercorn asgi:app --bind 0.0.0.0:5000
+"""
+from async_api import create_asgi_app
+
+app = create_asgi_app()
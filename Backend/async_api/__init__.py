@@ -0,0 +1,140 @@
+"""
+Async (ASGI) execution mode
+A Quart app serving the read endpoints of routes/ with async handlers and an
+async Supabase client, so a single process can keep thousands of requests
+waiting on Supabase at once. Every other request (writes, batch, change
+stream, profiles, metrics, delta sync) is passed to the regular WSGI app,
+which runs in a thread pool. The async routes go through the same response
+cache, serve-stale, single-flight, circuit breakers, rate limits and load
+shedding as the WSGI ones (async_api/caching.py, async_api/protection.py).
+Serve it with any ASGI server:
+    hypercorn asgi:app --bind 0.0.0.0:5000
+"""
+from time import perf_counter
+from hypercorn.middleware import AsyncioWSGIMiddleware
+from quart import Quart, g, jsonify, request
+from werkzeug.exceptions import HTTPException
+from config import Config
+from async_api.database import init_async_client
+from async_api.caching import register_async_response_cache, register_async_serve_stale
+from async_api.protection import register_async_load_shedding, register_async_rate_limit
+from async_api.routes.announcements import announcements_bp
+from async_api.routes.events import events_bp
+from async_api.routes.projects import projects_bp
+from async_api.routes.team_members import team_members_bp
+from async_api.routes.users import users_bp
+from main import CORS_ORIGINS, create_app
+from utils.metrics import HTTP_REQUEST_LATENCY, HTTP_REQUESTS, HTTP_REQUESTS_IN_FLIGHT
+from utils.shutdown import run_shutdown_hooks
+
+
+class AsgiDispatcher:
+    """
+    Sends each HTTP request to the async app when it has a handler for it,
+    and to the WSGI app otherwise
+    """
+
+    def __init__(self, async_app, wsgi_app):
+        self.async_app = async_app
+        self.wsgi_app = AsyncioWSGIMiddleware(wsgi_app)
+        self._urls = async_app.url_map.bind('localhost')
+
+    def handles(self, scope):
+        """Whether the async app serves this request"""
+        # Delta sync responses are built by the sync utils/delta_sync.py
+        if scope['method'] != 'GET' or b'updated_since' in scope['query_string']:
+            return False
+        try:
+            self._urls.match(scope['path'], method='GET')
+        except HTTPException:
+            return False
+        return True
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and not self.handles(scope):
+            await self.wsgi_app(scope, receive, send)
+        else:
+            # Async routes, plus the lifespan events that create the async client
+            await self.async_app(scope, receive, send)
+
+
+def create_async_app(config_class=Config):
+    """
+    Create the Quart app holding the async routes
+
+    Args:
+        config_class: Configuration class
+
+    Returns:
+        Quart: The async app (without the WSGI fallback)
+    """
+    app = Quart(__name__, static_folder=None)
+    app.config.from_object(config_class)
+
+    app.register_blueprint(users_bp, url_prefix='/api/users')
+    app.register_blueprint(team_members_bp, url_prefix='/api/team-members')
+    app.register_blueprint(projects_bp, url_prefix='/api/projects')
+    app.register_blueprint(events_bp, url_prefix='/api/events')
+    app.register_blueprint(announcements_bp, url_prefix='/api/announcements')
+
+    @app.before_serving
+    async def start_async_client():
+        await init_async_client()
+
+    @app.after_serving
+    async def flush_background_work():
+        run_shutdown_hooks()
+
+    @app.before_request
+    async def start_request_metrics():
+        g.metrics_started = perf_counter()
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+
+    @app.after_request
+    async def finish_request(response):
+        started = g.pop('metrics_started', None)
+        if started is not None and app.config.get('METRICS_ENABLED'):
+            labels = (request.endpoint or 'unmatched', request.method, str(response.status_code))
+            HTTP_REQUESTS.labels(*labels).inc()
+            HTTP_REQUEST_LATENCY.labels(*labels).observe(perf_counter() - started)
+        if started is not None:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+
+        # Same CORS policy as the WSGI app
+        origin = request.headers.get('Origin')
+        if origin in CORS_ORIGINS:
+            response.headers['Access-Control-Allow-Origin'] = origin
+            response.headers.add('Vary', 'Origin')
+        return response
+
+    @app.errorhandler(HTTPException)
+    async def handle_http_exception(e):
+        # Same body as the WSGI app (utils/error_handlers.py)
+        response = jsonify({'error': e.name, 'message': e.description, 'code': e.code})
+        # 429 and 503 raised by the rate limiter and load shedding
+        if getattr(e, 'retry_after', None) is not None:
+            response.headers['Retry-After'] = str(e.retry_after)
+        return response, e.code
+
+    # Same order as create_app(). After the metrics hooks, so refused and stale
+    # responses are counted, and after_request hooks run in reverse: the
+    # response cache stores a response before serve-stale may replace it.
+    register_async_serve_stale(app)
+    register_async_rate_limit(app)
+    register_async_response_cache(app)
+    register_async_load_shedding(app)
+
+    return app
+
+
+def create_asgi_app(config_class=Config):
+    """
+    Create the ASGI application: async routes with the WSGI app as fallback
+
+    Args:
+        config_class: Configuration class
+
+    Returns:
+        AsgiDispatcher: ASGI application
+    """
+    return AsgiDispatcher(create_async_app(config_class), create_app(config_class))
@@ -0,0 +1,184 @@
+"""
+Authentication and authorization decorators for the ASGI app
+Async versions of middleware/auth.py with the same rules and error bodies:
+the token is verified, the user's rate limit taken and the user looked up
+without blocking the event loop, at most once per request.
+"""
+import asyncio
+from functools import wraps
+from quart import request, g
+from config import Config
+from async_api.database import get_async_supabase_client
+from async_api.protection import limit_user
+from async_api.responses import forbidden_response, unauthorized_response
+from utils.metrics import AUTH_VERIFY_LATENCY
+from utils.shared_cache import shared_cache
+
+
+def get_auth_token():
+    """
+    Extract JWT token from Authorization header
+
+    Returns:
+        str: JWT token or None
+    """
+    auth_header = request.headers.get('Authorization')
+    if not auth_header:
+        return None
+
+    # Expected format: "Bearer <token>"
+    parts = auth_header.split()
+    if len(parts) != 2 or parts[0].lower() != 'bearer':
+        return None
+
+    return parts[1]
+
+
+async def verify_token(token):
+    """
+    Verify JWT token and extract user information
+
+    Args:
+        token (str): JWT token
+
+    Returns:
+        dict: Decoded token payload or None if invalid
+    """
+    try:
+        with AUTH_VERIFY_LATENCY.time():
+            response = await get_async_supabase_client().auth.get_user(token)
+
+        if response and response.user:
+            return {
+                'uid': response.user.id,
+                'email': response.user.email
+            }
+        return None
+    except Exception as e:
+        print(f"Token verification error: {str(e)}")
+        return None
+
+
+async def get_user_from_db(uid):
+    """
+    Fetch user details from database (through the shared user cache)
+    Cache calls may be Redis round trips, so they run in a worker thread.
+
+    Args:
+        uid (str): User ID
+
+    Returns:
+        dict: User data with is_admin and is_owner fields
+    """
+    try:
+        if Config.USER_CACHE_TTL > 0:
+            generation = await asyncio.to_thread(shared_cache.generation, 'users')
+            user = await asyncio.to_thread(shared_cache.get, 'users', uid, metric_name='users')
+            if user is not None:
+                return user
+
+        response = await get_async_supabase_client().table('users').select('*').eq('uid', uid).execute()
+
+        if response.data and len(response.data) > 0:
+            if Config.USER_CACHE_TTL > 0:
+                await asyncio.to_thread(
+                    shared_cache.set, 'users', uid, response.data[0], Config.USER_CACHE_TTL, generation
+                )
+            return response.data[0]
+        return None
+    except Exception as e:
+        print(f"Database error fetching user: {str(e)}")
+        return None
+
+
+async def authenticate_request():
+    """
+    Resolve the authenticated user for the current request
+
+    Returns:
+        tuple: (user, error_message) - user is None when authentication failed
+    """
+    if 'auth_result' in g:
+        return g.auth_result
+
+    token = get_auth_token()
+
+    if not token:
+        result = (None, 'Authentication token is required')
+    else:
+        user_info = await verify_token(token)
+        if not user_info:
+            result = (None, 'Invalid or expired token')
+        else:
+            # Signed-in clients also have a bucket of their own
+            await limit_user(user_info['uid'])
+            user = await get_user_from_db(user_info['uid'])
+            result = (user, None) if user else (None, 'User not found')
+
+    g.auth_result = result
+    return result
+
+
+def require_auth(f):
+    """Decorator to require authentication for an async route (user in g.current_user)"""
+    @wraps(f)
+    async def decorated_function(*args, **kwargs):
+        user, error_msg = await authenticate_request()
+        if error_msg:
+            return unauthorized_response(error_msg)
+
+        g.current_user = user
+
+        return await f(*args, **kwargs)
+
+    return decorated_function
+
+
+def require_admin(f):
+    """Decorator to require admin privileges (is_admin=True or is_owner=True)"""
+    @wraps(f)
+    async def decorated_function(*args, **kwargs):
+        user, error_msg = await authenticate_request()
+        if error_msg:
+            return unauthorized_response(error_msg)
+
+        if not user.get('is_admin') and not user.get('is_owner'):
+            return forbidden_response('Admin privileges required')
+
+        g.current_user = user
+
+        return await f(*args, **kwargs)
+
+    return decorated_function
+
+
+def require_owner(f):
+    """Decorator to require owner privileges (is_owner=True)"""
+    @wraps(f)
+    async def decorated_function(*args, **kwargs):
+        user, error_msg = await authenticate_request()
+        if error_msg:
+            return unauthorized_response(error_msg)
+
+        if not user.get('is_owner'):
+            return forbidden_response('Owner privileges required')
+
+        g.current_user = user
+
+        return await f(*args, **kwargs)
+
+    return decorated_function
+
+
+def optional_auth(f):
+    """Decorator for async routes where authentication is optional (g.current_user when authenticated)"""
+    @wraps(f)
+    async def decorated_function(*args, **kwargs):
+        if get_auth_token():
+            user, _ = await authenticate_request()
+            if user:
+                g.current_user = user
+
+        return await f(*args, **kwargs)
+
+    return decorated_function
@@ -0,0 +1,130 @@
+"""
+Response cache and serve-stale for the ASGI app
+Async versions of middleware/response_cache.py and middleware/serve_stale.py
+with the same rules: anonymous GETs of public content are answered from the
+shared cache (the same entries the WSGI app reads and writes), and a public
+read that fails is answered with its last good copy, or with a 503 and
+Retry-After when a circuit is open. Shared cache calls may be Redis round
+trips, so they run in a worker thread.
+"""
+import asyncio
+import math
+import time
+from quart import g, request
+from middleware.serve_stale import PUBLIC_BLUEPRINTS
+from async_api.responses import error_response
+from utils.cache import TTLCache
+from utils.change_feed import add_change_listener
+from utils.metrics import record_stale_response
+from utils.shared_cache import invalidate_on_change, shared_cache
+
+
+def is_public_read():
+    """Whether the current request is an anonymous GET of public content"""
+    return (
+        request.method == 'GET'
+        and request.blueprint in PUBLIC_BLUEPRINTS
+        and 'Authorization' not in request.headers
+    )
+
+
+def register_async_response_cache(app):
+    """
+    Register the shared response cache with the Quart app
+    Does nothing when RESPONSE_CACHE_TTL is 0. Async routes never serve
+    delta sync, so every public read is cacheable.
+
+    Args:
+        app: Quart application instance
+    """
+    add_change_listener(invalidate_on_change)
+
+    ttl = app.config.get('RESPONSE_CACHE_TTL', 0)
+    if ttl <= 0:
+        return
+
+    @app.before_request
+    async def serve_cached_response():
+        if not is_public_read():
+            return None
+
+        # Blueprint names match the tables they serve
+        g.response_cache_generation = await asyncio.to_thread(shared_cache.generation, request.blueprint)
+        if 'no-cache' in request.headers.get('Cache-Control', ''):
+            return None
+
+        cached = await asyncio.to_thread(
+            shared_cache.get, request.blueprint, request.full_path, metric_name='responses'
+        )
+        if cached is None:
+            return None
+
+        response = app.response_class(cached['body'], status=200, mimetype=cached['mimetype'])
+        response.headers['X-Cache'] = 'HIT'
+        return response
+
+    @app.after_request
+    async def store_response(response):
+        generation = g.pop('response_cache_generation', None)
+        if generation is None or 'X-Cache' in response.headers:
+            return response
+
+        if response.status_code == 200 and 'Warning' not in response.headers:
+            body = await response.get_data(as_text=True)
+            await asyncio.to_thread(shared_cache.set, request.blueprint, request.full_path, {
+                'body': body,
+                'mimetype': response.mimetype,
+            }, ttl, generation)
+        response.headers['X-Cache'] = 'MISS'
+        return response
+
+
+def register_async_serve_stale(app):
+    """
+    Register serve-stale-on-error handling with the Quart app
+    Does nothing unless SERVE_STALE_ENABLED is set in the app config.
+
+    Args:
+        app: Quart application instance
+    """
+    if not app.config.get('SERVE_STALE_ENABLED'):
+        return
+
+    last_good = TTLCache(
+        ttl=app.config['STALE_MAX_AGE'],
+        max_entries=app.config['STALE_CACHE_MAX_ENTRIES'],
+        name='stale_responses'
+    )
+
+    @app.after_request
+    async def serve_stale_on_error(response):
+        public = is_public_read()
+
+        if public and response.status_code == 200:
+            last_good.set(request.full_path, (await response.get_data(), response.mimetype, time.time()))
+            return response
+
+        if response.status_code < 500:
+            return response
+
+        if public:
+            entry = last_good.get(request.full_path)
+            if entry is not None:
+                body, mimetype, stored_at = entry
+                stale = app.response_class(body, status=200, mimetype=mimetype)
+                stale.headers['Age'] = str(int(time.time() - stored_at))
+                stale.headers['Warning'] = '110 - "Response is Stale", 111 - "Revalidation Failed"'
+                record_stale_response(request.endpoint)
+                return stale
+
+        circuit_error = g.get('circuit_open_error')
+        if circuit_error is not None:
+            unavailable, status_code = error_response(
+                'Service temporarily unavailable, please retry shortly',
+                error='Service Unavailable', status_code=503
+            )
+            unavailable.status_code = status_code
+            unavailable.headers['Retry-After'] = str(max(1, math.ceil(circuit_error.retry_after)))
+            return unavailable
+
+        return response
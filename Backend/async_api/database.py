@@ -0,0 +1,119 @@
+"""
+Async Supabase client for the ASGI app
+Queries are built exactly like the sync ones and awaited:
+    response = await get_async_supabase_client().table('events').select('*').execute()
+They share the circuit breakers and query observers (metrics, round-trip
+budgets) of database.py, and identical selects are coalesced. With
+SUPABASE_BACKEND=fake the async client reads and writes the same in-memory
+database as the WSGI app.
+"""
+import logging
+from time import perf_counter
+from quart import g, has_request_context
+from supabase import AsyncClientOptions, acreate_client
+from config import Config
+import database
+from database import InstrumentedQuery, async_query_single_flight, circuit_breakers, record_call
+from utils.circuit_breaker import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+_async_client = None
+
+
+class AsyncInstrumentedQuery(InstrumentedQuery):
+    """InstrumentedQuery whose execute() is awaited instead of blocking the thread"""
+
+    __slots__ = ()
+
+    async def execute(self):
+        """
+        Execute the query and notify the query observers
+
+        Identical selects in flight on the event loop share one round trip,
+        as in InstrumentedQuery.execute (SINGLE_FLIGHT_ENABLED).
+        """
+        try:
+            if self._operation == 'select' and Config.SINGLE_FLIGHT_ENABLED:
+                return await async_query_single_flight.do(
+                    self.single_flight_key(), self._execute, timeout=Config.SINGLE_FLIGHT_TIMEOUT
+                )
+            return await self._execute()
+        except CircuitOpenError as e:
+            # Lets the serve-stale hook answer 503 or a stale copy (see async_api/caching.py),
+            # for callers that shared the call too
+            if has_request_context():
+                g.circuit_open_error = e
+            raise
+
+    async def _execute(self):
+        # Fails fast with CircuitOpenError while the table's circuit is open
+        breaker = circuit_breakers.get(self._table) if Config.CIRCUIT_BREAKER_ENABLED else None
+        if breaker is not None:
+            breaker.before_call()
+
+        started = perf_counter()
+        error = None
+        try:
+            response = await self._builder.execute()
+        except Exception as e:
+            error = e
+            if breaker is not None:
+                breaker.record_failure(e)
+            raise
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return response
+        finally:
+            record_call(self._table, self._operation, perf_counter() - started, error)
+
+
+class AsyncInstrumentedClient:
+    """Async counterpart of database.InstrumentedClient"""
+
+    __slots__ = ('_client',)
+
+    def __init__(self, client):
+        self._client = client
+
+    def table(self, table_name):
+        return AsyncInstrumentedQuery(self._client.table(table_name), table_name, scope=id(self._client))
+
+    from_ = table
+
+    def rpc(self, fn, *args, **kwargs):
+        return AsyncInstrumentedQuery(self._client.rpc(fn, *args, **kwargs), fn, 'rpc')
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+async def init_async_client():
+    """
+    Create the process-wide async client
+    Called once when the ASGI server starts (the real client is created by a coroutine).
+    """
+    global _async_client
+    if _async_client is not None:
+        return
+
+    if Config.SUPABASE_BACKEND == 'fake':
+        _async_client = database.supabase.async_client()
+    else:
+        _async_client = await acreate_client(
+            Config.SUPABASE_URL, Config.SUPABASE_KEY,
+            options=AsyncClientOptions(postgrest_client_timeout=Config.SUPABASE_TIMEOUT)
+        )
+
+
+def get_async_supabase_client() -> AsyncInstrumentedClient:
+    """
+    Get the async Supabase client
+
+    Returns:
+        AsyncInstrumentedClient: Configured async Supabase client
+    """
+    if _async_client is None:
+        raise RuntimeError("Async Supabase client not initialized; serve the app with an ASGI server")
+    return AsyncInstrumentedClient(_async_client)
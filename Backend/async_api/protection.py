@@ -0,0 +1,101 @@
+"""
+Rate limiting and load shedding for the ASGI app
+The same token buckets, overload detector and 429/503 responses as
+middleware/rate_limit.py and middleware/load_shedding.py. Bucket updates
+may be Redis round trips, so they run in a worker thread instead of
+blocking the event loop.
+
+The async routes are all normal-priority reads; the expensive requests
+(batch, delta sync, activity log, change stream) are served by the WSGI app,
+which limits and sheds them itself.
+"""
+import asyncio
+import math
+from quart import current_app, request
+from werkzeug.exceptions import ServiceUnavailable
+from middleware.load_shedding import NORMAL, create_overload_detector, parse_request_start
+from middleware.rate_limit import take_token
+from utils.metrics import record_shed_request
+
+
+def client_ip():
+    """
+    Address of the client, read from X-Forwarded-For behind TRUSTED_PROXY_COUNT
+    proxies like werkzeug's ProxyFix does for the WSGI app
+
+    Returns:
+        str: Client IP
+    """
+    proxies = current_app.config.get('TRUSTED_PROXY_COUNT', 0)
+    if proxies > 0:
+        forwarded = [value.strip() for value in request.headers.get('X-Forwarded-For', '').split(',')]
+        if len(forwarded) >= proxies and forwarded[-proxies]:
+            return forwarded[-proxies]
+    return request.remote_addr or 'unknown'
+
+
+async def limit_user(uid):
+    """
+    Take a token from a signed-in user's bucket
+    Called by async_api/auth.py once the token is verified.
+
+    Args:
+        uid (str): User ID
+
+    Raises:
+        TooManyRequests: If the user's bucket is empty
+    """
+    config = current_app.config
+    if config.get('RATE_LIMIT_ENABLED'):
+        await asyncio.to_thread(take_token, 'user', uid, config['RATE_LIMIT_USER_RATE'], config['RATE_LIMIT_USER_BURST'])
+
+
+def register_async_rate_limit(app):
+    """
+    Register per-IP rate limiting with the Quart app
+    Does nothing unless RATE_LIMIT_ENABLED is set in the app config. Register it
+    before the response cache, so cached responses count against the limit too.
+
+    Args:
+        app: Quart application instance
+    """
+    if not app.config.get('RATE_LIMIT_ENABLED'):
+        return
+
+    rate = app.config['RATE_LIMIT_IP_RATE']
+    burst = app.config['RATE_LIMIT_IP_BURST']
+
+    @app.before_request
+    async def limit_client_ip():
+        if request.method != 'OPTIONS':
+            await asyncio.to_thread(take_token, 'ip', client_ip(), rate, burst)
+
+
+def register_async_load_shedding(app):
+    """
+    Register load shedding with the Quart app
+    Does nothing unless LOAD_SHED_ENABLED is set in the app config. Register it
+    after the response cache, so cached responses are served even while shedding.
+
+    Args:
+        app: Quart application instance
+    """
+    if not app.config.get('LOAD_SHED_ENABLED'):
+        return
+
+    # Only X-Request-Start from a trusted proxy: an ASGI server has no thread queue to probe
+    detector, trust_queue_header = create_overload_detector(app.config)
+    retry_after = max(1, math.ceil(detector.interval))
+
+    @app.before_request
+    async def shed_load():
+        if request.method == 'OPTIONS':
+            return
+        if trust_queue_header:
+            signal = parse_request_start(request.headers.get('X-Request-Start', ''))
+            if signal is not None:
+                detector.observe(signal)
+        # Normal requests are shed at level 2 only
+        if detector.current_level() >= 2:
+            record_shed_request(NORMAL, 'overload')
+            raise ServiceUnavailable("Server is overloaded, please retry shortly", retry_after=retry_after)
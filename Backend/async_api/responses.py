@@ -0,0 +1,76 @@
+"""
+Response helpers for the ASGI app
+Same response bodies and status codes as utils/responses.py, built with
+Quart's jsonify.
+"""
+from quart import jsonify
+
+
+def success_response(data=None, message=None, status_code=200):
+    """
+    Generate a successful response
+
+    Args:
+        data: Response data
+        message (str): Optional success message
+        status_code (int): HTTP status code (default: 200)
+
+    Returns:
+        tuple: (response, status_code)
+    """
+    response = {}
+
+    if message:
+        response['message'] = message
+
+    if data is not None:
+        response['data'] = data
+
+    return jsonify(response), status_code
+
+
+def error_response(message, error=None, status_code=400):
+    """
+    Generate an error response
+
+    Args:
+        message (str): Error message
+        error (str): Optional error type/code
+        status_code (int): HTTP status code (default: 400)
+
+    Returns:
+        tuple: (response, status_code)
+    """
+    response = {
+        'message': message
+    }
+
+    if error:
+        response['error'] = error
+
+    return jsonify(response), status_code
+
+
+def not_found_response(message="Resource not found"):
+    """Generate a 404 Not Found response"""
+    return error_response(message=message, error="Not Found", status_code=404)
+
+
+def unauthorized_response(message="Unauthorized"):
+    """Generate a 401 Unauthorized response"""
+    return error_response(message=message, error="Unauthorized", status_code=401)
+
+
+def forbidden_response(message="Forbidden"):
+    """Generate a 403 Forbidden response"""
+    return error_response(message=message, error="Forbidden", status_code=403)
+
+
+def bad_request_response(message="Bad request", error=None):
+    """Generate a 400 Bad Request response"""
+    return error_response(message=message, error=error or "Bad Request", status_code=400)
+
+
+def server_error_response(message="Internal server error"):
+    """Generate a 500 Internal Server Error response"""
+    return error_response(message=message, error="Internal Server Error", status_code=500)
@@ -0,0 +1,6 @@
+"""
+Async route handlers
+Read endpoints of the blueprints in routes/, with the same URLs, rules and
+response bodies. Writes and the remaining endpoints are served by the WSGI
+app (see async_api.AsgiDispatcher).
+"""
@@ -0,0 +1,66 @@
+"""
+Announcements routes (async) - read operations for announcements table
+Authorization: Public read
+"""
+from quart import Blueprint, request
+from async_api.database import get_async_supabase_client
+from async_api.responses import (
+    bad_request_response, not_found_response, server_error_response, success_response
+)
+
+announcements_bp = Blueprint('announcements', __name__)
+
+
+@announcements_bp.route('', methods=['GET'])
+async def get_announcements():
+    """
+    Get all announcements
+    Authorization: Public (no authentication required)
+    Ordered by created_at (most recent first)
+    """
+    try:
+        response = await get_async_supabase_client().table('announcements').select('*').order('created_at', desc=True).execute()
+
+        return success_response(data=response.data)
+
+    except Exception as e:
+        return server_error_response(f"Failed to fetch announcements: {str(e)}")
+
+
+@announcements_bp.route('/<announcement_id>', methods=['GET'])
+async def get_announcement(announcement_id):
+    """
+    Get a specific announcement by ID
+    Authorization: Public (no authentication required)
+    """
+    try:
+        response = await get_async_supabase_client().table('announcements').select('*').eq('id', announcement_id).execute()
+
+        if not response.data or len(response.data) == 0:
+            return not_found_response("Announcement not found")
+
+        return success_response(data=response.data[0])
+
+    except Exception as e:
+        return server_error_response(f"Failed to fetch announcement: {str(e)}")
+
+
+@announcements_bp.route('/recent', methods=['GET'])
+async def get_recent_announcements():
+    """
+    Get recent announcements (limit can be specified)
+    Authorization: Public (no authentication required)
+    Query parameter: limit (default: 10)
+    """
+    try:
+        limit = request.args.get('limit', 10, type=int)
+
+        if limit < 1 or limit > 100:
+            return bad_request_response("limit must be between 1 and 100")
+
+        response = await get_async_supabase_client().table('announcements').select('*').order('created_at', desc=True).limit(limit).execute()
+
+        return success_response(data=response.data)
+
+    except Exception as e:
+        return server_error_response(f"Failed to fetch recent announcements: {str(e)}")
@@ -0,0 +1,85 @@
+"""
+Events routes (async) - read operations for events table
+Authorization: Public read
+"""
+from quart import Blueprint, request
+from async_api.database import get_async_supabase_client
+from async_api.responses import not_found_response, server_error_response, success_response
+
+events_bp = Blueprint('events', __name__)
+
+
+@events_bp.route('', methods=['GET'])
+async def get_events():
+    """
+    Get all events
+    Authorization: Public (no authentication required)
+    Optional query parameters:
+    - is_past: Filter by is_past (true/false)
+    - type: Filter by event type
+    """
+    try:
+        query = get_async_supabase_client().table('events').select('*')
+
+        is_past = request.args.get('is_past')
+        if is_past is not None:
+            query = query.eq('is_past', is_past.lower() == 'true')
+
+        event_type = request.args.get('type')
+        if event_type:
+            query = query.eq('type', event_type)
+
+        response = await query.order('date', desc=True).execute()
+
+        return success_response(data=response.data)
+
+    except Exception as e:
+        return server_error_response(f"Failed to fetch events: {str(e)}")
+
+
+@events_bp.route('/<event_id>', methods=['GET'])
+async def get_event(event_id):
+    """
+    Get a specific event by ID
+    Authorization: Public (no authentication required)
+    """
+    try:
+        response = await get_async_supabase_client().table('events').select('*').eq('id', event_id).execute()
+
+        if not response.data or len(response.data) == 0:
+            return not_found_response("Event not found")
+
+        return success_response(data=response.data[0])
+
+    except Exception as e:
+        return server_error_response(f"Failed to fetch event: {str(e)}")
+
+
+@events_bp.route('/upcoming', methods=['GET'])
+async def get_upcoming_events():
+    """
+    Get upcoming events (is_past = false)
+    Authorization: Public (no authentication required)
+    """
+    try:
+        response = await get_async_supabase_client().table('events').select('*').eq('is_past', False).order('date', desc=False).execute()
+
+        return success_response(data=response.data)
+
+    except Exception as e:
+        return server_error_response(f"Failed to fetch upcoming events: {str(e)}")
+
+
+@events_bp.route('/past', methods=['GET'])
+async def get_past_events():
+    """
+    Get past events (is_past = true)
+    Authorization: Public (no authentication required)
+    """
+    try:
+        response = await get_async_supabase_client().table('events').select('*').eq('is_past', True).order('date', desc=True).execute()
+
+        return success_response(data=response.data)
+
+    except Exception as e:
+        return server_error_response(f"Failed to fetch past events: {str(e)}")
@@ -0,0 +1,75 @@
+"""
+Projects routes (async) - read operations for projects table
+Authorization: Public read
+"""
+from quart import Blueprint, request
+from async_api.database import get_async_supabase_client
+from async_api.responses import (
+    bad_request_response, not_found_response, server_error_response, success_response
+)
+
+projects_bp = Blueprint('projects', __name__)
+
+
+@projects_bp.route('', methods=['GET'])
+async def get_projects():
+    """
+    Get all projects
+    Authorization: Public (no authentication required)
+    Optional query parameters:
+    - type: Filter by type (current/past)
+    - status: Filter by status (On-going/Completed)
+    """
+    try:
+        query = get_async_supabase_client().table('projects').select('*')
+
+        project_type = request.args.get('type')
+        if project_type:
+            query = query.eq('type', project_type)
+
+        status = request.args.get('status')
+        if status:
+            query = query.eq('status', status)
+
+        response = await query.order('updated_at', desc=True).execute()
+
+        return success_response(data=response.data)
+
+    except Exception as e:
+        return server_error_response(f"Failed to fetch projects: {str(e)}")
+
+
+@projects_bp.route('/<project_id>', methods=['GET'])
+async def get_project(project_id):
+    """
+    Get a specific project by ID
+    Authorization: Public (no authentication required)
+    """
+    try:
+        response = await get_async_supabase_client().table('projects').select('*').eq('id', project_id).execute()
+
+        if not response.data or len(response.data) == 0:
+            return not_found_response("Project not found")
+
+        return success_response(data=response.data[0])
+
+    except Exception as e:
+        return server_error_response(f"Failed to fetch project: {str(e)}")
+
+
+@projects_bp.route('/type/<project_type>', methods=['GET'])
+async def get_projects_by_type(project_type):
+    """
+    Get projects by type (current/past)
+    Authorization: Public (no authentication required)
+    """
+    try:
+        if project_type not in ['current', 'past']:
+            return bad_request_response("Invalid project type. Must be 'current' or 'past'")
+
+        response = await get_async_supabase_client().table('projects').select('*').eq('type', project_type).order('updated_at', desc=True).execute()
+
+        return success_response(data=response.data)
+
+    except Exception as e:
+        return server_error_response(f"Failed to fetch projects by type: {str(e)}")
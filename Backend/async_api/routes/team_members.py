@@ -0,0 +1,65 @@
+"""
+Team Members routes (async) - read operations for team_members table
+Authorization: Public read
+"""
+from quart import Blueprint, request
+from async_api.database import get_async_supabase_client
+from async_api.responses import not_found_response, server_error_response, success_response
+
+team_members_bp = Blueprint('team_members', __name__)
+
+
+@team_members_bp.route('', methods=['GET'])
+async def get_team_members():
+    """
+    Get all team members
+    Authorization: Public (no authentication required)
+    Optional query parameters:
+    - category: Filter by category
+    """
+    try:
+        query = get_async_supabase_client().table('team_members').select('*')
+
+        category = request.args.get('category')
+        if category:
+            query = query.contains('categories', [category])
+
+        response = await query.order('rank', desc=True).execute()
+
+        return success_response(data=response.data)
+
+    except Exception as e:
+        return server_error_response(f"Failed to fetch team members: {str(e)}")
+
+
+@team_members_bp.route('/<member_id>', methods=['GET'])
+async def get_team_member(member_id):
+    """
+    Get a specific team member by ID
+    Authorization: Public (no authentication required)
+    """
+    try:
+        response = await get_async_supabase_client().table('team_members').select('*').eq('id', member_id).execute()
+
+        if not response.data or len(response.data) == 0:
+            return not_found_response("Team member not found")
+
+        return success_response(data=response.data[0])
+
+    except Exception as e:
+        return server_error_response(f"Failed to fetch team member: {str(e)}")
+
+
+@team_members_bp.route('/category/<category_name>', methods=['GET'])
+async def get_team_members_by_category(category_name):
+    """
+    Get team members by category
+    Authorization: Public (no authentication required)
+    """
+    try:
+        response = await get_async_supabase_client().table('team_members').select('*').contains('categories', [category_name]).order('rank', desc=True).execute()
+
+        return success_response(data=response.data)
+
+    except Exception as e:
+        return server_error_response(f"Failed to fetch team members by category: {str(e)}")
@@ -0,0 +1,45 @@
+"""
+Users routes (async) - read operations for users table
+Authorization: Admin/Owner access only
+"""
+from quart import Blueprint
+from async_api.auth import require_admin
+from async_api.database import get_async_supabase_client
+from async_api.responses import not_found_response, server_error_response, success_response
+
+users_bp = Blueprint('users', __name__)
+
+
+@users_bp.route('', methods=['GET'])
+@require_admin
+async def get_users():
+    """
+    Get all users
+    Authorization: Admin or Owner only
+    """
+    try:
+        response = await get_async_supabase_client().table('users').select('*').execute()
+
+        return success_response(data=response.data)
+
+    except Exception as e:
+        return server_error_response(f"Failed to fetch users: {str(e)}")
+
+
+@users_bp.route('/<uid>', methods=['GET'])
+@require_admin
+async def get_user(uid):
+    """
+    Get a specific user by UID
+    Authorization: Admin or Owner only
+    """
+    try:
+        response = await get_async_supabase_client().table('users').select('*').eq('uid', uid).execute()
+
+        if not response.data or len(response.data) == 0:
+            return not_found_response("User not found")
+
+        return success_response(data=response.data[0])
+
+    except Exception as e:
+        return server_error_response(f"Failed to fetch user: {str(e)}")
@@ -0,0 +1,11 @@
+"""
+Performance benchmarks
+Micro-benchmarks of the auth decorators, validators and response builders,
+and a load driver for the API, all running against the in-memory fake
+Supabase backend so results are reproducible offline.
+
+Usage (from Backend/):
+    python -m benchmarks all                       # micro + load, saved to benchmarks/results/
+    python -m benchmarks load --latency-ms 20      # model a 20 ms database round trip
+    python -m benchmarks compare base.json new.json
+"""
@@ -0,0 +1,172 @@
+"""
+Command line entry point: python -m benchmarks {micro,load,all,asgi,server,validation,compare}
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+
+# Benchmarks always run against the in-memory backend, never a live project
+os.environ['SUPABASE_BACKEND'] = 'fake'
+# Every simulated client shares one address, and overload is what is being measured
+os.environ.setdefault('RATE_LIMIT_ENABLED', 'False')
+os.environ.setdefault('LOAD_SHED_ENABLED', 'False')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Run API performance benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    for name, help_text in (('micro', 'micro-benchmarks only'), ('load', 'load scenarios only'),
+                            ('all', 'micro-benchmarks and load scenarios')):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('--output', help='Result file (default: benchmarks/results/<timestamp>-<commit>.json)')
+        command.add_argument('--latency-ms', type=float, default=0.0, help='Simulated database round trip')
+        command.add_argument('--jitter-ms', type=float, default=0.0, help='Extra random latency per database call')
+        if name != 'load':
+            command.add_argument('--filter', help='Only run micro-benchmarks whose name contains this')
+        if name != 'micro':
+            command.add_argument('--scenario', action='append', help='Load scenario (repeatable, default: all)')
+            command.add_argument('--requests', type=int, default=2000, help='Requests per scenario')
+            command.add_argument('--concurrency', type=int, default=8, help='Client threads')
+            command.add_argument('--seed', type=int, default=1, help='Seed for the request mix')
+
+    asgi = commands.add_parser('asgi', help='WSGI vs ASGI throughput on public reads')
+    asgi.add_argument('--output', help='Result file (default: benchmarks/results/<timestamp>-<commit>.json)')
+    asgi.add_argument('--latency-ms', type=float, default=20.0, help='Simulated database round trip')
+    asgi.add_argument('--jitter-ms', type=float, default=0.0, help='Extra random latency per database call')
+    asgi.add_argument('--requests', type=int, default=2000, help='Requests per mode and concurrency level')
+    asgi.add_argument('--concurrency', type=int, action='append',
+                      help='In-flight requests (repeatable, default: 8, 64 and 512)')
+    asgi.add_argument('--wsgi-threads', type=int, default=8, help='Server threads for the WSGI app (workers x threads)')
+
+    server = commands.add_parser('server', help='gunicorn worker models and settings over HTTP')
+    server.add_argument('--output', help='Result file (default: benchmarks/results/<timestamp>-<commit>.json)')
+    server.add_argument('--latency-ms', type=float, default=20.0, help='Simulated database round trip')
+    server.add_argument('--jitter-ms', type=float, default=0.0, help='Extra random latency per database call')
+    server.add_argument('--config', action='append', help='Configuration (repeatable, default: all)')
+    server.add_argument('--requests', type=int, default=2000, help='Requests per configuration')
+    server.add_argument('--concurrency', type=int, default=64, help='Requests in flight')
+
+    validation = commands.add_parser('validation', help='Compiled schemas vs validator helpers on generated rows')
+    validation.add_argument('--output', help='Result file (default: benchmarks/results/<timestamp>-<commit>.json)')
+    validation.add_argument('--rows', type=int, default=10000, help='Rows per resource')
+    validation.add_argument('--repeat', type=int, default=7, help='Timed passes over the rows')
+    validation.add_argument('--seed', type=int, default=1, help='Seed for the generated rows')
+    validation.set_defaults(latency_ms=0.0, jitter_ms=0.0)  # no database calls
+
+    compare = commands.add_parser('compare', help='Compare two result files')
+    compare.add_argument('baseline')
+    compare.add_argument('candidate')
+    compare.add_argument('--threshold', type=float, default=10.0, help='Percent change flagged as a regression')
+    return parser
+
+
+def compare(args):
+    from benchmarks.harness import compare_results
+
+    with open(args.baseline) as baseline_file, open(args.candidate) as candidate_file:
+        baseline, candidate = json.load(baseline_file), json.load(candidate_file)
+
+    print(f"baseline:  {baseline['meta'].get('commit')}  {baseline['meta'].get('timestamp')}")
+    print(f"candidate: {candidate['meta'].get('commit')}  {candidate['meta'].get('timestamp')}\n")
+
+    rows, regressions = compare_results(baseline, candidate, args.threshold)
+    width = max((len(row[0]) for row in rows), default=10)
+    for metric, old, new, change, flag in rows:
+        print(f"{metric:<{width}}  {old:>12}  {new:>12}  {change:>+7.1f}%  {flag}")
+
+    print(f"\n{len(regressions)} regression(s) above {args.threshold}%")
+    return 1 if regressions else 0
+
+
+def run(args):
+    from benchmarks.harness import environment_info, save_results
+    from database import supabase
+    from main import create_app
+
+    # Keep per-request warnings (e.g. round-trip budget) out of the report
+    logging.disable(logging.WARNING)
+
+    supabase.latency_ms = args.latency_ms
+    supabase.jitter_ms = args.jitter_ms
+    app = create_app()
+
+    results = {'meta': dict(environment_info(), latency_ms_setting=args.latency_ms, jitter_ms=args.jitter_ms)}
+
+    if args.command == 'server':
+        from benchmarks.server import run_server_benchmarks
+
+        print('Benchmarking gunicorn configurations...', file=sys.stderr)
+        results['server'] = run_server_benchmarks(
+            args.config, requests=args.requests, concurrency=args.concurrency, latency_ms=args.latency_ms
+        )
+        for name, result in results['server'].items():
+            latency = result['latency']
+            print(
+                f"  {name:<28} {result['throughput_rps']:>8.1f} req/s  p50 {latency['p50_ms']:.2f} ms  "
+                f"p99 {latency['p99_ms']:.2f} ms  errors {result['errors']}  "
+                f"{result['pss_kib'] / 1024:.0f} MiB  ready in {result['startup_s']:.2f} s"
+            )
+
+    if args.command == 'asgi':
+        from benchmarks.asgi import run_comparison
+
+        print('Comparing WSGI and ASGI...', file=sys.stderr)
+        results['asgi'] = run_comparison(args.requests, args.concurrency or (8, 64, 512), args.wsgi_threads)
+        for mode, levels in results['asgi'].items():
+            for level, result in levels.items():
+                latency = result['latency']
+                print(
+                    f"  {mode} {level:<17} {result['throughput_rps']:>8.1f} req/s  p50 {latency['p50_ms']:.2f} ms  "
+                    f"p99 {latency['p99_ms']:.2f} ms  errors {result['errors']}"
+                )
+
+    if args.command == 'validation':
+        from benchmarks.validation import run_validation
+
+        print(f'Validating {args.rows} rows per resource...', file=sys.stderr)
+        results['validation'] = run_validation(args.rows, repeat=args.repeat, seed=args.seed)
+        for name, result in results['validation'].items():
+            for mode in ('helpers', 'compiled'):
+                timing = result[mode]
+                print(
+                    f"  {name:<9} {mode:<9} {timing['total_ms']:>9.2f} ms  {timing['per_row_us']:>7.3f} us/row  "
+                    f"{timing['rejected']} rejected"
+                )
+            print(f"  {name:<9} speedup   {result['speedup']:.2f}x")
+
+    if args.command in ('micro', 'all'):
+        from benchmarks.micro import run_micro
+
+        print('Running micro-benchmarks...', file=sys.stderr)
+        results['micro'] = run_micro(app, only=args.filter)
+        for name, result in results['micro'].items():
+            print(f"  {name:<45} {result['median_us']:>10.2f} us  {result['peak_kib']:>8.1f} KiB peak")
+
+    if args.command in ('load', 'all'):
+        from benchmarks.load import run_load
+
+        results['load'] = run_load(
+            app, args.scenario, requests=args.requests, concurrency=args.concurrency, seed=args.seed
+        )
+        for name, result in results['load'].items():
+            latency = result['latency']
+            print(
+                f"  {name:<15} {result['throughput_rps']:>8.1f} req/s  p50 {latency['p50_ms']:.2f} ms  "
+                f"p95 {latency['p95_ms']:.2f} ms  p99 {latency['p99_ms']:.2f} ms  errors {result['errors']}  "
+                f"{result['allocations_per_request']['peak_kib']:.1f} KiB/request"
+            )
+
+    print(f"Results written to {save_results(results, args.output)}", file=sys.stderr)
+    return 0
+
+
+def main():
+    args = build_parser().parse_args()
+    return compare(args) if args.command == 'compare' else run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
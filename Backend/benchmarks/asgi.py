@@ -0,0 +1,149 @@
+"""
+WSGI vs ASGI comparison
+Sends the same public reads, at several concurrency levels, to create_app()
+served by a fixed pool of threads (as gunicorn workers x threads would) and
+to the ASGI app on one event loop. Meaningful only with a simulated database
+round trip (--latency-ms): WSGI throughput is capped at threads / round trip,
+while the async handlers overlap the waits.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+from benchmarks.harness import latency_summary
+
+READ_PATHS = [
+    '/api/announcements/recent',
+    '/api/events/upcoming',
+    '/api/events/past',
+    '/api/team-members',
+    '/api/team-members/category/Leadership',
+    '/api/projects?type=current',
+    '/api/projects/type/past',
+]
+
+
+def _summary(durations, statuses, elapsed, concurrency):
+    return {
+        'requests': len(durations),
+        'concurrency': concurrency,
+        'duration_s': round(elapsed, 3),
+        'throughput_rps': round(len(durations) / elapsed, 1) if elapsed else None,
+        'errors': sum(1 for status in statuses if status >= 400),
+        'latency': latency_summary(durations),
+    }
+
+
+async def _run_wsgi(app, requests, concurrency, threads):
+    durations, statuses = [], []
+    counter = iter(range(requests))
+    clients = threading.local()
+    loop = asyncio.get_running_loop()
+
+    def handle(path):
+        if not hasattr(clients, 'client'):
+            clients.client = app.test_client()
+        return clients.client.get(path).status_code
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        async def worker():
+            for i in counter:
+                started = time.perf_counter()
+                # Queued until one of the server threads is free, as in a gthread worker
+                status = await loop.run_in_executor(pool, handle, READ_PATHS[i % len(READ_PATHS)])
+                durations.append(time.perf_counter() - started)
+                statuses.append(status)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return _summary(durations, statuses, time.perf_counter() - started, concurrency)
+
+
+def run_wsgi(app, requests, concurrency, threads=8):
+    """
+    Drive the WSGI app through a fixed pool of server threads
+
+    Args:
+        app: Flask application
+        requests (int): Total requests
+        concurrency (int): Requests in flight (queued when all threads are busy)
+        threads (int): Server threads (gunicorn workers x threads)
+
+    Returns:
+        dict: Throughput, latency and errors
+    """
+    return asyncio.run(_run_wsgi(app, requests, concurrency, threads))
+
+
+async def _run_asgi(app, requests, concurrency):
+    durations, statuses = [], []
+    counter = iter(range(requests))
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url='http://benchmark') as client:
+        async def worker():
+            for i in counter:
+                started = time.perf_counter()
+                response = await client.get(READ_PATHS[i % len(READ_PATHS)])
+                durations.append(time.perf_counter() - started)
+                statuses.append(response.status_code)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return _summary(durations, statuses, time.perf_counter() - started, concurrency)
+
+
+def run_asgi(app, requests, concurrency):
+    """
+    Drive the ASGI app with concurrent asyncio tasks in one thread
+
+    Args:
+        app: ASGI application (async_api.create_asgi_app())
+        requests (int): Total requests
+        concurrency (int): Concurrent tasks
+
+    Returns:
+        dict: Throughput, latency and errors
+    """
+    async def run():
+        await app.async_app.startup()
+        try:
+            return await _run_asgi(app, requests, concurrency)
+        finally:
+            await app.async_app.shutdown()
+
+    return asyncio.run(run())
+
+
+def run_comparison(requests=2000, concurrency_levels=(8, 64, 512), wsgi_threads=8):
+    """
+    Compare both execution modes at several concurrency levels
+
+    Args:
+        requests (int): Requests per mode and level
+        concurrency_levels (iterable): In-flight requests to test
+        wsgi_threads (int): Server threads available to the WSGI app
+
+    Returns:
+        dict: Mode ('wsgi', 'asgi') -> 'concurrency_<n>' -> results
+    """
+    from async_api import create_asgi_app
+    from config import Config
+    from main import create_app
+
+    class ComparisonConfig(Config):
+        # The response cache would answer most WSGI requests without the database
+        RESPONSE_CACHE_TTL = 0
+
+    wsgi_app = create_app(ComparisonConfig)
+    asgi_app = create_asgi_app(ComparisonConfig)
+
+    run_wsgi(wsgi_app, 50, 4, wsgi_threads)
+    run_asgi(asgi_app, 50, 4)
+
+    results = {'wsgi': {}, 'asgi': {}}
+    for concurrency in concurrency_levels:
+        results['wsgi'][f'concurrency_{concurrency}'] = run_wsgi(wsgi_app, requests, concurrency, wsgi_threads)
+        results['asgi'][f'concurrency_{concurrency}'] = run_asgi(asgi_app, requests, concurrency)
+    return results
@@ -0,0 +1,214 @@
+"""
+Benchmark helpers: timing, percentiles, allocation tracking and result files
+"""
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BACKEND_DIR, 'benchmarks', 'results')
+
+
+def percentile(sorted_values, pct):
+    """
+    Nearest-rank percentile of an already sorted list
+
+    Args:
+        sorted_values (list): Values in ascending order
+        pct (float): Percentile between 0 and 100
+
+    Returns:
+        float: The percentile value (0.0 for an empty list)
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def latency_summary(durations):
+    """
+    Summarize request durations
+
+    Args:
+        durations (list): Durations in seconds
+
+    Returns:
+        dict: count and p50/p95/p99/max/mean in milliseconds
+    """
+    values = sorted(durations)
+    return {
+        'count': len(values),
+        'p50_ms': round(percentile(values, 50) * 1000, 3),
+        'p95_ms': round(percentile(values, 95) * 1000, 3),
+        'p99_ms': round(percentile(values, 99) * 1000, 3),
+        'max_ms': round(values[-1] * 1000, 3) if values else 0.0,
+        'mean_ms': round(statistics.fmean(values) * 1000, 3) if values else 0.0,
+    }
+
+
+def measure_allocations(fn, iterations):
+    """
+    Measure memory allocated while calling fn, using tracemalloc
+
+    Args:
+        fn (callable): Function to call with no arguments
+        iterations (int): Number of calls to average over
+
+    Returns:
+        dict: peak_kib (highest extra memory held during one call) and
+              retained_bytes (memory still held after a call, a leak indicator)
+    """
+    fn()  # Warm caches so one-time allocations are not counted
+    tracemalloc.start()
+    try:
+        peaks, retained = [], []
+        for _ in range(iterations):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            fn()
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            retained.append(current - before)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'peak_kib': round(statistics.fmean(peaks) / 1024, 2),
+        'retained_bytes': round(statistics.fmean(retained), 1),
+    }
+
+
+def time_function(fn, repeat=15, min_batch_time=0.05):
+    """
+    Time a fast function the way timeit does: batches of calls, repeated
+
+    Args:
+        fn (callable): Function to call with no arguments
+        repeat (int): Number of batches
+        min_batch_time (float): Minimum seconds per batch (sets calls per batch)
+
+    Returns:
+        dict: Per-call best/median/mean/stdev in microseconds and ops_per_sec
+    """
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    number = max(number, int(number * min_batch_time / 0.2))
+    per_call = sorted(total / number * 1e6 for total in timer.repeat(repeat=repeat, number=number))
+    median = statistics.median(per_call)
+
+    return {
+        'calls_per_batch': number,
+        'batches': repeat,
+        'best_us': round(per_call[0], 3),
+        'median_us': round(median, 3),
+        'mean_us': round(statistics.fmean(per_call), 3),
+        'stdev_us': round(statistics.stdev(per_call), 3) if len(per_call) > 1 else 0.0,
+        'ops_per_sec': round(1e6 / median, 1) if median else None,
+    }
+
+
+def git_commit():
+    """Current git commit (short hash, '-dirty' when there are local changes), or None"""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+        return f'{commit}-dirty' if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment_info():
+    """Metadata stored with every result file so runs can be compared fairly"""
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def save_results(results, path=None):
+    """
+    Write results as JSON
+
+    Args:
+        results (dict): Benchmark results
+        path (str): Output file (default: benchmarks/results/<timestamp>-<commit>.json)
+
+    Returns:
+        str: Path written
+    """
+    if path is None:
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        path = os.path.join(RESULTS_DIR, f"{stamp}-{results['meta'].get('commit') or 'unknown'}.json")
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as results_file:
+        json.dump(results, results_file, indent=2, sort_keys=True)
+    return path
+
+
+def flatten_metrics(results, prefix=''):
+    """Flatten nested result dicts into {'load.mixed.latency.p95_ms': value} pairs"""
+    metrics = {}
+    for key, value in results.items():
+        name = f'{prefix}{key}'
+        if isinstance(value, dict):
+            metrics.update(flatten_metrics(value, f'{name}.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            metrics[name] = value
+    return metrics
+
+
+# Metrics where a higher value is better; for everything else lower is better
+HIGHER_IS_BETTER = ('ops_per_sec', 'throughput_rps')
+
+# Metrics that describe the run rather than its performance
+IGNORED_METRICS = ('calls_per_batch', 'batches', 'count', 'requests', 'concurrency', 'cpu_count',
+                   'latency_ms_setting', 'duration_s', 'errors', 'iterations', 'rows', 'stdev_us', 'max_ms', 'retained_bytes')
+
+
+def compare_results(baseline, candidate, threshold=10.0):
+    """
+    Compare two result files metric by metric
+
+    Args:
+        baseline (dict): Results of the reference run
+        candidate (dict): Results of the new run
+        threshold (float): Percent change flagged as a regression
+
+    Returns:
+        tuple: (rows, regressions) where rows are (metric, old, new, change_pct, flag)
+    """
+    old_metrics = flatten_metrics({k: v for k, v in baseline.items() if k != 'meta'})
+    new_metrics = flatten_metrics({k: v for k, v in candidate.items() if k != 'meta'})
+    rows, regressions = [], []
+
+    for metric in sorted(old_metrics.keys() & new_metrics.keys()):
+        if metric.rsplit('.', 1)[-1] in IGNORED_METRICS:
+            continue
+        old, new = old_metrics[metric], new_metrics[metric]
+        change = ((new - old) / old * 100) if old else 0.0
+        worse = -change if metric.endswith(HIGHER_IS_BETTER) else change
+        flag = 'REGRESSION' if worse > threshold else ('improved' if worse < -threshold else '')
+        rows.append((metric, old, new, round(change, 1), flag))
+        if flag == 'REGRESSION':
+            regressions.append(metric)
+
+    return rows, regressions
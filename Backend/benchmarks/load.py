@@ -0,0 +1,242 @@
+"""
+Load driver for the API
+Runs weighted mixes of requests against create_app() with several client
+threads, over the fake Supabase backend, and reports throughput, latency
+percentiles per endpoint and memory allocated per request.
+"""
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from benchmarks.harness import latency_summary, measure_allocations
+
+ADMIN_HEADERS = {'Authorization': 'Bearer fake-admin-token'}
+
+
+class WorkerState:
+    """Per-thread state: the IDs of rows this worker created, for later updates/deletes"""
+
+    def __init__(self, worker_id):
+        self.worker_id = worker_id
+        self.sequence = 0
+        self.events = []
+        self.announcements = []
+
+    def next_id(self, prefix):
+        self.sequence += 1
+        return f'bench-{prefix}-{self.worker_id}-{self.sequence}'
+
+
+# Public reads
+
+def list_team_members(client, state):
+    return client.get('/api/team-members')
+
+
+def team_members_by_category(client, state):
+    return client.get('/api/team-members/category/Leadership')
+
+
+def upcoming_events(client, state):
+    return client.get('/api/events/upcoming')
+
+
+def past_events(client, state):
+    return client.get('/api/events/past')
+
+
+def events_delta(client, state):
+    since = (datetime.now(timezone.utc) - timedelta(minutes=5)).isoformat()
+    return client.get('/api/events', query_string={'updated_since': since})
+
+
+def current_projects(client, state):
+    return client.get('/api/projects', query_string={'type': 'current'})
+
+
+def recent_announcements(client, state):
+    return client.get('/api/announcements/recent')
+
+
+def batch_home_page(client, state):
+    return client.post('/api/batch', json={'requests': [
+        '/api/announcements/recent', '/api/events/upcoming', {'path': '/api/projects', 'params': {'type': 'current'}}
+    ]})
+
+
+# Admin writes
+
+def create_event(client, state):
+    event_id = state.next_id('event')
+    response = client.post('/api/events', headers=ADMIN_HEADERS, json={
+        'id': event_id,
+        'title': 'Load Test Workshop',
+        'date': '2030-03-01',
+        'description': 'Created by the load benchmark',
+        'type': 'workshop',
+        'location': 'TMU',
+    })
+    if response.status_code == 201:
+        state.events.append(event_id)
+    return response
+
+
+def update_event(client, state):
+    if not state.events:
+        return create_event(client, state)
+    return client.put(f'/api/events/{state.events[-1]}', headers=ADMIN_HEADERS, json={
+        'title': f'Load Test Workshop #{state.sequence}',
+    })
+
+
+def delete_event(client, state):
+    if not state.events:
+        return create_event(client, state)
+    return client.delete(f'/api/events/{state.events.pop(0)}', headers=ADMIN_HEADERS)
+
+
+def create_announcement(client, state):
+    announcement_id = state.next_id('announcement')
+    response = client.post('/api/announcements', headers=ADMIN_HEADERS, json={
+        'id': announcement_id,
+        'date': 'Mar 1, 2030',
+        'title': 'Load Test Announcement',
+        'description': 'Created by the load benchmark',
+    })
+    if response.status_code == 201:
+        state.announcements.append(announcement_id)
+    return response
+
+
+def delete_announcement(client, state):
+    if not state.announcements:
+        return create_announcement(client, state)
+    return client.delete(f'/api/announcements/{state.announcements.pop(0)}', headers=ADMIN_HEADERS)
+
+
+PUBLIC_READS = [
+    (20, recent_announcements),
+    (15, upcoming_events),
+    (10, past_events),
+    (15, list_team_members),
+    (10, team_members_by_category),
+    (15, current_projects),
+    (10, events_delta),
+    (5, batch_home_page),
+]
+
+ADMIN_WRITES = [
+    (3, create_event),
+    (3, update_event),
+    (2, delete_event),
+    (1, create_announcement),
+    (1, delete_announcement),
+]
+
+# Scenario name -> weighted operations
+SCENARIOS = {
+    # Visitors browsing the public site
+    'public_reads': PUBLIC_READS,
+    # 90% public reads, 10% admin dashboard writes (reads weigh 100 in total, writes 10)
+    'mixed': [(weight * 9, op) for weight, op in PUBLIC_READS] + [(weight * 10, op) for weight, op in ADMIN_WRITES],
+}
+
+
+def _run_worker(app, operations, weights, count, seed, worker_id, samples, lock):
+    client = app.test_client()
+    rng = random.Random(seed * 1000 + worker_id)
+    state = WorkerState(worker_id)
+    local = []
+
+    for _ in range(count):
+        operation = rng.choices(operations, weights)[0]
+        started = time.perf_counter()
+        response = operation(client, state)
+        local.append((operation.__name__, time.perf_counter() - started, response.status_code))
+
+    with lock:
+        samples.extend(local)
+
+
+def run_scenario(app, scenario, requests=2000, concurrency=8, seed=1, warmup=50, allocation_iterations=100):
+    """
+    Drive one scenario against the app
+
+    Args:
+        app: Flask application (using the fake Supabase backend)
+        scenario (str): Key of SCENARIOS
+        requests (int): Total measured requests, split across the threads
+        concurrency (int): Client threads
+        seed (int): Seed for the operation mix, so runs are reproducible
+        warmup (int): Unmeasured requests sent first
+        allocation_iterations (int): Sequential requests traced for allocations
+
+    Returns:
+        dict: Throughput, overall and per-endpoint latency, errors and allocations
+    """
+    weighted = SCENARIOS[scenario]
+    weights = [weight for weight, _ in weighted]
+    operations = [operation for _, operation in weighted]
+
+    _run_worker(app, operations, weights, warmup, seed, -1, [], threading.Lock())
+
+    samples = []
+    lock = threading.Lock()
+    per_worker = [requests // concurrency + (1 if i < requests % concurrency else 0) for i in range(concurrency)]
+    threads = [
+        threading.Thread(target=_run_worker, args=(app, operations, weights, count, seed, i, samples, lock))
+        for i, count in enumerate(per_worker)
+    ]
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    by_endpoint = defaultdict(list)
+    errors = defaultdict(int)
+    for name, duration, status in samples:
+        by_endpoint[name].append(duration)
+        if status >= 400:
+            errors[name] += 1
+
+    # Allocations are traced on a separate sequential pass: tracemalloc slows
+    # every allocation down and would distort the latency figures above
+    client = app.test_client()
+    rng = random.Random(seed)
+    state = WorkerState('alloc')
+
+    def one_request():
+        rng.choices(operations, weights)[0](client, state)
+
+    return {
+        'requests': len(samples),
+        'concurrency': concurrency,
+        'duration_s': round(elapsed, 3),
+        'throughput_rps': round(len(samples) / elapsed, 1) if elapsed else None,
+        'errors': sum(errors.values()),
+        'latency': latency_summary([duration for _, duration, _ in samples]),
+        'endpoints': {
+            name: dict(latency_summary(durations), errors=errors.get(name, 0))
+            for name, durations in sorted(by_endpoint.items())
+        },
+        'allocations_per_request': measure_allocations(one_request, allocation_iterations),
+    }
+
+
+def run_load(app, scenarios=None, **options):
+    """
+    Run several scenarios
+
+    Args:
+        app: Flask application
+        scenarios (list): Scenario names (default: all)
+        **options: Passed to run_scenario()
+
+    Returns:
+        dict: Scenario name -> results
+    """
+    return {name: run_scenario(app, name, **options) for name in (scenarios or SCENARIOS)}
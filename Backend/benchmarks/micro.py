@@ -0,0 +1,108 @@
+"""
+Micro-benchmarks for the auth decorators, validators and response builders
+Each case is timed in batches (see harness.time_function) and its transient
+memory is measured with tracemalloc.
+"""
+from benchmarks.harness import measure_allocations, time_function
+from middleware.auth import optional_auth, require_admin, require_auth, require_owner
+from utils.responses import bad_request_response, created_response, success_response
+from utils.schemas import EVENT_SCHEMA
+from utils.validators import (
+    parse_timestamp, validate_date_format, validate_email, validate_required_fields, validate_url
+)
+
+OWNER_HEADERS = {'Authorization': 'Bearer fake-owner-token'}
+
+SAMPLE_EVENT = {
+    'id': 'bench-event',
+    'title': 'Benchmark Event',
+    'date': '2030-01-15',
+    'description': 'An event used by the micro-benchmarks',
+    'location': 'TMU Student Centre',
+    'type': 'workshop',
+    'registration_url': 'https://byte.org/register',
+    'updated_at': '2030-01-01T12:00:00+00:00',
+}
+
+
+def _view():
+    return 'ok', 200
+
+
+def _in_request(app, fn, headers=None):
+    """Wrap fn so every call runs inside a fresh request context"""
+    def call():
+        with app.test_request_context('/api/bench', headers=headers):
+            return fn()
+    return call
+
+
+def _in_app(app, fn):
+    """Wrap fn so every call runs inside an app context (for jsonify)"""
+    def call():
+        with app.app_context():
+            return fn()
+    return call
+
+
+def micro_cases(app):
+    """
+    Benchmark cases as name -> zero-argument callable
+
+    The auth cases resolve a real token through the fake Supabase backend,
+    so they cover token verification and the user lookup as well.
+    """
+    rows_10 = [dict(SAMPLE_EVENT, id=f'event-{i}') for i in range(10)]
+    rows_100 = [dict(SAMPLE_EVENT, id=f'event-{i}') for i in range(100)]
+
+    return {
+        # Validators
+        'validators.validate_required_fields': lambda: validate_required_fields(
+            SAMPLE_EVENT, ['id', 'title', 'date', 'description']
+        ),
+        'validators.validate_email': lambda: validate_email('member@byte.org'),
+        'validators.validate_url': lambda: validate_url('https://github.com/byte-org/securebyte'),
+        'validators.validate_date_format': lambda: validate_date_format('2030-01-15'),
+        'validators.parse_timestamp': lambda: parse_timestamp('2030-01-15T12:30:00Z'),
+        'schemas.event_create': lambda: EVENT_SCHEMA.validate_create(SAMPLE_EVENT),
+        'schemas.event_update': lambda: EVENT_SCHEMA.validate_update({'title': 'Renamed', 'type': 'social'}),
+
+        # Response builders
+        'responses.success_response_1_row': _in_app(app, lambda: success_response(data=SAMPLE_EVENT)),
+        'responses.success_response_10_rows': _in_app(app, lambda: success_response(data=rows_10)),
+        'responses.success_response_100_rows': _in_app(app, lambda: success_response(data=rows_100)),
+        'responses.created_response': _in_app(app, lambda: created_response(data=SAMPLE_EVENT)),
+        'responses.bad_request_response': _in_app(app, lambda: bad_request_response('date is required')),
+
+        # Auth decorators (request context + token verification + user lookup)
+        'auth.request_context_only': _in_request(app, _view, OWNER_HEADERS),
+        'auth.optional_auth_anonymous': _in_request(app, optional_auth(_view)),
+        'auth.optional_auth_token': _in_request(app, optional_auth(_view), OWNER_HEADERS),
+        'auth.require_auth': _in_request(app, require_auth(_view), OWNER_HEADERS),
+        'auth.require_admin': _in_request(app, require_admin(_view), OWNER_HEADERS),
+        'auth.require_owner': _in_request(app, require_owner(_view), OWNER_HEADERS),
+        'auth.require_auth_missing_token': _in_request(app, require_auth(_view)),
+    }
+
+
+def run_micro(app, only=None, repeat=15, allocation_iterations=200):
+    """
+    Run the micro-benchmarks
+
+    Args:
+        app: Flask application (using the fake Supabase backend)
+        only (str): Optional substring; only matching cases are run
+        repeat (int): Timing batches per case
+        allocation_iterations (int): Calls averaged for the allocation figures
+
+    Returns:
+        dict: Case name -> timing and allocation results
+    """
+    results = {}
+    for name, fn in micro_cases(app).items():
+        if only and only not in name:
+            continue
+        result = time_function(fn, repeat=repeat)
+        result.update(measure_allocations(fn, allocation_iterations))
+        results[name] = result
+    return results
@@ -0,0 +1,165 @@
+"""
+Production server benchmarks
+Starts gunicorn with gunicorn.conf.py and a set of overrides, over the fake
+Supabase backend with a simulated round trip, then drives it over real HTTP
+with concurrent keep-alive clients. Reports throughput, latency, errors,
+the memory of the whole process tree and how long the server took to
+become ready.
+"""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import httpx
+from benchmarks.asgi import READ_PATHS
+from benchmarks.harness import latency_summary
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Configuration name -> environment overrides for gunicorn.conf.py (unset: its defaults)
+CONFIGURATIONS = {
+    'sync_w2': {'GUNICORN_WORKER_CLASS': 'sync', 'WEB_CONCURRENCY': '2'},
+    'gthread_w2_t4': {'GUNICORN_WORKER_CLASS': 'gthread', 'WEB_CONCURRENCY': '2', 'GUNICORN_THREADS': '4'},
+    'gthread_w2_t8': {'GUNICORN_WORKER_CLASS': 'gthread', 'WEB_CONCURRENCY': '2', 'GUNICORN_THREADS': '8'},
+    'gthread_w2_t16': {'GUNICORN_WORKER_CLASS': 'gthread', 'WEB_CONCURRENCY': '2', 'GUNICORN_THREADS': '16'},
+    'gevent_w2': {'GUNICORN_WORKER_CLASS': 'gevent', 'WEB_CONCURRENCY': '2'},
+    'gthread_w2_t8_keepalive_2': {'GUNICORN_WORKER_CLASS': 'gthread', 'WEB_CONCURRENCY': '2', 'GUNICORN_KEEPALIVE': '2'},
+    'gthread_w2_t8_keepalive_5': {'GUNICORN_WORKER_CLASS': 'gthread', 'WEB_CONCURRENCY': '2', 'GUNICORN_KEEPALIVE': '5'},
+    'gthread_w2_t8_no_preload': {'GUNICORN_WORKER_CLASS': 'gthread', 'WEB_CONCURRENCY': '2', 'GUNICORN_PRELOAD': 'False'},
+    'gthread_w2_t8_recycle_200': {
+        'GUNICORN_WORKER_CLASS': 'gthread', 'WEB_CONCURRENCY': '2',
+        'GUNICORN_MAX_REQUESTS': '200', 'GUNICORN_MAX_REQUESTS_JITTER': '20',
+    },
+}
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _tree_pss_kib(pid):
+    """
+    Proportional set size of a process and its children (Linux /proc only)
+
+    Unlike RSS, pages shared by forked workers (preload_app) are split between
+    them instead of being counted once per worker.
+    """
+    total = 0
+    pids = [pid]
+    while pids:
+        current = pids.pop()
+        try:
+            with open(f'/proc/{current}/smaps_rollup') as smaps:
+                total += next(int(line.split()[1]) for line in smaps if line.startswith('Pss:'))
+            with open(f'/proc/{current}/task/{current}/children') as children:
+                pids.extend(int(child) for child in children.read().split())
+        except (OSError, StopIteration):
+            continue
+    return total
+
+
+async def _drive(base_url, requests, concurrency):
+    durations, statuses = [], []
+    counter = iter(range(requests))
+    # Clients keep connections open, like browsers and proxies do
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def worker():
+            for i in counter:
+                started = time.perf_counter()
+                try:
+                    status = (await client.get(READ_PATHS[i % len(READ_PATHS)])).status_code
+                except httpx.HTTPError:
+                    status = 599
+                durations.append(time.perf_counter() - started)
+                statuses.append(status)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        'requests': len(durations),
+        'concurrency': concurrency,
+        'duration_s': round(elapsed, 3),
+        'throughput_rps': round(len(durations) / elapsed, 1) if elapsed else None,
+        'errors': sum(1 for status in statuses if status >= 400),
+        'latency': latency_summary(durations),
+    }
+
+
+def run_configuration(overrides, requests=2000, concurrency=64, latency_ms=20.0):
+    """
+    Benchmark one gunicorn configuration
+
+    Args:
+        overrides (dict): Environment variables read by gunicorn.conf.py
+        requests (int): Measured requests
+        concurrency (int): Requests in flight
+        latency_ms (float): Simulated Supabase round trip
+
+    Returns:
+        dict: Load results plus startup_s and pss_kib
+    """
+    port = _free_port()
+    env = dict(os.environ, **overrides)
+    env.update({
+        'SUPABASE_BACKEND': 'fake',
+        'FAKE_SUPABASE_LATENCY_MS': str(latency_ms),
+        'GUNICORN_BIND': f'127.0.0.1:{port}',
+        # Measure the server, not the response cache
+        'RESPONSE_CACHE_TTL': '0',
+    })
+    env.pop('PROMETHEUS_MULTIPROC_DIR', None)
+
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py'],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError(f"gunicorn exited with status {server.returncode} ({overrides})")
+            try:
+                if httpx.get(f'{base_url}/api/health', timeout=1).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                time.sleep(0.05)
+        startup = time.perf_counter() - started
+
+        asyncio.run(_drive(base_url, 100, 8))
+        result = asyncio.run(_drive(base_url, requests, concurrency))
+        result['startup_s'] = round(startup, 2)
+        result['pss_kib'] = _tree_pss_kib(server.pid)
+        return result
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def run_server_benchmarks(names=None, **options):
+    """
+    Benchmark several configurations
+
+    Args:
+        names (list): Keys of CONFIGURATIONS (default: all)
+        **options: Passed to run_configuration()
+
+    Returns:
+        dict: Configuration name -> results
+    """
+    results = {}
+    for name in names or CONFIGURATIONS:
+        print(f'  starting {name}...', file=sys.stderr)
+        results[name] = run_configuration(CONFIGURATIONS[name], **options)
+    return results
@@ -0,0 +1,150 @@
+"""
+Request body validation benchmark
+Validates the same generated rows with the helper chains the routes used to
+run (utils/validators.py, one check after another, stopping at the first
+error) and with the compiled schemas of utils/schemas.py. One row in ten is
+invalid, spread over every rule.
+"""
+import random
+import statistics
+import time
+from utils.schemas import EVENT_SCHEMA, PROJECT_SCHEMA
+from utils.validators import validate_date_format, validate_required_fields, validate_status, validate_url
+
+
+def helpers_event(data):
+    """Event create checks as routes/events.py ran them before the schemas"""
+    is_valid, error_msg = validate_required_fields(data, ['id', 'title', 'date', 'description'])
+    if not is_valid:
+        return [error_msg]
+    if not validate_date_format(data['date']):
+        return ["date must be in YYYY-MM-DD format"]
+    valid_types = ['workshop', 'hackathon', 'networking', 'social', 'competition']
+    if 'type' in data and data['type'] and data['type'] not in valid_types:
+        return [f"type must be one of: {', '.join(valid_types)}"]
+    if 'registration_url' in data and data['registration_url'] and not validate_url(data['registration_url']):
+        return ["registration_url must be a valid URL"]
+    if 'recap_url' in data and data['recap_url'] and not validate_url(data['recap_url']):
+        return ["recap_url must be a valid URL"]
+    return []
+
+
+def helpers_project(data):
+    """Project create checks as routes/projects.py ran them before the schemas"""
+    required_fields = ['id', 'title', 'status', 'description', 'technologies', 'github_url', 'type']
+    is_valid, error_msg = validate_required_fields(data, required_fields)
+    if not is_valid:
+        return [error_msg]
+    if not validate_status(data['status'], ['On-going', 'Completed']):
+        return ["status must be 'On-going' or 'Completed'"]
+    if not validate_status(data['type'], ['current', 'past']):
+        return ["type must be 'current' or 'past'"]
+    if not isinstance(data['technologies'], list):
+        return ["technologies must be an array"]
+    if not validate_url(data['github_url']):
+        return ["github_url must be a valid URL"]
+    return []
+
+
+# Mistakes applied to every tenth row, in turn
+EVENT_MISTAKES = (
+    lambda row: row.pop('title'),
+    lambda row: row.update(date='15/01/2030'),
+    lambda row: row.update(type='party'),
+    lambda row: row.update(registration_url='byte.org/register'),
+)
+PROJECT_MISTAKES = (
+    lambda row: row.update(description=''),
+    lambda row: row.update(status='Paused'),
+    lambda row: row.update(technologies='Python'),
+    lambda row: row.update(github_url='github.com/byte-org'),
+)
+
+
+def event_rows(count, rng):
+    rows = []
+    for i in range(count):
+        row = {
+            'id': f'event-{i}',
+            'title': f'Workshop {i}',
+            'date': f'2030-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+            'description': 'Hands-on session on building with large language models',
+            'location': 'TMU Student Centre',
+            'type': rng.choice(('workshop', 'hackathon', 'networking', 'social', 'competition')),
+            'registration_url': f'https://byte.org/register/{i}',
+            'recap_url': None,
+        }
+        if i % 10 == 9:
+            EVENT_MISTAKES[(i // 10) % len(EVENT_MISTAKES)](row)
+        rows.append(row)
+    return rows
+
+
+def project_rows(count, rng):
+    rows = []
+    for i in range(count):
+        row = {
+            'id': f'project-{i}',
+            'title': f'Project {i}',
+            'status': rng.choice(('On-going', 'Completed')),
+            'description': 'Static analysis and LLM review of submitted code',
+            'technologies': ['Python', 'Flask', 'React'],
+            'github_url': f'https://github.com/byte-org/project-{i}',
+            'type': rng.choice(('current', 'past')),
+            'image_url': None,
+        }
+        if i % 10 == 9:
+            PROJECT_MISTAKES[(i // 10) % len(PROJECT_MISTAKES)](row)
+        rows.append(row)
+    return rows
+
+
+def _time_rows(validate, rows, repeat):
+    """Median seconds to validate every row, and how many rows were rejected"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rejected = 0
+        for row in rows:
+            if validate(row):
+                rejected += 1
+        timings.append(time.perf_counter() - started)
+
+    median = statistics.median(timings)
+    return {
+        'rows': len(rows),
+        'rejected': rejected,
+        'total_ms': round(median * 1000, 3),
+        'per_row_us': round(median / len(rows) * 1e6, 3),
+        'rows_per_sec': round(len(rows) / median, 1),
+    }
+
+
+def run_validation(rows=10000, repeat=7, seed=1):
+    """
+    Validate generated event and project rows both ways
+
+    Args:
+        rows (int): Rows per resource
+        repeat (int): Timed passes over the rows (the median is reported)
+        seed (int): Seed for the generated rows
+
+    Returns:
+        dict: Resource -> helpers and compiled results, and the speedup
+    """
+    rng = random.Random(seed)
+    cases = {
+        'events': (event_rows(rows, rng), helpers_event, EVENT_SCHEMA.validate_create),
+        'projects': (project_rows(rows, rng), helpers_project, PROJECT_SCHEMA.validate_create),
+    }
+
+    results = {}
+    for name, (data, helpers, compiled) in cases.items():
+        before = _time_rows(helpers, data, repeat)
+        after = _time_rows(compiled, data, repeat)
+        results[name] = {
+            'helpers': before,
+            'compiled': after,
+            'speedup': round(before['total_ms'] / after['total_ms'], 2),
+        }
+    return results
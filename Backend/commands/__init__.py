@@ -0,0 +1,22 @@
+"""
+Flask CLI commands package
+Commands are available through the flask CLI, e.g.:
+    flask --app main activity-log retain --days 90
+"""
+from commands.activity_log import activity_log_cli
+from commands.data import data_cli
+from commands.images import images_cli
+from commands.snapshots import snapshots_cli
+
+
+def register_commands(app):
+    """
+    Register CLI command groups with Flask application
+
+    Args:
+        app: Flask application instance
+    """
+    app.cli.add_command(activity_log_cli)
+    app.cli.add_command(snapshots_cli)
+    app.cli.add_command(images_cli)
+    app.cli.add_command(data_cli)
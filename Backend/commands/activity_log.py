@@ -0,0 +1,28 @@
+"""
+Activity log maintenance commands
+"""
+import click
+from flask.cli import AppGroup
+from utils.activity_archive import RetentionError, run_retention
+
+activity_log_cli = AppGroup('activity-log', help='Activity log maintenance commands.')
+
+
+@activity_log_cli.command('retain')
+@click.option('--days', type=int, default=None,
+              help='Keep this many days of activity in the hot table (default: ACTIVITY_RETENTION_DAYS).')
+@click.option('--batch-size', type=int, default=None,
+              help='Rows archived and deleted per batch (default: ACTIVITY_RETENTION_BATCH_SIZE).')
+@click.option('--dry-run', is_flag=True, help='Only report how many rows would be archived.')
+def retain(days, batch_size, dry_run):
+    """
+    Roll up, archive and delete activity log rows older than the retention window
+
+    Intended to run daily from cron. Only one instance should run at a time.
+    """
+    try:
+        archived = run_retention(days=days, batch_size=batch_size, dry_run=dry_run, log=click.echo)
+    except RetentionError as e:
+        raise click.ClickException(str(e))
+    if not dry_run:
+        click.echo(f"Done: {archived} activity log rows archived")
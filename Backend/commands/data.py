@@ -0,0 +1,163 @@
+"""
+Bulk data commands
+"""
+import os
+import sys
+from datetime import datetime, timezone
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from utils.backup import BACKUP_TABLES, BackupError, load_manifest, run_backup, run_restore
+from utils.bulk_import import (
+    COLLECTIONS, FORMATS, ImportCheckpoint, SourceError, detect_format, file_digest, read_records,
+    run_import, sql_collections
+)
+
+data_cli = AppGroup('data', help='Bulk import, backup and restore of collection data.')
+
+
+@data_cli.command('import')
+@click.argument('source', type=click.Path(exists=True, dir_okay=False))
+@click.option('--collection', '-c', type=click.Choice(sorted(COLLECTIONS)),
+              help='Table to import into (default: the file name, e.g. events.csv; every table for .sql).')
+@click.option('--format', 'fmt', type=click.Choice(FORMATS), help='Source format (default: from the extension).')
+@click.option('--batch-size', type=int, default=None, help='Rows per insert (default: IMPORT_BATCH_SIZE).')
+@click.option('--workers', type=int, default=None, help='Batches in flight at once (default: IMPORT_WORKERS).')
+@click.option('--upsert', is_flag=True, help='Update rows whose key already exists instead of refusing them.')
+@click.option('--restart', is_flag=True, help='Ignore the checkpoint of an earlier run and import everything.')
+@click.option('--dry-run', is_flag=True, help='Only validate the rows.')
+def import_data(source, collection, fmt, batch_size, workers, upsert, restart, dry_run):
+    """
+    Import rows from a JSON, NDJSON, CSV or SQL seed file
+
+    Rows are checked with the create rules of the API, then inserted in
+    parallel batches. Progress is kept in SOURCE.<collection>.checkpoint:
+    after a crash or outage, run the same command again to continue where it
+    stopped.
+
+    \b
+    Examples:
+        flask --app main data import ../supabase_seed_data.sql
+        flask --app main data import members.csv -c team_members --upsert
+        flask --app main data import activity.ndjson -c activity_log --workers 8
+    """
+    fmt = fmt or detect_format(source)
+    if fmt is None:
+        raise click.UsageError(f"Cannot tell the format of {source}; pass --format")
+
+    if collection:
+        collections = [collection]
+    elif fmt == 'sql':
+        collections = sql_collections(source)
+    else:
+        name = os.path.splitext(os.path.basename(source))[0].replace('-', '_')
+        if name not in COLLECTIONS:
+            raise click.UsageError(f"Cannot tell the collection from the file name {source}; pass --collection")
+        collections = [name]
+
+    batch_size = batch_size or current_app.config['IMPORT_BATCH_SIZE']
+    digest = file_digest(source)
+    failed = False
+    for name in collections:
+        checkpoint = None
+        if not dry_run:
+            identity = {'source': digest, 'collection': name, 'batch_size': batch_size}
+            checkpoint = ImportCheckpoint(f'{source}.{name}.checkpoint', identity)
+            if restart:
+                checkpoint.remove()
+            try:
+                checkpoint.load()
+            except ValueError as e:
+                raise click.UsageError(f"{str(e)}; pass --restart to start over")
+
+        try:
+            result = run_import(
+                name, read_records(source, fmt, name), source_id=digest, batch_size=batch_size, workers=workers,
+                upsert=upsert, checkpoint=checkpoint, dry_run=dry_run, log=lambda line: click.echo(line, err=True)
+            )
+        except SourceError as e:
+            raise click.ClickException(str(e))
+
+        verb = 'valid' if dry_run else 'imported'
+        click.echo(
+            f"{name}: {result['imported']} {verb}, {result['skipped']} already imported, "
+            f"{result['rejected']} rejected, {result['refused']} refused by the database, {result['failed']} failed "
+            f"in {result['seconds']:.2f} s ({result['rows_per_sec']:.0f} rows/s)"
+        )
+        if result['rejected'] or result['refused'] or result['failed']:
+            failed = True
+        # Rejected and refused rows would fail again on a rerun; only an outage leaves work to resume
+        if checkpoint is not None and not result['failed']:
+            checkpoint.remove()
+
+    if failed:
+        sys.exit(1)
+
+
+@data_cli.command('backup')
+@click.argument('output', required=False, type=click.Path(file_okay=False))
+@click.option('--table', '-t', 'tables', multiple=True, type=click.Choice(list(BACKUP_TABLES)),
+              help='Only this table (repeatable; default: all).')
+@click.option('--page-size', type=int, default=None, help='Rows per read (default: BACKUP_PAGE_SIZE).')
+@click.option('--workers', type=int, default=None, help='Tables read at once (default: BACKUP_WORKERS).')
+def backup(output, tables, page_size, workers):
+    """
+    Stream tables to gzipped NDJSON files with a checksummed manifest
+
+    OUTPUT defaults to BACKUP_DIR/backup-<UTC timestamp>.
+    """
+    if output is None:
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        output = os.path.join(current_app.config['BACKUP_DIR'], f'backup-{stamp}')
+
+    try:
+        manifest = run_backup(output, tables or None, page_size=page_size, workers=workers, log=click.echo)
+    except BackupError as e:
+        raise click.ClickException(str(e))
+
+    rows = sum(entry['rows'] for entry in manifest['tables'].values())
+    click.echo(f"Done: {rows} rows from {len(manifest['tables'])} tables in {manifest['seconds']:.2f} s -> {output}")
+    changed = {table: entry['changed_during_backup'] for table, entry in manifest['tables'].items()
+               if entry['changed_during_backup']}
+    if changed:
+        click.echo("Rows changed while the backup ran (it may not be a consistent snapshot): "
+                   + ', '.join(f"{table} {count}" for table, count in changed.items()), err=True)
+
+
+@data_cli.command('verify')
+@click.argument('directory', type=click.Path(exists=True, file_okay=False))
+def verify(directory):
+    """Check every file of a backup against its manifest checksum"""
+    try:
+        manifest = load_manifest(directory)
+    except BackupError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"OK: {len(manifest['tables'])} tables from {manifest['started_at']}")
+
+
+@data_cli.command('restore')
+@click.argument('directory', type=click.Path(exists=True, file_okay=False))
+@click.option('--table', '-t', 'tables', multiple=True, type=click.Choice(list(BACKUP_TABLES)),
+              help='Only this table (repeatable; default: every table in the backup).')
+@click.option('--batch-size', type=int, default=None, help='Rows per insert (default: IMPORT_BATCH_SIZE).')
+@click.option('--workers', type=int, default=None, help='Batches in flight at once (default: IMPORT_WORKERS).')
+@click.option('--upsert', is_flag=True, help='Overwrite rows whose key already exists instead of refusing them.')
+def restore(directory, tables, batch_size, workers, upsert):
+    """
+    Load a backup made by `data backup`
+
+    Checksums are verified before anything is written. Restore into empty
+    tables, or pass --upsert to overwrite the rows a backup holds (rows added
+    since are kept). Users must exist in Supabase Auth with the same ids.
+    """
+    try:
+        results = run_restore(directory, tables or None, batch_size=batch_size, workers=workers, upsert=upsert,
+                              log=lambda line: click.echo(line, err=True))
+    except BackupError as e:
+        raise click.ClickException(str(e))
+
+    rows = sum(result['imported'] for result in results.values())
+    refused = sum(result['refused'] + result['failed'] for result in results.values())
+    click.echo(f"Done: {rows} rows restored into {len(results)} tables, {refused} not restored")
+    if refused:
+        sys.exit(1)
@@ -0,0 +1,32 @@
+"""
+Image commands
+"""
+import click
+from flask.cli import AppGroup
+from database import get_admin_client
+from utils.image_placeholders import IMAGE_COLUMNS, META_COLUMN, refresh_image_meta
+
+images_cli = AppGroup('images', help='Image sizes and placeholders.')
+
+
+@images_cli.command('placeholders')
+@click.option('--collection', '-c', 'collections', multiple=True, type=click.Choice(sorted(IMAGE_COLUMNS)),
+              help='Only this table (repeatable; default: all).')
+@click.option('--force', is_flag=True, help='Recompute every row, including images that failed before.')
+def placeholders(collections, force):
+    """
+    Fill image_meta (size and placeholder) for rows that lack it or whose image changed
+
+    Run once after adding the image_meta columns; later writes update it automatically.
+    """
+    supabase = get_admin_client()
+    for collection in collections or sorted(IMAGE_COLUMNS):
+        rows = supabase.table(collection).select('id').execute().data
+        updated = 0
+        for row in rows:
+            if refresh_image_meta(collection, row['id'], force=force):
+                updated += 1
+
+        metas = supabase.table(collection).select(f'id,{META_COLUMN}').execute().data
+        failed = sum(1 for row in metas if (row.get(META_COLUMN) or {}).get('error'))
+        click.echo(f"{collection}: {updated} of {len(rows)} updated, {failed} image(s) could not be read")
@@ -0,0 +1,42 @@
+"""
+Static JSON snapshot commands
+"""
+import sys
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from utils.static_export import SNAPSHOT_COLLECTIONS, SnapshotExporter
+
+snapshots_cli = AppGroup('snapshots', help='Static JSON snapshots of the public API.')
+
+
+@snapshots_cli.command('export')
+@click.option('--output', '-o', default=None,
+              help='Output directory (default: SNAPSHOT_DIR).')
+@click.option('--collection', '-c', 'collections', multiple=True, type=click.Choice(SNAPSHOT_COLLECTIONS),
+              help='Only export this collection (repeatable; default: all).')
+@click.option('--force', is_flag=True, help='Rewrite every file, even when its content is unchanged.')
+def export(output, collections, force):
+    """
+    Render the public endpoints to .json and .json.gz files with a manifest
+
+    Run once when deploying, and from cron (e.g. hourly) so /api/events/upcoming
+    and /api/events/past follow events moving into the past.
+    """
+    output = output or current_app.config.get('SNAPSHOT_DIR')
+    if not output:
+        raise click.UsageError('Pass --output or set SNAPSHOT_DIR')
+
+    result = SnapshotExporter(current_app, output).export(collections or None, force=force)
+    for name in result['written']:
+        click.echo(f"written   {name}")
+    for name in result['removed']:
+        click.echo(f"removed   {name}")
+    for name in result['failed']:
+        click.echo(f"FAILED    {name}", err=True)
+    click.echo(
+        f"Done: {len(result['written'])} written, {len(result['unchanged'])} unchanged, "
+        f"{len(result['removed'])} removed, {len(result['failed'])} failed"
+    )
+    if result['failed']:
+        sys.exit(1)
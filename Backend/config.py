@@ -3,11 +3,15 @@ Configuration module for Flask application
 Loads environment variables and sets up application configuration
 """
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Repository root (holds supabaseSchema.sql and supabase_seed_data.sql)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 
 class Config:
     """Base configuration class"""
@@ -16,18 +20,157 @@ class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
     DEBUG = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
 
+    # How the app is served; gunicorn.conf.py exports these. Unset: one process
+    # with a thread per request (python main.py, flask run)
+    SERVER_WORKERS = int(os.getenv('SERVER_WORKERS', '1'))  # worker processes
+    SERVER_THREADS = int(os.getenv('SERVER_THREADS', '0'))  # request threads per worker, 0 unbounded
+
     # Supabase settings
     SUPABASE_URL = os.getenv('SUPABASE_URL')
     SUPABASE_KEY = os.getenv('SUPABASE_KEY')
     SUPABASE_SERVICE_ROLE_KEY = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
 
+    # 'supabase' (default) or 'fake' for the in-memory stand-in (see fake_supabase/)
+    SUPABASE_BACKEND = os.getenv('SUPABASE_BACKEND', 'supabase').lower()
+    FAKE_SUPABASE_SCHEMA = os.getenv('FAKE_SUPABASE_SCHEMA', os.path.join(PROJECT_ROOT, 'supabaseSchema.sql'))
+    FAKE_SUPABASE_SEED = os.getenv('FAKE_SUPABASE_SEED', os.path.join(PROJECT_ROOT, 'supabase_seed_data.sql'))
+    FAKE_SUPABASE_LATENCY_MS = float(os.getenv('FAKE_SUPABASE_LATENCY_MS', '0'))  # per simulated round trip
+    FAKE_SUPABASE_LATENCY_JITTER_MS = float(os.getenv('FAKE_SUPABASE_LATENCY_JITTER_MS', '0'))
+    FAKE_SUPABASE_ERROR_RATE = float(os.getenv('FAKE_SUPABASE_ERROR_RATE', '0'))  # share of calls that fail
+
+    # Upstream failure handling
+    SUPABASE_TIMEOUT = float(os.getenv('SUPABASE_TIMEOUT', '10'))  # seconds per database call
+    CIRCUIT_BREAKER_ENABLED = os.getenv('CIRCUIT_BREAKER_ENABLED', 'True').lower() == 'true'
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '5'))  # consecutive failures per table
+    CIRCUIT_RESET_TIMEOUT = float(os.getenv('CIRCUIT_RESET_TIMEOUT', '30'))  # seconds before a probe call
+    SERVE_STALE_ENABLED = os.getenv('SERVE_STALE_ENABLED', 'True').lower() == 'true'
+    STALE_MAX_AGE = int(os.getenv('STALE_MAX_AGE', '86400'))  # seconds a last good public response is kept
+    STALE_CACHE_MAX_ENTRIES = int(os.getenv('STALE_CACHE_MAX_ENTRIES', '512'))
+
+    # Identical concurrent selects share one Supabase round trip
+    SINGLE_FLIGHT_ENABLED = os.getenv('SINGLE_FLIGHT_ENABLED', 'True').lower() == 'true'
+    SINGLE_FLIGHT_TIMEOUT = float(os.getenv('SINGLE_FLIGHT_TIMEOUT', '10'))  # seconds a waiting request waits
+
     # JWT settings
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', SUPABASE_KEY)
     JWT_ALGORITHM = 'HS256'
 
+    # Activity log settings
+    ACTIVITY_STATS_CACHE_TTL = int(os.getenv('ACTIVITY_STATS_CACHE_TTL', '60'))  # seconds
+    ACTIVITY_RETENTION_DAYS = int(os.getenv('ACTIVITY_RETENTION_DAYS', '90'))
+    ACTIVITY_RETENTION_BATCH_SIZE = int(os.getenv('ACTIVITY_RETENTION_BATCH_SIZE', '500'))
+    ACTIVITY_ARCHIVE_DIR = os.getenv('ACTIVITY_ARCHIVE_DIR', 'archive/activity_log')
+
+    # Bulk import (flask data import, see utils/bulk_import.py)
+    IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', '500'))  # rows per multi-row insert
+    IMPORT_WORKERS = int(os.getenv('IMPORT_WORKERS', '4'))  # batches in flight at once
+
+    # Backups (flask data backup, see utils/backup.py)
+    BACKUP_DIR = os.getenv('BACKUP_DIR', 'backups')  # a timestamped directory per backup is created here
+    BACKUP_PAGE_SIZE = int(os.getenv('BACKUP_PAGE_SIZE', '1000'))  # rows per read (at most PostgREST max-rows)
+    BACKUP_WORKERS = int(os.getenv('BACKUP_WORKERS', '4'))  # tables read at once
+
+    # Change stream (Server-Sent Events) settings
+    CHANGE_STREAM_HEARTBEAT = int(os.getenv('CHANGE_STREAM_HEARTBEAT', '15'))  # seconds
+    CHANGE_STREAM_MAX_DURATION = int(os.getenv('CHANGE_STREAM_MAX_DURATION', '300'))  # seconds, client reconnects
+    CHANGE_STREAM_REPLAY_SIZE = int(os.getenv('CHANGE_STREAM_REPLAY_SIZE', '1000'))  # events kept for Last-Event-ID
+    CHANGE_STREAM_MAX_PENDING = int(os.getenv('CHANGE_STREAM_MAX_PENDING', '100'))  # per subscriber before dropping
+    # Streams open at once per worker, 0 no limit. Each holds a thread on gthread and sync
+    # workers, so the default leaves three quarters of them for requests (gevent: no limit)
+    CHANGE_STREAM_MAX_PER_WORKER = int(os.getenv('CHANGE_STREAM_MAX_PER_WORKER', max(1, SERVER_THREADS // 4)
+                                                 if SERVER_THREADS else 0))
+
+    # Request timing (Server-Timing header and structured timing log line)
+    REQUEST_TIMING_ENABLED = os.getenv('REQUEST_TIMING_ENABLED', 'False').lower() == 'true'
+
+    # Prometheus metrics (GET /api/metrics)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() == 'true'
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')  # Optional bearer token required to scrape
+
+    # Database round trips per request above which a warning is logged (0 disables counting)
+    DB_CALLS_WARN_THRESHOLD = int(os.getenv('DB_CALLS_WARN_THRESHOLD', '6'))
+
+    # Batch request settings
+    BATCH_MAX_REQUESTS = int(os.getenv('BATCH_MAX_REQUESTS', '20'))  # sub-requests per batch
+    BATCH_MAX_WORKERS = int(os.getenv('BATCH_MAX_WORKERS', '8'))  # threads shared by all batches
+
+    # On-demand profiling (owners send X-Profile: 1 or X-Profile: sample)
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'True').lower() == 'true'
+    PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'byte-profiles'))
+    PROFILE_RING_SIZE = int(os.getenv('PROFILE_RING_SIZE', '20'))  # most recent profiles kept
+    PROFILE_SAMPLE_INTERVAL = float(os.getenv('PROFILE_SAMPLE_INTERVAL', '0.001'))  # seconds between samples
+
+    # Shared cache for public responses and user records (see utils/shared_cache.py)
+    # 'local', 'shm' or 'redis' (default: shm when several workers run, so invalidations reach all of them)
+    SHARED_CACHE_BACKEND = os.getenv('SHARED_CACHE_BACKEND', 'shm' if SERVER_WORKERS > 1 else 'local')
+    SHARED_CACHE_URL = os.getenv('SHARED_CACHE_URL', 'redis://localhost:6379/0')
+    SHARED_CACHE_PREFIX = os.getenv('SHARED_CACHE_PREFIX', 'byte:cache:')
+    SHARED_CACHE_SHM_PATH = os.getenv('SHARED_CACHE_SHM_PATH')  # default: /dev/shm/byte-cache-generations
+    SHARED_CACHE_MAX_ENTRIES = int(os.getenv('SHARED_CACHE_MAX_ENTRIES', '1024'))  # per worker (local, shm)
+    RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', '30'))  # seconds, 0 disables
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', '30'))  # seconds, 0 disables
+    if SHARED_CACHE_BACKEND == 'local' and SERVER_WORKERS > 1:
+        # Other workers would keep serving entries a write invalidated here,
+        # including the rights of a demoted admin: do not cache at all
+        RESPONSE_CACHE_TTL = USER_CACHE_TTL = 0
+
+    # Change stream fan-out between workers (see utils/change_feed.py): 'local', 'shm' or 'redis'
+    CHANGE_STREAM_BACKEND = os.getenv('CHANGE_STREAM_BACKEND', SHARED_CACHE_BACKEND)
+    CHANGE_STREAM_SHM_PATH = os.getenv('CHANGE_STREAM_SHM_PATH')  # default: /dev/shm/byte-change-feed
+
+    # Per-client rate limiting with token buckets (see middleware/rate_limit.py)
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'True').lower() == 'true'
+    RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND', SHARED_CACHE_BACKEND)  # 'local', 'shm' or 'redis'
+    RATE_LIMIT_PREFIX = os.getenv('RATE_LIMIT_PREFIX', 'byte:ratelimit:')  # redis key prefix
+    RATE_LIMIT_SHM_PATH = os.getenv('RATE_LIMIT_SHM_PATH')  # default: /dev/shm/byte-rate-limits
+    RATE_LIMIT_IP_RATE = float(os.getenv('RATE_LIMIT_IP_RATE', '20'))  # requests per second per client IP
+    RATE_LIMIT_IP_BURST = float(os.getenv('RATE_LIMIT_IP_BURST', '100'))
+    RATE_LIMIT_USER_RATE = float(os.getenv('RATE_LIMIT_USER_RATE', '10'))  # requests per second per signed-in user
+    RATE_LIMIT_USER_BURST = float(os.getenv('RATE_LIMIT_USER_BURST', '50'))
+    TRUSTED_PROXY_COUNT = int(os.getenv('TRUSTED_PROXY_COUNT', '0'))  # proxies setting X-Forwarded-For
+
+    # Load shedding (see middleware/load_shedding.py)
+    LOAD_SHED_ENABLED = os.getenv('LOAD_SHED_ENABLED', 'True').lower() == 'true'
+    LOAD_SHED_TARGET_MS = float(os.getenv('LOAD_SHED_TARGET_MS', '250'))  # acceptable queue delay
+    LOAD_SHED_INTERVAL_MS = float(os.getenv('LOAD_SHED_INTERVAL_MS', '500'))  # observation window
+    # Expensive requests at once per worker, 0 disables the cap (default: all threads but two)
+    LOAD_SHED_MAX_EXPENSIVE = int(os.getenv('LOAD_SHED_MAX_EXPENSIVE', max(1, SERVER_THREADS - 2) if SERVER_THREADS else 0))
+
+    # Idempotency-Key support on create endpoints (see middleware/idempotency.py)
+    IDEMPOTENCY_ENABLED = os.getenv('IDEMPOTENCY_ENABLED', 'True').lower() == 'true'
+    # 'local', 'shm' or 'redis' (default: the shared cache backend, at least shm when several workers run)
+    IDEMPOTENCY_BACKEND = os.getenv(
+        'IDEMPOTENCY_BACKEND', 'shm' if SHARED_CACHE_BACKEND == 'local' and SERVER_WORKERS > 1 else SHARED_CACHE_BACKEND
+    )
+    IDEMPOTENCY_SHM_PATH = os.getenv('IDEMPOTENCY_SHM_PATH')  # directory, default: /dev/shm/byte-idempotency
+    IDEMPOTENCY_PREFIX = os.getenv('IDEMPOTENCY_PREFIX', 'byte:idempotency:')  # redis key prefix
+    IDEMPOTENCY_TTL = int(os.getenv('IDEMPOTENCY_TTL', '3600'))  # seconds a response is replayed
+    IDEMPOTENCY_MAX_ENTRIES = int(os.getenv('IDEMPOTENCY_MAX_ENTRIES', '1000'))  # per worker (local), host (shm)
+    IDEMPOTENCY_WAIT_TIMEOUT = float(os.getenv('IDEMPOTENCY_WAIT_TIMEOUT', '10'))  # seconds a duplicate waits
+
+    # Resized image variants (see routes/images.py)
+    IMAGE_CACHE_DIR = os.getenv('IMAGE_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'byte-images'))
+    IMAGE_CACHE_MAX_MB = float(os.getenv('IMAGE_CACHE_MAX_MB', '512'))  # originals and variants, LRU beyond
+    IMAGE_ALLOWED_HOSTS = os.getenv('IMAGE_ALLOWED_HOSTS')  # comma-separated; default: the SUPABASE_URL host
+    IMAGE_SOURCE_DIR = os.getenv('IMAGE_SOURCE_DIR')  # serves src=/path from this directory (unset disables)
+    IMAGE_WIDTHS = os.getenv('IMAGE_WIDTHS', '64,128,256,512,1024,2048')  # requested widths round up to these
+    IMAGE_WORKERS = int(os.getenv('IMAGE_WORKERS', '2'))  # threads fetching and resizing, per worker
+    IMAGE_RENDER_WAIT = float(os.getenv('IMAGE_RENDER_WAIT', '0'))  # seconds a miss waits before falling back
+    IMAGE_FETCH_TIMEOUT = float(os.getenv('IMAGE_FETCH_TIMEOUT', '10'))  # seconds per original download
+    IMAGE_MAX_SOURCE_MB = float(os.getenv('IMAGE_MAX_SOURCE_MB', '20'))  # larger originals are refused
+    IMAGE_MAX_PIXELS = int(os.getenv('IMAGE_MAX_PIXELS', '40000000'))  # decompression bomb guard
+    IMAGE_PLACEHOLDERS_ENABLED = os.getenv('IMAGE_PLACEHOLDERS_ENABLED', 'True').lower() == 'true'  # image_meta
+
+    # Static JSON snapshots of the public API
+    SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR')  # Output directory (unset disables write-triggered exports)
+    SNAPSHOT_ON_WRITE = os.getenv('SNAPSHOT_ON_WRITE', 'True').lower() == 'true'
+
     @staticmethod
     def validate():
         """Validate that required environment variables are set"""
+        if Config.SUPABASE_BACKEND == 'fake':
+            return
+
         required_vars = ['SUPABASE_URL', 'SUPABASE_KEY']
         missing_vars = [var for var in required_vars if not os.getenv(var)]
 
@@ -38,6 +181,7 @@ class Config:
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
+    REQUEST_TIMING_ENABLED = os.getenv('REQUEST_TIMING_ENABLED', 'True').lower() == 'true'
 
 
 class ProductionConfig(Config):
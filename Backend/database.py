@@ -1,21 +1,220 @@
 """
 Supabase database client configuration and initialization
 """
-from supabase import create_client, Client
+import logging
+from collections import defaultdict
+from time import perf_counter
+from supabase import create_client, Client, ClientOptions
 from config import Config
+from utils.circuit_breaker import CircuitBreakerRegistry
+from utils.single_flight import AsyncSingleFlight, SingleFlight
+
+logger = logging.getLogger(__name__)
 
 # Validate configuration
 Config.validate()
 
 # Initialize Supabase client
-supabase: Client = create_client(Config.SUPABASE_URL, Config.SUPABASE_KEY)
+if Config.SUPABASE_BACKEND == 'fake':
+    # In-memory stand-in for offline development, tests and benchmarks
+    from fake_supabase import create_fake_client
+
+    supabase = create_fake_client(
+        Config.FAKE_SUPABASE_SCHEMA,
+        Config.FAKE_SUPABASE_SEED or None,
+        latency_ms=Config.FAKE_SUPABASE_LATENCY_MS,
+        jitter_ms=Config.FAKE_SUPABASE_LATENCY_JITTER_MS,
+        error_rate=Config.FAKE_SUPABASE_ERROR_RATE
+    )
+    logger.warning("Using the in-memory fake Supabase backend (SUPABASE_BACKEND=fake)")
+else:
+    # Bound every database call so a slow Supabase cannot hold requests indefinitely
+    supabase: Client = create_client(
+        Config.SUPABASE_URL, Config.SUPABASE_KEY,
+        options=ClientOptions(postgrest_client_timeout=Config.SUPABASE_TIMEOUT)
+    )
+
+# Service-role client, created on first use
+_admin_client = None
+
+# Builder methods that determine the operation a query performs
+QUERY_OPERATIONS = {'select', 'insert', 'update', 'upsert', 'delete'}
+
+# Builder methods that change table data
+WRITE_OPERATIONS = {'insert', 'update', 'upsert', 'delete'}
+
+# Callables notified after every executed query (see add_query_observer)
+_query_observers = []
+
+# Identical concurrent selects share one round trip (see InstrumentedQuery.execute)
+query_single_flight = SingleFlight()
+# The same for the async client of the ASGI app (see async_api/database.py)
+async_query_single_flight = AsyncSingleFlight()
+
+# Per-table circuit breakers (see utils/circuit_breaker.py)
+circuit_breakers = CircuitBreakerRegistry(Config.CIRCUIT_FAILURE_THRESHOLD, Config.CIRCUIT_RESET_TIMEOUT)
+
+# Writes executed per table by this process. Part of the single-flight key, so
+# a select issued after a write never joins a select that started before it.
+_write_generations = defaultdict(int)
+
+
+def add_query_observer(observer):
+    """
+    Register a callable notified after every database call
+
+    Args:
+        observer (callable): Called as observer(table, operation, duration, error)
+            where duration is in seconds and error is the raised exception or None
+    """
+    if observer not in _query_observers:
+        _query_observers.append(observer)
+
+
+def record_call(table, operation, duration, error):
+    """
+    Bookkeeping after a database call: bump the table's write generation after
+    writes and notify the query observers
+
+    Args:
+        table (str): Table or RPC function name
+        operation (str): Query operation
+        duration (float): Seconds the call took
+        error (Exception): Raised exception or None
+    """
+    if operation in WRITE_OPERATIONS:
+        _write_generations[table] += 1
+    for observer in _query_observers:
+        try:
+            observer(table, operation, duration, error)
+        except Exception as e:
+            logger.warning(f"Query observer failed: {str(e)}")
+
+
+class InstrumentedQuery:
+    """
+    Wraps a PostgREST request builder so execute() is timed and reported to the
+    query observers, tagged with the table and operation
+
+    The chain of builder calls is recorded so identical concurrent selects can
+    be coalesced into one database call.
+    """
+
+    __slots__ = ('_builder', '_table', '_operation', '_scope', '_calls')
+
+    def __init__(self, builder, table, operation=None, scope=None, calls=()):
+        self._builder = builder
+        self._table = table
+        self._operation = operation
+        self._scope = scope
+        self._calls = calls
 
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            return attr
 
-def get_supabase_client() -> Client:
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            # Keep wrapping chained builders (select().eq().order()...)
+            if hasattr(result, 'execute'):
+                operation = name if name in QUERY_OPERATIONS else self._operation
+                calls = self._calls + ((name, args, tuple(sorted(kwargs.items()))),)
+                return type(self)(result, self._table, operation, self._scope, calls)
+            return result
+
+        return call
+
+    def single_flight_key(self):
+        """Identity of the query: client, table, write generation and normalized call chain"""
+        return (self._scope, self._table, _write_generations[self._table], repr(self._calls))
+
+    def execute(self):
+        """
+        Execute the query and notify the query observers
+
+        Selects identical to one already in flight wait for it and share its
+        response instead of making another round trip (SINGLE_FLIGHT_ENABLED).
+        """
+        if self._operation == 'select' and Config.SINGLE_FLIGHT_ENABLED:
+            return query_single_flight.do(
+                self.single_flight_key(), self._execute, timeout=Config.SINGLE_FLIGHT_TIMEOUT
+            )
+        return self._execute()
+
+    def _execute(self):
+        # Fails fast with CircuitOpenError while the table's circuit is open
+        breaker = circuit_breakers.get(self._table) if Config.CIRCUIT_BREAKER_ENABLED else None
+        if breaker is not None:
+            breaker.before_call()
+
+        started = perf_counter()
+        error = None
+        try:
+            response = self._builder.execute()
+        except Exception as e:
+            error = e
+            if breaker is not None:
+                breaker.record_failure(e)
+            raise
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return response
+        finally:
+            record_call(self._table, self._operation, perf_counter() - started, error)
+
+
+class InstrumentedClient:
+    """
+    Thin wrapper around the Supabase client whose table() and rpc() queries are
+    instrumented. Everything else (auth, storage, ...) is passed through.
+    """
+
+    __slots__ = ('_client',)
+
+    def __init__(self, client):
+        self._client = client
+
+    def table(self, table_name):
+        return InstrumentedQuery(self._client.table(table_name), table_name, scope=id(self._client))
+
+    from_ = table
+
+    def rpc(self, fn, *args, **kwargs):
+        return InstrumentedQuery(self._client.rpc(fn, *args, **kwargs), fn, 'rpc')
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def get_supabase_client() -> InstrumentedClient:
     """
     Get the Supabase client instance
 
     Returns:
-        Client: Configured Supabase client
+        InstrumentedClient: Configured Supabase client
     """
-    return supabase
+    return InstrumentedClient(supabase)
+
+
+def get_admin_client() -> InstrumentedClient:
+    """
+    Get a Supabase client that bypasses Row Level Security
+    Used by maintenance jobs (e.g. activity log retention). Falls back to the
+    regular client when SUPABASE_SERVICE_ROLE_KEY is not configured.
+
+    Returns:
+        InstrumentedClient: Service-role Supabase client
+    """
+    global _admin_client
+
+    if not Config.SUPABASE_SERVICE_ROLE_KEY or Config.SUPABASE_BACKEND == 'fake':
+        return get_supabase_client()
+
+    if _admin_client is None:
+        _admin_client = create_client(
+            Config.SUPABASE_URL, Config.SUPABASE_SERVICE_ROLE_KEY,
+            options=ClientOptions(postgrest_client_timeout=Config.SUPABASE_TIMEOUT)
+        )
+    return InstrumentedClient(_admin_client)
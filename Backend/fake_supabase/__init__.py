@@ -0,0 +1,9 @@
+"""
+Fake Supabase backend
+In-memory stand-in for the Supabase client, built from supabaseSchema.sql and
+seeded from supabase_seed_data.sql, so the API can run, be tested and be
+benchmarked without a Supabase project. Enable it with SUPABASE_BACKEND=fake.
+"""
+from fake_supabase.client import FakeSupabaseClient, create_fake_client
+
+__all__ = ['FakeSupabaseClient', 'create_fake_client']
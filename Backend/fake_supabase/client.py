@@ -0,0 +1,705 @@
+"""
+In-memory stand-in for the Supabase client
+Implements the part of the postgrest-py / supabase-py API the routes use,
+over tables built from supabaseSchema.sql. Results are returned as the same
+APIResponse / UserResponse objects the real client returns, and raise the same
+APIError / AuthApiError types on failure.
+
+Not modelled: Row Level Security, foreign keys, CHECK constraints and views.
+"""
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+import uuid
+import httpx
+from datetime import datetime, timezone
+from postgrest.base_request_builder import APIResponse, SingleAPIResponse
+from supabase_auth.errors import AuthApiError
+from supabase_auth.types import User, UserResponse
+from fake_supabase.functions import RPC_FUNCTIONS, TRIGGER_FUNCTIONS
+from fake_supabase.sql import parse_inserts, parse_schema
+from fake_supabase.values import api_error, coerce, comparable, evaluate_default
+
+# Users created on startup so the auth decorators can be exercised offline.
+# Send "Authorization: Bearer fake-<role>-token".
+DEMO_USERS = (
+    ('owner', True, True),
+    ('admin', True, False),
+    ('member', False, False),
+)
+
+
+class FakeDatabase:
+    """
+    Tables, primary-key indexes and serial sequences for the fake client
+    All access goes through the methods below while holding `lock`.
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.lock = threading.RLock()
+        self._rows = {name: [] for name in schema}
+        self._index = {name: {} for name in schema}
+        self._sequences = {}
+
+    def table(self, name):
+        """Get a table's schema, raising the PostgREST error for unknown tables"""
+        table = self.schema.get(name)
+        if table is None:
+            raise api_error(f"Could not find the table 'public.{name}' in the schema cache", 'PGRST205')
+        return table
+
+    def column(self, table_name, column_name):
+        """Get a column's schema, raising the PostgreSQL error for unknown columns"""
+        column = self.table(table_name).columns.get(column_name)
+        if column is None:
+            raise api_error(f'column {table_name}.{column_name} does not exist', '42703')
+        return column
+
+    def rows(self, table_name):
+        """Live list of a table's rows"""
+        self.table(table_name)
+        return self._rows[table_name]
+
+    def find(self, table_name, **values):
+        """First row whose columns equal the given values, or None"""
+        for row in self.rows(table_name):
+            if all(row.get(column) == value for column, value in values.items()):
+                return row
+        return None
+
+    def lookup(self, table_name, key):
+        """Row with the given primary key tuple, or None"""
+        return self._index[table_name].get(key)
+
+    def _key(self, table, row):
+        return tuple(row.get(column) for column in table.primary_key)
+
+    def _check_constraints(self, table, row, existing=None):
+        for column in table.columns.values():
+            if column.not_null and row.get(column.name) is None:
+                raise api_error(
+                    f'null value in column "{column.name}" of relation "{table.name}" violates not-null constraint',
+                    '23502'
+                )
+
+        if table.primary_key:
+            other = self._index[table.name].get(self._key(table, row))
+            if other is not None and other is not existing:
+                raise api_error(f'duplicate key value violates unique constraint "{table.name}_pkey"', '23505')
+
+        for column in table.columns.values():
+            if column.unique and row.get(column.name) is not None:
+                for other in self._rows[table.name]:
+                    if other is not existing and other.get(column.name) == row[column.name]:
+                        raise api_error(
+                            f'duplicate key value violates unique constraint "{table.name}_{column.name}_key"',
+                            '23505'
+                        )
+
+    def _run_triggers(self, table, event, row, previous):
+        for function_name in table.triggers[event]:
+            trigger = TRIGGER_FUNCTIONS.get(function_name)
+            if trigger is not None:
+                trigger(row, previous)
+
+    def _coerce_payload(self, table, payload):
+        values = {}
+        for name, value in payload.items():
+            column = table.columns.get(name)
+            if column is None:
+                raise api_error(
+                    f"Could not find the '{name}' column of '{table.name}' in the schema cache", 'PGRST204'
+                )
+            values[name] = coerce(table.name, column, value)
+        return values
+
+    def insert_row(self, table_name, payload):
+        """
+        Insert a row, applying defaults, serial sequences, BEFORE INSERT triggers and constraints
+
+        Returns:
+            dict: The stored row
+        """
+        table = self.table(table_name)
+        values = self._coerce_payload(table, payload)
+        row = {}
+
+        for column in table.columns.values():
+            if column.name in values:
+                row[column.name] = values[column.name]
+            elif column.type in ('SERIAL', 'BIGSERIAL'):
+                sequence = (table.name, column.name)
+                self._sequences[sequence] = self._sequences.get(sequence, 0) + 1
+                row[column.name] = self._sequences[sequence]
+            elif column.default is not None:
+                row[column.name] = coerce(table.name, column, evaluate_default(column.default))
+            else:
+                row[column.name] = None
+
+        self._run_triggers(table, 'INSERT', row, None)
+        self._check_constraints(table, row)
+
+        # Keep explicit ids from pushing a sequence backwards into collisions
+        for column in table.columns.values():
+            if column.type in ('SERIAL', 'BIGSERIAL') and isinstance(row[column.name], int):
+                sequence = (table.name, column.name)
+                self._sequences[sequence] = max(self._sequences.get(sequence, 0), row[column.name])
+
+        self._rows[table.name].append(row)
+        if table.primary_key:
+            self._index[table.name][self._key(table, row)] = row
+        return row
+
+    def update_row(self, table_name, row, payload):
+        """
+        Apply changes to a stored row, running BEFORE UPDATE triggers and constraints
+
+        Returns:
+            dict: The updated row
+        """
+        table = self.table(table_name)
+        updated = dict(row)
+        updated.update(self._coerce_payload(table, payload))
+        self._run_triggers(table, 'UPDATE', updated, row)
+        self._check_constraints(table, updated, existing=row)
+
+        if table.primary_key:
+            self._index[table.name].pop(self._key(table, row), None)
+        row.clear()
+        row.update(updated)
+        if table.primary_key:
+            self._index[table.name][self._key(table, row)] = row
+        return row
+
+    def revert(self, table_name, undo):
+        """
+        Undo the inserts and updates of a failed multi-row write
+
+        Args:
+            table_name (str): Table written to
+            undo (list): (row, previous values or None for an insert), in write order
+        """
+        table = self.table(table_name)
+        inserted = {id(row) for row, previous in undo if previous is None}
+        for row, previous in reversed(undo):
+            if previous is not None:
+                if table.primary_key:
+                    self._index[table.name].pop(self._key(table, row), None)
+                row.clear()
+                row.update(previous)
+                if table.primary_key:
+                    self._index[table.name][self._key(table, row)] = row
+        if inserted:
+            self.delete_rows(table_name, lambda row: id(row) in inserted)
+
+    def delete_rows(self, table_name, predicate):
+        """
+        Delete the rows matching predicate
+
+        Returns:
+            list: Deleted rows
+        """
+        table = self.table(table_name)
+        kept, deleted = [], []
+        for row in self._rows[table.name]:
+            (deleted if predicate(row) else kept).append(row)
+
+        self._rows[table.name] = kept
+        if table.primary_key:
+            for row in deleted:
+                self._index[table.name].pop(self._key(table, row), None)
+        return deleted
+
+
+def _like_pattern(pattern, flags=0):
+    regex = ''.join('.*' if char == '%' else '.' if char == '_' else re.escape(char) for char in pattern)
+    return re.compile(f'^{regex}$', flags | re.S)
+
+
+class FakeQuery:
+    """
+    Query builder mirroring postgrest-py's request builders
+    Filter and modifier methods return the builder so calls can be chained;
+    execute() runs the query against the in-memory tables.
+    """
+
+    def __init__(self, client, table_name, rpc_params=None):
+        self._client = client
+        self._table = table_name
+        self._operation = 'rpc' if rpc_params is not None else None
+        self._params = rpc_params
+        self._payload = None
+        self._columns = '*'
+        self._count = None
+        self._on_conflict = None
+        self._filters = []
+        self._order = []
+        self._offset = 0
+        self._limit = None
+        self._single = None
+
+    def __getattr__(self, name):
+        raise AttributeError(f"The fake Supabase client does not support .{name}() yet")
+
+    # Operations
+
+    def select(self, *columns, count=None, **kwargs):
+        self._operation = self._operation or 'select'
+        self._columns = ','.join(columns) if columns else '*'
+        self._count = count
+        return self
+
+    def insert(self, json, count=None, upsert=False, **kwargs):
+        self._operation = 'upsert' if upsert else 'insert'
+        self._payload = json
+        self._count = count
+        return self
+
+    def upsert(self, json, count=None, on_conflict='', **kwargs):
+        self._operation = 'upsert'
+        self._payload = json
+        self._count = count
+        self._on_conflict = [column.strip() for column in on_conflict.split(',') if column.strip()]
+        return self
+
+    def update(self, json, count=None, **kwargs):
+        self._operation = 'update'
+        self._payload = json
+        self._count = count
+        return self
+
+    def delete(self, count=None, **kwargs):
+        self._operation = 'delete'
+        self._count = count
+        return self
+
+    # Filters
+
+    def _filter(self, column, operator, value):
+        self._filters.append((column, operator, value))
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, 'eq', value)
+
+    def neq(self, column, value):
+        return self._filter(column, 'neq', value)
+
+    def gt(self, column, value):
+        return self._filter(column, 'gt', value)
+
+    def gte(self, column, value):
+        return self._filter(column, 'gte', value)
+
+    def lt(self, column, value):
+        return self._filter(column, 'lt', value)
+
+    def lte(self, column, value):
+        return self._filter(column, 'lte', value)
+
+    def like(self, column, pattern):
+        return self._filter(column, 'like', pattern)
+
+    def ilike(self, column, pattern):
+        return self._filter(column, 'ilike', pattern)
+
+    def is_(self, column, value):
+        return self._filter(column, 'is', value)
+
+    def in_(self, column, values):
+        return self._filter(column, 'in', list(values))
+
+    def contains(self, column, value):
+        return self._filter(column, 'contains', value)
+
+    # Modifiers
+
+    def order(self, column, desc=False, nullsfirst=None, **kwargs):
+        self._order.append((column, desc, desc if nullsfirst is None else nullsfirst))
+        return self
+
+    def limit(self, size, **kwargs):
+        self._limit = size
+        return self
+
+    def offset(self, size):
+        self._offset = size
+        return self
+
+    def range(self, start, end, **kwargs):
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+
+    def single(self):
+        self._single = 'single'
+        return self
+
+    def maybe_single(self):
+        self._single = 'maybe_single'
+        return self
+
+    # Execution
+
+    def _matches(self, db, row, table_name=None):
+        for column_name, operator, value in self._filters:
+            if table_name is not None:
+                column = db.column(table_name, column_name)
+                stored = comparable(table_name, column, row.get(column_name))
+            else:
+                column, stored = None, row.get(column_name)
+
+            def convert(raw):
+                return comparable(table_name, column, raw) if column is not None else raw
+
+            if operator == 'is':
+                expected = None if value in (None, 'null') else value
+                if stored is not expected and stored != expected:
+                    return False
+                continue
+            if stored is None:
+                return False
+
+            if operator == 'eq' and not stored == convert(value):
+                return False
+            if operator == 'neq' and not stored != convert(value):
+                return False
+            if operator == 'gt' and not stored > convert(value):
+                return False
+            if operator == 'gte' and not stored >= convert(value):
+                return False
+            if operator == 'lt' and not stored < convert(value):
+                return False
+            if operator == 'lte' and not stored <= convert(value):
+                return False
+            if operator == 'in' and stored not in [convert(item) for item in value]:
+                return False
+            if operator in ('like', 'ilike'):
+                flags = re.I if operator == 'ilike' else 0
+                if not _like_pattern(value, flags).match(str(stored)):
+                    return False
+            if operator == 'contains':
+                if isinstance(value, dict):
+                    if not isinstance(stored, dict) or any(stored.get(k) != v for k, v in value.items()):
+                        return False
+                elif not set(value) <= set(stored):
+                    return False
+        return True
+
+    def _matching_rows(self, db):
+        table = db.table(self._table)
+
+        # Primary-key equality uses the index, like PostgreSQL would
+        if len(table.primary_key) == 1:
+            for column_name, operator, value in self._filters:
+                if column_name == table.primary_key[0] and operator == 'eq':
+                    column = table.columns[column_name]
+                    row = db.lookup(self._table, (coerce(self._table, column, value),))
+                    return [row] if row is not None and self._matches(db, row, self._table) else []
+
+        return [row for row in db.rows(self._table) if self._matches(db, row, self._table)]
+
+    def _sort(self, db, rows, table_name=None):
+        for column_name, desc, nulls_first in reversed(self._order):
+            column = db.column(table_name, column_name) if table_name else None
+            present = [row for row in rows if row.get(column_name) is not None]
+            nulls = [row for row in rows if row.get(column_name) is None]
+            present.sort(
+                key=lambda row: comparable(table_name, column, row[column_name]) if column else row[column_name],
+                reverse=desc
+            )
+            rows = nulls + present if nulls_first else present + nulls
+        return rows
+
+    def _page(self, rows):
+        end = None if self._limit is None else self._offset + self._limit
+        return rows[self._offset:end]
+
+    def _project(self, db, rows):
+        if self._columns.strip() == '*':
+            return rows
+        columns = [column.strip() for column in self._columns.split(',') if column.strip()]
+        for column in columns:
+            if '(' in column or ':' in column:
+                raise NotImplementedError(f"The fake Supabase client does not support select('{column}')")
+            db.column(self._table, column)
+        return [{column: row.get(column) for column in columns} for row in rows]
+
+    def _execute_rpc(self, db):
+        function = RPC_FUNCTIONS.get(self._table)
+        if function is None:
+            raise api_error(
+                f'Could not find the function public.{self._table} in the schema cache', 'PGRST202'
+            )
+        result = function(db, **self._params)
+        if not isinstance(result, list):
+            return result, None
+
+        rows = [row for row in result if self._matches(db, row)]
+        count = len(rows) if self._count else None
+        return self._page(self._sort(db, rows)), count
+
+    def _execute_write(self, db):
+        payload = self._payload
+        if self._operation in ('insert', 'upsert'):
+            rows = payload if isinstance(payload, list) else [payload]
+            result, undo = [], []
+            try:
+                for values in rows:
+                    existing = None
+                    if self._operation == 'upsert':
+                        table = db.table(self._table)
+                        conflict = self._on_conflict or list(table.primary_key)
+                        key = {
+                            column: coerce(self._table, table.columns[column], values.get(column))
+                            for column in conflict
+                        }
+                        if conflict == list(table.primary_key):
+                            existing = db.lookup(self._table, tuple(key.values()))
+                        else:
+                            existing = db.find(self._table, **key)
+                    if existing is not None:
+                        undo.append((existing, dict(existing)))
+                        result.append(db.update_row(self._table, existing, values))
+                    else:
+                        result.append(db.insert_row(self._table, values))
+                        undo.append((result[-1], None))
+            except Exception:
+                # One statement in PostgREST: a multi-row write that fails leaves no rows behind
+                db.revert(self._table, undo)
+                raise
+            return result
+
+        matched = self._matching_rows(db)
+        if self._operation == 'update':
+            return [db.update_row(self._table, row, payload) for row in matched]
+
+        matched_ids = {id(row) for row in matched}
+        return db.delete_rows(self._table, lambda row: id(row) in matched_ids)
+
+    def execute(self):
+        """
+        Run the query
+
+        Returns:
+            APIResponse: data (list, dict for single() or scalar for RPCs) and count
+
+        Raises:
+            APIError: For the same classes of errors PostgREST reports
+        """
+        self._client.simulate_network()
+        return self._run()
+
+    def _run(self):
+        db = self._client.db
+
+        with db.lock:
+            count = None
+            if self._operation == 'rpc':
+                data, count = self._execute_rpc(db)
+            elif self._operation == 'select':
+                rows = self._matching_rows(db)
+                if self._count:
+                    count = len(rows)
+                data = self._project(db, self._page(self._sort(db, rows, self._table)))
+            elif self._operation in ('insert', 'upsert', 'update', 'delete'):
+                data = self._execute_write(db)
+                if self._count:
+                    count = len(data)
+            else:
+                raise NotImplementedError('Call select(), insert(), update(), upsert() or delete() before execute()')
+
+            # Round-trip through JSON so callers get copies, as with a real response body
+            data = json.loads(json.dumps(data))
+
+        if self._single is not None:
+            if len(data) > 1 or (not data and self._single == 'single'):
+                raise api_error(
+                    'JSON object requested, multiple (or no) rows returned', 'PGRST116',
+                    hint=f'The result contains {len(data)} rows'
+                )
+            return SingleAPIResponse.model_construct(data=data[0] if data else None, count=count)
+
+        return APIResponse.model_construct(data=data, count=count)
+
+
+class FakeAuth:
+    """Stand-in for client.auth: resolves bearer tokens issued by FakeSupabaseClient.add_user()"""
+
+    def __init__(self, client):
+        self._client = client
+        self._tokens = {}
+
+    def add_token(self, token, uid, email):
+        self._tokens[token] = User(
+            id=uid, email=email, aud='authenticated', app_metadata={}, user_metadata={},
+            created_at=datetime.now(timezone.utc)
+        )
+
+    def get_user(self, jwt=None):
+        self._client.simulate_network()
+        user = self._tokens.get(jwt)
+        if user is None:
+            raise AuthApiError('invalid JWT: unable to parse or verify signature', 403, 'bad_jwt')
+        return UserResponse(user=user)
+
+
+class FakeSupabaseClient:
+    """
+    In-memory Supabase client for offline development, tests and benchmarks
+
+    Usage:
+        client = FakeSupabaseClient(schema_sql, seed_sql, latency_ms=20)
+        client.table('events').select('*').eq('is_past', True).execute()
+    """
+
+    def __init__(self, schema_sql, seed_sql=None, latency_ms=0, jitter_ms=0, error_rate=0, demo_users=True):
+        self.db = FakeDatabase(parse_schema(schema_sql))
+        self.auth = FakeAuth(self)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+
+        if seed_sql:
+            with self.db.lock:
+                for table_name, rows in parse_inserts(seed_sql):
+                    for row in rows:
+                        self.db.insert_row(table_name, row)
+
+        if demo_users:
+            for role, is_admin, is_owner in DEMO_USERS:
+                self.add_user(
+                    f'{role}@byte.local', username=f'demo-{role}', role=role,
+                    is_admin=is_admin, is_owner=is_owner, token=f'fake-{role}-token',
+                    uid=str(uuid.uuid5(uuid.NAMESPACE_URL, f'byte-fake-{role}'))
+                )
+
+    def _network_delay(self):
+        if self.latency_ms or self.jitter_ms:
+            return (self.latency_ms + random.uniform(0, self.jitter_ms)) / 1000
+        return 0
+
+    def _network_failure(self):
+        if self.error_rate and random.random() < self.error_rate:
+            raise httpx.ConnectError('Simulated network failure (FAKE_SUPABASE_ERROR_RATE)')
+
+    def simulate_network(self):
+        """
+        Sleep for the configured round-trip latency (plus random jitter), then
+        fail with a connection error for error_rate of the calls
+
+        Raises:
+            httpx.ConnectError: For the simulated share of failed calls
+        """
+        delay = self._network_delay()
+        if delay:
+            time.sleep(delay)
+        self._network_failure()
+
+    async def simulate_network_async(self):
+        """Same as simulate_network(), awaiting instead of blocking the thread"""
+        delay = self._network_delay()
+        if delay:
+            await asyncio.sleep(delay)
+        self._network_failure()
+
+    def async_client(self):
+        """
+        Async view of this client sharing its data, like supabase.AsyncClient
+
+        Returns:
+            AsyncFakeSupabaseClient: Client whose execute() and auth.get_user() are awaitable
+        """
+        return AsyncFakeSupabaseClient(self)
+
+    def add_user(self, email, username=None, role='member', is_admin=False, is_owner=False, token=None, uid=None):
+        """
+        Create a users row and a bearer token that authenticates as it
+
+        Returns:
+            tuple: (user row, token)
+        """
+        uid = uid or str(uuid.uuid4())
+        token = token or f'fake-{uid}'
+        with self.db.lock:
+            row = self.db.insert_row('users', {
+                'uid': uid, 'email': email, 'username': username or email.split('@')[0],
+                'role': role, 'is_admin': is_admin, 'is_owner': is_owner, 'email_verified': True
+            })
+        self.auth.add_token(token, uid, email)
+        return dict(row), token
+
+    def table(self, table_name):
+        return FakeQuery(self, table_name)
+
+    from_ = table
+
+    def rpc(self, fn, params=None, **kwargs):
+        return FakeQuery(self, fn, rpc_params=params or {})
+
+
+class AsyncFakeQuery(FakeQuery):
+    """FakeQuery whose execute() is a coroutine"""
+
+    async def execute(self):
+        await self._client.simulate_network_async()
+        return self._run()
+
+
+class AsyncFakeAuth:
+    """Async stand-in for AsyncClient.auth, sharing the tokens of a FakeAuth"""
+
+    def __init__(self, client):
+        self._client = client
+
+    async def get_user(self, jwt=None):
+        await self._client.simulate_network_async()
+        user = self._client.auth._tokens.get(jwt)
+        if user is None:
+            raise AuthApiError('invalid JWT: unable to parse or verify signature', 403, 'bad_jwt')
+        return UserResponse(user=user)
+
+
+class AsyncFakeSupabaseClient:
+    """Async counterpart of FakeSupabaseClient over the same in-memory database"""
+
+    def __init__(self, client):
+        self._client = client
+        self.auth = AsyncFakeAuth(client)
+
+    def table(self, table_name):
+        return AsyncFakeQuery(self._client, table_name)
+
+    from_ = table
+
+    def rpc(self, fn, params=None, **kwargs):
+        return AsyncFakeQuery(self._client, fn, rpc_params=params or {})
+
+
+def create_fake_client(schema_path, seed_path=None, latency_ms=0, jitter_ms=0, error_rate=0):
+    """
+    Build a fake client from the schema and (optionally) seed data files
+
+    Args:
+        schema_path (str): Path to supabaseSchema.sql
+        seed_path (str): Path to supabase_seed_data.sql, or None for empty tables
+        latency_ms (float): Simulated round-trip latency per call
+        jitter_ms (float): Extra random latency per call, uniform in [0, jitter_ms]
+        error_rate (float): Share of calls (0-1) failing with a connection error
+
+    Returns:
+        FakeSupabaseClient: Seeded fake client
+    """
+    with open(schema_path, encoding='utf-8') as schema_file:
+        schema_sql = schema_file.read()
+
+    seed_sql = None
+    if seed_path:
+        with open(seed_path, encoding='utf-8') as seed_file:
+            seed_sql = seed_file.read()
+
+    return FakeSupabaseClient(schema_sql, seed_sql, latency_ms=latency_ms, jitter_ms=jitter_ms, error_rate=error_rate)
@@ -0,0 +1,97 @@
+"""
+Python stand-ins for the database functions in supabaseSchema.sql
+TRIGGER_FUNCTIONS are bound to tables by the CREATE TRIGGER statements in the
+schema; RPC_FUNCTIONS back client.rpc(). Add an entry here whenever a new
+trigger or RPC function is added to the schema.
+"""
+from collections import defaultdict
+from datetime import datetime, timezone
+from fake_supabase.values import to_datetime, utc_now_iso
+
+
+def update_updated_at_column(row, previous):
+    row['updated_at'] = utc_now_iso()
+
+
+def update_event_is_past(row, previous):
+    row['is_past'] = row.get('date') is not None and row['date'] < datetime.now(timezone.utc).date().isoformat()
+
+
+# Trigger function name -> fn(new_row, old_row_or_None), mutating new_row
+TRIGGER_FUNCTIONS = {
+    'update_updated_at_column': update_updated_at_column,
+    'update_event_is_past': update_event_is_past,
+}
+
+
+def _group_key(row, group_by):
+    if group_by == 'user':
+        return row['user_id']
+    if group_by == 'action':
+        return row['action']
+    return row['collection']
+
+
+def archive_activity_log_batch(db, p_ids):
+    """Roll up the given activity_log rows into activity_log_daily and delete them"""
+    ids = set(p_ids)
+    archived = [row for row in db.rows('activity_log') if row['id'] in ids]
+
+    counts = defaultdict(int)
+    for row in archived:
+        day = to_datetime(row['timestamp']).date().isoformat()
+        counts[(day, row['user_id'], row['collection'], row['action'])] += 1
+
+    for (day, user_id, collection, action), count in counts.items():
+        existing = db.find('activity_log_daily', day=day, user_id=user_id, collection=collection, action=action)
+        if existing:
+            existing['count'] += count
+        else:
+            db.insert_row('activity_log_daily', {
+                'day': day, 'user_id': user_id, 'collection': collection, 'action': action, 'count': count
+            })
+
+    db.delete_rows('activity_log', lambda row: row['id'] in ids)
+    return len(archived)
+
+
+def activity_log_stats(db, p_bucket='day', p_group_by='collection', p_since=None, p_until=None):
+    """Activity counts per (bucket, group_key), including daily rollups for day buckets"""
+    since = to_datetime(p_since) if p_since else None
+    until = to_datetime(p_until) if p_until else None
+    counts = defaultdict(int)
+
+    for row in db.rows('activity_log'):
+        timestamp = to_datetime(row['timestamp'])
+        if (since and timestamp < since) or (until and timestamp >= until):
+            continue
+        if p_bucket == 'hour':
+            bucket = timestamp.replace(minute=0, second=0, microsecond=0)
+        else:
+            bucket = timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+        counts[(bucket, _group_key(row, p_group_by))] += 1
+
+    if p_bucket == 'day':
+        for row in db.rows('activity_log_daily'):
+            bucket = to_datetime(row['day'])
+            if (since and bucket.date() < since.date()) or (until and bucket.date() >= until.date()):
+                continue
+            counts[(bucket, _group_key(row, p_group_by))] += row['count']
+
+    return [
+        {'bucket': bucket.isoformat(), 'group_key': group_key, 'count': count}
+        for (bucket, group_key), count in sorted(counts.items())
+    ]
+
+
+def reset_serial_sequences(db):
+    """Nothing to do: FakeDatabase.insert_row already moves sequences past explicit ids"""
+    return None
+
+
+# RPC function name -> fn(db, **params)
+RPC_FUNCTIONS = {
+    'archive_activity_log_batch': archive_activity_log_batch,
+    'activity_log_stats': activity_log_stats,
+    'reset_serial_sequences': reset_serial_sequences,
+}
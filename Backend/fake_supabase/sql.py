@@ -0,0 +1,274 @@
+"""
+Minimal SQL reader for the fake Supabase backend
+Understands just enough of supabaseSchema.sql and supabase_seed_data.sql to
+build in-memory tables: CREATE TABLE, ALTER TABLE ... ADD COLUMN, CREATE
+TRIGGER and INSERT INTO ... VALUES. Everything else (indexes, policies,
+functions, views) is skipped.
+"""
+import json
+import re
+
+_IDENTIFIER = r'[A-Za-z_][A-Za-z0-9_]*'
+
+_CREATE_TABLE = re.compile(rf'^CREATE TABLE (?:IF NOT EXISTS )?({_IDENTIFIER})\s*\((.*)\)$', re.S | re.I)
+_ADD_COLUMN = re.compile(rf'^ALTER TABLE ({_IDENTIFIER}) ADD COLUMN (?:IF NOT EXISTS )?(.*)$', re.S | re.I)
+_CREATE_TRIGGER = re.compile(
+    rf'^CREATE TRIGGER {_IDENTIFIER} BEFORE ((?:INSERT|UPDATE)(?: OR (?:INSERT|UPDATE))?) ON ({_IDENTIFIER})'
+    rf'\s+FOR EACH ROW EXECUTE (?:FUNCTION|PROCEDURE) ({_IDENTIFIER})\(\)$',
+    re.S | re.I
+)
+_INSERT = re.compile(rf'^INSERT INTO ({_IDENTIFIER})\s*\(([^)]*)\)\s*VALUES\s*(.*)$', re.S | re.I)
+_COLUMN = re.compile(
+    rf'^({_IDENTIFIER})\s+([A-Za-z]+(?:\s*\(\s*\d+(?:\s*,\s*\d+)?\s*\))?(?:\[\])?)(.*)$', re.S
+)
+_DEFAULT = re.compile(r"\bDEFAULT\s+('(?:[^']|'')*'(?:::\w+)?|\w+\(\)|[\w.\-]+)", re.I)
+_TABLE_PRIMARY_KEY = re.compile(r'^PRIMARY KEY\s*\(([^)]*)\)', re.I)
+_NUMBER = re.compile(r'-?\d+(?:\.\d+)?')
+
+
+class Column:
+    """A table column: name, SQL type and constraints"""
+
+    __slots__ = ('name', 'type', 'is_array', 'not_null', 'unique', 'default')
+
+    def __init__(self, name, sql_type, not_null=False, unique=False, default=None):
+        self.name = name
+        self.is_array = sql_type.endswith('[]')
+        self.type = sql_type[:-2].upper() if self.is_array else sql_type.upper()
+        self.not_null = not_null
+        self.unique = unique
+        self.default = default
+
+
+class TableSchema:
+    """A table: ordered columns, primary key and BEFORE triggers"""
+
+    def __init__(self, name):
+        self.name = name
+        self.columns = {}
+        self.primary_key = ()
+        # {'INSERT': [function_name, ...], 'UPDATE': [...]}
+        self.triggers = {'INSERT': [], 'UPDATE': []}
+
+
+def split_statements(sql):
+    """
+    Split a SQL script into statements, dropping comments
+
+    Semicolons inside string literals and $$ ... $$ bodies do not end a statement.
+
+    Args:
+        sql (str): SQL script
+
+    Returns:
+        list: Statements without the trailing semicolon, whitespace-collapsed at the ends
+    """
+    statements = []
+    current = []
+    i = 0
+    length = len(sql)
+
+    while i < length:
+        char = sql[i]
+
+        if sql.startswith('--', i):
+            end = sql.find('\n', i)
+            i = length if end == -1 else end
+        elif sql.startswith('$$', i):
+            end = sql.find('$$', i + 2)
+            end = length if end == -1 else end + 2
+            current.append(sql[i:end])
+            i = end
+        elif char == "'":
+            end = i + 1
+            while end < length:
+                if sql[end] == "'":
+                    if sql.startswith("''", end):
+                        end += 2
+                        continue
+                    break
+                end += 1
+            current.append(sql[i:end + 1])
+            i = end + 1
+        elif char == ';':
+            statement = ''.join(current).strip()
+            if statement:
+                statements.append(statement)
+            current = []
+            i += 1
+        else:
+            current.append(char)
+            i += 1
+
+    statement = ''.join(current).strip()
+    if statement:
+        statements.append(statement)
+    return statements
+
+
+def split_top_level(text, separator=','):
+    """Split text on a separator outside parentheses, brackets and string literals"""
+    parts = []
+    depth = 0
+    start = 0
+    in_string = False
+    i = 0
+
+    while i < len(text):
+        char = text[i]
+        if in_string:
+            if char == "'":
+                if text.startswith("''", i):
+                    i += 1
+                else:
+                    in_string = False
+        elif char == "'":
+            in_string = True
+        elif char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(text[start:i].strip())
+            start = i + 1
+        i += 1
+
+    tail = text[start:].strip()
+    if tail:
+        parts.append(tail)
+    return parts
+
+
+def parse_column(definition):
+    """
+    Parse a column definition ('rank INTEGER NOT NULL DEFAULT 0')
+
+    Returns:
+        tuple: (Column, is_primary_key) or (None, False) for table constraints
+    """
+    match = _COLUMN.match(' '.join(definition.split()))
+    if not match or match.group(1).upper() in ('PRIMARY', 'UNIQUE', 'CONSTRAINT', 'CHECK', 'FOREIGN'):
+        return None, False
+
+    name, sql_type, rest = match.groups()
+    upper_rest = rest.upper()
+    is_primary_key = 'PRIMARY KEY' in upper_rest
+    default = _DEFAULT.search(rest)
+
+    column = Column(
+        name,
+        sql_type.replace(' ', ''),
+        not_null=is_primary_key or 'NOT NULL' in upper_rest,
+        unique='UNIQUE' in upper_rest,
+        default=default.group(1) if default else None
+    )
+    return column, is_primary_key
+
+
+def parse_schema(sql):
+    """
+    Read table definitions and BEFORE triggers from a schema script
+
+    Args:
+        sql (str): Contents of supabaseSchema.sql
+
+    Returns:
+        dict: Table name -> TableSchema
+    """
+    tables = {}
+
+    for statement in split_statements(sql):
+        match = _CREATE_TABLE.match(statement)
+        if match:
+            table = tables[match.group(1)] = TableSchema(match.group(1))
+            for definition in split_top_level(match.group(2)):
+                primary_key = _TABLE_PRIMARY_KEY.match(definition)
+                if primary_key:
+                    table.primary_key = tuple(col.strip() for col in primary_key.group(1).split(','))
+                    for name in table.primary_key:
+                        table.columns[name].not_null = True
+                    continue
+
+                column, is_primary_key = parse_column(definition)
+                if column is not None:
+                    table.columns[column.name] = column
+                    if is_primary_key:
+                        table.primary_key = (column.name,)
+            continue
+
+        match = _ADD_COLUMN.match(statement)
+        if match and match.group(1) in tables:
+            column, _ = parse_column(match.group(2))
+            if column is not None:
+                tables[match.group(1)].columns[column.name] = column
+            continue
+
+        match = _CREATE_TRIGGER.match(' '.join(statement.split()))
+        if match and match.group(2) in tables:
+            for event in match.group(1).upper().split(' OR '):
+                tables[match.group(2)].triggers[event].append(match.group(3))
+
+    return tables
+
+
+def parse_literal(text):
+    """
+    Parse a SQL literal used in seed data
+
+    Supports strings (with ::json/::jsonb casts), ARRAY[...], numbers,
+    TRUE/FALSE and NULL.
+
+    Args:
+        text (str): Literal text
+
+    Returns:
+        Python value
+    """
+    text = text.strip()
+    upper = text.upper()
+
+    if upper == 'NULL':
+        return None
+    if upper in ('TRUE', 'FALSE'):
+        return upper == 'TRUE'
+    if upper.startswith('ARRAY[') and text.endswith(']'):
+        return [parse_literal(item) for item in split_top_level(text[6:-1])]
+    if text.startswith("'"):
+        end = text.rfind("'")
+        value = text[1:end].replace("''", "'")
+        cast = text[end + 1:].lstrip(':').strip().lower()
+        return json.loads(value) if cast in ('json', 'jsonb') else value
+    if _NUMBER.fullmatch(text):
+        return float(text) if '.' in text else int(text)
+
+    raise ValueError(f"Unsupported SQL literal: {text[:40]}")
+
+
+def parse_inserts(sql):
+    """
+    Read INSERT INTO ... VALUES statements from a seed script
+
+    Args:
+        sql (str): Contents of supabase_seed_data.sql
+
+    Returns:
+        list: (table, rows) tuples where rows are dicts of column -> value
+    """
+    inserts = []
+
+    for statement in split_statements(sql):
+        match = _INSERT.match(statement)
+        if not match:
+            continue
+
+        table, columns, values = match.groups()
+        columns = [column.strip() for column in columns.split(',')]
+        rows = []
+        for group in split_top_level(values):
+            group = group.strip()
+            if not (group.startswith('(') and group.endswith(')')):
+                raise ValueError(f"Unsupported VALUES entry for {table}: {group[:40]}")
+            rows.append(dict(zip(columns, (parse_literal(item) for item in split_top_level(group[1:-1])))))
+        inserts.append((table, rows))
+
+    return inserts
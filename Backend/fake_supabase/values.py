@@ -0,0 +1,119 @@
+"""
+Value conversion between JSON payloads and fake Supabase columns
+Rows are stored the way PostgREST returns them: timestamps as ISO 8601
+strings in UTC, dates as 'YYYY-MM-DD', arrays as lists and JSONB as-is.
+"""
+import uuid
+from datetime import date, datetime, timezone
+from postgrest.exceptions import APIError
+
+INTEGER_TYPES = {'INTEGER', 'INT', 'INT4', 'INT8', 'BIGINT', 'SMALLINT', 'SERIAL', 'BIGSERIAL'}
+FLOAT_TYPES = {'NUMERIC', 'REAL', 'FLOAT', 'FLOAT8', 'DOUBLE'}
+TIMESTAMP_TYPES = {'TIMESTAMPTZ', 'TIMESTAMP'}
+JSON_TYPES = {'JSON', 'JSONB'}
+
+
+def api_error(message, code, hint=None):
+    """Build the APIError postgrest-py raises for a PostgREST error response"""
+    return APIError({'message': message, 'code': code, 'hint': hint, 'details': None})
+
+
+def utc_now_iso():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def to_datetime(value):
+    """
+    Parse a timestamp or date into an aware UTC datetime
+
+    Args:
+        value (str|datetime|date): ISO 8601 value; naive values are treated as UTC
+
+    Returns:
+        datetime: Aware UTC datetime
+    """
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, date):
+        parsed = datetime(value.year, value.month, value.day)
+    else:
+        parsed = datetime.fromisoformat(str(value).strip().replace(' ', 'T', 1))
+
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def evaluate_default(expression):
+    """
+    Evaluate a column DEFAULT expression from the schema
+
+    Args:
+        expression (str): e.g. "NOW()", "'member'", "FALSE", "0"
+
+    Returns:
+        Default value
+    """
+    upper = expression.upper()
+    if upper in ('NOW()', 'CURRENT_TIMESTAMP'):
+        return utc_now_iso()
+    if upper == 'CURRENT_DATE':
+        return datetime.now(timezone.utc).date().isoformat()
+    if upper in ('UUID_GENERATE_V4()', 'GEN_RANDOM_UUID()'):
+        return str(uuid.uuid4())
+    if upper in ('TRUE', 'FALSE'):
+        return upper == 'TRUE'
+    if upper == 'NULL':
+        return None
+    if expression.startswith("'"):
+        return expression[1:expression.rfind("'")].replace("''", "'")
+    return float(expression) if '.' in expression else int(expression)
+
+
+def coerce(table, column, value):
+    """
+    Convert a JSON value to the stored representation for a column
+
+    Raises:
+        APIError: When the value cannot be converted (PostgreSQL code 22P02)
+    """
+    if value is None:
+        return None
+
+    try:
+        if column.is_array:
+            if not isinstance(value, (list, tuple)):
+                raise ValueError('malformed array literal')
+            return list(value)
+        if column.type in JSON_TYPES:
+            return value
+        if column.type == 'BOOLEAN':
+            if isinstance(value, str):
+                if value.lower() not in ('true', 'false'):
+                    raise ValueError(value)
+                return value.lower() == 'true'
+            return bool(value)
+        if column.type in INTEGER_TYPES:
+            return int(value)
+        if column.type in FLOAT_TYPES:
+            return float(value)
+        if column.type in TIMESTAMP_TYPES:
+            return to_datetime(value).isoformat()
+        if column.type == 'DATE':
+            return to_datetime(value).date().isoformat()
+        return value if isinstance(value, str) else str(value)
+    except (TypeError, ValueError):
+        raise api_error(
+            f'invalid input syntax for type {column.type.lower()}: "{value}" '
+            f'(column {table}.{column.name})',
+            '22P02'
+        )
+
+
+def comparable(table, column, value):
+    """Convert a stored or filter value to something that orders like PostgreSQL would"""
+    if value is None or column.is_array or column.type in JSON_TYPES:
+        return value
+    if column.type in TIMESTAMP_TYPES:
+        return to_datetime(value)
+    return coerce(table, column, value)
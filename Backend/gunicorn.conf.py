@@ -0,0 +1,110 @@
+"""
+Gunicorn configuration (production server)
+    gunicorn -c gunicorn.conf.py
+Every setting can be overridden with the environment variables below, or on
+the command line. The defaults were picked with `python -m benchmarks server`
+(see README, Production Mode).
+"""
+import glob
+import multiprocessing
+import os
+import shutil
+import signal
+import tempfile
+import threading
+
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')  # 'sync', 'gthread' or 'gevent'
+
+if worker_class == 'gevent':
+    # Patch before the app (and its locks and sockets) is imported by preload_app
+    from gevent import monkey
+    monkey.patch_all()
+
+wsgi_app = 'wsgi:app'
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '5000')}")
+
+# Worker model
+workers = int(os.getenv('WEB_CONCURRENCY', str(max(2, multiprocessing.cpu_count()))))
+# gunicorn turns 'sync' into 'gthread' when threads > 1
+threads = int(os.getenv('GUNICORN_THREADS', '1' if worker_class == 'sync' else '8'))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '1000'))  # gevent only
+
+# Tell the app how it is served: per-worker limits and cross-worker backends are
+# picked from these (see config.py), so set workers and threads above, not with -w
+os.environ['SERVER_WORKERS'] = str(workers)
+os.environ['SERVER_THREADS'] = '0' if worker_class == 'gevent' else str(threads)
+
+# Every worker writes its Prometheus samples to this directory, so one scrape of
+# /api/metrics sums all of them (see utils/metrics.py). prometheus_client reads
+# it when it is imported, so it is set here, before the app is loaded.
+_metrics_temp_dir = None
+if workers > 1 and not os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+    _metrics_temp_dir = tempfile.mkdtemp(prefix='byte-metrics-')
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = _metrics_temp_dir
+
+# Import the app once in the master: workers fork with it loaded (faster boot, shared pages)
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True').lower() == 'true'
+
+# Worker recycling bounds slow memory growth; jitter keeps workers from restarting together
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '2000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '200'))
+
+# Timeouts (seconds)
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))  # silent worker is killed and replaced
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))  # drain time on SIGTERM / reload
+# Idle keep-alive. 0 closes after each response: with more client connections than
+# threads, kept-alive connections queue behind each other (see README)
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '0'))
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+
+
+def on_starting(server):
+    # Metric files of workers from a previous run would be summed with the new ones
+    metrics_dir = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+    if metrics_dir:
+        os.makedirs(metrics_dir, exist_ok=True)
+        for path in glob.glob(os.path.join(metrics_dir, '*.db')):
+            os.remove(path)
+
+
+def post_worker_init(worker):
+    from utils.shutdown import request_shutdown
+
+    # Start shutting down (e.g. end change streams) as soon as the worker is
+    # told to stop, so draining does not wait for the graceful timeout
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def handle_term(signum, frame):
+        threading.Thread(target=request_shutdown, name='shutdown', daemon=True).start()
+        if callable(previous):
+            previous(signum, frame)
+
+    signal.signal(signal.SIGTERM, handle_term)
+
+    # gthread workers queue accepted connections until a thread is free; the
+    # length of that queue tells the load shedder the worker is behind
+    work_queue = getattr(getattr(worker, 'tpool', None), '_work_queue', None)
+    if work_queue is not None:
+        from middleware.load_shedding import set_queue_probe
+        set_queue_probe(work_queue.qsize)
+
+
+def worker_exit(server, worker):
+    from utils.shutdown import run_shutdown_hooks
+
+    # In-flight requests are done; flush background work before the process exits
+    run_shutdown_hooks(timeout=max(1, graceful_timeout // 2))
+
+
+def child_exit(server, worker):
+    # Drops the live gauges (requests in flight) of the dead worker
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def on_exit(server):
+    if _metrics_temp_dir:
+        shutil.rmtree(_metrics_temp_dir, ignore_errors=True)
@@ -2,10 +2,24 @@
 BYTE Website Backend API
 Main application entry point
 """
-from flask import Flask
+import os
+from flask import Flask, request
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 from config import Config
+from database import circuit_breakers
 from utils.error_handlers import register_error_handlers
+from middleware.timing import register_request_timing
+from middleware.profiling import register_profiling
+from middleware.serve_stale import register_serve_stale
+from middleware.response_cache import register_response_cache
+from middleware.rate_limit import register_rate_limit
+from middleware.load_shedding import register_load_shedding
+from utils.static_export import register_static_export
+from utils.image_placeholders import register_image_placeholders
+from utils.metrics import register_metrics, render_metrics
+from utils.query_budget import register_query_budget
+from commands import register_commands
 
 # Import blueprints
 from routes.users import users_bp
@@ -14,6 +28,13 @@ from routes.projects import projects_bp
 from routes.events import events_bp
 from routes.announcements import announcements_bp
 from routes.activity_log import activity_log_bp
+from routes.changes import changes_bp
+from routes.batch import batch_bp
+from routes.profiles import profiles_bp
+from routes.images import images_bp
+
+# Frontend and admin dashboard origins allowed to call the API
+CORS_ORIGINS = ["http://localhost:3000", "http://localhost:5173"]
 
 
 def create_app(config_class=Config):
@@ -24,15 +45,53 @@ def create_app(config_class=Config):
     # Enable CORS for frontend and admin access
     CORS(app, resources={
         r"/api/*": {
-            "origins": ["http://localhost:3000", "http://localhost:5173"],
+            "origins": CORS_ORIGINS,
             "methods": ["GET", "POST", "PUT", "PATCH", "DELETE"],
-            "allow_headers": ["Content-Type", "Authorization"]
+            "allow_headers": ["Content-Type", "Authorization", "Last-Event-ID", "X-Profile", "Idempotency-Key"]
         }
     })
 
+    # Client addresses from X-Forwarded-For, when behind TRUSTED_PROXY_COUNT proxies
+    if app.config['TRUSTED_PROXY_COUNT'] > 0:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXY_COUNT'],
+                                x_proto=app.config['TRUSTED_PROXY_COUNT'])
+
+    # Register request timing (Server-Timing header), if enabled
+    register_request_timing(app)
+
+    # Register Prometheus request metrics, if enabled
+    register_metrics(app)
+
+    # Count database round trips per request and warn about excessive ones
+    register_query_budget(app)
+
+    # Register on-demand profiling for owners (X-Profile header), if enabled
+    register_profiling(app)
+
+    # Replay the last good public response when a request fails upstream
+    register_serve_stale(app)
+
+    # Rate limit each client IP and signed-in user (before the cache: hits count too)
+    register_rate_limit(app)
+
+    # Cache public responses in the shared cache, invalidated by writes
+    register_response_cache(app)
+
+    # Shed expensive requests while a queue builds up (after the cache: hits are never shed)
+    register_load_shedding(app)
+
+    # Re-export static JSON snapshots after writes, if SNAPSHOT_DIR is set
+    register_static_export(app)
+
+    # Compute image sizes and placeholders (image_meta) after writes
+    register_image_placeholders(app)
+
     # Register error handlers
     register_error_handlers(app)
 
+    # Register CLI commands
+    register_commands(app)
+
     # Register blueprints
     app.register_blueprint(users_bp, url_prefix='/api/users')
     app.register_blueprint(team_members_bp, url_prefix='/api/team-members')
@@ -40,6 +99,10 @@ def create_app(config_class=Config):
     app.register_blueprint(events_bp, url_prefix='/api/events')
     app.register_blueprint(announcements_bp, url_prefix='/api/announcements')
     app.register_blueprint(activity_log_bp, url_prefix='/api/activity-log')
+    app.register_blueprint(changes_bp, url_prefix='/api/changes')
+    app.register_blueprint(batch_bp, url_prefix='/api/batch')
+    app.register_blueprint(profiles_bp, url_prefix='/api/profiles')
+    app.register_blueprint(images_bp, url_prefix='/api/images')
 
     @app.route('/')
     def index():
@@ -51,11 +114,23 @@ def create_app(config_class=Config):
 
     @app.route('/api/health')
     def health():
+        open_circuits = sorted(name for name, state in circuit_breakers.states().items() if state != 'closed')
+        if open_circuits:
+            return {"status": "degraded", "open_circuits": open_circuits}, 200
         return {"status": "healthy"}, 200
 
+    @app.route('/api/metrics')
+    def metrics():
+        # Optional shared secret for the Prometheus scraper
+        token = app.config.get('METRICS_TOKEN')
+        if token and request.headers.get('Authorization') != f'Bearer {token}':
+            return {"error": "Unauthorized", "message": "Invalid metrics token"}, 401
+        return render_metrics()
+
     return app
 
 
 if __name__ == '__main__':
+    # Development server only; production runs gunicorn (see gunicorn.conf.py)
     app = create_app()
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    app.run(debug=app.config['DEBUG'], host='0.0.0.0', port=int(os.getenv('PORT', '5000')))
@@ -7,6 +7,10 @@ from flask import request, jsonify, g
 from database import get_supabase_client
 import jwt
 from config import Config
+from middleware.rate_limit import limit_user
+from middleware.timing import timed
+from utils.metrics import AUTH_VERIFY_LATENCY
+from utils.shared_cache import shared_cache
 
 
 def get_auth_token():
@@ -59,6 +63,8 @@ def verify_token(token):
 def get_user_from_db(uid):
     """
     Fetch user details from database
+    Records are kept in the shared cache for USER_CACHE_TTL seconds; any write
+    through /api/users invalidates them in every worker.
 
     Args:
         uid (str): User ID
@@ -67,10 +73,18 @@ def get_user_from_db(uid):
         dict: User data with is_admin and is_owner fields
     """
     try:
+        if Config.USER_CACHE_TTL > 0:
+            generation = shared_cache.generation('users')
+            user = shared_cache.get('users', uid, metric_name='users')
+            if user is not None:
+                return user
+
         supabase = get_supabase_client()
         response = supabase.table('users').select('*').eq('uid', uid).execute()
 
         if response.data and len(response.data) > 0:
+            if Config.USER_CACHE_TTL > 0:
+                shared_cache.set('users', uid, response.data[0], Config.USER_CACHE_TTL, generation)
             return response.data[0]
         return None
     except Exception as e:
@@ -78,6 +92,57 @@ def get_user_from_db(uid):
         return None
 
 
+def authenticate_request():
+    """
+    Resolve the authenticated user for the current request
+
+    The result is stored on g, so the token is verified and the user is looked
+    up at most once per request. Batch sub-requests are given the result of
+    the batch request (see routes/batch.py) and skip authentication entirely.
+
+    Returns:
+        tuple: (user, error_message) - user is None when authentication failed
+    """
+    if 'auth_result' in g:
+        return g.auth_result
+
+    token = get_auth_token()
+
+    if not token:
+        result = (None, 'Authentication token is required')
+    else:
+        # Verify token, then get full user details from database
+        with timed('auth_verify'), AUTH_VERIFY_LATENCY.time():
+            user_info = verify_token(token)
+        if not user_info:
+            result = (None, 'Invalid or expired token')
+        else:
+            # Signed-in clients also have a bucket of their own
+            limit_user(user_info['uid'])
+            with timed('user_lookup'):
+                user = get_user_from_db(user_info['uid'])
+            result = (user, None) if user else (None, 'User not found')
+
+    g.auth_result = result
+    return result
+
+
+def unauthorized_error(message):
+    """
+    Build the 401 response returned by the auth decorators
+
+    Args:
+        message (str): Error message
+
+    Returns:
+        tuple: (response, 401)
+    """
+    return jsonify({
+        'error': 'Unauthorized',
+        'message': message
+    }), 401
+
+
 def require_auth(f):
     """
     Decorator to require authentication for a route
@@ -90,29 +155,9 @@ def require_auth(f):
     """
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        token = get_auth_token()
-
-        if not token:
-            return jsonify({
-                'error': 'Unauthorized',
-                'message': 'Authentication token is required'
-            }), 401
-
-        # Verify token
-        user_info = verify_token(token)
-        if not user_info:
-            return jsonify({
-                'error': 'Unauthorized',
-                'message': 'Invalid or expired token'
-            }), 401
-
-        # Get full user details from database
-        user = get_user_from_db(user_info['uid'])
-        if not user:
-            return jsonify({
-                'error': 'Unauthorized',
-                'message': 'User not found'
-            }), 401
+        user, error_msg = authenticate_request()
+        if error_msg:
+            return unauthorized_error(error_msg)
 
         # Store user in Flask's g object for access in route handlers
         g.current_user = user
@@ -135,28 +180,9 @@ def require_admin(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
         # First check authentication
-        token = get_auth_token()
-
-        if not token:
-            return jsonify({
-                'error': 'Unauthorized',
-                'message': 'Authentication token is required'
-            }), 401
-
-        user_info = verify_token(token)
-        if not user_info:
-            return jsonify({
-                'error': 'Unauthorized',
-                'message': 'Invalid or expired token'
-            }), 401
-
-        # Get full user details
-        user = get_user_from_db(user_info['uid'])
-        if not user:
-            return jsonify({
-                'error': 'Unauthorized',
-                'message': 'User not found'
-            }), 401
+        user, error_msg = authenticate_request()
+        if error_msg:
+            return unauthorized_error(error_msg)
 
         # Check admin or owner privileges
         if not user.get('is_admin') and not user.get('is_owner'):
@@ -185,28 +211,9 @@ def require_owner(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
         # First check authentication
-        token = get_auth_token()
-
-        if not token:
-            return jsonify({
-                'error': 'Unauthorized',
-                'message': 'Authentication token is required'
-            }), 401
-
-        user_info = verify_token(token)
-        if not user_info:
-            return jsonify({
-                'error': 'Unauthorized',
-                'message': 'Invalid or expired token'
-            }), 401
-
-        # Get full user details
-        user = get_user_from_db(user_info['uid'])
-        if not user:
-            return jsonify({
-                'error': 'Unauthorized',
-                'message': 'User not found'
-            }), 401
+        user, error_msg = authenticate_request()
+        if error_msg:
+            return unauthorized_error(error_msg)
 
         # Check owner privileges
         if not user.get('is_owner'):
@@ -236,14 +243,10 @@ def optional_auth(f):
     """
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        token = get_auth_token()
-
-        if token:
-            user_info = verify_token(token)
-            if user_info:
-                user = get_user_from_db(user_info['uid'])
-                if user:
-                    g.current_user = user
+        if get_auth_token() or 'auth_result' in g:
+            user, _ = authenticate_request()
+            if user:
+                g.current_user = user
 
         return f(*args, **kwargs)
 
@@ -0,0 +1,91 @@
+"""
+Idempotency-Key support for create endpoints
+A client that may retry a POST sends the same Idempotency-Key header with
+every attempt. The first attempt runs; its response is kept for
+IDEMPOTENCY_TTL seconds and returned to later attempts without verifying the
+token or touching the database. Attempts arriving while the first one runs
+wait for its response.
+
+Keys are scoped to the Authorization header and the URL, so a replay only
+reaches the client holding the same token.
+"""
+import hashlib
+from functools import wraps
+from flask import current_app, make_response, request
+from utils.idempotency import BUSY, MISMATCH, REPLAY, idempotency_store
+from utils.metrics import record_idempotent_request
+from utils.responses import bad_request_response, error_response
+
+MAX_KEY_LENGTH = 255
+
+# Responses never replayed: auth failures and rate limits (like server errors) may succeed on retry
+_NOT_STORED = {401, 403, 429}
+
+
+def _scoped_key(key):
+    scope = '\n'.join((request.headers.get('Authorization', ''), request.method, request.path, key))
+    return hashlib.sha256(scope.encode('utf-8')).hexdigest()
+
+
+def idempotent(f):
+    """
+    Decorator making an endpoint safe to retry with an Idempotency-Key header
+    Place it above the auth decorator, so replays skip token verification.
+    Requests without the header, or without a token, run as usual.
+
+    Usage:
+        @events_bp.route('', methods=['POST'])
+        @idempotent
+        @require_admin
+        def create_event():
+            ...
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        key = request.headers.get('Idempotency-Key')
+        config = current_app.config
+        if key is None or not config.get('IDEMPOTENCY_ENABLED') or 'Authorization' not in request.headers:
+            return f(*args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return bad_request_response(f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters")
+
+        scoped_key = _scoped_key(key)
+        fingerprint = hashlib.sha256(request.get_data()).hexdigest()
+        ttl = config['IDEMPOTENCY_TTL']
+        outcome, record = idempotency_store.begin(scoped_key, fingerprint, ttl, config['IDEMPOTENCY_WAIT_TIMEOUT'])
+        record_idempotent_request(request.endpoint, outcome)
+
+        if outcome == REPLAY:
+            response = current_app.response_class(record['body'], status=record['status'], mimetype=record['mimetype'])
+            response.headers['Idempotent-Replayed'] = 'true'
+            return response
+        if outcome == MISMATCH:
+            return error_response(
+                "Idempotency-Key was already used with a different request body",
+                error='Unprocessable Entity', status_code=422
+            )
+        if outcome == BUSY:
+            response, status_code = error_response(
+                "A request with this Idempotency-Key is still being processed",
+                error='Conflict', status_code=409
+            )
+            response.headers['Retry-After'] = '1'
+            return response, status_code
+
+        try:
+            response = make_response(f(*args, **kwargs))
+        except BaseException:
+            idempotency_store.release(scoped_key)
+            raise
+
+        if response.status_code >= 500 or response.status_code in _NOT_STORED:
+            idempotency_store.release(scoped_key)
+        else:
+            idempotency_store.complete(scoped_key, fingerprint, {
+                'status': response.status_code,
+                'body': response.get_data(as_text=True),
+                'mimetype': response.mimetype,
+            }, ttl)
+        return response
+
+    return decorated_function
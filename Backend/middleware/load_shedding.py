@@ -0,0 +1,258 @@
+"""
+Adaptive load shedding
+When a worker falls behind, requests queue up and every client waits. This
+middleware watches for a standing queue and, while one persists, answers
+the most expensive requests at once with 503 and Retry-After so the rest
+keep moving. Enabled with LOAD_SHED_ENABLED.
+
+Priorities (public reads answered by the response cache are served before
+this middleware runs, so they are never shed):
+- normal: reads, image variants and writes
+- expensive: batches, delta sync, activity log queries, change streams and
+  public reads sent with no-cache (they bypass the response cache)
+
+Shedding only starts on a real queue signal, evaluated as in CoDel: over
+each LOAD_SHED_INTERVAL_MS window the smallest value is kept. A burst leaves
+some requests in the window that did not queue; a standing queue does not.
+- With a trusted proxy (TRUSTED_PROXY_COUNT set) sending X-Request-Start
+  (nginx: proxy_set_header X-Request-Start "t=${msec}";), the time each
+  request waited. Above LOAD_SHED_TARGET_MS expensive requests are shed,
+  above twice the target normal requests too.
+- Otherwise, on gthread workers, the connections waiting for a free thread
+  when a request starts. Any waiting: expensive requests are shed; a whole
+  round of SERVER_THREADS waiting: normal requests too.
+Public reads shed as normal requests are answered with their last good copy
+when serve-stale has one. Without either signal (sync or gevent workers
+without the header, the development server) nothing is shed for overload.
+
+Independently, at most LOAD_SHED_MAX_EXPENSIVE expensive requests run at once
+per worker (default: all threads but two), so they cannot occupy every thread.
+"""
+import math
+import threading
+import time
+from flask import g, request
+from werkzeug.exceptions import ServiceUnavailable
+from middleware.rate_limit import EXEMPT_ENDPOINTS
+from middleware.serve_stale import is_public_read
+from utils.metrics import record_overload_level, record_shed_request
+
+NORMAL = 'normal'
+EXPENSIVE = 'expensive'
+
+# Blueprints whose requests are expensive: batches fan out, activity log
+# queries scan and aggregate, change streams hold a thread for minutes
+EXPENSIVE_BLUEPRINTS = {'batch', 'activity_log', 'changes'}
+
+# Length of this worker's queue of connections waiting for a thread, set by
+# gunicorn.conf.py on gthread workers (see set_queue_probe)
+_queue_probe = None
+
+
+def set_queue_probe(probe):
+    """
+    Give the load shedder the length of the worker's connection queue
+
+    Args:
+        probe (callable): Returns the number of connections waiting for a thread
+    """
+    global _queue_probe
+    _queue_probe = probe
+
+
+class OverloadDetector:
+    """
+    Standing-queue detector for one worker
+
+    level is 0 (keeping up), 1 (shed expensive requests) or 2 (shed normal
+    requests too). It is re-evaluated at the end of every interval from the
+    smallest value observed in it: above expensive_above gives level 1,
+    above normal_above level 2.
+    """
+
+    def __init__(self, interval, expensive_above, normal_above):
+        self.interval = interval
+        self.expensive_above = expensive_above
+        self.normal_above = normal_above
+        self.level = 0
+        self._lowest = None
+        self._window_end = time.monotonic() + interval
+        self._lock = threading.Lock()
+
+    def _roll(self, now):
+        if now < self._window_end:
+            return
+
+        lowest = self._lowest
+        if lowest is None:
+            # Nothing measured: idle, or every request was shed. Step down and look again.
+            level = 0 if now >= self._window_end + self.interval else max(0, self.level - 1)
+        elif lowest > self.normal_above:
+            level = 2
+        elif lowest > self.expensive_above:
+            level = 1
+        else:
+            level = 0
+
+        if level != self.level:
+            self.level = level
+            record_overload_level(level)
+        self._lowest = None
+        self._window_end = now + self.interval
+
+    def observe(self, value):
+        """
+        Record the queue signal seen by one request
+
+        Args:
+            value (float): Seconds queued, or connections waiting for a thread
+        """
+        with self._lock:
+            self._roll(time.monotonic())
+            self._lowest = value if self._lowest is None else min(self._lowest, value)
+
+    def current_level(self):
+        """Overload level for a request arriving now"""
+        with self._lock:
+            self._roll(time.monotonic())
+            return self.level
+
+
+def request_priority():
+    """
+    Priority of the current request
+
+    Returns:
+        str: NORMAL or EXPENSIVE, or None for requests that are never shed
+    """
+    if request.method == 'OPTIONS' or request.endpoint in EXEMPT_ENDPOINTS or g.get('internal_request'):
+        return None
+    if request.blueprint in EXPENSIVE_BLUEPRINTS or 'updated_since' in request.args:
+        return EXPENSIVE
+    if is_public_read() and 'no-cache' in request.headers.get('Cache-Control', ''):
+        return EXPENSIVE
+    return NORMAL
+
+
+def parse_request_start(value):
+    """
+    Seconds a request waited in front of the app, from its X-Request-Start value
+
+    Accepts "t=<seconds>" with a fraction (nginx $msec), or milliseconds or
+    microseconds since the epoch.
+
+    Args:
+        value (str): Header value ('' when missing)
+
+    Returns:
+        float: Delay, or None when the value is missing or malformed
+    """
+    try:
+        started = float(value[2:] if value.startswith('t=') else value)
+    except ValueError:
+        return None
+    if started > 1e14:
+        started /= 1e6
+    elif started > 1e11:
+        started /= 1e3
+    return max(0.0, time.time() - started)
+
+
+def queue_delay():
+    """Seconds the current request waited in front of the app, or None (see parse_request_start)"""
+    return parse_request_start(request.headers.get('X-Request-Start', ''))
+
+
+def queue_signal(trust_queue_header):
+    """
+    Queue signal of the current request for the overload detector
+
+    Args:
+        trust_queue_header (bool): Whether X-Request-Start comes from a trusted proxy
+
+    Returns:
+        float: Seconds queued (header) or connections waiting for a thread
+        (gthread workers), or None when neither is available
+    """
+    if trust_queue_header:
+        return queue_delay()
+    if _queue_probe is not None:
+        try:
+            return _queue_probe()
+        except Exception:
+            return None
+    return None
+
+
+def create_overload_detector(config):
+    """
+    Build the overload detector for an app's configuration
+
+    Args:
+        config: App config (LOAD_SHED_*, TRUSTED_PROXY_COUNT, SERVER_THREADS)
+
+    Returns:
+        tuple: (OverloadDetector, whether X-Request-Start is trusted)
+    """
+    # X-Request-Start could be forged by clients that reach the app directly
+    trust_queue_header = config.get('TRUSTED_PROXY_COUNT', 0) > 0
+    interval = config['LOAD_SHED_INTERVAL_MS'] / 1000
+    if trust_queue_header:
+        target = config['LOAD_SHED_TARGET_MS'] / 1000
+        return OverloadDetector(interval, expensive_above=target, normal_above=2 * target), True
+    # Connections waiting for a thread: any, or at least a whole round of threads
+    threads = max(1, config.get('SERVER_THREADS', 0))
+    return OverloadDetector(interval, expensive_above=0, normal_above=threads - 1), False
+
+
+def register_load_shedding(app):
+    """
+    Register load shedding with Flask application
+    Does nothing unless LOAD_SHED_ENABLED is set in the app config. Register it
+    after the response cache, so cached responses are served even while shedding.
+
+    Args:
+        app: Flask application instance
+    """
+    if not app.config.get('LOAD_SHED_ENABLED'):
+        return
+
+    detector, trust_queue_header = create_overload_detector(app.config)
+    interval = detector.interval
+    max_expensive = app.config['LOAD_SHED_MAX_EXPENSIVE']
+    retry_after = max(1, math.ceil(interval))
+    expensive_lock = threading.Lock()
+    expensive_in_flight = [0]
+
+    def shed(priority, reason):
+        record_shed_request(priority, reason)
+        g.shed_priority = priority
+        raise ServiceUnavailable("Server is overloaded, please retry shortly", retry_after=retry_after)
+
+    @app.before_request
+    def shed_load():
+        priority = request_priority()
+        if priority is None:
+            return None
+
+        signal = queue_signal(trust_queue_header)
+        if signal is not None:
+            detector.observe(signal)
+
+        level = detector.current_level()
+        if level >= 2 or (level == 1 and priority == EXPENSIVE):
+            shed(priority, 'overload')
+
+        if priority == EXPENSIVE and max_expensive > 0:
+            with expensive_lock:
+                if expensive_in_flight[0] >= max_expensive:
+                    shed(priority, 'concurrency')
+                expensive_in_flight[0] += 1
+            g.load_shed_expensive = True
+        return None
+
+    @app.teardown_request
+    def finish_load_shedding(exc):
+        if g.pop('load_shed_expensive', False):
+            with expensive_lock:
+                expensive_in_flight[0] -= 1
@@ -0,0 +1,286 @@
+"""
+On-demand request profiling
+Owners can profile a single request by sending an X-Profile header:
+    X-Profile: 1 (or cprofile)  - deterministic profile (cProfile), downloadable as pstats
+    X-Profile: sample           - sampling profile, downloadable as speedscope JSON
+Profiles are kept in a bounded ring on disk (PROFILE_DIR) shared by all workers
+and listed/downloaded through /api/profiles. Requests without the header only
+pay for one header lookup.
+"""
+import cProfile
+import glob
+import json
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from flask import current_app, g, request
+from middleware.auth import authenticate_request
+
+CPROFILE_MODES = {'1', 'true', 'cprofile', 'pstats'}
+SAMPLING_MODES = {'sample', 'sampling', 'speedscope'}
+
+
+class SamplingProfiler:
+    """
+    Samples the call stack of one thread at a fixed interval from a helper thread
+    """
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.frames = []
+        self.frame_index = {}
+        self.samples = []
+        self.weights = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+
+    def start(self):
+        self._last_sample = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                key = (code.co_name, code.co_filename, code.co_firstlineno)
+                index = self.frame_index.get(key)
+                if index is None:
+                    index = self.frame_index[key] = len(self.frames)
+                    self.frames.append({'name': key[0], 'file': key[1], 'line': key[2]})
+                stack.append(index)
+                frame = frame.f_back
+
+            stack.reverse()
+            self.samples.append(stack)
+            self.weights.append(now - self._last_sample)
+            self._last_sample = now
+
+    def to_speedscope(self, name):
+        """
+        Export the samples in the speedscope file format
+
+        Args:
+            name (str): Profile name shown in speedscope
+
+        Returns:
+            dict: speedscope JSON document
+        """
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': name,
+            'exporter': 'byte-backend',
+            'shared': {'frames': self.frames},
+            'profiles': [{
+                'type': 'sampled',
+                'name': name,
+                'unit': 'seconds',
+                'startValue': 0,
+                'endValue': sum(self.weights),
+                'samples': self.samples,
+                'weights': self.weights
+            }]
+        }
+
+
+class ProfileStore:
+    """
+    Bounded ring of recent profiles stored as files in a directory
+    Each profile has a '<id>.json' metadata file and a '<id>.pstats' or
+    '<id>.speedscope.json' data file. The oldest profiles are removed once
+    more than max_profiles are stored.
+    """
+
+    def __init__(self, directory, max_profiles):
+        self.directory = directory
+        self.max_profiles = max_profiles
+
+    def save(self, meta, data, extension):
+        """
+        Store a profile and trim the ring
+
+        Args:
+            meta (dict): Profile metadata (must contain 'id')
+            data (bytes): Profile data
+            extension (str): Data file extension ('pstats' or 'speedscope.json')
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        meta['format'] = extension
+
+        with open(os.path.join(self.directory, f"{meta['id']}.{extension}"), 'wb') as data_file:
+            data_file.write(data)
+        with open(os.path.join(self.directory, f"{meta['id']}.meta.json"), 'w') as meta_file:
+            json.dump(meta, meta_file)
+
+        for old_meta in self.list()[self.max_profiles:]:
+            self.delete(old_meta)
+
+    def list(self):
+        """
+        List stored profiles, newest first
+
+        Returns:
+            list: Profile metadata dicts
+        """
+        profiles = []
+        for path in glob.glob(os.path.join(self.directory, '*.meta.json')):
+            try:
+                with open(path) as meta_file:
+                    profiles.append(json.load(meta_file))
+            except (OSError, ValueError):
+                continue
+        return sorted(profiles, key=lambda meta: meta['created_at'], reverse=True)
+
+    def get(self, profile_id):
+        """
+        Load a profile
+
+        Args:
+            profile_id (str): Profile ID
+
+        Returns:
+            tuple: (meta, data) or (None, None) if not found
+        """
+        if not profile_id.isalnum():
+            return None, None
+        try:
+            with open(os.path.join(self.directory, f'{profile_id}.meta.json')) as meta_file:
+                meta = json.load(meta_file)
+            with open(os.path.join(self.directory, f"{profile_id}.{meta['format']}"), 'rb') as data_file:
+                return meta, data_file.read()
+        except (OSError, ValueError, KeyError):
+            return None, None
+
+    def delete(self, meta):
+        for extension in ('meta.json', meta.get('format')):
+            try:
+                os.remove(os.path.join(self.directory, f"{meta['id']}.{extension}"))
+            except OSError:
+                pass
+
+
+def get_profile_store():
+    """Get the profile store configured for the current app"""
+    return ProfileStore(current_app.config['PROFILE_DIR'], current_app.config['PROFILE_RING_SIZE'])
+
+
+def pstats_to_text(data, limit=50):
+    """
+    Render marshalled pstats data as a text report sorted by cumulative time
+
+    Args:
+        data (bytes): Marshalled pstats data
+        limit (int): Number of functions to include
+
+    Returns:
+        str: Text report
+    """
+    import io
+    import tempfile
+
+    with tempfile.NamedTemporaryFile(suffix='.pstats', delete=False) as stats_file:
+        stats_file.write(data)
+    try:
+        output = io.StringIO()
+        pstats.Stats(stats_file.name, stream=output).sort_stats('cumulative').print_stats(limit)
+        return output.getvalue()
+    finally:
+        os.remove(stats_file.name)
+
+
+def _start_profile():
+    """before_request hook: start a profiler for owners sending X-Profile"""
+    mode = request.headers.get('X-Profile')
+    if not mode:
+        return
+
+    mode = mode.strip().lower()
+    if mode not in CPROFILE_MODES and mode not in SAMPLING_MODES:
+        return
+
+    # Authentication is cached on g, so the route's own decorator reuses it
+    user, _ = authenticate_request()
+    if not user or not user.get('is_owner'):
+        return
+
+    if mode in SAMPLING_MODES:
+        profiler = SamplingProfiler(threading.get_ident(), current_app.config['PROFILE_SAMPLE_INTERVAL'])
+        profiler.start()
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    g.profiler = profiler
+    g.profile_started = time.perf_counter()
+
+
+def _stop_profile(response):
+    """after_request hook: stop the profiler and store the profile"""
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return response
+
+    duration = time.perf_counter() - g.pop('profile_started')
+    profile_id = uuid.uuid4().hex
+    meta = {
+        'id': profile_id,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'method': request.method,
+        'path': request.full_path.rstrip('?'),
+        'endpoint': request.endpoint,
+        'status': response.status_code,
+        'duration_ms': round(duration * 1000, 2),
+        'user_id': g.auth_result[0]['uid']
+    }
+
+    if isinstance(profiler, SamplingProfiler):
+        profiler.stop()
+        data = json.dumps(profiler.to_speedscope(f"{request.method} {meta['path']}")).encode('utf-8')
+        get_profile_store().save(meta, data, 'speedscope.json')
+    else:
+        profiler.disable()
+        profiler.create_stats()
+        get_profile_store().save(meta, marshal.dumps(profiler.stats), 'pstats')
+
+    response.headers['X-Profile-Id'] = profile_id
+    return response
+
+
+def _discard_profile(exc):
+    """teardown hook: make sure a profiler never outlives its request"""
+    profiler = g.pop('profiler', None)
+    if isinstance(profiler, SamplingProfiler):
+        profiler.stop()
+    elif profiler is not None:
+        profiler.disable()
+
+
+def register_profiling(app):
+    """
+    Register on-demand profiling hooks with Flask application
+    Does nothing unless PROFILING_ENABLED is set in the app config.
+
+    Args:
+        app: Flask application instance
+    """
+    if not app.config.get('PROFILING_ENABLED'):
+        return
+
+    app.before_request(_start_profile)
+    app.after_request(_stop_profile)
+    app.teardown_request(_discard_profile)
@@ -0,0 +1,101 @@
+"""
+Per-client rate limiting
+Every request takes a token from its client IP's bucket, and requests of
+signed-in users also take one from their uid's bucket (see
+utils/token_bucket.py, shared by all workers). A batch takes one token per
+sub-request. An empty bucket answers 429 with Retry-After without running
+the route. Enabled with RATE_LIMIT_ENABLED.
+"""
+import math
+from flask import current_app, g, request
+from werkzeug.exceptions import TooManyRequests
+from utils.metrics import record_rate_limited
+from utils.token_bucket import token_buckets
+
+# Never limited: load balancer probes and the Prometheus scraper
+EXEMPT_ENDPOINTS = {'index', 'health', 'metrics'}
+
+
+def take_token(scope, key, rate, burst, cost=1):
+    """
+    Take `cost` tokens from a bucket
+
+    Args:
+        scope (str): 'ip' or 'user'
+        key (str): Client IP or user ID
+        rate (float): Tokens added per second
+        burst (int): Bucket size
+        cost (int): Tokens to take
+
+    Raises:
+        TooManyRequests: If the bucket does not hold them
+    """
+    # A bucket never holds more than `burst` tokens
+    wait = token_buckets.take(f'{scope}:{key}', rate, burst, min(cost, burst))
+    if wait > 0:
+        record_rate_limited(scope)
+        retry_after = max(1, math.ceil(wait))
+        raise TooManyRequests(f"Too many requests, retry in {retry_after} second(s)", retry_after=retry_after)
+
+
+def limit_user(uid):
+    """
+    Take a token from a signed-in user's bucket
+    Called by middleware/auth.py once the token is verified.
+
+    Args:
+        uid (str): User ID
+
+    Raises:
+        TooManyRequests: If the user's bucket is empty
+    """
+    config = current_app.config
+    if config.get('RATE_LIMIT_ENABLED') and not g.get('internal_request'):
+        take_token('user', uid, config['RATE_LIMIT_USER_RATE'], config['RATE_LIMIT_USER_BURST'])
+
+
+def limit_batch(count, uid=None):
+    """
+    Take the tokens of a batch's sub-requests
+    The batch request already took one token from each of its buckets and
+    its sub-requests are not limited, so this takes the other count - 1:
+    a batch costs as much as sending its sub-requests one by one.
+
+    Args:
+        count (int): Number of sub-requests
+        uid (str): User ID of a signed-in client, or None
+
+    Raises:
+        TooManyRequests: If a bucket does not hold the tokens
+    """
+    config = current_app.config
+    if not config.get('RATE_LIMIT_ENABLED') or count <= 1:
+        return
+    take_token('ip', request.remote_addr or 'unknown', config['RATE_LIMIT_IP_RATE'], config['RATE_LIMIT_IP_BURST'],
+           cost=count - 1)
+    if uid:
+        take_token('user', uid, config['RATE_LIMIT_USER_RATE'], config['RATE_LIMIT_USER_BURST'], cost=count - 1)
+
+
+def register_rate_limit(app):
+    """
+    Register per-IP rate limiting with Flask application
+    Does nothing unless RATE_LIMIT_ENABLED is set in the app config. Register it
+    before the response cache, so cached responses count against the limit too.
+
+    Args:
+        app: Flask application instance
+    """
+    if not app.config.get('RATE_LIMIT_ENABLED'):
+        return
+
+    rate = app.config['RATE_LIMIT_IP_RATE']
+    burst = app.config['RATE_LIMIT_IP_BURST']
+
+    @app.before_request
+    def limit_client_ip():
+        # CORS preflights and sub-requests of a batch (charged by limit_batch)
+        if request.method == 'OPTIONS' or request.endpoint in EXEMPT_ENDPOINTS or g.get('internal_request'):
+            return None
+        take_token('ip', request.remote_addr or 'unknown', rate, burst)
+        return None
@@ -0,0 +1,64 @@
+"""
+Shared response cache for public reads
+Anonymous GETs of public content are answered from the shared cache (see
+utils/shared_cache.py) for RESPONSE_CACHE_TTL seconds. Every committed write
+publishes a change notice, which invalidates the table's cached responses in
+all workers. Send "Cache-Control: no-cache" to bypass the cached copy.
+"""
+from flask import g, request
+from middleware.serve_stale import is_public_read
+from utils.change_feed import add_change_listener
+from utils.shared_cache import invalidate_on_change, shared_cache
+
+
+def _cacheable():
+    # Delta sync URLs are unique per client, caching them would only evict useful entries
+    return is_public_read() and 'updated_since' not in request.args
+
+
+def register_response_cache(app):
+    """
+    Register the shared response cache with Flask application
+    Writes always invalidate the shared cache, even when RESPONSE_CACHE_TTL is 0,
+    because the user lookup in middleware/auth.py uses it too.
+
+    Args:
+        app: Flask application instance
+    """
+    add_change_listener(invalidate_on_change)
+
+    ttl = app.config.get('RESPONSE_CACHE_TTL', 0)
+    if ttl <= 0:
+        return
+
+    @app.before_request
+    def serve_cached_response():
+        if not _cacheable():
+            return None
+
+        # Blueprint names match the tables they serve
+        g.response_cache_generation = shared_cache.generation(request.blueprint)
+        if 'no-cache' in request.headers.get('Cache-Control', ''):
+            return None
+
+        cached = shared_cache.get(request.blueprint, request.full_path, metric_name='responses')
+        if cached is None:
+            return None
+
+        response = app.response_class(cached['body'], status=200, mimetype=cached['mimetype'])
+        response.headers['X-Cache'] = 'HIT'
+        return response
+
+    @app.after_request
+    def store_response(response):
+        generation = g.pop('response_cache_generation', None)
+        if generation is None or 'X-Cache' in response.headers:
+            return response
+
+        if response.status_code == 200 and 'Warning' not in response.headers:
+            shared_cache.set(request.blueprint, request.full_path, {
+                'body': response.get_data(as_text=True),
+                'mimetype': response.mimetype,
+            }, ttl, generation)
+        response.headers['X-Cache'] = 'MISS'
+        return response
@@ -0,0 +1,78 @@
+"""
+Serve-stale-on-error
+Keeps the last successful response of every public GET and serves it again,
+marked with Warning and Age headers, when a later request for the same URL
+fails with a 5xx (for example while a circuit breaker is open). Requests
+that hit an open circuit with no stale copy get a 503 with Retry-After
+instead of a 500 carrying the exception text.
+"""
+import math
+import time
+from flask import g, request
+from utils.cache import TTLCache
+from utils.metrics import record_stale_response
+from utils.responses import error_response
+
+# Blueprints whose GET responses are public and safe to replay to anyone
+PUBLIC_BLUEPRINTS = {'team_members', 'projects', 'events', 'announcements'}
+
+
+def is_public_read():
+    """Whether the current request is an anonymous GET of public content"""
+    return (
+        request.method == 'GET'
+        and request.blueprint in PUBLIC_BLUEPRINTS
+        and 'Authorization' not in request.headers
+    )
+
+
+def register_serve_stale(app):
+    """
+    Register serve-stale-on-error handling with Flask application
+    Does nothing unless SERVE_STALE_ENABLED is set in the app config.
+
+    Args:
+        app: Flask application instance
+    """
+    if not app.config.get('SERVE_STALE_ENABLED'):
+        return
+
+    last_good = TTLCache(
+        ttl=app.config['STALE_MAX_AGE'],
+        max_entries=app.config['STALE_CACHE_MAX_ENTRIES'],
+        name='stale_responses'
+    )
+
+    @app.after_request
+    def serve_stale_on_error(response):
+        public = is_public_read()
+
+        if public and response.status_code == 200:
+            last_good.set(request.full_path, (response.get_data(), response.mimetype, time.time()))
+            return response
+
+        if response.status_code < 500:
+            return response
+
+        # Shed expensive requests keep their 503, so clients back off (see middleware/load_shedding.py)
+        if public and g.get('shed_priority') != 'expensive':
+            entry = last_good.get(request.full_path)
+            if entry is not None:
+                body, mimetype, stored_at = entry
+                stale = app.response_class(body, status=200, mimetype=mimetype)
+                stale.headers['Age'] = str(int(time.time() - stored_at))
+                stale.headers['Warning'] = '110 - "Response is Stale", 111 - "Revalidation Failed"'
+                record_stale_response(request.endpoint)
+                return stale
+
+        circuit_error = g.get('circuit_open_error')
+        if circuit_error is not None:
+            unavailable, status_code = error_response(
+                'Service temporarily unavailable, please retry shortly',
+                error='Service Unavailable', status_code=503
+            )
+            unavailable.status_code = status_code
+            unavailable.headers['Retry-After'] = str(max(1, math.ceil(circuit_error.retry_after)))
+            return unavailable
+
+        return response
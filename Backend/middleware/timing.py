@@ -0,0 +1,117 @@
+"""
+Request timing middleware
+Times the phases of each request (auth verification, user lookup, every
+database call and response serialization) and reports them in a
+Server-Timing header and a structured log line.
+Enabled with REQUEST_TIMING_ENABLED.
+"""
+import json
+import logging
+from contextlib import contextmanager
+from time import perf_counter
+from flask import g, request, has_request_context
+from database import add_query_observer
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTimer:
+    """Collects (name, duration, description) phases for one request"""
+
+    __slots__ = ('started', 'phases')
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.phases = []
+
+    def add(self, name, duration, desc=None):
+        self.phases.append((name, duration, desc))
+
+    def server_timing_header(self, total):
+        """Format the phases as a Server-Timing header value"""
+        entries = []
+        for name, duration, desc in self.phases:
+            entry = f'{name};dur={duration * 1000:.2f}'
+            if desc:
+                entry += f';desc="{desc}"'
+            entries.append(entry)
+        entries.append(f'total;dur={total * 1000:.2f}')
+        return ', '.join(entries)
+
+
+def _current_timer():
+    """Get the current request's timer, or None when timing is off"""
+    if not has_request_context():
+        return None
+    return g.get('request_timer')
+
+
+@contextmanager
+def timed(name, desc=None):
+    """
+    Time a block and record it as a phase of the current request
+    Does nothing outside a request or when timing is disabled.
+
+    Usage:
+        with timed('auth_verify'):
+            user_info = verify_token(token)
+    """
+    timer = _current_timer()
+    if timer is None:
+        yield
+        return
+
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(name, perf_counter() - started, desc)
+
+
+def _record_query(table, operation, duration, error):
+    """Query observer recording each database call as a 'db' phase"""
+    timer = _current_timer()
+    if timer is not None:
+        timer.add('db', duration, f'{table}.{operation or "query"}')
+
+
+def register_request_timing(app):
+    """
+    Register request timing hooks with Flask application
+    Does nothing unless REQUEST_TIMING_ENABLED is set in the app config.
+
+    Args:
+        app: Flask application instance
+    """
+    if not app.config.get('REQUEST_TIMING_ENABLED'):
+        return
+
+    add_query_observer(_record_query)
+
+    @app.before_request
+    def start_request_timer():
+        g.request_timer = RequestTimer()
+
+    @app.after_request
+    def add_server_timing(response):
+        timer = g.pop('request_timer', None)
+        if timer is None:
+            return response
+
+        total = perf_counter() - timer.started
+        response.headers['Server-Timing'] = timer.server_timing_header(total)
+
+        logger.info(json.dumps({
+            'event': 'request_timing',
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 2),
+            'phases': [
+                {'name': name, 'desc': desc, 'ms': round(duration * 1000, 2)}
+                for name, duration, desc in timer.phases
+            ]
+        }))
+
+        return response
@@ -2,17 +2,106 @@
 Activity Log routes - CRUD operations for activity_log table
 Authorization: Admin/Owner read and insert, Owner only for updates and deletes
 """
+from datetime import datetime, timedelta, timezone
 from flask import Blueprint, request, g
+from config import Config
 from database import get_supabase_client
 from middleware.auth import require_admin, require_owner
+from utils.activity_archive import read_archive
+from utils.cache import TTLCache
+from utils.change_feed import publish_change
 from utils.responses import (
     success_response, error_response, created_response,
     not_found_response, bad_request_response, server_error_response
 )
-from utils.validators import validate_required_fields
+from utils.schemas import ACTIVITY_LOG_SCHEMA
+from utils.validators import parse_timestamp
 
 activity_log_bp = Blueprint('activity_log', __name__)
 
+# Valid options for the stats endpoint
+STATS_BUCKETS = ['hour', 'day']
+STATS_GROUPS = ['user', 'collection', 'action']
+
+# Default stats window when no 'since' is given
+STATS_DEFAULT_WINDOW = timedelta(days=7)
+
+# Stats results are cached per (bucket, group_by, since, until)
+_stats_cache = TTLCache(ttl=Config.ACTIVITY_STATS_CACHE_TTL, max_entries=128, name='activity_stats')
+
+
+def parse_time_range():
+    """
+    Read the optional since/until query parameters (ISO 8601)
+
+    Returns:
+        tuple: (since, until, error_message) where since/until are datetimes or None
+    """
+    since = until = None
+
+    if request.args.get('since'):
+        since = parse_timestamp(request.args.get('since'))
+        if not since:
+            return None, None, "since must be an ISO 8601 timestamp"
+
+    if request.args.get('until'):
+        until = parse_timestamp(request.args.get('until'))
+        if not until:
+            return None, None, "until must be an ISO 8601 timestamp"
+
+    if since and until and since >= until:
+        return None, None, "since must be earlier than until"
+
+    return since, until, None
+
+
+def apply_time_range(query, since, until):
+    """
+    Restrict an activity_log query to a time range (uses idx_activity_log_timestamp)
+
+    Args:
+        query: Supabase query builder
+        since (datetime): Optional start of the range
+        until (datetime): Optional end of the range (exclusive)
+
+    Returns:
+        Query builder with the range applied
+    """
+    if since:
+        query = query.gte('timestamp', since.isoformat())
+    if until:
+        query = query.lt('timestamp', until.isoformat())
+    return query
+
+
+def include_archived_logs(logs, match, since, until, limit=None):
+    """
+    Append rows from the cold archive when ?include_archived=true is given
+
+    Archived rows are always older than rows in the hot table, so the archive
+    is only read when the hot results do not already fill the limit.
+
+    Args:
+        logs (list): Rows read from the hot table (most recent first)
+        match (dict): Field values archived rows must equal
+        since (datetime): Optional start of the range
+        until (datetime): Optional end of the range (exclusive)
+        limit (int): Optional maximum number of rows to return
+
+    Returns:
+        list: Hot and archived rows ordered by timestamp (most recent first)
+    """
+    if request.args.get('include_archived', 'false').lower() != 'true':
+        return logs
+    if limit and len(logs) >= limit:
+        return logs
+
+    hot_ids = {log['id'] for log in logs}
+    archived = read_archive(match, since, until, limit=limit)
+    logs = logs + [row for row in archived if row['id'] not in hot_ids]
+
+    return logs[:limit] if limit else logs
+
 
 @activity_log_bp.route('', methods=['GET'])
 @require_admin
@@ -24,9 +113,15 @@ def get_activity_logs():
     - user_id: Filter by user ID
     - collection: Filter by collection (table name)
     - action: Filter by action type
+    - since: Only logs at or after this ISO 8601 timestamp
+    - until: Only logs before this ISO 8601 timestamp
     - limit: Limit number of results (default: 100)
     """
     try:
+        since, until, error_msg = parse_time_range()
+        if error_msg:
+            return bad_request_response(error_msg)
+
         supabase = get_supabase_client()
         query = supabase.table('activity_log').select('*')
 
@@ -45,6 +140,9 @@ def get_activity_logs():
         if action:
             query = query.eq('action', action)
 
+        # Filter by time range
+        query = apply_time_range(query, since, until)
+
         # Apply limit
         limit = request.args.get('limit', 100, type=int)
         if limit < 1 or limit > 1000:
@@ -61,6 +159,85 @@ def get_activity_logs():
         return server_error_response(f"Failed to fetch activity logs: {str(e)}")
 
 
+@activity_log_bp.route('/stats', methods=['GET'])
+@require_admin
+def get_activity_log_stats():
+    """
+    Get activity counts bucketed by time and grouped by user, collection or action
+    Aggregation runs in the database (activity_log_stats function) and results
+    are cached for ACTIVITY_STATS_CACHE_TTL seconds.
+    Authorization: Admin or Owner only
+    Optional query parameters:
+    - bucket: Time bucket size, 'hour' or 'day' (default: day)
+    - group_by: 'user', 'collection' or 'action' (default: collection)
+    - since: Start of the range, ISO 8601 (default: 7 days ago)
+    - until: End of the range (exclusive), ISO 8601 (default: now)
+    """
+    try:
+        bucket = request.args.get('bucket', 'day')
+        if bucket not in STATS_BUCKETS:
+            return bad_request_response(f"bucket must be one of: {', '.join(STATS_BUCKETS)}")
+
+        group_by = request.args.get('group_by', 'collection')
+        if group_by not in STATS_GROUPS:
+            return bad_request_response(f"group_by must be one of: {', '.join(STATS_GROUPS)}")
+
+        since, until, error_msg = parse_time_range()
+        if error_msg:
+            return bad_request_response(error_msg)
+
+        if not since:
+            # Truncate the default window to the bucket size so the cache key
+            # stays stable for the lifetime of the bucket
+            since = datetime.now(timezone.utc) - STATS_DEFAULT_WINDOW
+            since = since.replace(minute=0, second=0, microsecond=0)
+            if bucket == 'day':
+                since = since.replace(hour=0)
+
+        since_iso = since.isoformat()
+        until_iso = until.isoformat() if until else None
+
+        cache_key = (bucket, group_by, since_iso, until_iso)
+        stats = _stats_cache.get(cache_key)
+        if stats is not None:
+            return success_response(data=stats)
+
+        supabase = get_supabase_client()
+        response = supabase.rpc('activity_log_stats', {
+            'p_bucket': bucket,
+            'p_group_by': group_by,
+            'p_since': since_iso,
+            'p_until': until_iso
+        }).execute()
+
+        # Reshape flat (bucket, group_key, count) rows into per-bucket counts
+        buckets = {}
+        totals = {}
+        for row in response.data or []:
+            group_key = row['group_key']
+            count = row['count']
+            entry = buckets.setdefault(row['bucket'], {'bucket': row['bucket'], 'counts': {}, 'total': 0})
+            entry['counts'][group_key] = count
+            entry['total'] += count
+            totals[group_key] = totals.get(group_key, 0) + count
+
+        stats = {
+            'bucket': bucket,
+            'group_by': group_by,
+            'since': since_iso,
+            'until': until_iso,
+            'buckets': sorted(buckets.values(), key=lambda entry: entry['bucket']),
+            'totals': totals,
+            'total': sum(totals.values())
+        }
+        _stats_cache.set(cache_key, stats)
+
+        return success_response(data=stats)
+
+    except Exception as e:
+        return server_error_response(f"Failed to fetch activity log stats: {str(e)}")
+
+
 @activity_log_bp.route('/<log_id>', methods=['GET'])
 @require_admin
 def get_activity_log(log_id):
@@ -87,17 +264,27 @@ def get_user_activity_logs(user_id):
     """
     Get activity logs for a specific user
     Authorization: Admin or Owner only
-    Optional query parameter: limit (default: 50)
+    Optional query parameters:
+    - limit: Limit number of results (default: 50)
+    - since / until: ISO 8601 time range
+    - include_archived: Also read archived months (true/false, default: false)
     """
     try:
         limit = request.args.get('limit', 50, type=int)
         if limit < 1 or limit > 500:
             return bad_request_response("limit must be between 1 and 500")
 
+        since, until, error_msg = parse_time_range()
+        if error_msg:
+            return bad_request_response(error_msg)
+
         supabase = get_supabase_client()
-        response = supabase.table('activity_log').select('*').eq('user_id', user_id).order('timestamp', desc=True).limit(limit).execute()
+        query = apply_time_range(supabase.table('activity_log').select('*').eq('user_id', user_id), since, until)
+        response = query.order('timestamp', desc=True).limit(limit).execute()
 
-        return success_response(data=response.data)
+        logs = include_archived_logs(response.data, {'user_id': user_id}, since, until, limit)
+
+        return success_response(data=logs)
 
     except Exception as e:
         return server_error_response(f"Failed to fetch user activity logs: {str(e)}")
@@ -131,12 +318,23 @@ def get_document_activity_logs(collection_name, document_id):
     """
     Get activity logs for a specific document in a collection
     Authorization: Admin or Owner only
+    Optional query parameters:
+    - since / until: ISO 8601 time range
+    - include_archived: Also read archived months (true/false, default: false)
     """
     try:
+        since, until, error_msg = parse_time_range()
+        if error_msg:
+            return bad_request_response(error_msg)
+
         supabase = get_supabase_client()
-        response = supabase.table('activity_log').select('*').eq('collection', collection_name).eq('document_id', document_id).order('timestamp', desc=True).execute()
+        query = supabase.table('activity_log').select('*').eq('collection', collection_name).eq('document_id', document_id)
+        response = apply_time_range(query, since, until).order('timestamp', desc=True).execute()
 
-        return success_response(data=response.data)
+        match = {'collection': collection_name, 'document_id': document_id}
+        logs = include_archived_logs(response.data, match, since, until)
+
+        return success_response(data=logs)
 
     except Exception as e:
         return server_error_response(f"Failed to fetch document activity logs: {str(e)}")
@@ -156,11 +354,10 @@ def create_activity_log():
     try:
         data = request.get_json()
 
-        # Validate required fields
-        required_fields = ['action', 'collection', 'document_id']
-        is_valid, error_msg = validate_required_fields(data, required_fields)
-        if not is_valid:
-            return bad_request_response(error_msg)
+        # Validate against the activity log schema
+        errors = ACTIVITY_LOG_SCHEMA.validate_create(data)
+        if errors:
+            return bad_request_response('; '.join(errors))
 
         # Build log data
         log_data = {
@@ -178,6 +375,9 @@ def create_activity_log():
         if not response.data:
             return error_response("Failed to create activity log", status_code=500)
 
+        _stats_cache.clear()
+        publish_change('activity_log', response.data[0]['id'], 'created', response.data[0].get('timestamp'))
+
         return created_response(data=response.data[0], message="Activity log created successfully")
 
     except Exception as e:
@@ -211,6 +411,11 @@ def update_activity_log(log_id):
         if not update_data:
             return bad_request_response("No valid fields to update")
 
+        # Validate against the activity log schema
+        errors = ACTIVITY_LOG_SCHEMA.validate_update(update_data)
+        if errors:
+            return bad_request_response('; '.join(errors))
+
         supabase = get_supabase_client()
 
         # Check if log exists
@@ -224,6 +429,9 @@ def update_activity_log(log_id):
         if not response.data:
             return error_response("Failed to update activity log", status_code=500)
 
+        _stats_cache.clear()
+        publish_change('activity_log', log_id, 'updated')
+
         return success_response(data=response.data[0], message="Activity log updated successfully")
 
     except Exception as e:
@@ -249,6 +457,9 @@ def delete_activity_log(log_id):
         # Delete log
         response = supabase.table('activity_log').delete().eq('id', log_id).execute()
 
+        _stats_cache.clear()
+        publish_change('activity_log', log_id, 'deleted')
+
         return success_response(message="Activity log deleted successfully")
 
     except Exception as e:
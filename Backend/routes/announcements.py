@@ -5,11 +5,14 @@ Authorization: Public read, Admin/Owner write
 from flask import Blueprint, request, g
 from database import get_supabase_client
 from middleware.auth import require_admin
+from middleware.idempotency import idempotent
 from utils.responses import (
     success_response, error_response, created_response,
     not_found_response, bad_request_response, server_error_response
 )
-from utils.validators import validate_required_fields
+from utils.change_feed import publish_change
+from utils.delta_sync import parse_updated_since, delta_response, record_tombstone
+from utils.schemas import ANNOUNCEMENT_SCHEMA
 
 announcements_bp = Blueprint('announcements', __name__)
 
@@ -20,9 +23,20 @@ def get_announcements():
     Get all announcements
     Authorization: Public (no authentication required)
     Ordered by created_at (most recent first)
+    Optional query parameters:
+    - updated_since: Only return announcements changed since this ISO 8601
+      timestamp, plus IDs of deleted announcements (delta sync)
     """
     try:
+        updated_since, error_msg = parse_updated_since()
+        if error_msg:
+            return bad_request_response(error_msg)
+
         supabase = get_supabase_client()
+
+        if updated_since:
+            return delta_response('announcements', supabase.table('announcements').select('*'), updated_since)
+
         response = supabase.table('announcements').select('*').order('created_at', desc=True).execute()
 
         return success_response(data=response.data)
@@ -73,6 +87,7 @@ def get_recent_announcements():
 
 
 @announcements_bp.route('', methods=['POST'])
+@idempotent
 @require_admin
 def create_announcement():
     """
@@ -85,11 +100,10 @@ def create_announcement():
     try:
         data = request.get_json()
 
-        # Validate required fields
-        required_fields = ['id', 'date', 'title', 'description']
-        is_valid, error_msg = validate_required_fields(data, required_fields)
-        if not is_valid:
-            return bad_request_response(error_msg)
+        # Validate against the announcement schema
+        errors = ANNOUNCEMENT_SCHEMA.validate_create(data)
+        if errors:
+            return bad_request_response('; '.join(errors))
 
         # Build announcement data
         announcement_data = {
@@ -107,6 +121,8 @@ def create_announcement():
         if not response.data:
             return error_response("Failed to create announcement", status_code=500)
 
+        publish_change('announcements', response.data[0]['id'], 'created', response.data[0].get('updated_at'))
+
         return created_response(data=response.data[0], message="Announcement created successfully")
 
     except Exception as e:
@@ -139,6 +155,11 @@ def update_announcement(announcement_id):
         if not update_data:
             return bad_request_response("No valid fields to update")
 
+        # Validate against the announcement schema
+        errors = ANNOUNCEMENT_SCHEMA.validate_update(update_data)
+        if errors:
+            return bad_request_response('; '.join(errors))
+
         # Add updated_by
         update_data['updated_by'] = g.current_user['uid']
 
@@ -155,6 +176,8 @@ def update_announcement(announcement_id):
         if not response.data:
             return error_response("Failed to update announcement", status_code=500)
 
+        publish_change('announcements', announcement_id, 'updated', response.data[0].get('updated_at'))
+
         return success_response(data=response.data[0], message="Announcement updated successfully")
 
     except Exception as e:
@@ -179,6 +202,9 @@ def delete_announcement(announcement_id):
         # Delete announcement
         response = supabase.table('announcements').delete().eq('id', announcement_id).execute()
 
+        record_tombstone('announcements', announcement_id)
+        publish_change('announcements', announcement_id, 'deleted')
+
         return success_response(message="Announcement deleted successfully")
 
     except Exception as e:
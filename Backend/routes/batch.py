@@ -0,0 +1,146 @@
+"""
+Batch routes - run several GET requests in one HTTP call
+Authorization: Per sub-request (each sub-request keeps its route's own rules)
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, urlencode
+from flask import Blueprint, request, g, current_app
+from config import Config
+from middleware.auth import authenticate_request, get_auth_token
+from middleware.rate_limit import limit_batch
+from utils.responses import success_response, bad_request_response
+from utils.shutdown import register_shutdown_hook
+
+batch_bp = Blueprint('batch', __name__)
+
+# Paths that cannot be used as sub-requests (recursive or streaming endpoints)
+EXCLUDED_PREFIXES = ('/api/batch', '/api/changes')
+
+# Shared, bounded pool for sub-requests of all concurrent batches
+_executor = ThreadPoolExecutor(max_workers=Config.BATCH_MAX_WORKERS, thread_name_prefix='batch')
+
+
+def _stop_batch_pool(timeout):
+    _executor.shutdown(wait=True, cancel_futures=True)
+
+
+register_shutdown_hook(_stop_batch_pool)
+
+
+def parse_sub_request(spec):
+    """
+    Validate a sub-request specification
+
+    Args:
+        spec: Either a path string ('/api/events?type=social') or a dict
+              with 'path' and optional 'params'
+
+    Returns:
+        tuple: ((path, query_params), error_message)
+    """
+    if isinstance(spec, str):
+        spec = {'path': spec}
+    if not isinstance(spec, dict) or not isinstance(spec.get('path'), str):
+        return None, "each request must be a path or an object with a 'path'"
+
+    method = spec.get('method', 'GET')
+    if not isinstance(method, str) or method.upper() != 'GET':
+        return None, "only GET sub-requests are supported"
+
+    parts = urlsplit(spec['path'])
+    if not parts.path.startswith('/api/') or parts.path.startswith(EXCLUDED_PREFIXES):
+        return None, f"path not allowed in a batch: {parts.path}"
+
+    params = spec.get('params') or {}
+    if not isinstance(params, dict):
+        return None, "params must be an object"
+
+    query = parts.query
+    if params:
+        query = '&'.join(filter(None, [query, urlencode(params)]))
+
+    return (parts.path, query), None
+
+
+def run_sub_request(app, path, query, headers, auth_result):
+    """
+    Dispatch one GET sub-request to its view function
+
+    Args:
+        app: Flask application
+        path (str): Request path
+        query (str): Query string
+        headers (dict): Headers forwarded from the batch request
+        auth_result (tuple): Authentication result of the batch request, or None
+
+    Returns:
+        dict: Sub-response with path, status, body and duration_ms
+    """
+    started = time.perf_counter()
+
+    with app.test_request_context(path, method='GET', query_string=query, headers=headers):
+        # Rate limits (one token per sub-request) and load shedding already applied to the batch
+        g.internal_request = True
+        if auth_result is not None:
+            # Reuse the batch's authentication instead of verifying the token again
+            g.auth_result = auth_result
+
+        response = app.full_dispatch_request()
+
+        return {
+            'path': f'{path}?{query}' if query else path,
+            'status': response.status_code,
+            'body': response.get_json(silent=True),
+            'duration_ms': round((time.perf_counter() - started) * 1000, 2)
+        }
+
+
+@batch_bp.route('', methods=['POST'])
+def run_batch():
+    """
+    Run several GET sub-requests concurrently and return their results in order
+    Authorization: The token (if any) is verified once and reused by every
+    sub-request; each sub-request is still checked against its route's rules.
+
+    Request body:
+        {"requests": ["/api/events/upcoming", {"path": "/api/projects", "params": {"type": "current"}}]}
+
+    Response data:
+        {"responses": [{"path": ..., "status": 200, "body": {...}, "duration_ms": 12.3}, ...]}
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return bad_request_response("request body must be a JSON object with 'requests'")
+    specs = data.get('requests')
+
+    if not isinstance(specs, list) or len(specs) == 0:
+        return bad_request_response("requests must be a non-empty array")
+    if len(specs) > Config.BATCH_MAX_REQUESTS:
+        return bad_request_response(f"a batch can contain at most {Config.BATCH_MAX_REQUESTS} requests")
+
+    sub_requests = []
+    for spec in specs:
+        sub_request, error_msg = parse_sub_request(spec)
+        if error_msg:
+            return bad_request_response(error_msg)
+        sub_requests.append(sub_request)
+
+    # Authenticate once for the whole batch
+    auth_result = authenticate_request() if get_auth_token() else None
+
+    # Sub-requests skip rate limiting: the batch pays for all of them up front
+    user = auth_result[0] if auth_result else None
+    limit_batch(len(sub_requests), user['uid'] if user else None)
+
+    headers = {}
+    if request.headers.get('Authorization'):
+        headers['Authorization'] = request.headers['Authorization']
+
+    app = current_app._get_current_object()
+    futures = [
+        _executor.submit(run_sub_request, app, path, query, headers, auth_result)
+        for path, query in sub_requests
+    ]
+
+    return success_response(data={'responses': [future.result() for future in futures]})
@@ -0,0 +1,110 @@
+"""
+Change stream routes - Server-Sent Events feed of committed writes
+Authorization: Public for content tables, Admin/Owner also receive users and activity_log changes
+"""
+import json
+import time
+from flask import Blueprint, Response, request, g
+from werkzeug.exceptions import ServiceUnavailable
+from config import Config
+from middleware.auth import optional_auth
+from utils.change_feed import broker
+
+changes_bp = Blueprint('changes', __name__)
+
+# Collections whose change notices are only sent to admins and owners
+PRIVATE_COLLECTIONS = {'users', 'activity_log'}
+
+
+def format_sse(data, event=None, event_id=None):
+    """
+    Format a Server-Sent Events message
+
+    Args:
+        data (dict): JSON payload
+        event (str): Optional event type
+        event_id (str): Optional event ID (sent back by the client as Last-Event-ID)
+
+    Returns:
+        str: Encoded SSE message
+    """
+    message = ''
+    if event_id:
+        message += f'id: {event_id}\n'
+    if event:
+        message += f'event: {event}\n'
+    return message + f'data: {json.dumps(data, separators=(",", ":"))}\n\n'
+
+
+@changes_bp.route('/stream', methods=['GET'])
+@optional_auth
+def stream_changes():
+    """
+    Stream change notices as Server-Sent Events
+    Authorization: Public (admins and owners also receive private collections)
+
+    Each 'change' event carries: collection, document_id, action, updated_at.
+    A 'reset' event means missed changes could not be replayed and the client
+    should reload its data. The stream closes after CHANGE_STREAM_MAX_DURATION
+    seconds, or when the client falls too far behind; EventSource reconnects
+    automatically and resumes from Last-Event-ID. A stream holds a worker
+    thread, so beyond CHANGE_STREAM_MAX_PER_WORKER open streams the answer
+    is 503 with Retry-After.
+
+    Optional query parameters:
+    - collections: Comma-separated list of collections to receive
+    - last_event_id: Resume point for clients that cannot send the Last-Event-ID header
+    """
+    user = g.get('current_user') or {}
+    is_admin = bool(user.get('is_admin') or user.get('is_owner'))
+
+    collections = request.args.get('collections')
+    wanted = set(collections.split(',')) if collections else None
+
+    def is_visible(event):
+        if event['collection'] in PRIVATE_COLLECTIONS and not is_admin:
+            return False
+        return wanted is None or event['collection'] in wanted
+
+    def to_message(event):
+        payload = {key: event[key] for key in ('collection', 'document_id', 'action', 'updated_at')}
+        return format_sse(payload, event='change', event_id=event['id'])
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    subscription = broker.subscribe(last_event_id)
+    if subscription is None:
+        raise ServiceUnavailable("Too many open change streams, please retry shortly",
+                                 retry_after=Config.CHANGE_STREAM_HEARTBEAT)
+
+    def generate():
+        deadline = time.monotonic() + Config.CHANGE_STREAM_MAX_DURATION
+        try:
+            yield f'retry: {Config.CHANGE_STREAM_HEARTBEAT * 1000}\n\n'
+
+            if subscription.reset:
+                yield format_sse({'reason': 'missed changes are no longer available'}, event='reset')
+
+            for event in subscription.replay:
+                if is_visible(event):
+                    yield to_message(event)
+
+            while time.monotonic() < deadline:
+                event = subscription.get(timeout=Config.CHANGE_STREAM_HEARTBEAT)
+
+                if subscription.dropped:
+                    # Client fell behind; it reconnects and resumes from Last-Event-ID
+                    break
+                if event is None:
+                    yield ': heartbeat\n\n'
+                elif is_visible(event):
+                    yield to_message(event)
+        finally:
+            broker.unsubscribe(subscription)
+
+    response = Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # Disable proxy buffering (nginx)
+    })
+    # Also frees the slot when the client leaves before the stream has started
+    response.call_on_close(lambda: broker.unsubscribe(subscription))
+    return response
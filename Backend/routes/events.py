@@ -5,11 +5,14 @@ Authorization: Public read, Admin/Owner write
 from flask import Blueprint, request, g
 from database import get_supabase_client
 from middleware.auth import require_admin
+from middleware.idempotency import idempotent
 from utils.responses import (
     success_response, error_response, created_response,
     not_found_response, bad_request_response, server_error_response
 )
-from utils.validators import validate_required_fields, validate_date_format, validate_url
+from utils.change_feed import publish_change
+from utils.delta_sync import parse_updated_since, delta_response, record_tombstone
+from utils.schemas import EVENT_SCHEMA
 
 events_bp = Blueprint('events', __name__)
 
@@ -22,11 +25,20 @@ def get_events():
     Optional query parameters:
     - is_past: Filter by is_past (true/false)
     - type: Filter by event type
+    - updated_since: Only return events changed since this ISO 8601 timestamp,
+      plus IDs of deleted events (delta sync)
     """
     try:
+        updated_since, error_msg = parse_updated_since(filter_params=('is_past', 'type'))
+        if error_msg:
+            return bad_request_response(error_msg)
+
         supabase = get_supabase_client()
         query = supabase.table('events').select('*')
 
+        if updated_since:
+            return delta_response('events', query, updated_since)
+
         # Filter by is_past if provided
         is_past = request.args.get('is_past')
         if is_past is not None:
@@ -101,6 +113,7 @@ def get_past_events():
 
 
 @events_bp.route('', methods=['POST'])
+@idempotent
 @require_admin
 def create_event():
     """
@@ -113,27 +126,10 @@ def create_event():
     try:
         data = request.get_json()
 
-        # Validate required fields
-        required_fields = ['id', 'title', 'date', 'description']
-        is_valid, error_msg = validate_required_fields(data, required_fields)
-        if not is_valid:
-            return bad_request_response(error_msg)
-
-        # Validate date format (YYYY-MM-DD)
-        if not validate_date_format(data['date']):
-            return bad_request_response("date must be in YYYY-MM-DD format")
-
-        # Validate type if provided
-        valid_types = ['workshop', 'hackathon', 'networking', 'social', 'competition']
-        if 'type' in data and data['type'] and data['type'] not in valid_types:
-            return bad_request_response(f"type must be one of: {', '.join(valid_types)}")
-
-        # Validate URLs if provided
-        if 'registration_url' in data and data['registration_url'] and not validate_url(data['registration_url']):
-            return bad_request_response("registration_url must be a valid URL")
-
-        if 'recap_url' in data and data['recap_url'] and not validate_url(data['recap_url']):
-            return bad_request_response("recap_url must be a valid URL")
+        # Validate against the event schema
+        errors = EVENT_SCHEMA.validate_create(data)
+        if errors:
+            return bad_request_response('; '.join(errors))
 
         # Build event data
         event_data = {
@@ -158,6 +154,8 @@ def create_event():
         if not response.data:
             return error_response("Failed to create event", status_code=500)
 
+        publish_change('events', response.data[0]['id'], 'created', response.data[0].get('updated_at'))
+
         return created_response(data=response.data[0], message="Event created successfully")
 
     except Exception as e:
@@ -192,21 +190,10 @@ def update_event(event_id):
         if not update_data:
             return bad_request_response("No valid fields to update")
 
-        # Validate date if provided
-        if 'date' in update_data and not validate_date_format(update_data['date']):
-            return bad_request_response("date must be in YYYY-MM-DD format")
-
-        # Validate type if provided
-        valid_types = ['workshop', 'hackathon', 'networking', 'social', 'competition']
-        if 'type' in update_data and update_data['type'] and update_data['type'] not in valid_types:
-            return bad_request_response(f"type must be one of: {', '.join(valid_types)}")
-
-        # Validate URLs if provided
-        if 'registration_url' in update_data and update_data['registration_url'] and not validate_url(update_data['registration_url']):
-            return bad_request_response("registration_url must be a valid URL")
-
-        if 'recap_url' in update_data and update_data['recap_url'] and not validate_url(update_data['recap_url']):
-            return bad_request_response("recap_url must be a valid URL")
+        # Validate against the event schema
+        errors = EVENT_SCHEMA.validate_update(update_data)
+        if errors:
+            return bad_request_response('; '.join(errors))
 
         # Add updated_by
         update_data['updated_by'] = g.current_user['uid']
@@ -224,6 +211,8 @@ def update_event(event_id):
         if not response.data:
             return error_response("Failed to update event", status_code=500)
 
+        publish_change('events', event_id, 'updated', response.data[0].get('updated_at'))
+
         return success_response(data=response.data[0], message="Event updated successfully")
 
     except Exception as e:
@@ -248,6 +237,9 @@ def delete_event(event_id):
         # Delete event
         response = supabase.table('events').delete().eq('id', event_id).execute()
 
+        record_tombstone('events', event_id)
+        publish_change('events', event_id, 'deleted')
+
         return success_response(message="Event deleted successfully")
 
     except Exception as e:
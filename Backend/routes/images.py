@@ -0,0 +1,100 @@
+"""
+Images routes - resized variants of team, event, project and announcement images
+Authorization: Public (no authentication required)
+"""
+from flask import Blueprint, current_app, redirect, request, send_file
+from werkzeug.http import HTTP_STATUS_CODES
+from utils.images import AVAILABLE_FORMATS, FORMATS, ImageSourceError, image_variants
+from utils.metrics import record_image_request
+from utils.responses import bad_request_response, error_response
+
+images_bp = Blueprint('images', __name__)
+
+# Variant URLs name their content (source, width and format), so they never change
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+
+def _width_bucket(value):
+    """Round a requested width up to the nearest of IMAGE_WIDTHS (None if invalid)"""
+    try:
+        width = int(value)
+    except (TypeError, ValueError):
+        return None
+    if width < 1:
+        return None
+    widths = sorted(int(w) for w in current_app.config['IMAGE_WIDTHS'].split(','))
+    return next((w for w in widths if w >= width), widths[-1])
+
+
+def _negotiate_format():
+    """Best output format the client accepts (JPEG works everywhere)"""
+    accept = request.headers.get('Accept', '')
+    for fmt in ('avif', 'webp'):
+        if fmt in AVAILABLE_FORMATS and f'image/{fmt}' in accept:
+            return fmt
+    return 'jpeg'
+
+
+def _original(source):
+    """The original image, for clients asking before its variant is ready"""
+    if source.path is not None:
+        response = send_file(source.path, max_age=0)
+    else:
+        response = redirect(source.src, code=307)
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
+@images_bp.route('', methods=['GET'])
+def get_image():
+    """
+    Get a resized copy of an image
+    Authorization: Public (no authentication required)
+
+    Query parameters:
+    - src: Image URL on an IMAGE_ALLOWED_HOSTS host, or /path under IMAGE_SOURCE_DIR
+    - w: Width in pixels, rounded up to the nearest of IMAGE_WIDTHS (never upscaled)
+    - format: avif, webp, jpeg or png (default: the best one the Accept header allows)
+
+    Variants are rendered in the background. Until one is ready (or for up to
+    IMAGE_RENDER_WAIT seconds), the client is sent to the original instead.
+    """
+    try:
+        source = image_variants.resolve(request.args.get('src'))
+    except ImageSourceError as e:
+        return error_response(e.message, error=HTTP_STATUS_CODES[e.status_code], status_code=e.status_code)
+
+    width = _width_bucket(request.args.get('w'))
+    if width is None:
+        return bad_request_response("w must be a positive integer")
+
+    fmt = request.args.get('format')
+    negotiated = fmt is None
+    if negotiated:
+        fmt = _negotiate_format()
+    elif fmt not in AVAILABLE_FORMATS:
+        return bad_request_response(f"format must be one of: {', '.join(AVAILABLE_FORMATS)}")
+
+    variant = image_variants.lookup(source, width, fmt)
+    result = 'hit'
+    if variant is None:
+        # A recent failure (e.g. not an image) is not retried until it expires
+        future = None if image_variants.failure(source) else image_variants.render(source, width, fmt)
+        wait = current_app.config['IMAGE_RENDER_WAIT']
+        if future is not None and wait > 0:
+            try:
+                variant = future.result(timeout=wait)
+                result = 'rendered'
+            except Exception:
+                pass  # still rendering, or failed (logged by the render job)
+        if variant is None:
+            record_image_request('fallback')
+            return _original(source)
+
+    record_image_request(result)
+    path, etag = variant
+    response = send_file(path, mimetype=FORMATS[fmt][1], etag=etag, conditional=True, max_age=31536000)
+    response.headers['Cache-Control'] = IMMUTABLE
+    if negotiated:
+        response.vary.add('Accept')
+    return response
@@ -0,0 +1,63 @@
+"""
+Profiles routes - list and download request profiles captured with X-Profile
+Authorization: Owner access only
+"""
+from flask import Blueprint, Response, request
+from middleware.auth import require_owner
+from middleware.profiling import get_profile_store, pstats_to_text
+from utils.responses import success_response, not_found_response, bad_request_response
+
+profiles_bp = Blueprint('profiles', __name__)
+
+# Download formats available for each stored profile format
+DOWNLOAD_FORMATS = {
+    'pstats': {'pstats', 'text'},
+    'speedscope.json': {'speedscope'},
+}
+
+
+@profiles_bp.route('', methods=['GET'])
+@require_owner
+def get_profiles():
+    """
+    List recent profiles, newest first
+    Authorization: Owner only
+    """
+    return success_response(data=get_profile_store().list())
+
+
+@profiles_bp.route('/<profile_id>', methods=['GET'])
+@require_owner
+def download_profile(profile_id):
+    """
+    Download a profile
+    Authorization: Owner only
+
+    Optional query parameters:
+    - format: 'pstats' (cProfile profiles, load with pstats.Stats or snakeviz),
+              'text' (cProfile profiles, top functions by cumulative time) or
+              'speedscope' (sampled profiles, open at https://www.speedscope.app).
+              Defaults to the format the profile was captured in.
+    """
+    meta, data = get_profile_store().get(profile_id)
+    if meta is None:
+        return not_found_response('Profile not found')
+
+    available = DOWNLOAD_FORMATS[meta['format']]
+    download_format = request.args.get('format') or next(iter(sorted(available)))
+    if download_format not in available:
+        return bad_request_response(
+            f"Format must be one of: {', '.join(sorted(available))} for this profile"
+        )
+
+    if download_format == 'text':
+        return Response(pstats_to_text(data), mimetype='text/plain')
+
+    if download_format == 'pstats':
+        mimetype, filename = 'application/octet-stream', f'{profile_id}.pstats'
+    else:
+        mimetype, filename = 'application/json', f'{profile_id}.speedscope.json'
+
+    return Response(data, mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename="{filename}"'
+    })
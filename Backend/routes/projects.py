@@ -5,11 +5,14 @@ Authorization: Public read, Admin/Owner write
 from flask import Blueprint, request, g
 from database import get_supabase_client
 from middleware.auth import require_admin
+from middleware.idempotency import idempotent
 from utils.responses import (
     success_response, error_response, created_response,
     not_found_response, bad_request_response, server_error_response
 )
-from utils.validators import validate_required_fields, validate_status, validate_url
+from utils.change_feed import publish_change
+from utils.delta_sync import parse_updated_since, delta_response, record_tombstone
+from utils.schemas import PROJECT_SCHEMA
 
 projects_bp = Blueprint('projects', __name__)
 
@@ -22,11 +25,20 @@ def get_projects():
     Optional query parameters:
     - type: Filter by type (current/past)
     - status: Filter by status (On-going/Completed)
+    - updated_since: Only return projects changed since this ISO 8601 timestamp,
+      plus IDs of deleted projects (delta sync)
     """
     try:
+        updated_since, error_msg = parse_updated_since(filter_params=('type', 'status'))
+        if error_msg:
+            return bad_request_response(error_msg)
+
         supabase = get_supabase_client()
         query = supabase.table('projects').select('*')
 
+        if updated_since:
+            return delta_response('projects', query, updated_since)
+
         # Filter by type if provided
         project_type = request.args.get('type')
         if project_type:
@@ -87,6 +99,7 @@ def get_projects_by_type(project_type):
 
 
 @projects_bp.route('', methods=['POST'])
+@idempotent
 @require_admin
 def create_project():
     """
@@ -99,27 +112,10 @@ def create_project():
     try:
         data = request.get_json()
 
-        # Validate required fields
-        required_fields = ['id', 'title', 'status', 'description', 'technologies', 'github_url', 'type']
-        is_valid, error_msg = validate_required_fields(data, required_fields)
-        if not is_valid:
-            return bad_request_response(error_msg)
-
-        # Validate status
-        if not validate_status(data['status'], ['On-going', 'Completed']):
-            return bad_request_response("status must be 'On-going' or 'Completed'")
-
-        # Validate type
-        if not validate_status(data['type'], ['current', 'past']):
-            return bad_request_response("type must be 'current' or 'past'")
-
-        # Validate technologies is a list
-        if not isinstance(data['technologies'], list):
-            return bad_request_response("technologies must be an array")
-
-        # Validate github_url
-        if not validate_url(data['github_url']):
-            return bad_request_response("github_url must be a valid URL")
+        # Validate against the project schema
+        errors = PROJECT_SCHEMA.validate_create(data)
+        if errors:
+            return bad_request_response('; '.join(errors))
 
         # Build project data
         project_data = {
@@ -140,6 +136,8 @@ def create_project():
         if not response.data:
             return error_response("Failed to create project", status_code=500)
 
+        publish_change('projects', response.data[0]['id'], 'created', response.data[0].get('updated_at'))
+
         return created_response(data=response.data[0], message="Project created successfully")
 
     except Exception as e:
@@ -172,21 +170,10 @@ def update_project(project_id):
         if not update_data:
             return bad_request_response("No valid fields to update")
 
-        # Validate status if provided
-        if 'status' in update_data and not validate_status(update_data['status'], ['On-going', 'Completed']):
-            return bad_request_response("status must be 'On-going' or 'Completed'")
-
-        # Validate type if provided
-        if 'type' in update_data and not validate_status(update_data['type'], ['current', 'past']):
-            return bad_request_response("type must be 'current' or 'past'")
-
-        # Validate technologies if provided
-        if 'technologies' in update_data and not isinstance(update_data['technologies'], list):
-            return bad_request_response("technologies must be an array")
-
-        # Validate github_url if provided
-        if 'github_url' in update_data and not validate_url(update_data['github_url']):
-            return bad_request_response("github_url must be a valid URL")
+        # Validate against the project schema
+        errors = PROJECT_SCHEMA.validate_update(update_data)
+        if errors:
+            return bad_request_response('; '.join(errors))
 
         supabase = get_supabase_client()
 
@@ -201,6 +188,8 @@ def update_project(project_id):
         if not response.data:
             return error_response("Failed to update project", status_code=500)
 
+        publish_change('projects', project_id, 'updated', response.data[0].get('updated_at'))
+
         return success_response(data=response.data[0], message="Project updated successfully")
 
     except Exception as e:
@@ -225,6 +214,9 @@ def delete_project(project_id):
         # Delete project
         response = supabase.table('projects').delete().eq('id', project_id).execute()
 
+        record_tombstone('projects', project_id)
+        publish_change('projects', project_id, 'deleted')
+
         return success_response(message="Project deleted successfully")
 
     except Exception as e:
@@ -5,11 +5,14 @@ Authorization: Public read, Admin/Owner write
 from flask import Blueprint, request, g
 from database import get_supabase_client
 from middleware.auth import require_admin, optional_auth
+from middleware.idempotency import idempotent
 from utils.responses import (
     success_response, error_response, created_response,
     not_found_response, bad_request_response, server_error_response
 )
-from utils.validators import validate_required_fields
+from utils.change_feed import publish_change
+from utils.delta_sync import parse_updated_since, delta_response, record_tombstone
+from utils.schemas import TEAM_MEMBER_SCHEMA
 
 team_members_bp = Blueprint('team_members', __name__)
 
@@ -22,11 +25,20 @@ def get_team_members():
     Optional query parameters:
     - category: Filter by category
     - rank: Order by rank
+    - updated_since: Only return members changed since this ISO 8601 timestamp,
+      plus IDs of deleted members (delta sync)
     """
     try:
+        updated_since, error_msg = parse_updated_since(filter_params=('category',))
+        if error_msg:
+            return bad_request_response(error_msg)
+
         supabase = get_supabase_client()
         query = supabase.table('team_members').select('*')
 
+        if updated_since:
+            return delta_response('team_members', query, updated_since)
+
         # Filter by category if provided
         category = request.args.get('category')
         if category:
@@ -80,6 +92,7 @@ def get_team_members_by_category(category_name):
 
 
 @team_members_bp.route('', methods=['POST'])
+@idempotent
 @require_admin
 def create_team_member():
     """
@@ -92,15 +105,10 @@ def create_team_member():
     try:
         data = request.get_json()
 
-        # Validate required fields
-        required_fields = ['id', 'name', 'position', 'profile_pic_url', 'rank', 'categories']
-        is_valid, error_msg = validate_required_fields(data, required_fields)
-        if not is_valid:
-            return bad_request_response(error_msg)
-
-        # Validate categories is a list
-        if not isinstance(data['categories'], list) or len(data['categories']) == 0:
-            return bad_request_response("categories must be a non-empty array")
+        # Validate against the team member schema
+        errors = TEAM_MEMBER_SCHEMA.validate_create(data)
+        if errors:
+            return bad_request_response('; '.join(errors))
 
         # Build member data
         member_data = {
@@ -120,6 +128,8 @@ def create_team_member():
         if not response.data:
             return error_response("Failed to create team member", status_code=500)
 
+        publish_change('team_members', response.data[0]['id'], 'created', response.data[0].get('updated_at'))
+
         return created_response(data=response.data[0], message="Team member created successfully")
 
     except Exception as e:
@@ -152,10 +162,10 @@ def update_team_member(member_id):
         if not update_data:
             return bad_request_response("No valid fields to update")
 
-        # Validate categories if provided
-        if 'categories' in update_data:
-            if not isinstance(update_data['categories'], list) or len(update_data['categories']) == 0:
-                return bad_request_response("categories must be a non-empty array")
+        # Validate against the team member schema
+        errors = TEAM_MEMBER_SCHEMA.validate_update(update_data)
+        if errors:
+            return bad_request_response('; '.join(errors))
 
         # Add updated_by
         update_data['updated_by'] = g.current_user['uid']
@@ -173,6 +183,8 @@ def update_team_member(member_id):
         if not response.data:
             return error_response("Failed to update team member", status_code=500)
 
+        publish_change('team_members', member_id, 'updated', response.data[0].get('updated_at'))
+
         return success_response(data=response.data[0], message="Team member updated successfully")
 
     except Exception as e:
@@ -197,6 +209,9 @@ def delete_team_member(member_id):
         # Delete member
         response = supabase.table('team_members').delete().eq('id', member_id).execute()
 
+        record_tombstone('team_members', member_id)
+        publish_change('team_members', member_id, 'deleted')
+
         return success_response(message="Team member deleted successfully")
 
     except Exception as e:
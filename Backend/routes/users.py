@@ -9,7 +9,9 @@ from utils.responses import (
     success_response, error_response, created_response,
     not_found_response, bad_request_response, server_error_response
 )
-from utils.validators import validate_required_fields, validate_email
+from utils.change_feed import publish_change
+from utils.delta_sync import parse_updated_since, delta_response, record_tombstone
+from utils.schemas import USER_SCHEMA
 
 users_bp = Blueprint('users', __name__)
 
@@ -20,9 +22,20 @@ def get_users():
     """
     Get all users
     Authorization: Admin or Owner only
+    Optional query parameters:
+    - updated_since: Only return users changed since this ISO 8601 timestamp,
+      plus UIDs of deleted users (delta sync)
     """
     try:
+        updated_since, error_msg = parse_updated_since()
+        if error_msg:
+            return bad_request_response(error_msg)
+
         supabase = get_supabase_client()
+
+        if updated_since:
+            return delta_response('users', supabase.table('users').select('*'), updated_since, key='uid')
+
         response = supabase.table('users').select('*').execute()
 
         return success_response(data=response.data)
@@ -64,14 +77,10 @@ def create_user():
     try:
         data = request.get_json()
 
-        # Validate required fields
-        is_valid, error_msg = validate_required_fields(data, ['username', 'email'])
-        if not is_valid:
-            return bad_request_response(error_msg)
-
-        # Validate email format
-        if not validate_email(data['email']):
-            return bad_request_response("Invalid email format")
+        # Validate against the user schema
+        errors = USER_SCHEMA.validate_create(data)
+        if errors:
+            return bad_request_response('; '.join(errors))
 
         # Set defaults
         user_data = {
@@ -95,6 +104,8 @@ def create_user():
         if not response.data:
             return error_response("Failed to create user", status_code=500)
 
+        publish_change('users', response.data[0]['uid'], 'created', response.data[0].get('updated_at'))
+
         return created_response(data=response.data[0], message="User created successfully")
 
     except Exception as e:
@@ -128,9 +139,10 @@ def update_user(uid):
         if not update_data:
             return bad_request_response("No valid fields to update")
 
-        # Validate email if provided
-        if 'email' in update_data and not validate_email(update_data['email']):
-            return bad_request_response("Invalid email format")
+        # Validate against the user schema
+        errors = USER_SCHEMA.validate_update(update_data)
+        if errors:
+            return bad_request_response('; '.join(errors))
 
         supabase = get_supabase_client()
 
@@ -145,6 +157,8 @@ def update_user(uid):
         if not response.data:
             return error_response("Failed to update user", status_code=500)
 
+        publish_change('users', uid, 'updated', response.data[0].get('updated_at'))
+
         return success_response(data=response.data[0], message="User updated successfully")
 
     except Exception as e:
@@ -169,6 +183,9 @@ def delete_user(uid):
         # Delete user
         response = supabase.table('users').delete().eq('uid', uid).execute()
 
+        record_tombstone('users', uid)
+        publish_change('users', uid, 'deleted')
+
         return success_response(message="User deleted successfully")
 
     except Exception as e:
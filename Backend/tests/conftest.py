@@ -0,0 +1,45 @@
+"""
+Test setup: the app runs on the in-memory fake Supabase backend
+
+Config reads the environment at import time, so it is set here before any
+application module is imported.
+"""
+import os
+import sys
+import pytest
+
+os.environ['SUPABASE_BACKEND'] = 'fake'
+# Caches off, so each request makes every database call it needs
+os.environ['RESPONSE_CACHE_TTL'] = '0'
+os.environ['USER_CACHE_TTL'] = '0'
+# No background work writing to the database after a request has returned
+os.environ['IMAGE_PLACEHOLDERS_ENABLED'] = 'False'
+# All test requests come from one address, and timings are meaningless here
+os.environ['RATE_LIMIT_ENABLED'] = 'False'
+os.environ['LOAD_SHED_ENABLED'] = 'False'
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import create_app  # noqa: E402
+from utils.token_bucket import LocalTokenBuckets  # noqa: E402
+
+ADMIN_HEADERS = {'Authorization': 'Bearer fake-admin-token'}
+OWNER_HEADERS = {'Authorization': 'Bearer fake-owner-token'}
+
+
+@pytest.fixture(scope='session')
+def app():
+    return create_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture(autouse=True)
+def token_buckets(monkeypatch):
+    """Every test starts with full rate limit buckets"""
+    buckets = LocalTokenBuckets()
+    monkeypatch.setattr('middleware.rate_limit.token_buckets', buckets)
+    return buckets
@@ -0,0 +1,39 @@
+"""
+Activity log retention job
+"""
+import pytest
+from config import Config
+from database import get_admin_client
+from fake_supabase import functions
+from utils.activity_archive import RetentionError, run_retention
+
+OLD_ROWS = [
+    {'id': f'00000000-0000-4000-8000-00000000000{i}', 'user_id': None, 'action': 'created_event',
+     'collection': 'events', 'document_id': f'retention-{i}', 'timestamp': f'2000-01-0{i}T12:00:00+00:00'}
+    for i in range(1, 4)
+]
+
+
+@pytest.fixture
+def old_rows(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, 'ACTIVITY_ARCHIVE_DIR', str(tmp_path))
+    supabase = get_admin_client()
+    user_id = supabase.table('users').select('uid').limit(1).execute().data[0]['uid']
+    rows = [dict(row, user_id=user_id) for row in OLD_ROWS]
+    supabase.table('activity_log').insert(rows).execute()
+    yield rows
+    supabase.table('activity_log').delete().in_('id', [row['id'] for row in rows]).execute()
+
+
+def test_stops_when_rows_are_not_deleted(old_rows, monkeypatch):
+    # As when the job runs without the service role key: RLS lets nothing be deleted
+    monkeypatch.setitem(functions.RPC_FUNCTIONS, 'archive_activity_log_batch', lambda db, p_ids: 0)
+
+    with pytest.raises(RetentionError, match='deleted 0 of 2 rows'):
+        run_retention(days=1, batch_size=2, log=lambda line: None)
+
+
+def test_archives_and_deletes(old_rows):
+    assert run_retention(days=1, batch_size=2, log=lambda line: None) >= len(old_rows)
+    ids = [row['id'] for row in old_rows]
+    assert get_admin_client().table('activity_log').select('id').in_('id', ids).execute().data == []
@@ -0,0 +1,136 @@
+"""
+Async (ASGI) routes: rate limiting, load shedding, response cache and
+serve-stale, compared with the WSGI app
+"""
+import asyncio
+import time
+import pytest
+from conftest import ADMIN_HEADERS
+from config import Config
+from database import circuit_breakers
+
+pytest.importorskip('quart')
+
+from async_api import create_async_app  # noqa: E402
+from async_api.database import init_async_client  # noqa: E402
+
+
+class ProtectedConfig(Config):
+    RATE_LIMIT_ENABLED = True
+    RATE_LIMIT_IP_RATE = 0.001
+    RATE_LIMIT_IP_BURST = 2
+    RATE_LIMIT_USER_RATE = 0.001
+    RATE_LIMIT_USER_BURST = 1
+    LOAD_SHED_ENABLED = True
+    TRUSTED_PROXY_COUNT = 1
+
+
+def _statuses(requests, config_class=ProtectedConfig):
+    """Send (path, headers) requests in order to a new async app and return their responses"""
+    async def send():
+        app = create_async_app(config_class)
+        responses = []
+        # Not app.test_app(): its shutdown would stop the thread pools of the WSGI app
+        await init_async_client()
+        client = app.test_client()
+        for path, headers in requests:
+            responses.append(await client.get(path, headers=headers))
+        return responses
+    return asyncio.run(send())
+
+
+def test_client_ip_is_rate_limited():
+    client = {'X-Forwarded-For': '203.0.113.7'}
+    responses = _statuses([('/api/events', client)] * 3 + [('/api/events', {'X-Forwarded-For': '203.0.113.8'})])
+
+    assert [response.status_code for response in responses] == [200, 200, 429, 200]
+    assert int(responses[2].headers['Retry-After']) >= 1
+
+
+def test_signed_in_user_is_rate_limited():
+    # Different addresses, same user
+    responses = _statuses([
+        ('/api/users', dict(ADMIN_HEADERS, **{'X-Forwarded-For': '203.0.113.20'})),
+        ('/api/users', dict(ADMIN_HEADERS, **{'X-Forwarded-For': '203.0.113.21'})),
+    ])
+    assert [response.status_code for response in responses] == [200, 429]
+
+
+def test_standing_queue_is_shed(monkeypatch):
+    monkeypatch.setattr(ProtectedConfig, 'RATE_LIMIT_ENABLED', False)
+    monkeypatch.setattr(ProtectedConfig, 'LOAD_SHED_INTERVAL_MS', 50)
+
+    def queued(seconds):
+        return {'X-Request-Start': f't={time.time() - seconds:.3f}'}
+
+    async def send():
+        app = create_async_app(ProtectedConfig)
+        await init_async_client()
+        client = app.test_client()
+        # Every request of a window waited 5 s: the next window sheds
+        await client.get('/api/events', headers=queued(5))
+        await asyncio.sleep(0.06)
+        # Another URL: a shed public read with a last good copy is answered with it
+        return (await client.get('/api/events?type=workshop', headers=queued(5))).status_code
+
+    assert asyncio.run(send()) == 503
+
+
+@pytest.fixture
+def open_circuit():
+    """Opens a table's circuit until the end of the test"""
+    opened = []
+
+    def open_table(table):
+        breaker = circuit_breakers.get(table)
+        breaker.state, breaker.opened_at = 'open', time.monotonic()
+        opened.append(breaker)
+
+    yield open_table
+    for breaker in opened:
+        breaker.record_success()
+
+
+def _compare_with_wsgi(client, path):
+    """The WSGI and async responses for the same request"""
+    wsgi = client.get(path)
+    asgi = _statuses([(path, None)], Config)[0]
+    return wsgi, asgi, asyncio.run(asgi.get_json())
+
+
+def test_open_circuit_without_stale_copy_is_a_503(client, open_circuit):
+    open_circuit('events')
+    wsgi, asgi, asgi_body = _compare_with_wsgi(client, '/api/events?type=never-fetched')
+
+    assert wsgi.status_code == asgi.status_code == 503
+    assert asgi_body == wsgi.get_json()
+    assert asgi.headers['Retry-After'] == wsgi.headers['Retry-After']
+
+
+def test_open_circuit_serves_the_stale_copy(client, open_circuit):
+    path = '/api/projects?status=current'
+    fresh = client.get(path).get_json()
+
+    async def fetch_before_and_during_outage():
+        app = create_async_app()
+        await init_async_client()
+        async_client = app.test_client()
+        assert (await async_client.get(path)).status_code == 200
+        open_circuit('projects')
+        return await async_client.get(path)
+
+    asgi = asyncio.run(fetch_before_and_during_outage())
+    wsgi = client.get(path)
+
+    assert wsgi.status_code == asgi.status_code == 200
+    assert asyncio.run(asgi.get_json()) == wsgi.get_json() == fresh
+    assert asgi.headers['Warning'] == wsgi.headers['Warning']
+
+
+def test_public_reads_use_the_response_cache():
+    class CachedConfig(Config):
+        RESPONSE_CACHE_TTL = 30
+
+    first, second = _statuses([('/api/announcements/recent', None)] * 2, CachedConfig)
+    assert (first.headers['X-Cache'], second.headers['X-Cache']) == ('MISS', 'HIT')
+    assert asyncio.run(second.get_data()) == asyncio.run(first.get_data())
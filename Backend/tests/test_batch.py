@@ -0,0 +1,30 @@
+"""
+Batch request validation and rate limiting
+"""
+from conftest import ADMIN_HEADERS
+
+
+def test_method_must_be_a_string(client):
+    response = client.post('/api/batch', json={'requests': [{'path': '/api/events', 'method': 1}]})
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'only GET sub-requests are supported'
+
+
+def test_batch_takes_a_token_per_sub_request(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, 'RATE_LIMIT_ENABLED', True)
+    monkeypatch.setitem(app.config, 'RATE_LIMIT_USER_RATE', 0.001)
+    monkeypatch.setitem(app.config, 'RATE_LIMIT_USER_BURST', 5)
+    batch = {'requests': ['/api/events', '/api/projects', '/api/team-members']}
+
+    # 1 token for the batch, 2 more for its other sub-requests; the second batch finds 2 left
+    assert client.post('/api/batch', headers=ADMIN_HEADERS, json=batch).status_code == 200
+    response = client.post('/api/batch', headers=ADMIN_HEADERS, json=batch)
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+
+
+def test_body_must_be_an_object(client):
+    for body in ([], ['/api/events'], 'text', 1, None):
+        response = client.post('/api/batch', json=body)
+        assert response.status_code == 400
+        assert response.get_json()['message'] == "request body must be a JSON object with 'requests'"
@@ -0,0 +1,22 @@
+"""
+flask data import: checkpoint handling
+"""
+import json
+import os
+
+EVENTS = [
+    {'id': 'import-event-1', 'title': 'Imported', 'date': '2030-02-01', 'description': 'First imported event'},
+    {'id': 'import-event-2', 'title': 'Imported', 'date': 'not a date', 'description': 'Rejected by validation'},
+]
+
+
+def test_rejected_rows_do_not_keep_the_checkpoint(app, tmp_path):
+    source = tmp_path / 'events.json'
+    source.write_text(json.dumps(EVENTS))
+
+    result = app.test_cli_runner().invoke(args=['data', 'import', str(source)])
+
+    assert result.exit_code == 1
+    assert 'events: 1 imported, 0 already imported, 1 rejected' in result.output
+    # A rerun would only reject the same row again
+    assert not os.path.exists(f'{source}.events.checkpoint')
@@ -0,0 +1,81 @@
+"""
+Database round trips per endpoint
+
+Each limit is what the endpoint makes today. A change that adds a call
+fails here; lower the limit when a change removes one.
+"""
+import pytest
+import database
+from conftest import ADMIN_HEADERS, OWNER_HEADERS
+from utils import query_budget
+from utils.query_budget import QueryBudgetExceeded, assert_max_db_calls, count_db_calls
+
+TEST_EVENT = {
+    'id': 'query-budget-event',
+    'title': 'Query Budget',
+    'date': '2030-01-15',
+    'description': 'An event created by the query budget tests',
+    'type': 'workshop',
+}
+
+
+@pytest.mark.parametrize('path, headers, limit', [
+    ('/api/events', None, 1),
+    ('/api/events/upcoming', None, 1),
+    ('/api/events/past', None, 1),
+    ('/api/projects', None, 1),
+    ('/api/team-members', None, 1),
+    ('/api/announcements', None, 1),
+    ('/api/announcements/recent', None, 1),
+    ('/api/users', ADMIN_HEADERS, 2),
+    ('/api/users/me', ADMIN_HEADERS, 1),
+    ('/api/activity-log', OWNER_HEADERS, 2),
+    ('/api/activity-log/stats', OWNER_HEADERS, 2),
+])
+def test_read_budget(client, path, headers, limit):
+    with assert_max_db_calls(limit):
+        response = client.get(path, headers=headers)
+    assert response.status_code == 200
+
+
+def test_write_budget(client):
+    with assert_max_db_calls(2):
+        response = client.post('/api/events', headers=ADMIN_HEADERS, json=TEST_EVENT)
+    assert response.status_code == 201
+
+    with assert_max_db_calls(3):
+        response = client.put(f"/api/events/{TEST_EVENT['id']}", headers=ADMIN_HEADERS, json={'title': 'Renamed'})
+    assert response.status_code == 200
+
+    # The tombstone for delta sync is the fourth call
+    with assert_max_db_calls(4):
+        response = client.delete(f"/api/events/{TEST_EVENT['id']}", headers=ADMIN_HEADERS)
+    assert response.status_code == 200
+
+
+def test_batch_budget(client):
+    # One user lookup for the whole batch, then one call per sub-request
+    batch = {'requests': [
+        {'method': 'GET', 'path': '/api/events'},
+        {'method': 'GET', 'path': '/api/projects'},
+        {'method': 'GET', 'path': '/api/users/me'},
+    ]}
+    with assert_max_db_calls(3):
+        response = client.post('/api/batch', headers=ADMIN_HEADERS, json=batch)
+    assert response.status_code == 200
+
+
+def test_counting_without_request_tracking(client, monkeypatch):
+    # As if the app had been created with DB_CALLS_WARN_THRESHOLD=0
+    observers = [observer for observer in database._query_observers if observer is not query_budget._record_query]
+    monkeypatch.setattr(database, '_query_observers', observers)
+    with count_db_calls() as tracker:
+        client.get('/api/events')
+    assert len(tracker) == 1
+    assert tracker.summary()[0].startswith('1 x events.select at routes/events.py:')
+
+
+def test_budget_exceeded(client):
+    with pytest.raises(QueryBudgetExceeded, match='users.select'):
+        with assert_max_db_calls(0):
+            client.get('/api/users/me', headers=ADMIN_HEADERS)
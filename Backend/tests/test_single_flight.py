@@ -0,0 +1,73 @@
+"""
+Single-flight call coalescing
+"""
+import asyncio
+import threading
+import time
+from utils.single_flight import AsyncSingleFlight, SingleFlight
+
+
+def test_every_caller_of_a_shared_call_gets_its_own_copy():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    rows = [{'id': 'e1', 'title': 'Shared'}]
+
+    def query():
+        started.set()
+        release.wait(5)
+        return rows
+
+    results = {}
+    leader = threading.Thread(target=lambda: results.setdefault('leader', flight.do('key', query)))
+    leader.start()
+    started.wait(5)
+    waiter = threading.Thread(target=lambda: results.setdefault('waiter', flight.do('key', query)))
+    waiter.start()
+    # Let the waiter join the call before it finishes
+    while flight._calls['key'].waiters == 0:
+        time.sleep(0.001)
+    release.set()
+    leader.join(5)
+    waiter.join(5)
+
+    results['leader'][0]['title'] = 'Changed by the leader'
+    assert results['waiter'] == [{'id': 'e1', 'title': 'Shared'}]
+    assert results['leader'] is not rows
+
+
+def test_unshared_call_returns_the_result_itself():
+    rows = [{'id': 'e1'}]
+    assert SingleFlight().do('key', lambda: rows) is rows
+
+
+def test_async_callers_share_one_call_and_get_their_own_copies():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def query():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return [{'id': 'e1'}]
+
+    async def run():
+        return await asyncio.gather(*(flight.do('key', query) for _ in range(3)))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert results == [[{'id': 'e1'}]] * 3
+    assert len({id(result) for result in results}) == 3
+
+
+def test_async_waiters_receive_the_shared_error():
+    flight = AsyncSingleFlight()
+
+    async def query():
+        await asyncio.sleep(0.01)
+        raise ConnectionError('down')
+
+    async def run():
+        return await asyncio.gather(*(flight.do('key', query) for _ in range(2)), return_exceptions=True)
+
+    assert [type(error) for error in asyncio.run(run())] == [ConnectionError, ConnectionError]
+    assert flight.in_flight() == 0
@@ -0,0 +1,67 @@
+"""
+Shared store backends and their base classes
+"""
+import pytest
+from utils.idempotency import REPLAY, RUN, IdempotencyStore, LocalIdempotencyStore
+from utils.shared_cache import LocalCacheBackend, SharedCache
+from utils.token_bucket import LocalTokenBuckets, TokenBuckets
+
+
+def test_incomplete_shared_cache_cannot_be_created():
+    class NoStore(SharedCache):
+        def generation(self, namespace):
+            return 0
+
+        def invalidate(self, namespace):
+            pass
+
+        def _load(self, key):
+            return None
+
+    with pytest.raises(TypeError, match='_store'):
+        NoStore()
+
+
+def test_shared_cache_backend_round_trip():
+    cache = LocalCacheBackend()
+    generation = cache.generation('events')
+    cache.set('events', 'list', [1, 2], ttl=30, generation=generation)
+    assert cache.get('events', 'list') == [1, 2]
+
+    cache.invalidate('events')
+    assert cache.get('events', 'list') is None
+
+
+def test_incomplete_token_buckets_cannot_be_created():
+    class NoTake(TokenBuckets):
+        pass
+
+    with pytest.raises(TypeError, match='take'):
+        NoTake()
+
+
+def test_token_bucket_backend_limits_a_burst():
+    buckets = LocalTokenBuckets()
+    assert buckets.take('ip:203.0.113.7', rate=1, burst=2) == 0
+    assert buckets.take('ip:203.0.113.7', rate=1, burst=2) == 0
+    assert buckets.take('ip:203.0.113.7', rate=1, burst=2) > 0
+
+
+def test_incomplete_idempotency_store_cannot_be_created():
+    class NoRelease(IdempotencyStore):
+        def begin(self, key, fingerprint, ttl, timeout):
+            return RUN, None
+
+        def complete(self, key, fingerprint, record, ttl):
+            pass
+
+    with pytest.raises(TypeError, match='release'):
+        NoRelease()
+
+
+def test_idempotency_store_backend_replays_a_completed_key():
+    store = LocalIdempotencyStore()
+    record = {'status': 201, 'body': '{"id": "e1"}', 'mimetype': 'application/json'}
+    assert store.begin('admin:k1', 'f1', ttl=60, timeout=1) == (RUN, None)
+    store.complete('admin:k1', 'f1', record, ttl=60)
+    assert store.begin('admin:k1', 'f1', ttl=60, timeout=1) == (REPLAY, record)
@@ -0,0 +1,204 @@
+"""
+Activity log retention and cold archive
+Old activity_log rows are rolled up into daily aggregates (activity_log_daily),
+appended to month-partitioned gzip JSONL files and deleted from the hot table.
+"""
+import glob
+import gzip
+import json
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from config import Config
+from database import get_admin_client
+from utils.validators import parse_timestamp
+
+ARCHIVE_FILE_PATTERN = re.compile(r'^activity_log-(\d{4}-\d{2})\.jsonl\.gz$')
+
+
+class RetentionError(Exception):
+    """A retention batch that was archived but not deleted from the hot table"""
+
+
+def archive_path(month):
+    """
+    Get the archive file path for a month
+
+    Args:
+        month (str): Month in 'YYYY-MM' format
+
+    Returns:
+        str: Path to the month's gzip JSONL archive
+    """
+    return os.path.join(Config.ACTIVITY_ARCHIVE_DIR, f'activity_log-{month}.jsonl.gz')
+
+
+def archived_months():
+    """
+    List the months that have an archive file, newest first
+
+    Returns:
+        list: Months in 'YYYY-MM' format
+    """
+    months = []
+    for path in glob.glob(os.path.join(Config.ACTIVITY_ARCHIVE_DIR, 'activity_log-*.jsonl.gz')):
+        match = ARCHIVE_FILE_PATTERN.match(os.path.basename(path))
+        if match:
+            months.append(match.group(1))
+    return sorted(months, reverse=True)
+
+
+def months_in_range(since=None, until=None):
+    """
+    List archived months overlapping a time range, newest first
+
+    Args:
+        since (datetime): Optional start of the range
+        until (datetime): Optional end of the range (exclusive)
+
+    Returns:
+        list: Months in 'YYYY-MM' format
+    """
+    first = since.strftime('%Y-%m') if since else None
+    last = until.strftime('%Y-%m') if until else None
+    return [
+        month for month in archived_months()
+        if (first is None or month >= first) and (last is None or month <= last)
+    ]
+
+
+def append_to_archive(rows):
+    """
+    Append activity log rows to their month's archive file
+
+    Each call appends a new gzip member, so files can be extended safely and
+    read back with a single gzip stream. Data is fsynced before returning so
+    rows are never deleted from the hot table before they are on disk.
+
+    Args:
+        rows (list): Activity log rows (dicts with an ISO 'timestamp')
+    """
+    by_month = {}
+    for row in rows:
+        by_month.setdefault(row['timestamp'][:7], []).append(row)
+
+    os.makedirs(Config.ACTIVITY_ARCHIVE_DIR, exist_ok=True)
+
+    for month, month_rows in by_month.items():
+        with open(archive_path(month), 'ab') as raw_file:
+            with gzip.GzipFile(fileobj=raw_file, mode='wb') as gzip_file:
+                for row in month_rows:
+                    gzip_file.write(json.dumps(row, separators=(',', ':')).encode('utf-8') + b'\n')
+            raw_file.flush()
+            os.fsync(raw_file.fileno())
+
+
+def read_archive(match, since=None, until=None, limit=None):
+    """
+    Read archived activity log rows, newest month first
+
+    Args:
+        match (dict): Field values rows must equal (e.g. {'user_id': uid})
+        since (datetime): Optional start of the range
+        until (datetime): Optional end of the range (exclusive)
+        limit (int): Optional maximum number of rows to return
+
+    Returns:
+        list: Matching rows ordered by timestamp (most recent first)
+    """
+    results = []
+    seen_ids = set()
+
+    for month in months_in_range(since, until):
+        month_rows = []
+        with gzip.open(archive_path(month), 'rt', encoding='utf-8') as archive_file:
+            for line in archive_file:
+                row = json.loads(line)
+
+                # A retention run interrupted after archiving but before the
+                # delete can leave duplicate rows behind
+                if row['id'] in seen_ids:
+                    continue
+                if any(row.get(field) != value for field, value in match.items()):
+                    continue
+
+                timestamp = parse_timestamp(row['timestamp'])
+                if since and timestamp < since:
+                    continue
+                if until and timestamp >= until:
+                    continue
+
+                seen_ids.add(row['id'])
+                month_rows.append(row)
+
+        month_rows.sort(key=lambda row: row['timestamp'], reverse=True)
+        results.extend(month_rows)
+
+        if limit and len(results) >= limit:
+            return results[:limit]
+
+    return results
+
+
+def run_retention(days=None, batch_size=None, dry_run=False, log=print):
+    """
+    Move activity log rows older than the retention window to the cold archive
+
+    For each batch: rows are appended to the archive, then rolled up into
+    activity_log_daily and deleted from activity_log in one database call
+    (archive_activity_log_batch).
+
+    Args:
+        days (int): Keep this many days in the hot table (default: ACTIVITY_RETENTION_DAYS)
+        batch_size (int): Rows per batch (default: ACTIVITY_RETENTION_BATCH_SIZE)
+        dry_run (bool): Only count the rows that would be archived
+        log (callable): Progress logger
+
+    Returns:
+        int: Number of rows archived (or that would be archived in dry-run mode)
+
+    Raises:
+        RetentionError: If the database deleted fewer rows of a batch than were
+            archived; that batch is in the archive and must not be written again
+    """
+    days = days or Config.ACTIVITY_RETENTION_DAYS
+    batch_size = batch_size or Config.ACTIVITY_RETENTION_BATCH_SIZE
+
+    # Align the cutoff to a UTC day so daily rollups never receive a partial day
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    cutoff = cutoff.replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
+
+    supabase = get_admin_client()
+
+    if dry_run:
+        response = supabase.table('activity_log').select('id', count='exact').lt('timestamp', cutoff).limit(1).execute()
+        log(f"{response.count or 0} activity log rows older than {cutoff} would be archived")
+        return response.count or 0
+
+    archived = 0
+    while True:
+        response = supabase.table('activity_log').select('*').lt('timestamp', cutoff).order('timestamp').order('id').limit(batch_size).execute()
+        rows = response.data or []
+        if not rows:
+            break
+
+        append_to_archive(rows)
+        response = supabase.rpc('archive_activity_log_batch', {'p_ids': [row['id'] for row in rows]}).execute()
+
+        # Rows left behind would be selected, archived and rolled up again on every pass
+        deleted = response.data if isinstance(response.data, int) else 0
+        if deleted < len(rows):
+            raise RetentionError(
+                f"archive_activity_log_batch deleted {deleted} of {len(rows)} rows (up to {rows[-1]['timestamp']}) "
+                f"after {archived} were archived; check that SUPABASE_SERVICE_ROLE_KEY is set and that no other "
+                f"retention job is running"
+            )
+
+        archived += len(rows)
+        log(f"Archived {archived} activity log rows (up to {rows[-1]['timestamp']})")
+
+        if len(rows) < batch_size:
+            break
+
+    return archived
+
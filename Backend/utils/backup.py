@@ -0,0 +1,298 @@
+"""
+Backup and restore of every table
+A backup is a directory holding one gzipped NDJSON file per table and a
+manifest.json with each file's row count and SHA-256. Tables are read
+concurrently, BACKUP_PAGE_SIZE rows at a time in primary key order (keyset
+paging: each page starts after the last key of the previous one, so late
+pages cost the same as early ones), and every page is written out before
+the next is fetched. A backup therefore needs one page per table in memory
+however large activity_log grows.
+
+Each page is its own read, so rows written while a backup runs may or may
+not be in it. The manifest counts, per table, the rows changed after the
+backup started; 0 everywhere means the backup is a consistent snapshot.
+
+Restore checks every checksum first, then bulk-loads the tables in foreign
+key order through the batched writer of utils/bulk_import.py.
+"""
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from config import Config
+from database import get_admin_client
+from utils.bulk_import import file_digest, write_batches
+
+MANIFEST_NAME = 'manifest.json'
+FORMAT_VERSION = 1
+
+# Table -> primary key columns, in restore order (referenced tables first)
+BACKUP_TABLES = {
+    'users': ('uid',),
+    'team_members': ('id',),
+    'projects': ('id',),
+    'events': ('id',),
+    'announcements': ('id',),
+    'faqs': ('id',),
+    'activity_log': ('id',),
+    'activity_log_daily': ('day', 'user_id', 'collection', 'action'),
+    'deleted_records': ('id',),
+}
+
+# Table -> column moved forward by every write, to detect rows changed during a backup
+CHANGE_COLUMNS = {
+    'users': 'updated_at',
+    'team_members': 'updated_at',
+    'projects': 'updated_at',
+    'events': 'updated_at',
+    'announcements': 'updated_at',
+    'faqs': 'updated_at',
+    'activity_log': 'timestamp',
+    'deleted_records': 'deleted_at',
+}
+
+
+class BackupError(Exception):
+    """A backup directory that is incomplete or does not match its manifest"""
+
+
+class _HashingWriter:
+    """File wrapper counting and hashing the bytes written through it"""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.sha256.update(data)
+        self.size += len(data)
+        return self.raw.write(data)
+
+    def flush(self):
+        self.raw.flush()
+
+
+def keyset_pages(supabase, table, key, page_size):
+    """
+    Read a table in primary key order, one page at a time
+
+    Rows after the last key (k1, k2, ...) are those with the same k1 and a
+    greater k2 (and so on down the key), then those with a greater k1; each
+    of these is one indexed range query, tried deepest first.
+
+    Args:
+        supabase: Supabase client
+        table (str): Table name
+        key (tuple): Primary key columns
+        page_size (int): Rows per request (at most PostgREST's max-rows)
+
+    Yields:
+        list: Pages of rows
+    """
+    def query():
+        builder = supabase.table(table).select('*')
+        for column in key:
+            builder = builder.order(column)
+        return builder
+
+    rows = query().limit(page_size).execute().data
+    while rows:
+        yield rows
+        last = rows[-1]
+        rows = []
+        for depth in range(len(key) - 1, -1, -1):
+            builder = query()
+            for column in key[:depth]:
+                builder = builder.eq(column, last[column])
+            rows = builder.gt(key[depth], last[key[depth]]).limit(page_size).execute().data
+            if rows:
+                break
+
+
+def backup_table(directory, table, page_size):
+    """
+    Stream one table to <directory>/<table>.ndjson.gz
+
+    Returns:
+        dict: Manifest entry (file, rows, bytes, sha256, key, seconds)
+    """
+    started = time.perf_counter()
+    name = f'{table}.ndjson.gz'
+    supabase = get_admin_client()
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f'.{table}-')
+    rows = 0
+    try:
+        with os.fdopen(fd, 'wb') as raw_file:
+            writer = _HashingWriter(raw_file)
+            # mtime=0: the same rows always give the same file and checksum
+            with gzip.GzipFile(filename='', mode='wb', fileobj=writer, mtime=0) as gzip_file:
+                for page in keyset_pages(supabase, table, BACKUP_TABLES[table], page_size):
+                    gzip_file.write(''.join(
+                        json.dumps(row, separators=(',', ':'), ensure_ascii=False) + '\n' for row in page
+                    ).encode('utf-8'))
+                    rows += len(page)
+            raw_file.flush()
+            os.fsync(raw_file.fileno())
+        os.replace(temp_path, os.path.join(directory, name))
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+    return {
+        'file': name,
+        'rows': rows,
+        'bytes': writer.size,
+        'sha256': writer.sha256.hexdigest(),
+        'key': list(BACKUP_TABLES[table]),
+        'seconds': round(time.perf_counter() - started, 3),
+    }
+
+
+def _changed_since(table, since):
+    """Rows of a table changed after `since`, or None if the table has no change column"""
+    column = CHANGE_COLUMNS.get(table)
+    if column is None:
+        return None
+    key = BACKUP_TABLES[table][0]
+    response = get_admin_client().table(table).select(key, count='exact').gt(column, since).limit(1).execute()
+    return response.count or 0
+
+
+def run_backup(directory, tables=None, page_size=None, workers=None, log=print):
+    """
+    Back up tables to a new directory
+
+    The manifest is written last, so a directory without one is an
+    interrupted backup.
+
+    Args:
+        directory (str): Output directory (created; must not hold a backup already)
+        tables (list): Tables to back up (default: all of BACKUP_TABLES)
+        page_size (int): Rows per read (default: BACKUP_PAGE_SIZE)
+        workers (int): Tables read at once (default: BACKUP_WORKERS)
+        log (callable): Receives one line per finished table
+
+    Returns:
+        dict: The manifest
+    """
+    tables = [table for table in BACKUP_TABLES if table in (tables or BACKUP_TABLES)]
+    page_size = page_size or Config.BACKUP_PAGE_SIZE
+    workers = workers or Config.BACKUP_WORKERS
+
+    if os.path.exists(os.path.join(directory, MANIFEST_NAME)):
+        raise BackupError(f"{directory} already holds a backup")
+    # The files include user emails: readable by the owner only
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    started_at = datetime.now(timezone.utc).isoformat()
+    started = time.perf_counter()
+    manifest = {'version': FORMAT_VERSION, 'started_at': started_at, 'tables': {}}
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='backup') as pool:
+        futures = {table: pool.submit(backup_table, directory, table, page_size) for table in tables}
+        for table, future in futures.items():
+            entry = future.result()
+            manifest['tables'][table] = entry
+            log(f"{table}: {entry['rows']} rows, {entry['bytes'] / 1024:.1f} KiB in {entry['seconds']:.2f} s")
+
+    manifest['finished_at'] = datetime.now(timezone.utc).isoformat()
+    manifest['seconds'] = round(time.perf_counter() - started, 3)
+    for table in tables:
+        manifest['tables'][table]['changed_during_backup'] = _changed_since(table, started_at)
+
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.manifest-')
+    with os.fdopen(fd, 'w', encoding='utf-8') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+    os.replace(temp_path, os.path.join(directory, MANIFEST_NAME))
+    return manifest
+
+
+def load_manifest(directory, tables=None, verify=True):
+    """
+    Read a backup's manifest and check the files of the requested tables
+
+    Args:
+        directory (str): Backup directory
+        tables (list): Tables to check (default: every table in the backup)
+        verify (bool): Compare each file's SHA-256 with the manifest
+
+    Returns:
+        dict: The manifest
+
+    Raises:
+        BackupError: Missing manifest, missing table or checksum mismatch
+    """
+    path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(path):
+        raise BackupError(f"{directory} has no {MANIFEST_NAME} (not a backup, or an interrupted one)")
+    with open(path, encoding='utf-8') as manifest_file:
+        manifest = json.load(manifest_file)
+    if manifest.get('version') != FORMAT_VERSION:
+        raise BackupError(f"Unsupported backup format version: {manifest.get('version')}")
+
+    for table in tables or manifest['tables']:
+        entry = manifest['tables'].get(table)
+        if entry is None:
+            raise BackupError(f"The backup does not include {table}")
+        if verify and file_digest(os.path.join(directory, entry['file'])) != entry['sha256']:
+            raise BackupError(f"{entry['file']} does not match its checksum")
+    return manifest
+
+
+def read_backup_rows(directory, entry):
+    """
+    Stream the rows of one backed-up table
+
+    Yields:
+        tuple: (line number, row)
+    """
+    with gzip.open(os.path.join(directory, entry['file']), 'rt', encoding='utf-8') as source:
+        for number, line in enumerate(source, start=1):
+            yield number, json.loads(line)
+
+
+def run_restore(directory, tables=None, batch_size=None, workers=None, upsert=False, log=print):
+    """
+    Load a backup into the database
+
+    Every checksum is verified before the first row is written. Tables are
+    loaded one after another in foreign key order, each in parallel batches.
+
+    Args:
+        directory (str): Backup directory
+        tables (list): Tables to restore (default: every table in the backup)
+        batch_size (int): Rows per insert (default: IMPORT_BATCH_SIZE)
+        workers (int): Batches in flight at once (default: IMPORT_WORKERS)
+        upsert (bool): Overwrite rows whose key already exists instead of refusing them
+        log (callable): Receives refused rows and one line per restored table
+
+    Returns:
+        dict: Table -> imported, refused and failed counts, seconds and rows_per_sec
+    """
+    manifest = load_manifest(directory, tables)
+    selected = [table for table in BACKUP_TABLES if table in (tables or manifest['tables'])]
+    results = {}
+
+    for table in selected:
+        entry = manifest['tables'][table]
+        result = {'imported': 0, 'skipped': 0, 'refused': 0, 'failed': 0}
+        started = time.perf_counter()
+        write_batches(
+            table, ','.join(entry['key']), read_backup_rows(directory, entry), result,
+            batch_size or Config.IMPORT_BATCH_SIZE, workers or Config.IMPORT_WORKERS, upsert=upsert, log=log
+        )
+        seconds = time.perf_counter() - started
+        result['seconds'] = round(seconds, 3)
+        result['rows_per_sec'] = round(result['imported'] / seconds, 1) if seconds else 0.0
+        results[table] = result
+        log(f"{table}: {result['imported']} of {entry['rows']} rows restored in {seconds:.2f} s")
+
+    if 'faqs' in selected or 'deleted_records' in selected:
+        # Restored rows kept their ids; move the serial sequences past them
+        get_admin_client().rpc('reset_serial_sequences').execute()
+    return results
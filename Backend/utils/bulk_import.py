@@ -0,0 +1,394 @@
+"""
+Bulk import of JSON, NDJSON, CSV and SQL seed files
+Rows are checked with the same compiled schemas the create routes use
+(utils/schemas.py). Valid rows are sent in batches of IMPORT_BATCH_SIZE, one
+multi-row insert per batch, with IMPORT_WORKERS batches in flight at once.
+Rejected rows are reported by record number and skipped.
+
+Batches are numbered in file order. Each one that lands is recorded in a
+checkpoint file next to the source. After a crash, or batches that failed
+for good, rerunning the same command skips the recorded batches. The
+checkpoint is deleted once no batch is left to retry (rows rejected or
+refused for their content would only fail again). A batch the database
+refuses (e.g. one duplicate key) is split in half until the offending rows
+are isolated, so one bad row does not keep 499 good ones out.
+"""
+import csv
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from postgrest.types import ReturnMethod
+from config import Config
+from database import get_admin_client
+from utils.circuit_breaker import CircuitOpenError, is_upstream_failure
+from utils.schemas import (
+    ACTIVITY_LOG_SCHEMA, ANNOUNCEMENT_SCHEMA, EVENT_SCHEMA, PROJECT_SCHEMA, TEAM_MEMBER_SCHEMA, USER_SCHEMA,
+    Field, Schema
+)
+from utils.shared_cache import shared_cache
+
+FORMATS = ('json', 'ndjson', 'csv', 'sql')
+EXTENSIONS = {'.json': 'json', '.ndjson': 'ndjson', '.jsonl': 'ndjson', '.csv': 'csv', '.sql': 'sql'}
+
+
+def _import_schema(schema, **extra):
+    """A route schema plus the columns an import may set that the API sets itself"""
+    return Schema(f'{schema.name} import', dict(schema.fields, **extra))
+
+
+# Collection -> (schema, key column). Imports may carry the audit columns a
+# migration needs to keep (who created a row, when), which the routes fill in.
+COLLECTIONS = {
+    'team_members': (_import_schema(TEAM_MEMBER_SCHEMA, created_at=Field('string'), updated_by=Field('string')), 'id'),
+    'projects': (_import_schema(PROJECT_SCHEMA, created_at=Field('string'), created_by=Field('string')), 'id'),
+    'events': (_import_schema(EVENT_SCHEMA, created_at=Field('string'), updated_by=Field('string')), 'id'),
+    'announcements': (_import_schema(ANNOUNCEMENT_SCHEMA, created_at=Field('string'), updated_by=Field('string')), 'id'),
+    'users': (_import_schema(USER_SCHEMA, uid=Field('string', required=True), created_at=Field('string'),
+                             last_login=Field('string')), 'uid'),
+    # Rows without an id get one derived from the source and record number, so retries never duplicate them
+    'activity_log': (_import_schema(ACTIVITY_LOG_SCHEMA, id=Field('string'), user_id=Field('string', required=True),
+                                    timestamp=Field('string')), 'id'),
+}
+
+# Retry delays (seconds) for batches that failed because Supabase was unavailable
+RETRY_DELAYS = (0.5, 2, 8)
+
+_TRUE = ('true', 't', '1', 'yes')
+_FALSE = ('false', 'f', '0', 'no')
+
+
+class SourceError(Exception):
+    """A source file, or one record of it, that cannot be read"""
+
+
+def detect_format(path):
+    """Format named by the file extension, or None"""
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def file_digest(path):
+    """SHA-256 of a file, identifying the exact source a checkpoint belongs to"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source:
+        for chunk in iter(lambda: source.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _csv_value(field, value):
+    """Convert one CSV cell to the JSON type its field expects (left as text if it does not parse)"""
+    if value == '':
+        return None
+    kind = field.kind if field is not None else None
+    try:
+        if kind == 'integer':
+            return int(value)
+        if kind == 'boolean' and value.lower() in _TRUE + _FALSE:
+            return value.lower() in _TRUE
+        if kind == 'array':
+            # A JSON array, or values separated by |
+            return json.loads(value) if value.lstrip().startswith('[') else value.split('|')
+        if kind in ('object', None) and value.lstrip()[:1] in ('{', '['):
+            return json.loads(value)
+    except ValueError:
+        pass
+    return value
+
+
+def read_records(path, fmt, collection):
+    """
+    Read the rows of one collection from a source file
+
+    JSON files hold an array of rows, or an API response ({"data": [...]}).
+    NDJSON files hold one row per line and are read as a stream. CSV files
+    have a header row; arrays are JSON or |-separated. SQL files are seed
+    scripts like supabase_seed_data.sql; only their INSERTs into the
+    collection are read.
+
+    Args:
+        path (str): Source file
+        fmt (str): One of FORMATS
+        collection (str): One of COLLECTIONS
+
+    Yields:
+        tuple: (record number, row)
+    """
+    schema = COLLECTIONS[collection][0]
+
+    if fmt == 'ndjson':
+        with open(path, encoding='utf-8') as source:
+            for number, line in enumerate(source, start=1):
+                if line.strip():
+                    try:
+                        yield number, json.loads(line)
+                    except ValueError as e:
+                        yield number, SourceError(f"Invalid JSON: {str(e)}")
+        return
+
+    if fmt == 'csv':
+        with open(path, encoding='utf-8', newline='') as source:
+            # Header is line 1, so data rows start at 2
+            for number, row in enumerate(csv.DictReader(source), start=2):
+                yield number, {name: _csv_value(schema.fields.get(name), value) for name, value in row.items()}
+        return
+
+    if fmt == 'sql':
+        from fake_supabase.sql import parse_inserts
+
+        with open(path, encoding='utf-8') as source:
+            inserts = parse_inserts(source.read())
+        rows = [row for table, table_rows in inserts if table == collection for row in table_rows]
+        yield from enumerate(rows, start=1)
+        return
+
+    with open(path, encoding='utf-8') as source:
+        try:
+            data = json.load(source)
+        except ValueError as e:
+            raise SourceError(f"{path} is not valid JSON: {str(e)}")
+    if isinstance(data, dict) and isinstance(data.get('data'), list):
+        data = data['data']
+    if not isinstance(data, list):
+        raise SourceError(f"{path} must hold a JSON array of rows")
+    yield from enumerate(data, start=1)
+
+
+def sql_collections(path):
+    """Collections a seed script inserts into, in script order"""
+    from fake_supabase.sql import parse_inserts
+
+    with open(path, encoding='utf-8') as source:
+        inserts = parse_inserts(source.read())
+    ordered = []
+    for table, _ in inserts:
+        if table in COLLECTIONS and table not in ordered:
+            ordered.append(table)
+    return ordered
+
+
+class ImportCheckpoint:
+    """
+    Batches of one import already written, saved after each batch
+
+    Args:
+        path (str): Checkpoint file
+        identity (dict): Source digest, collection and batch size; a checkpoint
+            written for anything else is refused, since its batch numbers would
+            not match
+    """
+
+    def __init__(self, path, identity):
+        self.path = path
+        self.identity = identity
+        self.done = set()
+        self._lock = threading.Lock()
+
+    def load(self):
+        """
+        Read the batches recorded by an earlier run
+
+        Raises:
+            ValueError: The checkpoint belongs to a different source, collection or batch size
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding='utf-8') as checkpoint_file:
+            saved = json.load(checkpoint_file)
+        if saved.get('identity') != self.identity:
+            raise ValueError(f"{self.path} was written for a different import")
+        self.done = set(saved.get('done', []))
+
+    def mark_done(self, index):
+        with self._lock:
+            self.done.add(index)
+            self._save()
+
+    def _save(self):
+        # Write-then-rename, so a crash mid-write never leaves a truncated checkpoint
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.checkpoint-')
+        with os.fdopen(fd, 'w', encoding='utf-8') as temp_file:
+            json.dump({'identity': self.identity, 'done': sorted(self.done)}, temp_file)
+        os.replace(temp_path, self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _write(supabase, collection, rows, key, upsert):
+    """One multi-row insert (or upsert); columns a row leaves out get their defaults"""
+    table = supabase.table(collection)
+    if upsert:
+        query = table.upsert(rows, on_conflict=key, returning=ReturnMethod.minimal, default_to_null=False)
+    else:
+        query = table.insert(rows, returning=ReturnMethod.minimal, default_to_null=False)
+    query.execute()
+
+
+def _write_with_retries(supabase, collection, rows, key, upsert):
+    """Write a batch, retrying while Supabase is unavailable; other errors are raised at once"""
+    for attempt, delay in enumerate(RETRY_DELAYS + (None,)):
+        try:
+            return _write(supabase, collection, rows, key, upsert)
+        except CircuitOpenError as e:
+            if delay is None:
+                raise
+            time.sleep(max(delay, min(e.retry_after, 30)))
+        except Exception as e:
+            if delay is None or not is_upstream_failure(e):
+                raise
+            time.sleep(delay)
+
+
+def _write_batch(supabase, collection, batch, key, upsert):
+    """
+    Write a batch, isolating the rows the database refuses
+
+    A failed multi-row insert writes nothing, so it is safe to split it and
+    try each half again, down to single rows.
+
+    Returns:
+        list: (record number, error message, whether Supabase was unavailable)
+              of the rows not written
+    """
+    try:
+        _write_with_retries(supabase, collection, [row for _, row in batch], key, upsert)
+        return []
+    except Exception as e:
+        unavailable = is_upstream_failure(e) or isinstance(e, CircuitOpenError)
+        if len(batch) == 1 or unavailable:
+            message = getattr(e, 'message', None) or str(e)
+            return [(number, message, unavailable) for number, _ in batch]
+    middle = len(batch) // 2
+    return (_write_batch(supabase, collection, batch[:middle], key, upsert)
+            + _write_batch(supabase, collection, batch[middle:], key, upsert))
+
+
+def write_batches(collection, key, records, result, batch_size, workers, upsert=False, checkpoint=None,
+                  dry_run=False, log=print):
+    """
+    Write rows in parallel batches, isolating the rows the database refuses
+
+    Args:
+        collection (str): Table name
+        key (str): Key column(s) for upserts, comma-separated
+        records (iterable): (record number, row) pairs ready to insert
+        result (dict): Counters to add imported, skipped, refused and failed rows to
+        batch_size (int): Rows per insert
+        workers (int): Batches in flight at once
+        upsert (bool): Update rows whose key already exists instead of refusing them
+        checkpoint (ImportCheckpoint): Skips and records finished batches
+        dry_run (bool): Only count the rows
+        log (callable): Receives one line per refused row and per failed batch
+    """
+    supabase = get_admin_client()
+    lock = threading.Lock()
+    # Bounds the rows held in memory while workers catch up with the reader
+    slots = threading.BoundedSemaphore(workers * 2)
+
+    def finished(index, batch, future):
+        slots.release()
+        try:
+            refused = future.result()
+        except Exception as e:
+            refused = [(number, str(e), True) for number, _ in batch]
+        for number, message, unavailable in refused:
+            if not unavailable:
+                log(f"record {number}: refused by the database: {message}")
+        retry = [number for number, _, unavailable in refused if unavailable]
+        if retry:
+            log(f"records {retry[0]}-{retry[-1]}: not written, Supabase is unavailable ({refused[0][1]}); "
+                f"run the command again to retry them")
+        with lock:
+            result['imported'] += len(batch) - len(refused)
+            result['refused'] += len(refused) - len(retry)
+            result['failed'] += len(retry)
+        # Rows refused for their content would be refused again; rows that met an outage are retried by a rerun
+        if checkpoint is not None and not retry:
+            checkpoint.mark_done(index)
+
+    def submit(index, batch):
+        if checkpoint is not None and index in checkpoint.done:
+            result['skipped'] += len(batch)
+            return
+        if dry_run:
+            result['imported'] += len(batch)
+            return
+        slots.acquire()
+        future = pool.submit(_write_batch, supabase, collection, batch, key, upsert)
+        future.add_done_callback(lambda f: finished(index, batch, f))
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'import-{collection}') as pool:
+        batch, index = [], 0
+        for record in records:
+            batch.append(record)
+            if len(batch) == batch_size:
+                submit(index, batch)
+                batch, index = [], index + 1
+        if batch:
+            submit(index, batch)
+
+    if result['imported'] and not dry_run:
+        # Cached public responses and user lookups must not outlive the import, in any worker
+        shared_cache.invalidate(collection)
+
+
+def run_import(collection, records, source_id='', batch_size=None, workers=None, upsert=False,
+               checkpoint=None, dry_run=False, log=print):
+    """
+    Validate rows and write them in parallel batches
+
+    Args:
+        collection (str): One of COLLECTIONS
+        records (iterable): (record number, row) pairs, e.g. from read_records()
+        source_id (str): Identifies the source (e.g. its digest); seeds derived activity log ids
+        batch_size (int): Rows per insert (default: IMPORT_BATCH_SIZE)
+        workers (int): Batches in flight at once (default: IMPORT_WORKERS)
+        upsert (bool): Update rows whose key already exists instead of refusing them
+        checkpoint (ImportCheckpoint): Skips and records finished batches
+        dry_run (bool): Only validate
+        log (callable): Receives one line per rejected or refused row
+
+    Returns:
+        dict: imported (or valid, in a dry run), skipped (already in the
+              checkpoint), rejected (invalid), refused (by the database) and
+              failed (Supabase unavailable) row counts, seconds, and rows_per_sec
+    """
+    schema, key = COLLECTIONS[collection]
+    result = {'imported': 0, 'skipped': 0, 'rejected': 0, 'refused': 0, 'failed': 0}
+    started = time.perf_counter()
+
+    def valid_rows():
+        ignored = set()
+        for number, row in records:
+            errors = [str(row)] if isinstance(row, SourceError) else schema.validate_create(row)
+            if errors:
+                result['rejected'] += 1
+                log(f"record {number}: {'; '.join(errors)}")
+                continue
+
+            for name in row.keys() - schema.fields.keys() - ignored:
+                ignored.add(name)
+                log(f"column {name!r} is not imported into {collection}")
+
+            # Only known columns; nulls are left out so the column defaults apply
+            values = {name: value for name, value in row.items() if name in schema.fields and value is not None}
+            if collection == 'activity_log' and 'id' not in values:
+                values['id'] = str(uuid.uuid5(uuid.NAMESPACE_URL, f'byte-import:{source_id}:{number}'))
+            yield number, values
+
+    write_batches(
+        collection, key, valid_rows(), result, batch_size or Config.IMPORT_BATCH_SIZE,
+        workers or Config.IMPORT_WORKERS, upsert=upsert, checkpoint=checkpoint, dry_run=dry_run, log=log
+    )
+
+    seconds = time.perf_counter() - started
+    result['seconds'] = round(seconds, 3)
+    result['rows_per_sec'] = round(result['imported'] / seconds, 1) if seconds else 0.0
+    return result
@@ -0,0 +1,87 @@
+"""
+In-process caching utilities
+Small thread-safe TTL cache used for memoizing expensive query results
+"""
+import threading
+import time
+from collections import OrderedDict
+from utils.metrics import record_cache_lookup
+
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded cache whose entries expire after a fixed TTL
+
+    Entries are evicted least-recently-used first once max_entries is reached.
+    Lookups are counted in the byte_cache_requests_total metric when a name is given.
+
+    Usage:
+        cache = TTLCache(ttl=60, max_entries=256, name='activity_stats')
+        value = cache.get(key)
+        if value is None:
+            value = compute()
+            cache.set(key, value)
+    """
+
+    def __init__(self, ttl=60, max_entries=256, name=None):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Get a cached value
+
+        Args:
+            key: Cache key (must be hashable)
+            default: Value returned when the key is missing or expired
+
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if self.name:
+            record_cache_lookup(self.name, entry is not None)
+
+        return entry[1] if entry is not None else default
+
+    def set(self, key, value, ttl=None):
+        """
+        Store a value in the cache
+
+        Args:
+            key: Cache key (must be hashable)
+            value: Value to store
+            ttl (float): Optional per-entry TTL in seconds (default: cache TTL)
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """Remove a single key from the cache"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove every entry from the cache"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
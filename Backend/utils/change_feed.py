@@ -0,0 +1,556 @@
+"""
+Change feed
+Write handlers publish a small change notice after each committed write.
+Notices fan out to Server-Sent Events subscribers (GET /api/changes/stream)
+and to in-process listeners registered with add_change_listener().
+Backends (CHANGE_STREAM_BACKEND, default: the shared cache backend):
+- local: notices stay in the publishing process (single worker, development)
+- shm:   a ring of recent notices in a shared memory file, followed by every
+         worker of a host
+- redis: recent notices in a Redis sorted set, followed by every host
+"""
+import json
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from config import Config
+from utils.shared_cache import SharedMemoryFile
+from utils.shutdown import register_shutdown_hook
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    A single change stream subscriber
+
+    Events are buffered in a bounded queue. A subscriber that falls more than
+    max_pending events behind is dropped instead of slowing down publishers;
+    it can reconnect and resume with Last-Event-ID.
+    """
+
+    def __init__(self, max_pending):
+        self.max_pending = max_pending
+        self.dropped = False
+        self.reset = False
+        self.replay = []
+        self._pending = deque()
+        self._condition = threading.Condition()
+
+    def offer(self, event):
+        """
+        Queue an event without blocking
+
+        Returns:
+            bool: False if the subscriber was too slow and has been dropped
+        """
+        with self._condition:
+            if self.dropped:
+                return False
+            if len(self._pending) >= self.max_pending:
+                self.dropped = True
+                self._pending.clear()
+                self._condition.notify()
+                return False
+
+            self._pending.append(event)
+            self._condition.notify()
+            return True
+
+    def close(self):
+        """Drop the subscriber and wake up its stream"""
+        with self._condition:
+            self.dropped = True
+            self._pending.clear()
+            self._condition.notify()
+
+    def get(self, timeout):
+        """
+        Wait for the next event
+
+        Args:
+            timeout (float): Seconds to wait before giving up (used for heartbeats)
+
+        Returns:
+            dict: Next event, or None on timeout or when the subscriber was dropped
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._pending or self.dropped, timeout)
+            if self._pending and not self.dropped:
+                return self._pending.popleft()
+            return None
+
+
+class ChangeBroker:
+    """
+    Fan-out pub/sub for change notices with a bounded replay buffer, within
+    one process (single worker, development)
+
+    Event IDs have the form '<broker id>-<sequence>'. Resuming with an ID from
+    another process (or from before a restart) cannot be served from the replay
+    buffer, so the subscription is flagged for a full reload instead.
+    At most max_subscribers streams are open at once (0: no limit).
+    """
+
+    def __init__(self, replay_size=1000, max_pending=100, max_subscribers=0):
+        self._broker_id = uuid.uuid4().hex[:8]
+        self.max_pending = max_pending
+        self.max_subscribers = max_subscribers
+        self._sequence = 0
+        self._replay = deque(maxlen=replay_size)
+        self._subscribers = set()
+        self._listeners = []
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @property
+    def broker_id(self):
+        return self._broker_id
+
+    @staticmethod
+    def _notice(collection, document_id, action, updated_at):
+        return {
+            'collection': collection,
+            'document_id': str(document_id),
+            'action': action,
+            'updated_at': updated_at or datetime.now(timezone.utc).isoformat()
+        }
+
+    def _event(self, sequence, notice):
+        return dict(notice, id=f'{self.broker_id}-{sequence}', sequence=sequence)
+
+    def publish(self, collection, document_id, action, updated_at=None):
+        """
+        Publish a change notice to every subscriber and listener
+
+        Args:
+            collection (str): Table name
+            document_id: ID of the affected row
+            action (str): 'created', 'updated' or 'deleted'
+            updated_at (str): Row's updated_at, defaults to now
+
+        Returns:
+            dict: The published event
+        """
+        notice = self._notice(collection, document_id, action, updated_at)
+        with self._lock:
+            self._sequence += 1
+            event = self._event(self._sequence, notice)
+            self._replay.append(event)
+            subscribers = list(self._subscribers)
+
+        self._fan_out([event], subscribers)
+        self._notify_listeners(event)
+        return event
+
+    def _fan_out(self, events, subscribers):
+        for subscription in subscribers:
+            for event in events:
+                if not subscription.offer(event):
+                    self.unsubscribe(subscription)
+                    break
+
+    def _notify_listeners(self, event):
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logger.warning(f"Change listener {listener!r} failed: {str(e)}")
+
+    def _events_after(self, sequence):
+        """Buffered events after a sequence number, or None if some are gone (lock held)"""
+        oldest = self._replay[0]['sequence'] if self._replay else self._sequence + 1
+        if sequence + 1 < oldest:
+            return None
+        return [event for event in self._replay if event['sequence'] > sequence]
+
+    def subscribe(self, last_event_id=None):
+        """
+        Register a new subscriber
+
+        Args:
+            last_event_id (str): Optional ID of the last event the client saw
+
+        Returns:
+            Subscription: Subscription with any missed events in .replay, or
+            .reset set when the missed events are no longer available; None
+            when max_subscribers streams are already open
+        """
+        subscription = Subscription(self.max_pending)
+
+        with self._lock:
+            if self._closed:
+                # Shutting down: the stream ends at once and the client reconnects elsewhere
+                subscription.dropped = True
+                return subscription
+            if self.max_subscribers and len(self._subscribers) >= self.max_subscribers:
+                return None
+
+            if last_event_id:
+                broker_id, _, sequence = last_event_id.partition('-')
+                missed = None
+                if broker_id == self.broker_id and sequence.isdigit():
+                    missed = self._events_after(int(sequence))
+                if missed is None:
+                    subscription.reset = True
+                else:
+                    subscription.replay = missed
+
+            self._subscribers.add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Remove a subscriber"""
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def close(self):
+        """
+        End every subscription (on shutdown); streams finish their current
+        message and close, and EventSource clients reconnect to another worker
+        """
+        with self._lock:
+            self._closed = True
+            subscribers = list(self._subscribers)
+            self._subscribers.clear()
+
+        for subscription in subscribers:
+            subscription.close()
+
+    def add_listener(self, listener):
+        """
+        Register a callable invoked with every published event
+        Listeners run on the publishing request thread and must be fast.
+        """
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    @property
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+
+class SharedMemoryChangeLog:
+    """
+    The last `capacity` change notices in a memory-mapped ring, shared by the
+    workers of one host
+
+    The header holds the feed id, the capacity and the last sequence number;
+    notice N is in slot N % capacity, tagged with N so a slot overwritten
+    since is detected. The feed id changes when the file is created or
+    resized, so IDs from an older feed are never taken for current ones.
+    """
+
+    HEADER = struct.Struct('<QQQ')
+    SLOT_HEADER = struct.Struct('<QH')
+    SLOT_SIZE = 512
+    poll_interval = 0.05  # seconds between checks for new notices
+
+    def __init__(self, path, capacity):
+        self.capacity = capacity
+        self._file = SharedMemoryFile(path, self.HEADER.size + capacity * self.SLOT_SIZE)
+        with self._file.lock():
+            feed, stored_capacity, _ = self.HEADER.unpack_from(self._file.map, 0)
+            if feed == 0 or stored_capacity != capacity:
+                feed = int.from_bytes(os.urandom(8), 'little') or 1
+                self.HEADER.pack_into(self._file.map, 0, feed, capacity, 0)
+        self.feed_id = f'{feed:016x}'
+
+    def _slot(self, sequence):
+        return self.HEADER.size + (sequence % self.capacity) * self.SLOT_SIZE
+
+    def watch(self, callback):
+        """Appends are found by polling every poll_interval"""
+
+    def last_sequence(self):
+        return self.HEADER.unpack_from(self._file.map, 0)[2]
+
+    def append(self, notice):
+        """
+        Add a notice to the ring
+
+        Returns:
+            int: Its sequence number
+        """
+        data = json.dumps(notice, separators=(',', ':')).encode('utf-8')
+        if len(data) > self.SLOT_SIZE - self.SLOT_HEADER.size:
+            raise ValueError(f"Change notice of {len(data)} bytes does not fit a shared feed slot")
+
+        with self._file.lock():
+            feed, capacity, sequence = self.HEADER.unpack_from(self._file.map, 0)
+            sequence += 1
+            offset = self._slot(sequence)
+            self.SLOT_HEADER.pack_into(self._file.map, offset, sequence, len(data))
+            start = offset + self.SLOT_HEADER.size
+            self._file.map[start:start + len(data)] = data
+            self.HEADER.pack_into(self._file.map, 0, feed, capacity, sequence)
+        return sequence
+
+    def read(self, after, upto):
+        """
+        Notices after one sequence number, up to another
+
+        Returns:
+            list: (sequence, notice) pairs, or None if some were overwritten
+        """
+        if upto - after > self.capacity:
+            return None
+        entries = []
+        with self._file.lock():
+            for sequence in range(after + 1, upto + 1):
+                offset = self._slot(sequence)
+                stored, length = self.SLOT_HEADER.unpack_from(self._file.map, offset)
+                if stored != sequence:
+                    return None
+                start = offset + self.SLOT_HEADER.size
+                entries.append((sequence, json.loads(self._file.map[start:start + length])))
+        return entries
+
+
+# KEYS[1] sequence, KEYS[2] log, KEYS[3] channel; ARGV notice, capacity.
+# Atomic, so notices enter the log in sequence order.
+_APPEND_SCRIPT = """
+local sequence = redis.call('INCR', KEYS[1])
+redis.call('ZADD', KEYS[2], sequence, sequence .. ' ' .. ARGV[1])
+redis.call('ZREMRANGEBYRANK', KEYS[2], 0, -tonumber(ARGV[2]) - 1)
+redis.call('PUBLISH', KEYS[3], sequence)
+return sequence
+"""
+
+
+class RedisChangeLog:
+    """
+    The last `capacity` change notices in a Redis sorted set scored by
+    sequence number, shared by every host
+
+    Each append is announced on a pub/sub channel, which wakes up the
+    followers at once; they also poll every poll_interval in case the
+    subscriber is disconnected.
+    """
+
+    poll_interval = 1.0
+
+    def __init__(self, url, prefix, capacity):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CHANGE_STREAM_BACKEND=redis needs the redis package (pip install redis)")
+
+        self.capacity = capacity
+        self._redis = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+        self._append = self._redis.register_script(_APPEND_SCRIPT)
+        self._feed_key = prefix + 'changes:feed'
+        self._sequence_key = prefix + 'changes:sequence'
+        self._log_key = prefix + 'changes:log'
+        self._channel = prefix + 'changes'
+        self._feed_id = None
+
+    @property
+    def feed_id(self):
+        # Read on first use rather than at import, when Redis may not be up yet
+        if self._feed_id is None:
+            self._redis.set(self._feed_key, uuid.uuid4().hex[:8], nx=True)
+            self._feed_id = self._redis.get(self._feed_key).decode('utf-8')
+        return self._feed_id
+
+    def watch(self, callback):
+        """Call `callback` after every append, from a subscriber thread"""
+        threading.Thread(target=self._listen, args=(callback,), name='change-feed-pubsub', daemon=True).start()
+
+    def _listen(self, callback):
+        while True:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self._channel)
+                # Appends made while we were not listening
+                callback()
+                for _ in pubsub.listen():
+                    callback()
+            except Exception as e:
+                logger.warning(f"Change feed subscriber disconnected: {str(e)}")
+            finally:
+                pubsub.close()
+            time.sleep(1)
+
+    def last_sequence(self):
+        return int(self._redis.get(self._sequence_key) or 0)
+
+    def append(self, notice):
+        notice = json.dumps(notice, separators=(',', ':'))
+        return int(self._append(keys=[self._sequence_key, self._log_key, self._channel],
+                                args=[notice, self.capacity]))
+
+    def read(self, after, upto):
+        members = self._redis.zrangebyscore(self._log_key, after + 1, upto)
+        if len(members) != upto - after:
+            return None
+        entries = []
+        for member in members:
+            sequence, _, data = member.decode('utf-8').partition(' ')
+            entries.append((int(sequence), json.loads(data)))
+        return entries
+
+
+class SharedChangeBroker(ChangeBroker):
+    """
+    Change broker whose notices go through a log shared by every worker
+
+    publish() appends to the log. In each worker a follower thread reads new
+    notices in log order and hands them to that worker's subscribers, so a
+    stream sees the writes of every worker, and Last-Event-ID resumes on
+    any worker (and across restarts, while the log still holds the events).
+    Listeners only run in the publishing worker: they invalidate caches and
+    export snapshots, which must happen once per write.
+    """
+
+    def __init__(self, log, max_pending=100, max_subscribers=0):
+        super().__init__(replay_size=0, max_pending=max_pending, max_subscribers=max_subscribers)
+        self._log = log
+        self._delivered = 0
+        self._follower = None
+        self._wakeup = threading.Event()
+
+    @property
+    def broker_id(self):
+        return self._log.feed_id
+
+    def publish(self, collection, document_id, action, updated_at=None):
+        notice = self._notice(collection, document_id, action, updated_at)
+        try:
+            event = self._event(self._log.append(notice), notice)
+        except Exception as e:
+            # The write is committed: still run the listeners, only streams miss it
+            logger.error(f"Could not add a change to the shared feed: {str(e)}")
+            event = notice
+        self._wakeup.set()
+        self._notify_listeners(event)
+        return event
+
+    def _ensure_follower(self):
+        if self._follower is None:
+            with self._lock:
+                if self._follower is None:
+                    # Started lazily, in the worker (threads do not survive a fork)
+                    self._delivered = self._log.last_sequence()
+                    self._follower = threading.Thread(target=self._follow, name='change-feed', daemon=True)
+                    self._follower.start()
+                    self._log.watch(self._wakeup.set)
+
+    def _follow(self):
+        while not self._closed:
+            self._wakeup.wait(self._log.poll_interval)
+            self._wakeup.clear()
+            try:
+                last = self._log.last_sequence()
+                if last <= self._delivered:
+                    continue
+                entries = self._log.read(self._delivered, last)
+            except Exception as e:
+                logger.warning(f"Could not read the shared change feed: {str(e)}")
+                time.sleep(1)
+                continue
+
+            with self._lock:
+                self._delivered = last
+                subscribers = list(self._subscribers)
+            if entries is None:
+                # This worker fell behind the log: streams reconnect and are told to reload
+                logger.warning("Change feed follower fell behind; closing streams")
+                for subscription in subscribers:
+                    self.unsubscribe(subscription)
+                    subscription.close()
+            else:
+                self._fan_out([self._event(sequence, notice) for sequence, notice in entries], subscribers)
+
+    def _events_after(self, sequence):
+        if sequence >= self._delivered:
+            return []
+        try:
+            entries = self._log.read(sequence, self._delivered)
+        except Exception as e:
+            logger.warning(f"Could not read the shared change feed: {str(e)}")
+            return None
+        return None if entries is None else [self._event(number, notice) for number, notice in entries]
+
+    def subscribe(self, last_event_id=None):
+        self._ensure_follower()
+        return super().subscribe(last_event_id)
+
+    def close(self):
+        super().close()
+        self._wakeup.set()
+
+
+def create_change_broker(backend=None):
+    """
+    Create the broker selected by CHANGE_STREAM_BACKEND
+
+    Args:
+        backend (str): 'local', 'shm' or 'redis' (default: Config.CHANGE_STREAM_BACKEND)
+
+    Returns:
+        ChangeBroker: Broker
+    """
+    backend = backend or Config.CHANGE_STREAM_BACKEND
+    limits = {
+        'max_pending': Config.CHANGE_STREAM_MAX_PENDING,
+        'max_subscribers': Config.CHANGE_STREAM_MAX_PER_WORKER
+    }
+    if backend == 'local':
+        if Config.SERVER_WORKERS > 1:
+            logger.warning("CHANGE_STREAM_BACKEND=local with several workers: a stream only sees the writes "
+                           "of its own worker")
+        return ChangeBroker(replay_size=Config.CHANGE_STREAM_REPLAY_SIZE, **limits)
+    if backend == 'shm':
+        shm_dir = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+        path = Config.CHANGE_STREAM_SHM_PATH or os.path.join(shm_dir, 'byte-change-feed')
+        return SharedChangeBroker(SharedMemoryChangeLog(path, Config.CHANGE_STREAM_REPLAY_SIZE), **limits)
+    if backend == 'redis':
+        log = RedisChangeLog(Config.SHARED_CACHE_URL, Config.SHARED_CACHE_PREFIX, Config.CHANGE_STREAM_REPLAY_SIZE)
+        return SharedChangeBroker(log, **limits)
+    raise ValueError(f"Unknown CHANGE_STREAM_BACKEND: {backend}")
+
+
+# Process-wide broker used by the write handlers and the change stream
+broker = create_change_broker()
+
+
+def _close_streams(timeout):
+    broker.close()
+
+
+register_shutdown_hook(_close_streams, early=True)
+
+
+def publish_change(collection, document_id, action, updated_at=None):
+    """
+    Publish a change notice after a committed write
+
+    Args:
+        collection (str): Table name
+        document_id: ID of the affected row
+        action (str): 'created', 'updated' or 'deleted'
+        updated_at (str): Row's updated_at, defaults to now
+    """
+    return broker.publish(collection, document_id, action, updated_at)
+
+
+def add_change_listener(listener):
+    """
+    Register a callable invoked with every published change event
+
+    Args:
+        listener (callable): Function taking the event dict
+    """
+    broker.add_listener(listener)
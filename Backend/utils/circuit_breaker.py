@@ -0,0 +1,188 @@
+"""
+Circuit breakers for the data layer
+One breaker per table. After CIRCUIT_FAILURE_THRESHOLD consecutive upstream
+failures the circuit opens and calls fail immediately with CircuitOpenError
+instead of waiting on a struggling Supabase. After CIRCUIT_RESET_TIMEOUT
+seconds one probe call is let through (half-open): success closes the
+circuit, failure opens it again.
+"""
+import threading
+import time
+import httpx
+from flask import g, has_request_context
+from postgrest.exceptions import APIError
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# PostgreSQL error classes meaning the database itself is in trouble:
+# 08 connection exception, 53 insufficient resources, 57 operator intervention
+# (includes 57014 statement timeout)
+UPSTREAM_SQLSTATE_CLASSES = ('08', '53', '57')
+
+# PostgREST errors for a database it cannot reach or use
+UPSTREAM_POSTGREST_CODES = {'PGRST000', 'PGRST001', 'PGRST002', 'PGRST003'}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the database while a circuit is open"""
+
+    def __init__(self, name, retry_after):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(f"Circuit open for {name}, retry in {retry_after:.0f}s")
+
+
+def is_upstream_failure(error):
+    """
+    Whether an exception means Supabase is unavailable (as opposed to a bad query)
+
+    Args:
+        error (Exception): Exception raised by a database call
+
+    Returns:
+        bool: True for timeouts, connection errors and server-side failures
+    """
+    if isinstance(error, (httpx.TimeoutException, httpx.TransportError, TimeoutError, ConnectionError)):
+        return True
+    if isinstance(error, APIError):
+        code = str(error.code or '')
+        return (
+            code.startswith(UPSTREAM_SQLSTATE_CLASSES)
+            or code in UPSTREAM_POSTGREST_CODES
+            or (len(code) == 3 and code.startswith('5'))  # HTTP 5xx without a PostgREST body
+        )
+    return False
+
+
+class CircuitBreaker:
+    """
+    Thread-safe closed / open / half-open circuit breaker
+
+    Usage:
+        breaker = CircuitBreaker('events', failure_threshold=5, reset_timeout=30)
+        breaker.before_call()          # raises CircuitOpenError while open
+        try:
+            result = call()
+        except Exception as e:
+            breaker.record_failure(e)
+            raise
+        breaker.record_success()
+    """
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30, listeners=()):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self._listeners = listeners
+
+    def _set_state(self, state):
+        if state != self.state:
+            self.state = state
+            for listener in self._listeners:
+                listener(self.name, state)
+
+    def retry_after(self):
+        """Seconds until the next probe is allowed (0 when not open)"""
+        if self.state != OPEN:
+            return 0
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def before_call(self):
+        """
+        Check whether a call may go ahead
+
+        Raises:
+            CircuitOpenError: While open, or half-open with a probe already running
+        """
+        with self._lock:
+            if self.state == OPEN and self.retry_after() == 0:
+                self._set_state(HALF_OPEN)
+                self._probe_in_flight = False
+
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+
+            if self.state == CLOSED:
+                return
+
+            error = CircuitOpenError(self.name, self.retry_after() if self.state == OPEN else 1)
+
+        # Let the serve-stale middleware tell an outage from an ordinary error
+        if has_request_context():
+            g.circuit_open_error = error
+        raise error
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._probe_in_flight = False
+            self._set_state(CLOSED)
+
+    def record_failure(self, error):
+        """
+        Record a failed call; only upstream failures count towards opening
+
+        Args:
+            error (Exception): The exception the call raised
+        """
+        with self._lock:
+            if not is_upstream_failure(error):
+                # The database answered, so it is reachable
+                if self.state == HALF_OPEN:
+                    self._probe_in_flight = False
+                    self._set_state(CLOSED)
+                self.failures = 0
+                return
+
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self._set_state(OPEN)
+
+
+class CircuitBreakerRegistry:
+    """Creates and holds one CircuitBreaker per name (table or RPC function)"""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers = {}
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    def add_listener(self, listener):
+        """
+        Register a callable notified on every state change
+
+        Args:
+            listener (callable): Called as listener(name, state)
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def get(self, name):
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(name, CircuitBreaker(
+                    name, self.failure_threshold, self.reset_timeout, self._listeners
+                ))
+        return breaker
+
+    def states(self):
+        """
+        Current state of every breaker
+
+        Returns:
+            dict: name -> state
+        """
+        return {name: breaker.state for name, breaker in self._breakers.items()}
@@ -0,0 +1,98 @@
+"""
+Delta sync helpers
+Lets list endpoints return only the rows changed since a client's last sync
+(?updated_since=<ts>), plus tombstones for rows deleted since then.
+"""
+from datetime import datetime, timedelta, timezone
+from flask import current_app, g, request
+from database import get_supabase_client
+from utils.responses import success_response
+from utils.validators import parse_timestamp
+
+# synced_at is moved back by this much so rows whose transaction committed
+# while the delta was being read are delivered again on the next sync
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+def parse_updated_since(filter_params=()):
+    """
+    Read the optional updated_since query parameter
+
+    Args:
+        filter_params (tuple): Names of list filters that cannot be combined with
+            updated_since (rows that stop matching a filter would never be reported)
+
+    Returns:
+        tuple: (updated_since, error_message) where updated_since is a datetime or None
+    """
+    value = request.args.get('updated_since')
+    if not value:
+        return None, None
+
+    updated_since = parse_timestamp(value)
+    if not updated_since:
+        return None, "updated_since must be an ISO 8601 timestamp"
+
+    used_filters = [param for param in filter_params if request.args.get(param)]
+    if used_filters:
+        return None, f"updated_since cannot be combined with: {', '.join(used_filters)}"
+
+    return updated_since, None
+
+
+def delta_response(collection, query, updated_since, key='id'):
+    """
+    Build a delta sync response for a collection
+
+    Response data:
+        items: Rows created or updated since updated_since
+        deleted: IDs of rows deleted since updated_since
+        synced_at: Value to send as updated_since on the next sync
+
+    Args:
+        collection (str): Table name (matches deleted_records.collection)
+        query: Select query builder for the collection (before execute)
+        updated_since (datetime): Start of the delta
+        key (str): Primary key column (default: 'id')
+
+    Returns:
+        tuple: (response, status_code)
+    """
+    synced_at = datetime.now(timezone.utc) - SYNC_OVERLAP
+    since_iso = updated_since.isoformat()
+
+    supabase = get_supabase_client()
+    items = query.gte('updated_at', since_iso).execute().data
+    tombstones = supabase.table('deleted_records').select('document_id').eq('collection', collection).gte('deleted_at', since_iso).execute().data
+
+    # A row deleted and then re-created with the same ID is reported as an item only
+    live_ids = {str(item[key]) for item in items}
+    deleted = sorted({row['document_id'] for row in tombstones} - live_ids)
+
+    return success_response(data={
+        'items': items,
+        'deleted': deleted,
+        'synced_at': synced_at.isoformat()
+    })
+
+
+def record_tombstone(collection, document_id):
+    """
+    Record that a row was deleted so delta sync clients can remove it
+    Called by delete handlers after the delete succeeds. Failures are logged
+    rather than raised because the delete itself has already happened.
+
+    Args:
+        collection (str): Table name
+        document_id: Primary key of the deleted row
+    """
+    try:
+        current_user = g.get('current_user') or {}
+        supabase = get_supabase_client()
+        supabase.table('deleted_records').insert({
+            'collection': collection,
+            'document_id': str(document_id),
+            'deleted_by': current_user.get('uid')
+        }).execute()
+    except Exception as e:
+        current_app.logger.warning(f"Failed to record tombstone for {collection}/{document_id}: {str(e)}")
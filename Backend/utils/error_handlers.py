@@ -64,11 +64,15 @@ def register_error_handlers(app):
     @app.errorhandler(HTTPException)
     def handle_http_exception(e):
         """Handle all HTTP exceptions with JSON responses"""
-        return jsonify({
+        response = jsonify({
             'error': e.name,
             'message': e.description,
             'code': e.code
-        }), e.code
+        })
+        # 429 and 503 raised by the rate limiter and load shedding
+        if getattr(e, 'retry_after', None) is not None:
+            response.headers['Retry-After'] = str(e.retry_after)
+        return response, e.code
 
     @app.errorhandler(Exception)
     def handle_generic_exception(e):
@@ -0,0 +1,339 @@
+"""
+Idempotency key store
+Remembers the response of a request made with an Idempotency-Key header, so
+a retry gets the same response instead of running again (see
+middleware/idempotency.py). Backends (IDEMPOTENCY_BACKEND):
+- local: bounded in-process store; a retry is only recognized by the worker
+         that handled the first attempt (single worker, development)
+- shm:   one file per key in a shared memory directory, seen by every worker
+         of a host (default when several workers run)
+- redis: shared by every worker and host (default with SHARED_CACHE_BACKEND=redis)
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from config import Config
+from utils.shared_cache import SharedMemoryFile
+
+logger = logging.getLogger(__name__)
+
+# Outcomes of IdempotencyStore.begin()
+RUN = 'run'            # first attempt: run it, then complete() or release()
+REPLAY = 'replay'      # finished before: return the stored response
+MISMATCH = 'mismatch'  # key already used for a different request
+BUSY = 'busy'          # first attempt still running after the wait timeout
+
+
+class IdempotencyStore(ABC):
+    """
+    Base class
+
+    A key is claimed by the first request; identical requests arriving while
+    it runs wait for its response instead of racing it.
+    """
+
+    @abstractmethod
+    def begin(self, key, fingerprint, ttl, timeout):
+        """
+        Claim a key, or wait for the request that claimed it
+
+        Args:
+            key (str): Scoped idempotency key
+            fingerprint (str): Hash of the request, compared with the first attempt's
+            ttl (float): Seconds a claim is kept
+            timeout (float): Seconds to wait for a concurrent first attempt
+
+        Returns:
+            tuple: (outcome, stored response or None)
+        """
+
+    @abstractmethod
+    def complete(self, key, fingerprint, record, ttl):
+        """
+        Store the response of a claimed key and wake up waiting duplicates
+
+        Args:
+            key (str): Scoped idempotency key
+            fingerprint (str): Hash of the request
+            record (dict): Response with status, body and mimetype
+            ttl (float): Seconds the response is replayed
+        """
+
+    @abstractmethod
+    def release(self, key):
+        """Give up a claim without a response (the next attempt runs again)"""
+
+
+class _Entry:
+    __slots__ = ('fingerprint', 'record', 'expires')
+
+    def __init__(self, fingerprint, expires):
+        self.fingerprint = fingerprint
+        self.record = None
+        self.expires = expires
+
+
+class LocalIdempotencyStore(IdempotencyStore):
+    """In-process store holding at most max_entries keys, oldest dropped first"""
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._condition = threading.Condition()
+
+    def begin(self, key, fingerprint, ttl, timeout):
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                entry = self._entries.get(key)
+                if entry is not None and entry.expires <= now:
+                    del self._entries[key]
+                    entry = None
+
+                if entry is None:
+                    self._entries[key] = _Entry(fingerprint, now + ttl)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                    return RUN, None
+                if entry.fingerprint != fingerprint:
+                    return MISMATCH, None
+                if entry.record is not None:
+                    return REPLAY, entry.record
+                if now >= deadline:
+                    return BUSY, None
+                self._condition.wait(deadline - now)
+
+    def complete(self, key, fingerprint, record, ttl):
+        with self._condition:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.record = record
+                entry.expires = time.monotonic() + ttl
+            self._condition.notify_all()
+
+    def release(self, key):
+        with self._condition:
+            self._entries.pop(key, None)
+            self._condition.notify_all()
+
+
+class SharedMemoryIdempotencyStore(IdempotencyStore):
+    """
+    Store in a directory shared by the workers of one host
+
+    Each key is a small JSON file: first a pending claim naming its owner,
+    then the response. Files are read and replaced under a lock file (the
+    process-exclusive lock of the shared cache), so two workers never both
+    claim a key; duplicates poll the file until the response replaces the
+    claim. Claims expire after PENDING_LEASE seconds, so a worker killed
+    mid-request does not block the key. Expired files are swept every
+    SWEEP_INTERVAL seconds, and beyond max_entries the oldest go first.
+    """
+
+    PENDING_LEASE = 60  # longer than gunicorn lets a request run
+    POLL_INTERVAL = 0.05
+    SWEEP_INTERVAL = 60
+
+    def __init__(self, directory, max_entries=1000):
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        self.directory = directory
+        self.max_entries = max_entries
+        self._file = SharedMemoryFile(os.path.join(directory, '.lock'), 8)
+        self._owners = {}
+        self._next_sweep = 0.0
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.json')
+
+    @staticmethod
+    def _read(path):
+        try:
+            with open(path, encoding='utf-8') as entry_file:
+                return json.load(entry_file)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write(self, path, entry):
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix='.entry-')
+        with os.fdopen(fd, 'w', encoding='utf-8') as entry_file:
+            json.dump(entry, entry_file)
+        os.replace(temp_path, path)
+
+    def _sweep(self, now):
+        """Remove expired entries, then the oldest beyond max_entries (lock held)"""
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + self.SWEEP_INTERVAL
+
+        live = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.directory, name)
+            entry = self._read(path)
+            if entry is None or entry['expires'] <= now:
+                os.remove(path)
+            else:
+                live.append((entry['expires'], path))
+        live.sort()
+        for _, path in live[:max(0, len(live) - self.max_entries)]:
+            os.remove(path)
+
+    def begin(self, key, fingerprint, ttl, timeout):
+        deadline = time.monotonic() + timeout
+        owner = uuid.uuid4().hex
+        path = self._path(key)
+        try:
+            while True:
+                with self._file.lock():
+                    now = time.time()
+                    self._sweep(now)
+                    entry = self._read(path)
+                    if entry is None or entry['expires'] <= now:
+                        self._write(path, {'fingerprint': fingerprint, 'owner': owner,
+                                           'expires': now + self.PENDING_LEASE})
+                        self._owners[key] = owner
+                        return RUN, None
+
+                if entry['fingerprint'] != fingerprint:
+                    return MISMATCH, None
+                if 'record' in entry:
+                    return REPLAY, entry['record']
+                if time.monotonic() >= deadline:
+                    return BUSY, None
+                time.sleep(self.POLL_INTERVAL)
+        except OSError as e:
+            logger.warning(f"Idempotency store unavailable, running the request: {str(e)}")
+            return RUN, None
+
+    def complete(self, key, fingerprint, record, ttl):
+        self._owners.pop(key, None)
+        try:
+            with self._file.lock():
+                self._write(self._path(key), {'fingerprint': fingerprint, 'record': record,
+                                              'expires': time.time() + ttl})
+        except OSError as e:
+            logger.warning(f"Could not store idempotent response: {str(e)}")
+
+    def release(self, key):
+        owner = self._owners.pop(key, None)
+        if owner is None:
+            return
+        path = self._path(key)
+        try:
+            with self._file.lock():
+                entry = self._read(path)
+                if entry is not None and entry.get('owner') == owner:
+                    os.remove(path)
+        except OSError as e:
+            logger.warning(f"Could not release idempotency key: {str(e)}")
+
+
+# Deletes a pending claim only if it still belongs to the caller
+_RELEASE_SCRIPT = """
+local value = redis.call('GET', KEYS[1])
+if value and cjson.decode(value)['owner'] == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisIdempotencyStore(IdempotencyStore):
+    """
+    Store in Redis (or any server speaking its protocol)
+
+    A claim is a pending entry written with SET NX; duplicates poll it until
+    the response replaces it. Pending entries expire after PENDING_LEASE
+    seconds, so a worker killed mid-request does not block the key. If Redis
+    cannot be reached, requests run without idempotency.
+    """
+
+    PENDING_LEASE = 60  # longer than gunicorn lets a request run
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, url, prefix='byte:idempotency:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("IDEMPOTENCY_BACKEND=redis needs the redis package (pip install redis)")
+
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+        self._release = self._redis.register_script(_RELEASE_SCRIPT)
+        self._owners = {}
+
+    def begin(self, key, fingerprint, ttl, timeout):
+        deadline = time.monotonic() + timeout
+        owner = uuid.uuid4().hex
+        pending = json.dumps({'fingerprint': fingerprint, 'owner': owner})
+        try:
+            while True:
+                if self._redis.set(self.prefix + key, pending, nx=True, ex=self.PENDING_LEASE):
+                    self._owners[key] = owner
+                    return RUN, None
+
+                value = self._redis.get(self.prefix + key)
+                if value is None:
+                    continue  # expired or released in between: claim it
+                entry = json.loads(value)
+                if entry['fingerprint'] != fingerprint:
+                    return MISMATCH, None
+                if 'record' in entry:
+                    return REPLAY, entry['record']
+                if time.monotonic() >= deadline:
+                    return BUSY, None
+                time.sleep(self.POLL_INTERVAL)
+        except Exception as e:
+            logger.warning(f"Idempotency store unavailable, running the request: {str(e)}")
+            return RUN, None
+
+    def complete(self, key, fingerprint, record, ttl):
+        self._owners.pop(key, None)
+        try:
+            self._redis.set(self.prefix + key, json.dumps({'fingerprint': fingerprint, 'record': record}),
+                            ex=max(1, int(ttl)))
+        except Exception as e:
+            logger.warning(f"Could not store idempotent response: {str(e)}")
+
+    def release(self, key):
+        owner = self._owners.pop(key, None)
+        if owner is None:
+            return
+        try:
+            self._release(keys=[self.prefix + key], args=[owner])
+        except Exception as e:
+            logger.warning(f"Could not release idempotency key: {str(e)}")
+
+
+def create_idempotency_store(backend=None):
+    """
+    Create the store selected by IDEMPOTENCY_BACKEND
+
+    Args:
+        backend (str): 'local', 'shm' or 'redis' (default: Config.IDEMPOTENCY_BACKEND)
+
+    Returns:
+        IdempotencyStore: Store
+    """
+    backend = backend or Config.IDEMPOTENCY_BACKEND
+    if backend == 'local':
+        return LocalIdempotencyStore(Config.IDEMPOTENCY_MAX_ENTRIES)
+    if backend == 'shm':
+        shm_dir = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+        directory = Config.IDEMPOTENCY_SHM_PATH or os.path.join(shm_dir, 'byte-idempotency')
+        return SharedMemoryIdempotencyStore(directory, Config.IDEMPOTENCY_MAX_ENTRIES)
+    if backend == 'redis':
+        return RedisIdempotencyStore(Config.SHARED_CACHE_URL, Config.IDEMPOTENCY_PREFIX)
+    raise ValueError(f"Unknown IDEMPOTENCY_BACKEND: {backend}")
+
+
+# Process-wide store used by middleware/idempotency.py
+idempotency_store = create_idempotency_store()
@@ -0,0 +1,148 @@
+"""
+Image placeholders stored with each row
+Every team member, event, project and announcement keeps, next to its image
+URL, an image_meta JSONB column:
+
+    {"src": "<image URL>", "width": 1200, "height": 800,
+     "placeholder": "data:image/webp;base64,..."}
+
+so clients can reserve the image's box and paint a blurred preview before it
+loads, with no extra request. After each create or update a change listener
+queues the row on the image thread pool (see utils/images.py), which fetches
+the image, writes image_meta and publishes an 'updated' change so caches and
+snapshots pick it up. Rows whose image_meta already describes their current
+URL are left alone, so that change notice ends the cycle. Images that can
+never be read (not allowed, too large, not an image) get {"src": ..., "error": ...}
+and are retried when the URL changes or by `flask images placeholders --force`.
+When the image host cannot be reached, image_meta is left as it is, so the
+next write to the row or `flask images placeholders` tries again.
+"""
+import logging
+import threading
+from database import get_admin_client
+from utils.change_feed import add_change_listener, publish_change
+from utils.images import ImageSourceError, image_variants
+
+logger = logging.getLogger(__name__)
+
+# Table -> column holding its image URL
+IMAGE_COLUMNS = {
+    'team_members': 'profile_pic_url',
+    'events': 'image_url',
+    'projects': 'image_url',
+    'announcements': 'image_url',
+}
+META_COLUMN = 'image_meta'
+
+
+def compute_image_meta(url):
+    """
+    Describe the image at url
+
+    Args:
+        url (str): Image URL
+
+    Returns:
+        dict: src, width, height and placeholder, or src and error when the
+        image can never be used as it is (refused, too large, not an image)
+
+    Raises:
+        ImageSourceError: The image could not be fetched or rendered right now (5xx)
+    """
+    try:
+        return dict(image_variants.describe(image_variants.resolve(url)), src=url)
+    except ImageSourceError as e:
+        if e.status_code >= 500:
+            raise
+        return {'src': url, 'error': e.message}
+
+
+def refresh_image_meta(collection, document_id, force=False):
+    """
+    Bring a row's image_meta in line with its image URL
+
+    Args:
+        collection (str): Table name (one of IMAGE_COLUMNS)
+        document_id (str): Row ID
+        force (bool): Recompute even when image_meta matches the URL
+
+    Returns:
+        bool: True if image_meta was written
+    """
+    column = IMAGE_COLUMNS[collection]
+    supabase = get_admin_client()
+    rows = supabase.table(collection).select(f'id,{column},{META_COLUMN}').eq('id', document_id).execute().data
+    if not rows:
+        return False
+
+    url = rows[0].get(column) or None
+    meta = rows[0].get(META_COLUMN)
+    if not force and (meta or {}).get('src') == url:
+        return False
+
+    try:
+        new_meta = compute_image_meta(url) if url else None
+    except ImageSourceError as e:
+        # Temporary (host down, DNS, timeout): keep image_meta, so a later run retries
+        logger.warning(f"Image of {collection}/{document_id} unavailable, will retry: {e.message}")
+        return False
+    if new_meta is None and meta is None:
+        return False
+
+    # Only if the URL is unchanged, so a newer image is never given this one's placeholder
+    query = supabase.table(collection).update({META_COLUMN: new_meta}).eq('id', document_id)
+    query = query.eq(column, url) if url else query.is_(column, 'null')
+    response = query.execute()
+    if not response.data:
+        return False
+
+    publish_change(collection, document_id, 'updated', response.data[0].get('updated_at'))
+    return True
+
+
+class _PlaceholderQueue:
+    """Change listener queuing rows on the image pool, one job per row at a time"""
+
+    def __init__(self):
+        self._queued = set()
+        self._lock = threading.Lock()
+
+    def on_change(self, event):
+        collection = event['collection']
+        if collection not in IMAGE_COLUMNS or event['action'] == 'deleted':
+            return
+        key = (collection, event['document_id'])
+        with self._lock:
+            if key in self._queued:
+                return
+            self._queued.add(key)
+        try:
+            image_variants.submit(self._run, key)
+        except RuntimeError:  # pool shut down
+            with self._lock:
+                self._queued.discard(key)
+
+    def _run(self, key):
+        with self._lock:
+            self._queued.discard(key)
+        try:
+            refresh_image_meta(*key)
+        except Exception as e:
+            logger.error(f"Could not update the image placeholder of {key[0]}/{key[1]}: {str(e)}")
+
+
+# One queue per worker, however many apps are created
+_queue = _PlaceholderQueue()
+
+
+def register_image_placeholders(app):
+    """
+    Compute image placeholders after every write to a table with images
+    Does nothing unless IMAGE_PLACEHOLDERS_ENABLED is set in the app config.
+
+    Args:
+        app: Flask application instance
+    """
+    if not app.config.get('IMAGE_PLACEHOLDERS_ENABLED'):
+        return
+    add_change_listener(_queue.on_change)
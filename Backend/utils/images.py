@@ -0,0 +1,531 @@
+"""
+Resized image variants
+Smaller WebP, AVIF, JPEG or PNG copies of the images referenced by team
+members, events, projects and announcements (served by routes/images.py).
+Each original is fetched once. Variants are rendered by a small thread pool,
+never on a request thread, and kept on disk under content-addressed names:
+- originals/<sha256 of the original's bytes>
+- variants/<sha256 of the original's digest, width and output settings>.<ext>
+- refs/<sha256 of the source>: digest of the original it pointed to
+The directory is trimmed to IMAGE_CACHE_MAX_MB, least recently used first.
+The same pool computes the placeholders of utils/image_placeholders.py.
+"""
+import base64
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import httpx
+from PIL import Image, ImageOps, features
+from config import Config
+from utils.cache import TTLCache
+from utils.metrics import record_image_render
+from utils.shutdown import register_shutdown_hook
+
+logger = logging.getLogger(__name__)
+
+# Output format -> (Pillow format, mimetype, file extension, encoder options)
+FORMATS = {
+    'avif': ('AVIF', 'image/avif', 'avif', {'quality': 55, 'speed': 8}),
+    'webp': ('WEBP', 'image/webp', 'webp', {'quality': 75, 'method': 4}),
+    'jpeg': ('JPEG', 'image/jpeg', 'jpg', {'quality': 80, 'optimize': True, 'progressive': True}),
+    'png': ('PNG', 'image/png', 'png', {'optimize': True}),
+}
+
+
+def _can_encode(fmt):
+    if fmt in ('jpeg', 'png'):
+        return True
+    try:
+        return bool(features.check(fmt))
+    except ValueError:  # feature unknown to this Pillow version
+        return False
+
+
+# Formats this Pillow build can write (AVIF needs Pillow 11.3 or newer)
+AVAILABLE_FORMATS = tuple(fmt for fmt in FORMATS if _can_encode(fmt))
+
+# Variant renders queued or running per worker; further misses are not queued
+MAX_PENDING = 256
+
+# Placeholders fit in this many pixels a side, encoded as a WebP data URI (~200 bytes)
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_QUALITY = 40
+
+# EXIF orientations that swap width and height
+ORIENTATION_TAG = 0x0112
+ROTATED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+class ImageSourceError(Exception):
+    """The original cannot be used: not allowed, missing, too large or not an image"""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+class ImageSource:
+    """
+    A validated original: a URL, or a file under IMAGE_SOURCE_DIR
+
+    key identifies the original's current version; for files it changes
+    when the file is modified.
+    """
+
+    __slots__ = ('src', 'path', 'key')
+
+    def __init__(self, src, path=None, version=''):
+        self.src = src
+        self.path = path
+        self.key = hashlib.sha256(f'{src}\n{version}'.encode('utf-8')).hexdigest()
+
+
+def _sharded(kind, digest, ext=''):
+    return os.path.join(kind, digest[:2], digest + ext)
+
+
+class DiskCache:
+    """
+    Directory of immutable files, trimmed least recently used first
+
+    A file's modification time is its last use. Every worker writes to the
+    same directory; files are written to a temporary name and renamed, so
+    readers never see partial files.
+    """
+
+    TOUCH_AFTER = 60  # seconds between recorded uses of one file
+    TRIM_TO = 0.9  # share of max_bytes kept after an eviction
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._size = None  # bytes stored, estimated by this worker between scans
+        self._lock = threading.Lock()
+        self._evict_lock = threading.Lock()
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def lookup(self, name):
+        """
+        Path of a stored file, marking it as used
+
+        Args:
+            name (str): File name relative to the cache directory
+
+        Returns:
+            str: Absolute path, or None when the file is not stored
+        """
+        path = self.path(name)
+        try:
+            modified = os.stat(path).st_mtime
+        except FileNotFoundError:
+            return None
+        if modified < time.time() - self.TOUCH_AFTER:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return path
+
+    def read(self, name):
+        """Contents of a stored file, or None"""
+        path = self.lookup(name)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as stored:
+                return stored.read()
+        except FileNotFoundError:
+            return None
+
+    def store(self, name, data):
+        """
+        Store a file, evicting old files when the cache is over its size
+
+        Args:
+            name (str): File name relative to the cache directory
+            data (bytes): Contents
+
+        Returns:
+            str: Absolute path
+        """
+        path = self.path(name)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as output:
+                output.write(data)
+            os.replace(temporary, path)
+        except BaseException:
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+            raise
+
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._files())
+            else:
+                self._size += len(data)
+            over = self._size > self.max_bytes
+        if over:
+            self.evict()
+        return path
+
+    def _files(self):
+        """(last use, size, path) of every stored file"""
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def evict(self):
+        """
+        Remove the least recently used files until the cache is below TRIM_TO of its size
+
+        Returns:
+            int: Files removed
+        """
+        with self._evict_lock:
+            files = sorted(self._files())
+            total = sum(size for _, size, _ in files)
+            target = self.max_bytes * self.TRIM_TO
+            removed = 0
+            for _, size, path in files:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+            with self._lock:
+                self._size = total
+        if removed:
+            logger.info(f"Image cache: evicted {removed} file(s), {total / 1e6:.1f} MB left")
+        return removed
+
+
+class ImageVariants:
+    """
+    Resolves image sources and renders their variants in a thread pool
+
+    Args:
+        cache (DiskCache): Where originals and variants are kept
+        workers (int): Threads fetching and resizing
+        allowed_hosts (iterable): Hosts images may be fetched from
+        source_dir (str): Directory served for src=/path (None disables)
+        fetch_timeout (float): Seconds per download
+        max_source_bytes (int): Largest original accepted
+        max_pixels (int): Largest original accepted, in pixels
+    """
+
+    def __init__(self, cache, workers=2, allowed_hosts=(), source_dir=None, fetch_timeout=10.0,
+                 max_source_bytes=20_000_000, max_pixels=40_000_000):
+        self.cache = cache
+        self.allowed_hosts = {host.lower() for host in allowed_hosts}
+        self.source_dir = os.path.realpath(source_dir) if source_dir else None
+        self.max_source_bytes = max_source_bytes
+        self.max_pixels = max_pixels
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='images')
+        self._client = httpx.Client(
+            timeout=fetch_timeout, follow_redirects=True, max_redirects=3,
+            event_hooks={'request': [self._check_request]}
+        )
+        self._digests = TTLCache(ttl=3600, max_entries=4096)  # source key -> digest of its original
+        self._failures = TTLCache(ttl=60, max_entries=1024)  # source key -> ImageSourceError
+        self._jobs = {}
+        self._jobs_lock = threading.Lock()
+        self._source_locks = [threading.Lock() for _ in range(64)]
+
+    def resolve(self, src):
+        """
+        Validate the src parameter of a request
+
+        Args:
+            src (str): http(s) URL on an allowed host, or /path under the source directory
+
+        Returns:
+            ImageSource: Source
+
+        Raises:
+            ImageSourceError: If the source is not allowed or the file does not exist
+        """
+        if not src:
+            raise ImageSourceError("src is required")
+
+        if src.startswith(('http://', 'https://')):
+            host = (urlparse(src).hostname or '').lower()
+            if host not in self.allowed_hosts:
+                raise ImageSourceError(f"Images from {host or 'this URL'} are not allowed", 403)
+            return ImageSource(src)
+
+        if self.source_dir is None or not src.startswith('/'):
+            raise ImageSourceError("src must be an http(s) URL")
+        path = os.path.realpath(os.path.join(self.source_dir, src.lstrip('/')))
+        if os.path.commonpath([self.source_dir, path]) != self.source_dir:
+            raise ImageSourceError("src is outside the image directory", 403)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            raise ImageSourceError("Image not found", 404)
+        return ImageSource(src, path, f'{stat.st_mtime_ns}:{stat.st_size}')
+
+    @staticmethod
+    def variant_name(digest, width, fmt):
+        """Cache name of a variant (its digest doubles as the ETag)"""
+        settings = f'{digest}:{width}:{fmt}:{sorted(FORMATS[fmt][3].items())}'
+        return _sharded('variants', hashlib.sha256(settings.encode('utf-8')).hexdigest(), '.' + FORMATS[fmt][2])
+
+    def lookup(self, source, width, fmt):
+        """
+        Find a rendered variant, without rendering it
+
+        Args:
+            source (ImageSource): Original
+            width (int): Width bucket
+            fmt (str): Output format
+
+        Returns:
+            tuple: (path, etag), or None when the variant is not rendered yet
+        """
+        digest = self._digest(source)
+        if digest is None:
+            return None
+        name = self.variant_name(digest, width, fmt)
+        path = self.cache.lookup(name)
+        if path is None:
+            return None
+        return path, os.path.basename(name).split('.')[0]
+
+    def failure(self, source):
+        """The error of a recent failed render of this source, or None"""
+        return self._failures.get(source.key)
+
+    def render(self, source, width, fmt):
+        """
+        Queue a variant for rendering; identical requests share one job
+
+        Args:
+            source (ImageSource): Original
+            width (int): Width bucket
+            fmt (str): Output format
+
+        Returns:
+            Future: Resolves to (path, etag), or None when too many renders are pending
+        """
+        job_key = (source.key, width, fmt)
+        with self._jobs_lock:
+            future = self._jobs.get(job_key)
+            if future is not None:
+                return future
+            if len(self._jobs) >= MAX_PENDING:
+                return None
+            future = self._executor.submit(self._render, source, width, fmt)
+            self._jobs[job_key] = future
+        future.add_done_callback(lambda _: self._forget(job_key))
+        return future
+
+    def submit(self, fn, *args):
+        """
+        Run other image work (e.g. placeholders) on the same thread pool
+
+        Returns:
+            Future: Result of fn(*args)
+        """
+        return self._executor.submit(fn, *args)
+
+    def describe(self, source):
+        """
+        Intrinsic size and a tiny blurred-up placeholder of an original
+
+        Runs on the calling thread; call it from the pool (see submit()).
+
+        Args:
+            source (ImageSource): Original
+
+        Returns:
+            dict: width, height (after EXIF orientation) and placeholder (data URI)
+
+        Raises:
+            ImageSourceError: If the original cannot be fetched or read
+        """
+        _, data = self._original(source)
+        try:
+            with Image.open(io.BytesIO(data)) as original:
+                if original.width * original.height > self.max_pixels:
+                    raise ImageSourceError("Image has too many pixels", 413)
+                width, height = original.size
+                if original.getexif().get(ORIENTATION_TAG) in ROTATED_ORIENTATIONS:
+                    width, height = height, width
+                original.draft('RGB', (PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+                image = ImageOps.exif_transpose(original)
+                image.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.Resampling.BOX)
+                has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+                image = image.convert('RGBA' if has_alpha else 'RGB')
+                output = io.BytesIO()
+                image.save(output, 'WEBP', quality=PLACEHOLDER_QUALITY)
+        except (Image.UnidentifiedImageError, Image.DecompressionBombError, OSError, SyntaxError, ValueError):
+            raise ImageSourceError("Source is not a supported image", 422)
+
+        return {
+            'width': width,
+            'height': height,
+            'placeholder': 'data:image/webp;base64,' + base64.b64encode(output.getvalue()).decode('ascii'),
+        }
+
+    def _forget(self, job_key):
+        with self._jobs_lock:
+            self._jobs.pop(job_key, None)
+
+    def _render(self, source, width, fmt):
+        started = time.perf_counter()
+        try:
+            digest, data = self._original(source)
+            name = self.variant_name(digest, width, fmt)
+            path = self.cache.lookup(name)
+            if path is None:
+                path = self.cache.store(name, self._resize(data, width, fmt))
+        except ImageSourceError as e:
+            self._failures.set(source.key, e)
+            record_image_render(fmt, 'error', time.perf_counter() - started)
+            raise
+        except Exception as e:
+            logger.warning(f"Could not render {source.src} at {width}px as {fmt}: {str(e)}")
+            self._failures.set(source.key, ImageSourceError("Could not render the image", 502))
+            record_image_render(fmt, 'error', time.perf_counter() - started)
+            raise
+
+        record_image_render(fmt, 'ok', time.perf_counter() - started)
+        return path, os.path.basename(name).split('.')[0]
+
+    def _digest(self, source):
+        digest = self._digests.get(source.key)
+        if digest is None:
+            stored = self.cache.read(_sharded('refs', source.key))
+            if stored is not None:
+                digest = stored.decode('ascii')
+                self._digests.set(source.key, digest)
+        return digest
+
+    def _original(self, source):
+        """(digest, bytes) of the original, fetched at most once per source"""
+        with self._source_locks[int(source.key[:8], 16) % len(self._source_locks)]:
+            digest = self._digest(source)
+            if digest is not None:
+                data = self.cache.read(_sharded('originals', digest))
+                if data is not None:
+                    return digest, data
+
+            data = self._read_file(source.path) if source.path else self._fetch(source.src)
+            digest = hashlib.sha256(data).hexdigest()
+            self.cache.store(_sharded('originals', digest), data)
+            self.cache.store(_sharded('refs', source.key), digest.encode('ascii'))
+            self._digests.set(source.key, digest)
+            return digest, data
+
+    def _read_file(self, path):
+        if os.path.getsize(path) > self.max_source_bytes:
+            raise ImageSourceError("Image is too large", 413)
+        with open(path, 'rb') as original:
+            return original.read()
+
+    def _check_request(self, request):
+        """httpx hook: redirects must stay on allowed hosts"""
+        if (request.url.host or '').lower() not in self.allowed_hosts:
+            raise ImageSourceError(f"Image redirected to {request.url.host}, which is not allowed", 403)
+
+    def _fetch(self, url):
+        try:
+            with self._client.stream('GET', url) as response:
+                if response.status_code != 200:
+                    raise ImageSourceError(f"Image source answered {response.status_code}", 502)
+                if int(response.headers.get('Content-Length') or 0) > self.max_source_bytes:
+                    raise ImageSourceError("Image is too large", 413)
+                chunks, size = [], 0
+                for chunk in response.iter_bytes():
+                    size += len(chunk)
+                    if size > self.max_source_bytes:
+                        raise ImageSourceError("Image is too large", 413)
+                    chunks.append(chunk)
+                return b''.join(chunks)
+        except httpx.HTTPError as e:
+            raise ImageSourceError(f"Could not fetch the image: {str(e)}", 502)
+
+    def _resize(self, data, width, fmt):
+        """Encode the original at most width pixels wide"""
+        pil_format, _, _, options = FORMATS[fmt]
+        try:
+            with Image.open(io.BytesIO(data)) as original:
+                if original.width * original.height > self.max_pixels:
+                    raise ImageSourceError("Image has too many pixels", 413)
+                # JPEG: decode at a reduced scale that still covers width either way up
+                original.draft('RGB', (width, width))
+                image = ImageOps.exif_transpose(original)
+                if image.width > width:
+                    image.thumbnail((width, image.height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+                has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+                if fmt == 'jpeg' and has_alpha:
+                    rgba = image.convert('RGBA')
+                    image = Image.new('RGB', rgba.size, 'white')
+                    image.paste(rgba, mask=rgba.getchannel('A'))
+                else:
+                    image = image.convert('RGBA' if has_alpha else 'RGB')
+
+                output = io.BytesIO()
+                image.save(output, pil_format, **options)
+                return output.getvalue()
+        except (Image.UnidentifiedImageError, Image.DecompressionBombError, OSError, SyntaxError, ValueError):
+            raise ImageSourceError("Source is not a supported image", 422)
+
+    def shutdown(self, timeout):
+        """Stop rendering (queued renders are dropped) and close the HTTP client"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._client.close()
+
+
+def create_image_variants():
+    """
+    Create the image service configured by the IMAGE_* settings
+
+    Returns:
+        ImageVariants: Service
+    """
+    if Config.IMAGE_ALLOWED_HOSTS is not None:
+        allowed_hosts = [host.strip() for host in Config.IMAGE_ALLOWED_HOSTS.split(',') if host.strip()]
+    else:
+        # Supabase Storage lives on the project's host
+        allowed_hosts = [urlparse(Config.SUPABASE_URL).hostname] if Config.SUPABASE_URL else []
+
+    return ImageVariants(
+        DiskCache(Config.IMAGE_CACHE_DIR, int(Config.IMAGE_CACHE_MAX_MB * 1e6)),
+        workers=Config.IMAGE_WORKERS,
+        allowed_hosts=allowed_hosts,
+        source_dir=Config.IMAGE_SOURCE_DIR,
+        fetch_timeout=Config.IMAGE_FETCH_TIMEOUT,
+        max_source_bytes=int(Config.IMAGE_MAX_SOURCE_MB * 1e6),
+        max_pixels=Config.IMAGE_MAX_PIXELS,
+    )
+
+
+# Process-wide service used by routes/images.py
+image_variants = create_image_variants()
+register_shutdown_hook(image_variants.shutdown)
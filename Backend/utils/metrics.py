@@ -0,0 +1,244 @@
+"""
+Prometheus metrics
+Exposed in the Prometheus text format at GET /api/metrics.
+
+With several gunicorn workers, every worker writes its samples to
+PROMETHEUS_MULTIPROC_DIR and one scrape aggregates the whole process group.
+gunicorn.conf.py creates a fresh temporary directory when it is not set.
+"""
+import os
+from time import perf_counter
+from flask import g, request
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram, REGISTRY,
+    CONTENT_TYPE_LATEST, generate_latest
+)
+from prometheus_client import multiprocess
+from database import add_query_observer, async_query_single_flight, circuit_breakers, query_single_flight
+from utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN
+
+# Latency buckets in seconds, tuned for Supabase round trips (tens of ms)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+
+HTTP_REQUESTS = Counter(
+    'byte_http_requests_total', 'HTTP requests handled',
+    ['endpoint', 'method', 'status']
+)
+HTTP_REQUEST_LATENCY = Histogram(
+    'byte_http_request_duration_seconds', 'HTTP request latency',
+    ['endpoint', 'method', 'status'], buckets=LATENCY_BUCKETS
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    'byte_http_requests_in_flight', 'HTTP requests currently being handled',
+    multiprocess_mode='livesum'
+)
+DB_QUERY_LATENCY = Histogram(
+    'byte_db_query_duration_seconds', 'Database call latency',
+    ['table', 'operation'], buckets=LATENCY_BUCKETS
+)
+DB_QUERY_ERRORS = Counter(
+    'byte_db_query_errors_total', 'Database calls that raised an error',
+    ['table', 'operation']
+)
+CACHE_REQUESTS = Counter(
+    'byte_cache_requests_total', 'Cache lookups by result (hit/miss)',
+    ['cache', 'result']
+)
+DB_QUERIES_COALESCED = Counter(
+    'byte_db_queries_coalesced_total', 'Selects that shared an identical in-flight query instead of running',
+    ['table']
+)
+CIRCUIT_STATE = Gauge(
+    'byte_circuit_state', 'Circuit breaker state per table (0 closed, 1 half-open, 2 open)',
+    ['table'], multiprocess_mode='max'
+)
+STALE_RESPONSES = Counter(
+    'byte_stale_responses_total', 'Last known good responses served after an error',
+    ['endpoint']
+)
+RATE_LIMITED = Counter(
+    'byte_rate_limited_total', 'Requests refused with 429 by a token bucket',
+    ['scope']
+)
+SHED_REQUESTS = Counter(
+    'byte_shed_requests_total', 'Requests refused with 503 to shed load',
+    ['priority', 'reason']
+)
+OVERLOAD_LEVEL = Gauge(
+    'byte_overload_level', 'Load shedding level (0 keeping up, 1 shedding expensive, 2 shedding normal)',
+    multiprocess_mode='max'
+)
+IDEMPOTENT_REQUESTS = Counter(
+    'byte_idempotent_requests_total', 'Requests sent with an Idempotency-Key, by outcome',
+    ['endpoint', 'outcome']
+)
+IMAGE_REQUESTS = Counter(
+    'byte_image_requests_total', 'Image variant requests, by result',
+    ['result']
+)
+IMAGE_RENDER_LATENCY = Histogram(
+    'byte_image_render_duration_seconds', 'Image variant render latency (fetch, resize and encode)',
+    ['format', 'result'], buckets=LATENCY_BUCKETS
+)
+AUTH_VERIFY_LATENCY = Histogram(
+    'byte_auth_verify_duration_seconds', 'Token verification latency',
+    buckets=LATENCY_BUCKETS
+)
+
+
+def record_cache_lookup(cache_name, hit):
+    """
+    Count a cache lookup (hit ratio = hit / (hit + miss))
+
+    Args:
+        cache_name (str): Name of the cache
+        hit (bool): Whether the lookup was a hit
+    """
+    CACHE_REQUESTS.labels(cache=cache_name, result='hit' if hit else 'miss').inc()
+
+
+def _record_query(table, operation, duration, error):
+    """Query observer recording database call latency by table"""
+    operation = operation or 'query'
+    DB_QUERY_LATENCY.labels(table=table, operation=operation).observe(duration)
+    if error is not None:
+        DB_QUERY_ERRORS.labels(table=table, operation=operation).inc()
+
+
+def record_stale_response(endpoint):
+    """
+    Count a stale response served in place of an error
+
+    Args:
+        endpoint (str): Flask endpoint name
+    """
+    STALE_RESPONSES.labels(endpoint=endpoint or 'unmatched').inc()
+
+
+def record_rate_limited(scope):
+    """
+    Count a request refused by a rate limit
+
+    Args:
+        scope (str): Bucket scope ('ip' or 'user')
+    """
+    RATE_LIMITED.labels(scope=scope).inc()
+
+
+def record_shed_request(priority, reason):
+    """
+    Count a request shed under load
+
+    Args:
+        priority (str): Request priority ('normal' or 'expensive')
+        reason (str): 'overload' (queue detected) or 'concurrency' (expensive cap)
+    """
+    SHED_REQUESTS.labels(priority=priority, reason=reason).inc()
+
+
+def record_overload_level(level):
+    """
+    Export the load shedding level of this worker
+
+    Args:
+        level (int): 0, 1 or 2
+    """
+    OVERLOAD_LEVEL.set(level)
+
+
+def record_idempotent_request(endpoint, outcome):
+    """
+    Count a request made with an Idempotency-Key
+
+    Args:
+        endpoint (str): Flask endpoint name
+        outcome (str): 'run', 'replay', 'mismatch' or 'busy'
+    """
+    IDEMPOTENT_REQUESTS.labels(endpoint=endpoint or 'unmatched', outcome=outcome).inc()
+
+
+def record_image_request(result):
+    """
+    Count a request for an image variant
+
+    Args:
+        result (str): 'hit' (served from disk), 'rendered' (rendered while waiting)
+            or 'fallback' (answered with the original)
+    """
+    IMAGE_REQUESTS.labels(result=result).inc()
+
+
+def record_image_render(fmt, result, duration):
+    """
+    Record one image variant render
+
+    Args:
+        fmt (str): Output format
+        result (str): 'ok' or 'error'
+        duration (float): Seconds
+    """
+    IMAGE_RENDER_LATENCY.labels(format=fmt, result=result).observe(duration)
+
+
+def _record_circuit_state(table, state):
+    """Circuit breaker listener exporting the state of each breaker"""
+    CIRCUIT_STATE.labels(table=table).set({CLOSED: 0, HALF_OPEN: 1, OPEN: 2}[state])
+
+
+def _record_coalesced(key):
+    """Single-flight listener counting selects served by a shared query"""
+    DB_QUERIES_COALESCED.labels(table=key[1]).inc()
+
+
+def render_metrics():
+    """
+    Render all metrics in the Prometheus text format
+
+    Returns:
+        tuple: (body, status_code, headers)
+    """
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return generate_latest(registry), 200, {'Content-Type': CONTENT_TYPE_LATEST}
+
+
+def register_metrics(app):
+    """
+    Register request metrics hooks with Flask application
+    Does nothing unless METRICS_ENABLED is set in the app config.
+
+    Args:
+        app: Flask application instance
+    """
+    if not app.config.get('METRICS_ENABLED'):
+        return
+
+    add_query_observer(_record_query)
+    query_single_flight.add_listener(_record_coalesced)
+    async_query_single_flight.add_listener(_record_coalesced)
+    circuit_breakers.add_listener(_record_circuit_state)
+
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_started = perf_counter()
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+
+    @app.after_request
+    def record_request_metrics(response):
+        started = g.get('metrics_started')
+        if started is not None:
+            # Unmatched URLs share one label to keep cardinality bounded
+            endpoint = request.endpoint or 'unmatched'
+            labels = (endpoint, request.method, str(response.status_code))
+            HTTP_REQUESTS.labels(*labels).inc()
+            HTTP_REQUEST_LATENCY.labels(*labels).observe(perf_counter() - started)
+        return response
+
+    @app.teardown_request
+    def finish_request_metrics(exc):
+        if g.pop('metrics_started', None) is not None:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
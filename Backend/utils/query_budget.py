@@ -0,0 +1,163 @@
+"""
+Database round-trip budget
+Counts every Supabase call made while handling a request, logs a warning with
+the call sites when a request exceeds DB_CALLS_WARN_THRESHOLD, and provides
+an assertion helper so tests can pin each endpoint's maximum round trips.
+
+Usage in tests:
+    from utils.query_budget import assert_max_db_calls
+
+    with assert_max_db_calls(1):
+        client.get('/api/events')
+"""
+import logging
+import os
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from flask import g, request, has_request_context
+from database import add_query_observer
+
+logger = logging.getLogger(__name__)
+
+# Frames from these files are skipped when looking for a call site
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+_SKIPPED_FILES = {
+    os.path.join(_BACKEND_DIR, 'database.py'),
+    os.path.join(_BACKEND_DIR, 'utils', 'single_flight.py'),
+    os.path.abspath(__file__),
+}
+
+# Trackers opened by count_db_calls(), notified from any thread
+_trackers = []
+_trackers_lock = threading.Lock()
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised by assert_max_db_calls() when a block makes too many database calls"""
+
+
+class DBCallTracker:
+    """Collects (table, operation, call_site) for each database call"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __len__(self):
+        return len(self.calls)
+
+    def summary(self):
+        """
+        Group calls by call site
+
+        Returns:
+            list: 'count x table.operation at call_site' strings, most frequent first
+        """
+        counts = Counter(self.calls)
+        return [
+            f"{count} x {table}.{operation or 'query'} at {call_site}"
+            for (table, operation, call_site), count in counts.most_common()
+        ]
+
+
+def find_call_site():
+    """
+    Find the first frame in application code outside the database layer
+
+    Returns:
+        str: 'path/to/file.py:line in function'
+    """
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_BACKEND_DIR) and filename not in _SKIPPED_FILES:
+            return f"{filename[len(_BACKEND_DIR):]}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return 'unknown'
+
+
+def _record_query(table, operation, duration, error):
+    """Query observer recording the call against the request and open trackers"""
+    in_request = has_request_context() and 'db_calls' in g
+    if not in_request and not _trackers:
+        return
+
+    call = (table, operation, find_call_site())
+
+    if in_request:
+        g.db_calls.calls.append(call)
+
+    with _trackers_lock:
+        for tracker in _trackers:
+            tracker.calls.append(call)
+
+
+@contextmanager
+def count_db_calls():
+    """
+    Count database calls made inside the block, from any thread
+
+    Yields:
+        DBCallTracker: Tracker holding the calls made so far
+    """
+    # Also needed when per-request counting is off (DB_CALLS_WARN_THRESHOLD=0)
+    add_query_observer(_record_query)
+    tracker = DBCallTracker()
+    with _trackers_lock:
+        _trackers.append(tracker)
+    try:
+        yield tracker
+    finally:
+        with _trackers_lock:
+            _trackers.remove(tracker)
+
+
+@contextmanager
+def assert_max_db_calls(limit):
+    """
+    Fail if the block makes more than `limit` database calls
+
+    Args:
+        limit (int): Maximum number of database round trips allowed
+
+    Raises:
+        QueryBudgetExceeded: With the offending call sites
+    """
+    with count_db_calls() as tracker:
+        yield tracker
+
+    if len(tracker) > limit:
+        raise QueryBudgetExceeded(
+            f"Expected at most {limit} database calls, got {len(tracker)}:\n  "
+            + '\n  '.join(tracker.summary())
+        )
+
+
+def register_query_budget(app):
+    """
+    Register per-request database call counting with Flask application
+    Requests making more than DB_CALLS_WARN_THRESHOLD calls are logged.
+
+    Args:
+        app: Flask application instance
+    """
+    threshold = app.config.get('DB_CALLS_WARN_THRESHOLD')
+    if not threshold:
+        return
+
+    add_query_observer(_record_query)
+
+    @app.before_request
+    def start_db_call_tracking():
+        g.db_calls = DBCallTracker()
+
+    @app.after_request
+    def check_db_call_budget(response):
+        tracker = g.pop('db_calls', None)
+        if tracker is not None and len(tracker) > threshold:
+            logger.warning(
+                f"{request.method} {request.path} ({request.endpoint}) made {len(tracker)} "
+                f"database calls (threshold {threshold}):\n  " + '\n  '.join(tracker.summary())
+            )
+        return response
@@ -2,6 +2,7 @@
 Response utility functions for consistent API responses
 """
 from flask import jsonify
+from middleware.timing import timed
 
 
 def success_response(data=None, message=None, status_code=200):
@@ -24,7 +25,8 @@ def success_response(data=None, message=None, status_code=200):
     if data is not None:
         response['data'] = data
 
-    return jsonify(response), status_code
+    with timed('serialize'):
+        return jsonify(response), status_code
 
 
 def error_response(message, error=None, status_code=400):
@@ -46,7 +48,8 @@ def error_response(message, error=None, status_code=400):
     if error:
         response['error'] = error
 
-    return jsonify(response), status_code
+    with timed('serialize'):
+        return jsonify(response), status_code
 
 
 def created_response(data, message="Resource created successfully"):
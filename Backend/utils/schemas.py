@@ -0,0 +1,242 @@
+"""
+Declarative request body schemas
+Each resource lists its fields once. A Schema compiles them, when it is
+defined, into two plain Python functions (one for creates, one for partial
+updates) that check every field in a single pass and return all errors at
+once, instead of re-running a chain of helpers from utils/validators.py on
+every request.
+"""
+import re
+from datetime import date
+
+# JSON type of a field -> (Python type, name used in error messages)
+KINDS = {
+    'string': (str, 'a string'),
+    'integer': (int, 'an integer'),
+    'boolean': (bool, 'a boolean'),
+    'array': (list, 'an array'),
+    'object': (dict, 'an object'),
+}
+
+_DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+
+def _is_date(value):
+    """YYYY-MM-DD naming a real day (same rule as validate_date_format)"""
+    if not _DATE_PATTERN.fullmatch(value):
+        return False
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _is_url(value):
+    return value.startswith(('http://', 'https://'))
+
+
+def _is_email(value):
+    return '@' in value
+
+
+# format -> (check on a string, error message suffix)
+FORMATS = {
+    'date': (_is_date, 'must be in YYYY-MM-DD format'),
+    'url': (_is_url, 'must be a valid URL'),
+    'email': (_is_email, 'must be a valid email address'),
+}
+
+NOT_AN_OBJECT = "Request body must be a JSON object"
+
+
+class Field:
+    """
+    One field of a request body
+
+    Args:
+        kind (str): JSON type, one of KINDS (None accepts any JSON value)
+        required (bool): Must be present and not null or empty on create, and
+            cannot be cleared by an update
+        choices (tuple): Allowed values
+        format (str): String format, one of FORMATS
+        items (str): JSON type of every element of an array
+        min_items (int): Smallest allowed array length
+    """
+
+    __slots__ = ('kind', 'required', 'choices', 'format', 'items', 'min_items')
+
+    def __init__(self, kind=None, required=False, choices=None, format=None, items=None, min_items=0):
+        if kind is not None and kind not in KINDS:
+            raise ValueError(f"Unknown field kind: {kind}")
+        if format is not None and (format not in FORMATS or kind != 'string'):
+            raise ValueError(f"format {format!r} needs a known format on a string field")
+        if (items is not None or min_items) and kind != 'array':
+            raise ValueError("items and min_items only apply to array fields")
+        if items is not None and items not in KINDS:
+            raise ValueError(f"Unknown item kind: {items}")
+        self.kind = kind
+        self.required = required
+        self.choices = tuple(choices) if choices is not None else None
+        self.format = format
+        self.items = items
+        self.min_items = min_items
+
+
+class Schema:
+    """
+    Fields of one resource, compiled into validators
+
+    Attributes:
+        validate_create: function(data) -> list of error messages; required
+            fields must be present
+        validate_update: function(data) -> list of error messages; only the
+            fields present are checked
+    """
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = dict(fields)
+        self.validate_create = self._compile(partial=False)
+        self.validate_update = self._compile(partial=True)
+
+    def _compile(self, partial):
+        """Generate the source of one validator and build it with exec()"""
+        namespace = {'NOT_AN_OBJECT': NOT_AN_OBJECT}
+        lines = [
+            'def validate(data):',
+            '    if type(data) is not dict:',
+            '        return [NOT_AN_OBJECT]',
+            '    errors = []',
+        ]
+        if not partial:
+            lines.append('    missing = []')
+
+        for index, (name, field) in enumerate(self.fields.items()):
+            key = repr(name)
+            if partial:
+                lines += [f'    if {key} in data:', f'        value = data[{key}]']
+                indent = ' ' * 8
+                empty = f'errors.append({name + " cannot be empty"!r})'
+            else:
+                lines.append(f'    value = data.get({key})')
+                indent = ' ' * 4
+                empty = f'missing.append({key})'
+
+            # Optional fields may be omitted, null or empty; required ones may not
+            lines += [f"{indent}if value is None or value == '':", f"{indent}    {empty if field.required else 'pass'}"]
+            for condition, message in self._checks(name, field, index, namespace):
+                lines += [f'{indent}elif {condition}:', f'{indent}    errors.append({message!r})']
+
+        if not partial:
+            lines += [
+                '    if missing:',
+                "        errors.insert(0, 'Missing required fields: ' + ', '.join(missing))",
+            ]
+        lines.append('    return errors')
+
+        source = '\n'.join(lines)
+        exec(compile(source, f'<schema {self.name} {"update" if partial else "create"}>', 'exec'), namespace)
+        validate = namespace['validate']
+        validate.__doc__ = f"Generated validator for {self.name} {'update' if partial else 'create'} request bodies"
+        validate.source = source
+        return validate
+
+    @staticmethod
+    def _checks(name, field, index, namespace):
+        """(condition, error message) pairs for one field, cheapest first"""
+        checks = []
+        if field.kind is not None:
+            python_type, description = KINDS[field.kind]
+            namespace[f'T{index}'] = python_type
+            checks.append((f'type(value) is not T{index}', f'{name} must be {description}'))
+
+        if field.choices is not None:
+            namespace[f'C{index}'] = frozenset(field.choices)
+            checks.append((f'value not in C{index}', f"{name} must be one of: {', '.join(field.choices)}"))
+
+        if field.format is not None:
+            check, message = FORMATS[field.format]
+            namespace[f'F{index}'] = check
+            checks.append((f'not F{index}(value)', f'{name} {message}'))
+
+        if field.min_items:
+            noun = 'a non-empty array' if field.min_items == 1 else f'an array of at least {field.min_items} items'
+            checks.append((f'len(value) < {field.min_items}', f'{name} must be {noun}'))
+
+        if field.items is not None:
+            python_type, description = KINDS[field.items]
+            namespace[f'I{index}'] = python_type
+            plural = description.split(' ', 1)[1] + 's'
+            checks.append((f'any(type(item) is not I{index} for item in value)', f'{name} must be an array of {plural}'))
+        return checks
+
+
+# Resource schemas, mirroring the columns and CHECK constraints in supabaseSchema.sql
+
+EVENT_TYPES = ('workshop', 'hackathon', 'networking', 'social', 'competition')
+PROJECT_STATUSES = ('On-going', 'Completed')
+PROJECT_TYPES = ('current', 'past')
+USER_ROLES = ('owner', 'admin', 'member')
+USER_STATUSES = ('active', 'inactive', 'suspended')
+
+EVENT_SCHEMA = Schema('event', {
+    'id': Field('string', required=True),
+    'title': Field('string', required=True),
+    'date': Field('string', required=True, format='date'),
+    'description': Field('string', required=True),
+    'image_url': Field('string'),
+    'location': Field('string'),
+    'type': Field('string', choices=EVENT_TYPES),
+    'registration_url': Field('string', format='url'),
+    'recap_url': Field('string', format='url'),
+    'recap': Field('object'),
+})
+
+PROJECT_SCHEMA = Schema('project', {
+    'id': Field('string', required=True),
+    'title': Field('string', required=True),
+    'status': Field('string', required=True, choices=PROJECT_STATUSES),
+    'description': Field('string', required=True),
+    'technologies': Field('array', required=True, items='string'),
+    'github_url': Field('string', required=True, format='url'),
+    'type': Field('string', required=True, choices=PROJECT_TYPES),
+    'image_url': Field('string'),
+})
+
+TEAM_MEMBER_SCHEMA = Schema('team member', {
+    'id': Field('string', required=True),
+    'name': Field('string', required=True),
+    'position': Field('string', required=True),
+    'profile_pic_url': Field('string', required=True),
+    'rank': Field('integer', required=True),
+    'categories': Field('array', required=True, items='string', min_items=1),
+    'connections': Field('array', items='string'),
+})
+
+ANNOUNCEMENT_SCHEMA = Schema('announcement', {
+    'id': Field('string', required=True),
+    'date': Field('string', required=True),  # Display date string (e.g., 'Sep 12, 2025')
+    'title': Field('string', required=True),
+    'description': Field('string', required=True),
+    'image_url': Field('string'),
+})
+
+USER_SCHEMA = Schema('user', {
+    'uid': Field('string'),
+    'username': Field('string', required=True),
+    'email': Field('string', required=True, format='email'),
+    'role': Field('string', choices=USER_ROLES),
+    'is_admin': Field('boolean'),
+    'is_owner': Field('boolean'),
+    'status': Field('string', choices=USER_STATUSES),
+    'email_verified': Field('boolean'),
+})
+
+ACTIVITY_LOG_SCHEMA = Schema('activity log', {
+    'action': Field('string', required=True),
+    'collection': Field('string', required=True),
+    'document_id': Field('string', required=True),
+    'changes': Field(),
+    'metadata': Field(),
+})
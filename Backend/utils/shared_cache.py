@@ -0,0 +1,297 @@
+"""
+Cache shared by every gunicorn worker
+Values live in namespaces (one per table). Each namespace has a generation
+number that is part of every key; a write to a table bumps its generation,
+which makes every cached value of that table unreachable in all workers at
+once. Backends (SHARED_CACHE_BACKEND):
+- local: per-process cache and generations (single worker, development)
+- shm:   per-process values, generations in a shared memory file, so a write
+         in one worker is seen by the next lookup in every other worker
+- redis: values and generations in a Redis-protocol server; bumps are
+         broadcast over pub/sub to every worker's generation table
+"""
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from config import Config
+from utils.cache import TTLCache
+from utils.metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl
+except ImportError:  # Windows: the shm backend is not available
+    fcntl = None
+
+INVALIDATION_CHANNEL = 'invalidate'
+
+
+class SharedCache(ABC):
+    """
+    Base class: generation-versioned keys over a key/value store
+
+    Values must be JSON-serializable; every get() returns a fresh copy.
+    Read the generation before computing a value and store it with that
+    generation, so a write that lands in between is never cached as current:
+
+        generation = cache.generation('events')
+        value = cache.get('events', key)
+        if value is None:
+            value = compute()
+            cache.set('events', key, value, ttl=30, generation=generation)
+    """
+
+    @abstractmethod
+    def generation(self, namespace):
+        """Current generation number of a namespace"""
+
+    @abstractmethod
+    def invalidate(self, namespace):
+        """Make every cached value of a namespace unreachable, in every worker"""
+
+    @abstractmethod
+    def _load(self, key):
+        """Serialized value stored under a full key, or None"""
+
+    @abstractmethod
+    def _store(self, key, data, ttl):
+        """Store a serialized value under a full key for ttl seconds"""
+
+    def get(self, namespace, key, metric_name=None):
+        """
+        Get a value cached under the namespace's current generation
+
+        Args:
+            namespace (str): Namespace (table name)
+            key (str): Key within the namespace
+            metric_name (str): Counted in byte_cache_requests_total when given
+
+        Returns:
+            The cached value, or None
+        """
+        try:
+            data = self._load(f'{namespace}:{self.generation(namespace)}:{key}')
+        except Exception as e:
+            logger.warning(f"Shared cache read failed: {str(e)}")
+            data = None
+
+        if metric_name:
+            record_cache_lookup(metric_name, data is not None)
+        return json.loads(data) if data is not None else None
+
+    def set(self, namespace, key, value, ttl, generation=None):
+        """
+        Cache a value
+
+        Args:
+            namespace (str): Namespace (table name)
+            key (str): Key within the namespace
+            value: JSON-serializable value
+            ttl (float): Seconds the value is kept
+            generation (int): Generation read before the value was computed
+        """
+        if generation is None:
+            generation = self.generation(namespace)
+        try:
+            self._store(f'{namespace}:{generation}:{key}', json.dumps(value), ttl)
+        except Exception as e:
+            logger.warning(f"Shared cache write failed: {str(e)}")
+
+
+class LocalCacheBackend(SharedCache):
+    """Values and generations in this process only"""
+
+    def __init__(self, max_entries=1024):
+        self._values = TTLCache(max_entries=max_entries)
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def generation(self, namespace):
+        return self._generations.get(namespace, 0)
+
+    def invalidate(self, namespace):
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    def _load(self, key):
+        return self._values.get(key)
+
+    def _store(self, key, data, ttl):
+        self._values.set(key, data, ttl)
+
+
+class SharedMemoryFile:
+    """
+    Fixed-size memory-mapped file shared by the workers of one host
+
+    lock() serializes read-modify-write cycles across threads and processes.
+    It takes POSIX record locks (lockf), which belong to a process: unlike
+    flock, they also exclude workers forked from a preloaded master that
+    inherited the same file descriptor.
+    """
+
+    def __init__(self, path, size):
+        if fcntl is None:
+            raise RuntimeError("Shared memory backends need fcntl (Linux or macOS)")
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._thread_lock = threading.Lock()
+        with self.lock():
+            if os.fstat(self._fd).st_size < size:
+                os.ftruncate(self._fd, size)
+        self.map = mmap.mmap(self._fd, size)
+
+    @contextmanager
+    def lock(self):
+        """Hold the file for one read-modify-write cycle"""
+        with self._thread_lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+
+class SharedMemoryCacheBackend(LocalCacheBackend):
+    """
+    Per-process values with generations in a memory-mapped file
+
+    The file holds a fixed table of 64-bit counters; namespaces are hashed to
+    a slot. Two namespaces sharing a slot only cost each other extra misses.
+    """
+
+    SLOTS = 256
+    SLOT = struct.Struct('<Q')
+
+    def __init__(self, path, max_entries=1024):
+        super().__init__(max_entries)
+        self._file = SharedMemoryFile(path, self.SLOTS * self.SLOT.size)
+
+    def _offset(self, namespace):
+        return (zlib.crc32(namespace.encode('utf-8')) % self.SLOTS) * self.SLOT.size
+
+    def generation(self, namespace):
+        return self.SLOT.unpack_from(self._file.map, self._offset(namespace))[0]
+
+    def invalidate(self, namespace):
+        offset = self._offset(namespace)
+        # Keeps concurrent bumps from different workers from collapsing into one
+        with self._file.lock():
+            self.SLOT.pack_into(self._file.map, offset, self.SLOT.unpack_from(self._file.map, offset)[0] + 1)
+
+
+class RedisCacheBackend(SharedCache):
+    """
+    Values and generations in Redis (or any server speaking its protocol)
+
+    Each worker keeps the generations in memory, updated by a pub/sub
+    subscriber thread as soon as another worker bumps one. While the
+    subscriber is not connected, generations are read from Redis instead.
+    """
+
+    def __init__(self, url, prefix='byte:cache:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("SHARED_CACHE_BACKEND=redis needs the redis package (pip install redis)")
+
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+        self._generations = {}
+        self._subscribed = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _generation_key(self, namespace):
+        return f'{self.prefix}generation:{namespace}'
+
+    def _ensure_subscriber(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._listen, name='shared-cache-pubsub', daemon=True)
+                    self._thread.start()
+
+    def _listen(self):
+        channel = self.prefix + INVALIDATION_CHANNEL
+        while True:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(channel)
+                # Generations bumped while we were not listening
+                self._generations.clear()
+                self._subscribed.set()
+                for message in pubsub.listen():
+                    namespace, _, generation = message['data'].decode('utf-8').rpartition(':')
+                    self._generations[namespace] = max(int(generation), self._generations.get(namespace, 0))
+            except Exception as e:
+                logger.warning(f"Shared cache subscriber disconnected: {str(e)}")
+            finally:
+                self._subscribed.clear()
+                pubsub.close()
+            time.sleep(1)
+
+    def generation(self, namespace):
+        self._ensure_subscriber()
+        if self._subscribed.is_set():
+            generation = self._generations.get(namespace)
+            if generation is not None:
+                return generation
+
+        generation = int(self._redis.get(self._generation_key(namespace)) or 0)
+        if self._subscribed.is_set():
+            self._generations.setdefault(namespace, generation)
+        return generation
+
+    def invalidate(self, namespace):
+        generation = self._redis.incr(self._generation_key(namespace))
+        self._generations[namespace] = max(generation, self._generations.get(namespace, 0))
+        self._redis.publish(self.prefix + INVALIDATION_CHANNEL, f'{namespace}:{generation}')
+
+    def _load(self, key):
+        return self._redis.get(self.prefix + key)
+
+    def _store(self, key, data, ttl):
+        self._redis.set(self.prefix + key, data, ex=max(1, int(ttl)))
+
+
+def create_shared_cache(backend=None):
+    """
+    Create the cache backend selected by SHARED_CACHE_BACKEND
+
+    Args:
+        backend (str): 'local', 'shm' or 'redis' (default: Config.SHARED_CACHE_BACKEND)
+
+    Returns:
+        SharedCache: Cache backend
+    """
+    backend = backend or Config.SHARED_CACHE_BACKEND
+    if backend == 'local':
+        return LocalCacheBackend(Config.SHARED_CACHE_MAX_ENTRIES)
+    if backend == 'shm':
+        shm_dir = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+        path = Config.SHARED_CACHE_SHM_PATH or os.path.join(shm_dir, 'byte-cache-generations')
+        return SharedMemoryCacheBackend(path, Config.SHARED_CACHE_MAX_ENTRIES)
+    if backend == 'redis':
+        return RedisCacheBackend(Config.SHARED_CACHE_URL, Config.SHARED_CACHE_PREFIX)
+    raise ValueError(f"Unknown SHARED_CACHE_BACKEND: {backend}")
+
+
+# Process-wide cache used by the response cache and the auth user lookup
+shared_cache = create_shared_cache()
+
+
+def invalidate_on_change(event):
+    """Change listener: a committed write to a table invalidates its namespace"""
+    try:
+        shared_cache.invalidate(event['collection'])
+    except Exception as e:
+        logger.error(f"Could not invalidate cached {event['collection']}: {str(e)}")
@@ -0,0 +1,77 @@
+"""
+Graceful shutdown hooks
+Modules with long-lived connections or background work register hooks here.
+The server entry points call them when a worker is stopping:
+- request_shutdown(): as soon as the worker is told to stop, before in-flight
+  requests are drained. Early hooks end requests that would otherwise run
+  until the graceful timeout (e.g. change streams).
+- run_shutdown_hooks(): after in-flight requests finished. Hooks flush
+  background work (e.g. pending snapshot exports), most recently registered first.
+"""
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_early_hooks = []
+_hooks = []
+_shutting_down = threading.Event()
+_lock = threading.Lock()
+
+
+def register_shutdown_hook(hook, early=False):
+    """
+    Register a callable run when the worker shuts down
+
+    Args:
+        hook (callable): Called with the seconds left before the worker is killed
+        early (bool): Run when shutdown is requested, before requests are drained
+    """
+    with _lock:
+        hooks = _early_hooks if early else _hooks
+        if hook not in hooks:
+            hooks.append(hook)
+
+
+def is_shutting_down():
+    """Whether the worker has been told to stop"""
+    return _shutting_down.is_set()
+
+
+def _run(hooks, timeout):
+    deadline = time.monotonic() + timeout
+    for hook in reversed(hooks):
+        remaining = max(0.0, deadline - time.monotonic())
+        try:
+            hook(remaining)
+        except Exception as e:
+            logger.error(f"Shutdown hook {getattr(hook, '__qualname__', hook)!r} failed: {str(e)}")
+
+
+def request_shutdown(timeout=5):
+    """
+    Mark the worker as stopping and run the early hooks (only the first call does anything)
+
+    Args:
+        timeout (float): Seconds shared by all early hooks
+    """
+    with _lock:
+        if _shutting_down.is_set():
+            return
+        _shutting_down.set()
+        hooks = list(_early_hooks)
+    _run(hooks, timeout)
+
+
+def run_shutdown_hooks(timeout=10):
+    """
+    Run every shutdown hook once in-flight requests have finished
+
+    Args:
+        timeout (float): Seconds shared by all hooks
+    """
+    request_shutdown(timeout)
+    with _lock:
+        hooks, _hooks[:] = list(_hooks), []
+    _run(hooks, timeout)
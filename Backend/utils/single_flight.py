@@ -0,0 +1,185 @@
+"""
+Single-flight call coalescing
+Concurrent calls with the same key share one execution: the first caller
+(the leader) runs the function, later callers wait for it and receive the
+same result, or the same exception. AsyncSingleFlight does the same for
+coroutines on one event loop (the ASGI app).
+"""
+import asyncio
+import copy
+import threading
+
+
+class SingleFlightTimeout(TimeoutError):
+    """Raised to a waiting caller when the shared call does not finish in time"""
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls by key
+
+    Every caller that shares a result gets a deep copy of it, the leader
+    included, so no caller can mutate another caller's data (or a result a
+    waiter is still copying). A leader nobody joined gets the result itself. Results are not cached: once the shared
+    call finishes, the next call with the same key runs again.
+
+    Usage:
+        flight = SingleFlight()
+        response = flight.do(('events', 'upcoming'), run_query, timeout=10)
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    def add_listener(self, listener):
+        """
+        Register a callable notified whenever a caller shares another caller's result
+
+        Args:
+            listener (callable): Called as listener(key)
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def in_flight(self):
+        """Number of keys currently being executed"""
+        with self._lock:
+            return len(self._calls)
+
+    def do(self, key, fn, timeout=None):
+        """
+        Run fn, or wait for an identical call already in flight
+
+        Args:
+            key: Hashable call identity
+            fn (callable): Function to run with no arguments
+            timeout (float): Seconds a waiting caller waits before giving up (None: forever)
+
+        Returns:
+            fn's result (a deep copy when the call was shared)
+
+        Raises:
+            SingleFlightTimeout: If waiting for the shared call timed out
+            Exception: Whatever the shared call raised
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                    # No caller can join once the key is removed
+                    shared = call.waiters > 0
+                call.done.set()
+            return copy.deepcopy(call.result) if shared else call.result
+
+        if not call.done.wait(timeout):
+            raise SingleFlightTimeout(f"Timed out after {timeout}s waiting for a shared call")
+
+        for listener in self._listeners:
+            listener(key)
+
+        if call.error is not None:
+            raise call.error
+        return copy.deepcopy(call.result)
+
+
+class AsyncSingleFlight:
+    """
+    SingleFlight for coroutines: concurrent awaits with the same key share one
+    execution, with the same copying rules. Not thread-safe; use one per event
+    loop.
+
+    Usage:
+        flight = AsyncSingleFlight()
+        response = await flight.do(('events', 'upcoming'), run_query, timeout=10)
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._listeners = []
+
+    def add_listener(self, listener):
+        """
+        Register a callable notified whenever a caller shares another caller's result
+
+        Args:
+            listener (callable): Called as listener(key)
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def in_flight(self):
+        """Number of keys currently being executed"""
+        return len(self._calls)
+
+    async def do(self, key, fn, timeout=None):
+        """
+        Await fn(), or wait for an identical call already in flight
+
+        Args:
+            key: Hashable call identity
+            fn (callable): Coroutine function to run with no arguments
+            timeout (float): Seconds a waiting caller waits before giving up (None: forever)
+
+        Returns:
+            fn's result (a deep copy when the call was shared)
+
+        Raises:
+            SingleFlightTimeout: If waiting for the shared call timed out
+            Exception: Whatever the shared call raised
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = self._calls[key] = [asyncio.get_running_loop().create_future(), 0]
+            future = call[0]
+            try:
+                result = await fn()
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except BaseException as e:
+                future.set_exception(e)
+                # Retrieved here, so a call nobody joined logs no "never retrieved" warning
+                future.exception()
+                raise
+            else:
+                future.set_result(result)
+            finally:
+                del self._calls[key]
+            return copy.deepcopy(result) if call[1] else result
+
+        call[1] += 1
+        # asyncio.wait never cancels the leader's call, even when this waiter gives up
+        done, _ = await asyncio.wait([call[0]], timeout=timeout)
+        if not done:
+            raise SingleFlightTimeout(f"Timed out after {timeout}s waiting for a shared call")
+
+        for listener in self._listeners:
+            listener(key)
+
+        # Raises the shared call's exception
+        return copy.deepcopy(call[0].result())
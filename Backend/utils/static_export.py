@@ -0,0 +1,341 @@
+"""
+Static JSON snapshots of the public API
+Renders every public list endpoint to <SNAPSHOT_DIR>/<url path>.json plus a
+pre-compressed .json.gz, and records the SHA-256 of each file in
+manifest.json. After a write only the snapshots of the changed collection
+are rendered again, and only files whose content changed are rewritten, so
+nginx or a CDN can serve public reads without reaching Flask.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+from flask import g
+from database import get_supabase_client
+from utils.change_feed import add_change_listener
+from utils.shutdown import register_shutdown_hook
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process manifest lock
+    fcntl = None
+
+MANIFEST_NAME = 'manifest.json'
+
+# Collections with public snapshots
+SNAPSHOT_COLLECTIONS = ('events', 'projects', 'team_members', 'announcements')
+
+
+class SnapshotTarget:
+    """One public URL and the file its response is written to"""
+
+    __slots__ = ('collection', 'path', 'query', 'file')
+
+    def __init__(self, collection, path, file, query=None):
+        self.collection = collection
+        self.path = path
+        self.query = query or {}
+        self.file = file
+
+    @property
+    def url(self):
+        return f"{self.path}?{urlencode(self.query)}" if self.query else self.path
+
+
+def _safe_segment(value):
+    """Whether a category or type value can be used as a file name"""
+    return isinstance(value, str) and value and '/' not in value and '\\' not in value and not value.startswith('.')
+
+
+def _distinct(table, column):
+    """Distinct non-empty values of a column (array columns are flattened)"""
+    rows = get_supabase_client().table(table).select(column).execute().data
+    values = set()
+    for row in rows:
+        value = row.get(column)
+        for item in value if isinstance(value, list) else [value]:
+            if _safe_segment(item):
+                values.add(item)
+            elif item:
+                logger.warning(f"Skipping {table}.{column} value {item!r}: not usable as a file name")
+    return sorted(values)
+
+
+def snapshot_targets(collection):
+    """
+    Snapshot targets of a collection, including one per category or type in use
+
+    Args:
+        collection (str): One of SNAPSHOT_COLLECTIONS
+
+    Returns:
+        list: SnapshotTarget objects
+    """
+    if collection == 'events':
+        targets = [
+            SnapshotTarget('events', '/api/events', 'api/events.json'),
+            SnapshotTarget('events', '/api/events/upcoming', 'api/events/upcoming.json'),
+            SnapshotTarget('events', '/api/events/past', 'api/events/past.json'),
+        ]
+        # /api/events?type=<type> has no path form, so it is written as api/events/type/<type>.json
+        targets += [
+            SnapshotTarget('events', '/api/events', f'api/events/type/{event_type}.json', {'type': event_type})
+            for event_type in _distinct('events', 'type')
+        ]
+        return targets
+
+    if collection == 'projects':
+        return [SnapshotTarget('projects', '/api/projects', 'api/projects.json')] + [
+            SnapshotTarget('projects', f'/api/projects/type/{project_type}', f'api/projects/type/{project_type}.json')
+            for project_type in _distinct('projects', 'type')
+        ]
+
+    if collection == 'team_members':
+        return [SnapshotTarget('team_members', '/api/team-members', 'api/team-members.json')] + [
+            SnapshotTarget('team_members', f'/api/team-members/category/{category}',
+                           f'api/team-members/category/{category}.json')
+            for category in _distinct('team_members', 'categories')
+        ]
+
+    if collection == 'announcements':
+        return [
+            SnapshotTarget('announcements', '/api/announcements', 'api/announcements.json'),
+            SnapshotTarget('announcements', '/api/announcements/recent', 'api/announcements/recent.json'),
+        ]
+
+    raise ValueError(f"No snapshots for collection: {collection}")
+
+
+def render_target(app, target):
+    """
+    Render a target through the app, exactly as an anonymous visitor would get it
+
+    Args:
+        app: Flask application instance
+        target (SnapshotTarget): Target to render
+
+    Returns:
+        bytes: Response body
+
+    Raises:
+        RuntimeError: If the response is not a fresh 200
+    """
+    # no-cache: render from the database, not from the shared response cache
+    with app.test_request_context(target.path, method='GET', query_string=target.query,
+                                  headers={'Cache-Control': 'no-cache'}):
+        # Not a client request: exempt from rate limits and load shedding
+        g.internal_request = True
+        response = app.full_dispatch_request()
+
+    # A stale replay (see middleware/serve_stale.py) must not overwrite a good snapshot
+    if response.status_code != 200 or 'Warning' in response.headers:
+        raise RuntimeError(f"{target.url} returned {response.status_code}")
+    return response.get_data()
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class SnapshotExporter:
+    """
+    Writes snapshots and keeps manifest.json in step
+
+    Manifest updates are serialized with a lock file, so several gunicorn
+    workers can export into the same directory.
+    """
+
+    def __init__(self, app, output_dir):
+        self.app = app
+        self.output_dir = output_dir
+        self._lock = threading.Lock()
+
+    def _manifest_path(self):
+        return os.path.join(self.output_dir, MANIFEST_NAME)
+
+    def read_manifest(self):
+        """
+        Load the manifest
+
+        Returns:
+            dict: Manifest with a 'files' mapping (empty if none was written yet)
+        """
+        try:
+            with open(self._manifest_path(), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'files': {}}
+
+    def export(self, collections=None, force=False):
+        """
+        Render the snapshots of some collections and rewrite what changed
+
+        Args:
+            collections (iterable): Collections to export (default: all)
+            force (bool): Rewrite files even when their hash is unchanged
+
+        Returns:
+            dict: Lists of 'written', 'unchanged', 'removed' and 'failed' files
+        """
+        collections = list(collections or SNAPSHOT_COLLECTIONS)
+        result = {'written': [], 'unchanged': [], 'removed': [], 'failed': []}
+
+        rendered = {}
+        exported = set()
+        for collection in collections:
+            try:
+                targets = snapshot_targets(collection)
+            except Exception as e:
+                logger.error(f"Could not list {collection} snapshots: {str(e)}")
+                result['failed'].append(collection)
+                continue
+
+            exported.add(collection)
+            for target in targets:
+                try:
+                    rendered[target.file] = (target, render_target(self.app, target))
+                except Exception as e:
+                    logger.error(f"Could not render {target.url}: {str(e)}")
+                    result['failed'].append(target.file)
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        with self._lock, open(os.path.join(self.output_dir, '.lock'), 'w') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            manifest = self.read_manifest()
+            files = manifest.setdefault('files', {})
+
+            for name, (target, body) in rendered.items():
+                digest = hashlib.sha256(body).hexdigest()
+                entry = files.get(name)
+                path = os.path.join(self.output_dir, name)
+                if not force and entry and entry['sha256'] == digest and os.path.exists(path):
+                    result['unchanged'].append(name)
+                    continue
+
+                # mtime=0 keeps the .gz byte-identical for identical content
+                compressed = gzip.compress(body, compresslevel=9, mtime=0)
+                _write_atomic(path, body)
+                _write_atomic(path + '.gz', compressed)
+                files[name] = {
+                    'url': target.url,
+                    'collection': target.collection,
+                    'sha256': digest,
+                    'bytes': len(body),
+                    'gzip_sha256': hashlib.sha256(compressed).hexdigest(),
+                    'gzip_bytes': len(compressed),
+                    'updated_at': datetime.now(timezone.utc).isoformat(),
+                }
+                result['written'].append(name)
+
+            # Categories or types that no longer exist
+            failed = set(result['failed'])
+            for name, entry in list(files.items()):
+                if entry['collection'] in exported and name not in rendered and name not in failed:
+                    for path in (name, name + '.gz'):
+                        try:
+                            os.remove(os.path.join(self.output_dir, path))
+                        except FileNotFoundError:
+                            pass
+                    del files[name]
+                    result['removed'].append(name)
+
+            if result['written'] or result['removed'] or not os.path.exists(self._manifest_path()):
+                manifest['generated_at'] = datetime.now(timezone.utc).isoformat()
+                _write_atomic(
+                    self._manifest_path(),
+                    json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8')
+                )
+
+        return result
+
+
+class _SnapshotWorker:
+    """
+    Background thread re-exporting collections after writes
+
+    Change listeners run on the request thread, so they only queue the
+    collection; bursts of writes to one collection collapse into one export.
+    """
+
+    def __init__(self, exporter):
+        self.exporter = exporter
+        self._pending = set()
+        self._exporting = False
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def on_change(self, event):
+        collection = event['collection']
+        if collection not in SNAPSHOT_COLLECTIONS:
+            return
+        with self._condition:
+            self._pending.add(collection)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='snapshot-export', daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending)
+                collections, self._pending = self._pending, set()
+                self._exporting = True
+            try:
+                result = self.exporter.export(collections)
+                logger.info(
+                    f"Snapshots for {', '.join(sorted(collections))}: "
+                    f"{len(result['written'])} written, {len(result['removed'])} removed"
+                )
+            except Exception as e:
+                logger.error(f"Snapshot export failed: {str(e)}")
+            finally:
+                with self._condition:
+                    self._exporting = False
+                    self._condition.notify_all()
+
+    def flush(self, timeout):
+        """
+        Wait for queued exports to finish (shutdown hook)
+
+        Args:
+            timeout (float): Seconds to wait at most
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: not self._pending and not self._exporting, timeout):
+                logger.warning(f"Shutting down with snapshot exports pending: {sorted(self._pending)}")
+
+
+def register_static_export(app):
+    """
+    Re-export snapshots after every write to a public collection
+    Does nothing unless SNAPSHOT_DIR and SNAPSHOT_ON_WRITE are set in the app config.
+
+    Args:
+        app: Flask application instance
+    """
+    output_dir = app.config.get('SNAPSHOT_DIR')
+    if not output_dir or not app.config.get('SNAPSHOT_ON_WRITE'):
+        return
+
+    worker = _SnapshotWorker(SnapshotExporter(app, output_dir))
+    add_change_listener(worker.on_change)
+    register_shutdown_hook(worker.flush)
+    app.extensions['snapshot_worker'] = worker
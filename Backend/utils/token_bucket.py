@@ -0,0 +1,201 @@
+"""
+Token buckets shared by every gunicorn worker
+A bucket holds up to `burst` tokens and refills at `rate` tokens per second;
+each request takes one. Backends (RATE_LIMIT_BACKEND, default: the shared
+cache backend):
+- local: buckets in this process (single worker, development)
+- shm:   buckets in a shared memory file, one table for all workers of a host
+- redis: buckets in a Redis-protocol server, updated atomically by a Lua
+         script, shared by every host
+"""
+import hashlib
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from config import Config
+from utils.shared_cache import SharedMemoryFile
+
+logger = logging.getLogger(__name__)
+
+
+def _refill(tokens, updated, now, rate, burst, cost):
+    """
+    Apply the refill since the last update and try to take `cost` tokens
+
+    Returns:
+        tuple: (tokens left, seconds to wait; 0 when the tokens were taken)
+    """
+    tokens = min(burst, tokens + max(0.0, now - updated) * rate)
+    if tokens >= cost:
+        return tokens - cost, 0.0
+    return tokens, (cost - tokens) / rate
+
+
+class TokenBuckets(ABC):
+    """Base class: a keyed set of token buckets"""
+
+    @abstractmethod
+    def take(self, key, rate, burst, cost=1):
+        """
+        Take tokens from a bucket (created full on first use)
+
+        Args:
+            key (str): Bucket key, e.g. 'ip:203.0.113.7'
+            rate (float): Tokens added per second
+            burst (float): Bucket capacity
+            cost (float): Tokens this request needs
+
+        Returns:
+            float: 0 if the request may proceed, else seconds until it could
+        """
+
+
+class LocalTokenBuckets(TokenBuckets):
+    """Buckets in this process only; the least recently used are dropped first"""
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, burst, cost=1):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (burst, now))
+            tokens, wait = _refill(tokens, updated, now, rate, burst, cost)
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class SharedMemoryTokenBuckets(TokenBuckets):
+    """
+    Buckets in a memory-mapped table of (key hash, tokens, last update) slots
+
+    A key probes a few slots from its hash. Slots idle for RECLAIM_AFTER
+    seconds (full again at any sane rate) are reused; if every probed slot
+    is busy, the key shares the first one, which can only make limits stricter.
+    """
+
+    SLOTS = 8192
+    PROBES = 4
+    RECLAIM_AFTER = 60.0
+    SLOT = struct.Struct('<Qdd')
+
+    def __init__(self, path):
+        self._file = SharedMemoryFile(path, self.SLOTS * self.SLOT.size)
+
+    @staticmethod
+    def _hash(key):
+        # 0 marks an empty slot
+        return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little') or 1
+
+    def take(self, key, rate, burst, cost=1):
+        key_hash = self._hash(key)
+        now = time.time()  # wall clock: comparable between processes
+        table = self._file.map
+
+        with self._file.lock():
+            match = free = None
+            for probe in range(self.PROBES):
+                candidate = ((key_hash + probe) % self.SLOTS) * self.SLOT.size
+                slot_hash, tokens, updated = self.SLOT.unpack_from(table, candidate)
+                if slot_hash == key_hash:
+                    match = (candidate, tokens, updated)
+                    break
+                if free is None and (slot_hash == 0 or now - updated >= self.RECLAIM_AFTER):
+                    free = candidate
+
+            if match is not None:
+                offset, tokens, updated = match
+            elif free is not None:
+                offset, tokens, updated = free, burst, now
+            else:
+                offset = (key_hash % self.SLOTS) * self.SLOT.size
+                _, tokens, updated = self.SLOT.unpack_from(table, offset)
+
+            tokens, wait = _refill(tokens, updated, now, rate, burst, cost)
+            self.SLOT.pack_into(table, offset, key_hash, tokens, now)
+        return wait
+
+
+# KEYS[1] bucket; ARGV rate, burst, cost. Uses the server clock, so hosts
+# with skewed clocks agree. Returns the wait as a string (Lua numbers are
+# truncated to integers in replies).
+_TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class RedisTokenBuckets(TokenBuckets):
+    """
+    Buckets in Redis (or any server speaking its protocol and running Lua)
+
+    If Redis cannot be reached, requests are let through: an outage of the
+    limiter must not take the API down with it.
+    """
+
+    def __init__(self, url, prefix='byte:ratelimit:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis needs the redis package (pip install redis)")
+
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+        self._take = self._redis.register_script(_TAKE_SCRIPT)
+
+    def take(self, key, rate, burst, cost=1):
+        try:
+            return float(self._take(keys=[self.prefix + key], args=[rate, burst, cost]))
+        except Exception as e:
+            logger.warning(f"Rate limiter unavailable, letting the request through: {str(e)}")
+            return 0.0
+
+
+def create_token_buckets(backend=None):
+    """
+    Create the bucket store selected by RATE_LIMIT_BACKEND
+
+    Args:
+        backend (str): 'local', 'shm' or 'redis' (default: Config.RATE_LIMIT_BACKEND)
+
+    Returns:
+        TokenBuckets: Bucket store
+    """
+    backend = backend or Config.RATE_LIMIT_BACKEND
+    if backend == 'local':
+        return LocalTokenBuckets()
+    if backend == 'shm':
+        shm_dir = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+        return SharedMemoryTokenBuckets(Config.RATE_LIMIT_SHM_PATH or os.path.join(shm_dir, 'byte-rate-limits'))
+    if backend == 'redis':
+        return RedisTokenBuckets(Config.SHARED_CACHE_URL, Config.RATE_LIMIT_PREFIX)
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {backend}")
+
+
+# Process-wide buckets used by middleware/rate_limit.py
+token_buckets = create_token_buckets()
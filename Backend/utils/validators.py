@@ -1,7 +1,7 @@
 """
 Input validation utilities
 """
-from datetime import datetime
+from datetime import datetime, timezone
 
 
 def validate_required_fields(data, required_fields):
@@ -83,3 +83,40 @@ def validate_url(url):
     if not url:
         return False
     return url.startswith('http://') or url.startswith('https://')
+
+
+def parse_timestamp(timestamp):
+    """
+    Parse an ISO 8601 date or timestamp string
+    (e.g. '2025-09-01', '2025-09-01T12:00:00Z', '2025-09-01T12:00:00+00:00')
+    Timestamps without a timezone are treated as UTC.
+
+    Args:
+        timestamp (str): Timestamp string to parse
+
+    Returns:
+        datetime: Timezone-aware datetime, or None if invalid
+    """
+    if not timestamp or not isinstance(timestamp, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def validate_timestamp(timestamp):
+    """
+    Validate an ISO 8601 date or timestamp string
+
+    Args:
+        timestamp (str): Timestamp string to validate
+
+    Returns:
+        bool: True if valid, False otherwise
+    """
+    return parse_timestamp(timestamp) is not None
@@ -0,0 +1,7 @@
+"""
+BYTE Website Backend API - WSGI entry point
+    gunicorn -c gunicorn.conf.py        (worker model and hooks: gunicorn.conf.py)
+"""
+from main import create_app
+
+app = create_app()
@@ -85,6 +85,9 @@ CREATE TABLE team_members (
   -- Members can belong to multiple categories
   categories TEXT[] NOT NULL,
 
+  -- Image size and placeholder, set by the backend: { src, width, height, placeholder }
+  image_meta JSONB,
+
   -- Metadata
   created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
   updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
@@ -138,6 +141,9 @@ CREATE TABLE projects (
   image_url TEXT,
   type TEXT NOT NULL CHECK (type IN ('current', 'past')),
 
+  -- Image size and placeholder, set by the backend: { src, width, height, placeholder }
+  image_meta JSONB,
+
   -- Metadata
   created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
   updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
@@ -197,6 +203,9 @@ CREATE TABLE events (
   -- Event recap (stored as JSONB for flexibility)
   recap JSONB, -- Structure: { summary: string, images: string[] }
 
+  -- Image size and placeholder, set by the backend: { src, width, height, placeholder }
+  image_meta JSONB,
+
   -- Computed/denormalized field
   is_past BOOLEAN NOT NULL DEFAULT FALSE,
 
@@ -252,6 +261,7 @@ CREATE TABLE announcements (
   title TEXT NOT NULL,
   description TEXT NOT NULL,
   image_url TEXT,
+  image_meta JSONB, -- Set by the backend: { src, width, height, placeholder }
 
   -- Metadata
   created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
@@ -379,6 +389,158 @@ CREATE POLICY "Admins can insert activity log" ON activity_log
     )
   );
 
+-- ==================== ACTIVITY LOG DAILY ROLLUP ====================
+-- Daily aggregates of activity_log rows that have been moved to the cold
+-- archive by the retention job (flask activity-log retain)
+
+CREATE TABLE activity_log_daily (
+  day DATE NOT NULL,
+  user_id UUID NOT NULL,
+  collection TEXT NOT NULL,
+  action TEXT NOT NULL,
+  count BIGINT NOT NULL DEFAULT 0,
+
+  PRIMARY KEY (day, user_id, collection, action)
+);
+
+-- Enable RLS
+ALTER TABLE activity_log_daily ENABLE ROW LEVEL SECURITY;
+
+-- RLS Policies - Admin read only (written by the retention job)
+CREATE POLICY "Admins can view activity log rollups" ON activity_log_daily
+  FOR SELECT USING (
+    EXISTS (
+      SELECT 1 FROM users WHERE uid = auth.uid() AND is_admin = TRUE
+    )
+  );
+
+-- Roll up a batch of activity_log rows into activity_log_daily and delete them,
+-- in one transaction. Called by the retention job after the rows have been
+-- written to the cold archive.
+CREATE OR REPLACE FUNCTION archive_activity_log_batch(p_ids UUID[])
+RETURNS INTEGER AS $$
+DECLARE
+  deleted_count INTEGER;
+BEGIN
+  INSERT INTO activity_log_daily (day, user_id, collection, action, count)
+  SELECT (timestamp AT TIME ZONE 'UTC')::DATE, user_id, collection, action, COUNT(*)
+  FROM activity_log
+  WHERE id = ANY(p_ids)
+  GROUP BY 1, 2, 3, 4
+  ON CONFLICT (day, user_id, collection, action)
+  DO UPDATE SET count = activity_log_daily.count + EXCLUDED.count;
+
+  DELETE FROM activity_log WHERE id = ANY(p_ids);
+  GET DIAGNOSTICS deleted_count = ROW_COUNT;
+
+  RETURN deleted_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Aggregated activity counts for the admin dashboard (GET /api/activity-log/stats)
+-- Buckets rows by hour or day and groups them by user, collection or action.
+-- Day buckets also include the rollups of archived rows; archived rows are not
+-- available at hourly resolution.
+-- Runs as the caller (SECURITY INVOKER), so the RLS policies above still apply.
+CREATE OR REPLACE FUNCTION activity_log_stats(
+  p_bucket TEXT DEFAULT 'day',
+  p_group_by TEXT DEFAULT 'collection',
+  p_since TIMESTAMPTZ DEFAULT NULL,
+  p_until TIMESTAMPTZ DEFAULT NULL
+)
+RETURNS TABLE (bucket TIMESTAMPTZ, group_key TEXT, count BIGINT) AS $$
+  SELECT bucket, group_key, SUM(count)::BIGINT AS count
+  FROM (
+    SELECT
+      date_trunc(p_bucket, timestamp, 'UTC') AS bucket,
+      CASE p_group_by
+        WHEN 'user' THEN user_id::TEXT
+        WHEN 'action' THEN action
+        ELSE collection
+      END AS group_key,
+      COUNT(*) AS count
+    FROM activity_log
+    WHERE (p_since IS NULL OR timestamp >= p_since)
+      AND (p_until IS NULL OR timestamp < p_until)
+    GROUP BY 1, 2
+
+    UNION ALL
+
+    SELECT
+      (day::TIMESTAMP AT TIME ZONE 'UTC') AS bucket,
+      CASE p_group_by
+        WHEN 'user' THEN user_id::TEXT
+        WHEN 'action' THEN action
+        ELSE collection
+      END AS group_key,
+      SUM(count) AS count
+    FROM activity_log_daily
+    WHERE p_bucket = 'day'
+      AND (p_since IS NULL OR day >= (p_since AT TIME ZONE 'UTC')::DATE)
+      AND (p_until IS NULL OR day < (p_until AT TIME ZONE 'UTC')::DATE)
+    GROUP BY 1, 2
+  ) AS combined
+  GROUP BY bucket, group_key
+  ORDER BY bucket, group_key;
+$$ LANGUAGE sql STABLE;
+
+
+-- ==================== DELETED RECORDS TABLE ====================
+-- Tombstones written by the API delete handlers so delta sync clients
+-- (GET ...?updated_since=<ts>) learn about deleted rows
+
+CREATE TABLE deleted_records (
+  id BIGSERIAL PRIMARY KEY,
+  collection TEXT NOT NULL, -- Table name
+  document_id TEXT NOT NULL, -- ID of deleted record
+  deleted_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  deleted_by UUID REFERENCES users(uid) ON DELETE SET NULL
+);
+
+-- Indexes
+CREATE INDEX idx_deleted_records_collection_deleted_at ON deleted_records(collection, deleted_at);
+
+-- Enable RLS
+ALTER TABLE deleted_records ENABLE ROW LEVEL SECURITY;
+
+-- RLS Policies - Public read for content tables, admin read for users, admin write
+CREATE POLICY "Anyone can view content tombstones" ON deleted_records
+  FOR SELECT USING (collection <> 'users');
+
+CREATE POLICY "Admins can view all tombstones" ON deleted_records
+  FOR SELECT USING (
+    EXISTS (
+      SELECT 1 FROM users WHERE uid = auth.uid() AND is_admin = TRUE
+    )
+  );
+
+CREATE POLICY "Admins can insert tombstones" ON deleted_records
+  FOR INSERT WITH CHECK (
+    EXISTS (
+      SELECT 1 FROM users WHERE uid = auth.uid() AND is_admin = TRUE
+    )
+  );
+
+-- updated_at indexes for delta sync (projects already has idx_projects_updated_at)
+CREATE INDEX idx_users_updated_at ON users(updated_at);
+CREATE INDEX idx_team_members_updated_at ON team_members(updated_at);
+CREATE INDEX idx_events_updated_at ON events(updated_at);
+CREATE INDEX idx_announcements_updated_at ON announcements(updated_at);
+
+
+-- ==================== BACKUP RESTORE ====================
+-- Restores insert faqs and deleted_records rows with their original ids, which
+-- does not advance the serial sequences. Called by `flask data restore`
+-- afterwards so new rows do not collide with restored ones.
+CREATE OR REPLACE FUNCTION reset_serial_sequences()
+RETURNS VOID AS $$
+BEGIN
+  PERFORM setval(pg_get_serial_sequence('faqs', 'id'), COALESCE((SELECT MAX(id) FROM faqs), 0) + 1, false);
+  PERFORM setval(pg_get_serial_sequence('deleted_records', 'id'),
+                 COALESCE((SELECT MAX(id) FROM deleted_records), 0) + 1, false);
+END;
+$$ LANGUAGE plpgsql;
+
 
 -- ==================== TRIGGERS ====================
 
@@ -490,6 +652,15 @@ ORDER BY updated_at DESC;
 --    INSERT INTO announcements (id, date, title, description, image_url)
 --    VALUES (...) for each announcement in announcementsData
 
+-- ==================== IMAGE PLACEHOLDERS MIGRATION ====================
+-- Existing databases: add the image_meta columns, then fill them with
+-- `flask --app main images placeholders` from Backend/.
+
+-- ALTER TABLE team_members ADD COLUMN image_meta JSONB;
+-- ALTER TABLE projects ADD COLUMN image_meta JSONB;
+-- ALTER TABLE events ADD COLUMN image_meta JSONB;
+-- ALTER TABLE announcements ADD COLUMN image_meta JSONB;
+
 -- ==================== DATABASE MIGRATION QUERY ====================
 -- If you already have the team_members table with 'category TEXT' column,
 -- use this query to migrate to 'categories TEXT[]':